@@ -19,24 +19,122 @@ class Settings(BaseSettings):
     api_port: int = 8000
     
     # Configurações da Exchange
+    # exchange_name: id do ccxt (ex: "binance") ou backend offline "replay" / "synthetic"
     exchange_name: str = "binance"
     exchange_type: str = "spot"
     
+    # Backends offline (replay de fixtures e sintético): latência e falhas injetadas
+    replay_fixtures_dir: str = "fixtures/ohlcv"
+    fake_exchange_latency_ms: float = 0.0
+    fake_exchange_jitter_ms: float = 0.0
+    fake_exchange_failure_rate: float = 0.0
+    fake_exchange_seed: Optional[int] = None
+    
+    # Retry (backoff exponencial com jitter) e circuit breaker das chamadas à exchange
+    retry_max_delay: float = 10.0
+    circuit_breaker_enabled: bool = True
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_reset_timeout: float = 30.0
+    
+    # Índice de mercados (load_markets no startup e recarga periódica em segundo plano)
+    market_index_enabled: bool = True
+    market_refresh_interval: float = 3600.0
+    quote_preference: list = ["USDT", "FDUSD", "USDC", "BRL", "BTC"]
+    
+    # Snapshot de preços de /prices (uma chamada fetch_tickers compartilhada)
+    tickers_snapshot_ttl_seconds: float = 2.0
+    max_symbols_per_request: int = 100
+    
     # Configurações dos Indicadores
+    # (EMA9/EMA21/EMA50/EMA200 na resposta são as EMAs rápida/média/tendência/lenta)
     rsi_period: int = 14
     ema_fast: int = 9
     ema_medium: int = 21
+    ema_trend: int = 50
     ema_slow: int = 200
+    sma_period: int = 100
     volume_ma_period: int = 20
     macd_fast: int = 12
     macd_slow: int = 26
     macd_signal: int = 9
+    stoch_rsi_length: int = 14
+    stoch_k: int = 3
+    stoch_d: int = 3
+    atr_period: int = 14
+    bb_period: int = 20
+    bb_std: float = 2.0
+    mfi_period: int = 14
+    adx_period: int = 14
+    
+    # Histórico mínimo por timeframe calculado a partir do aquecimento dos indicadores
+    # (tolerância = peso residual máximo do estado inicial das EMAs/RMAs)
+    lookback_planner_enabled: bool = True
+    lookback_tolerance: float = 0.05
+    lookback_default_candles: int = 500
+    lookback_max_candles: int = 1000
+    
+    # Indicadores incrementais (estado por symbol/timeframe, custo O(1) por candle)
+    # O estado de cada série é compartilhado entre requisições e avança todos os
+    # indicadores: com o motor ligado, o seletor de campos (?fields=) só reduz a
+    # resposta e o gráfico. A avaliação seletiva (só os campos pedidos e suas
+    # dependências) vale apenas com o motor desligado, no kernel do pool de processos.
+    streaming_indicators_enabled: bool = True
+    
+    # Cache de resultados de indicadores (por último candle e candle em formação)
+    indicator_cache_enabled: bool = True
+    indicator_cache_max_entries: int = 1024
+    indicator_cache_max_mb: int = 64
+    
+    # Pools de execução: processos para indicadores/score, threads para I/O bloqueante
+    # (fila limitada: acima de workers + fila, a requisição recebe 503)
+    executor_pools_enabled: bool = True
+    cpu_pool_workers: int = 0  # 0 = número de núcleos
+    cpu_pool_queue: int = 64
+    io_pool_workers: int = 8
+    io_pool_queue: int = 64
+    
+    # Screener de mercado (/screener): pares por varredura (os de maior volume em 24h),
+    # buscas simultâneas de candles, símbolos por lote no pool e tamanho máximo do ranking.
+    # O cache e os buffers de candles ganham espaço para screener_universe × timeframes séries
+    screener_universe: int = 150
+    screener_concurrency: int = 16
+    screener_batch_size: int = 50
+    screener_max_top: int = 100
+    
+    # Pesos do score geral (parcial, ex: {"trend": 0.5, "momentum": 0.2}); ver ScoreWeights.
+    # Pesos >= 0; categorias e sub-pesos do momento devem somar 1 cada (validado na inicialização)
+    score_weights: dict = {}
     
     # Configurações de Dados
     default_candle_limit: int = 100
     analysis_candle_limit: int = 200
     default_timeframes: list = ["1h", "4h", "1d"]
     
+    # Cache de candles (apenas o candle em formação é atualizado)
+    # Capacidade efetiva: candle_cache_max_entries + screener_universe × len(default_timeframes)
+    candle_cache_enabled: bool = True
+    candle_cache_max_entries: int = 256
+    
+    # Buffers circulares por (symbol, timeframe) para refresh incremental
+    # Capacidade efetiva: candle_buffer_max_series + screener_universe × len(default_timeframes)
+    # (450 séries do screener com o padrão; ~48 KB por série de 1000 candles, ~24 KB compacta)
+    incremental_refresh_enabled: bool = True
+    candle_buffer_max_series: int = 256
+    
+    # Candles compactos: OHLCV em float32 e timestamps int32 (segundos desde uma base)
+    # nos buffers e no cache, 24 em vez de 48 bytes por candle (~50% da memória;
+    # ~7 dígitos significativos, os DataFrames entregues aos serviços são float64)
+    compact_candles: bool = False
+    
+    # Coalescência de chamadas idênticas simultâneas à exchange (single-flight)
+    single_flight_enabled: bool = True
+    
+    # Deriva 4h/1d localmente a partir do menor timeframe pedido (ex: 1h)
+    resample_timeframes: bool = False
+    
+    # Histórico local de candles (arquivos memory-mapped por symbol/timeframe)
+    candle_store_dir: str = "data/candles"
+    
     # Configurações de CORS
     cors_origins: list = ["*"]
     
@@ -2,10 +2,14 @@
 Crypto Insight AI - Backend
 FastAPI application para análise de criptomoedas
 """
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.routes import price, analyze
+from app.routes import price, analyze, indicators, screener
 from app.models.schemas import HealthResponse
+from app.config import settings
+from app.services.crypto_service import get_crypto_service
+from app.services.executor_pool import get_cpu_pool, shutdown_pools
 
 # Inicializa a aplicação FastAPI
 app = FastAPI(
@@ -26,6 +30,60 @@ app.add_middleware(
 # Inclui as rotas
 app.include_router(price.router, tags=["Price"])
 app.include_router(analyze.router, tags=["Analysis"])
+app.include_router(indicators.router, tags=["Indicators"])
+app.include_router(screener.router, tags=["Screener"])
+
+
+# Tarefa de recarga periódica do índice de mercados
+_market_refresh_task = None
+
+
+@app.on_event("startup")
+async def load_market_index():
+    """
+    Carrega o índice de mercados da exchange e agenda sua recarga periódica
+    
+    Se a carga falhar, a API sobe mesmo assim (símbolos são só normalizados com /USDT)
+    e a recarga em segundo plano tenta de novo.
+    """
+    global _market_refresh_task
+    if not settings.market_index_enabled:
+        return
+    
+    crypto_service = get_crypto_service()
+    try:
+        count = await crypto_service.load_markets()
+        print(f"✅ Índice de mercados carregado: {count} pares")
+    except Exception as e:
+        print(f"⚠️ Não foi possível carregar o índice de mercados: {type(e).__name__} - {str(e)}")
+    
+    _market_refresh_task = asyncio.create_task(
+        crypto_service.refresh_markets_periodically(settings.market_refresh_interval)
+    )
+
+
+@app.on_event("startup")
+async def start_executor_pools():
+    """
+    Inicia os workers do pool de processos, para que a primeira análise não
+    espere o spawn; se falhar, os workers são criados no primeiro pedido
+    """
+    try:
+        await get_cpu_pool().warm_up('app.services.analysis_tasks')
+    except Exception as e:
+        print(f"⚠️ Não foi possível iniciar o pool de processos: {type(e).__name__} - {str(e)}")
+
+
+@app.on_event("shutdown")
+async def close_exchange_sessions():
+    """
+    Cancela a recarga do índice de mercados, fecha a sessão HTTP assíncrona
+    da exchange compartilhada pelas rotas e encerra os pools de execução
+    """
+    if _market_refresh_task is not None:
+        _market_refresh_task.cancel()
+    await get_crypto_service().close()
+    shutdown_pools()
 
 
 @app.get("/", response_model=HealthResponse)
@@ -21,6 +21,13 @@ class PriceResponse(BaseModel):
     timeframes: Dict[str, List[CandleData]]
 
 
+class PricesResponse(BaseModel):
+    """Resposta do endpoint /prices"""
+    prices: Dict[str, float]
+    missing: List[str] = []
+    timestamp: int
+
+
 class TrendIndicators(BaseModel):
     """Indicadores de Tendência"""
     EMA9: Optional[float] = None
@@ -103,6 +110,14 @@ class ChartDataResponse(BaseModel):
     candles: List[CandleWithEMA]
 
 
+class IndicatorSeriesResponse(BaseModel):
+    """Resposta do endpoint /indicators/{symbol} (formato colunar)"""
+    symbol: str
+    timeframe: str
+    timestamps: List[int]  # timestamp de abertura de cada candle em milissegundos
+    series: Dict[str, List[Optional[float]]]  # um valor por timestamp (null durante o aquecimento)
+
+
 class TradeOpportunity(BaseModel):
     """Oportunidade de trade rápido (scalp/day trade)"""
     probability: float
@@ -123,6 +138,30 @@ class AnalyzeResponse(BaseModel):
     trade_opportunity: Optional[TradeOpportunity] = None
 
 
+class ScreenerEntry(BaseModel):
+    """Par do ranking do screener"""
+    rank: int
+    symbol: str
+    score: float
+    diagnostic: str
+    scores: Dict[str, float]  # score de cada timeframe
+    last_close: float
+    rsi: Optional[float] = None
+
+
+class ScreenerResponse(BaseModel):
+    """Resposta do endpoint /screener"""
+    quote: str
+    timeframe: Optional[str] = None  # None = score geral (1h/4h/1d)
+    timeframes: List[str]
+    candle_open: int  # abertura (ms) do candle atual do menor timeframe; o ranking vale até o seu fechamento
+    scanned: int
+    failed: int
+    elapsed_seconds: float
+    cached: bool
+    results: List[ScreenerEntry]
+
+
 class HealthResponse(BaseModel):
     """Resposta do endpoint raiz"""
     status: str
@@ -1,9 +1,19 @@
 """
 Rotas para análise técnica
 """
-from fastapi import APIRouter, HTTPException
-from app.services.crypto_service import CryptoService
+import asyncio
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from app.services.crypto_service import get_crypto_service
+from app.config import settings
+from app.services.analysis_tasks import chart_candles, compute_indicators, compute_indicators_with_emas, score_timeframes
+from app.services.executor_pool import ExecutorSaturatedError, get_cpu_pool, get_io_pool
+from app.services.indicator_cache import IndicatorCache
+from app.services.indicator_kernel import mask_indicators
+from app.services.indicator_params import CHART_EMA_FIELDS, IndicatorParams
+from app.services.lookback_planner import LookbackPlanner
 from app.services.indicator_service import IndicatorService
+from app.services.streaming_indicators import StreamingIndicatorService
 from app.utils.score_engine import ScoreEngine
 from app.utils.ai_analyzer import generate_ai_comment
 from app.models.schemas import (
@@ -12,21 +22,56 @@ from app.models.schemas import (
     VolumeIndicators, StrengthIndicators, PriceData, TradeOpportunity
 )
 from app.routes.helpers import validate_and_normalize_symbol, handle_crypto_service_error
-import pandas as pd
 
 router = APIRouter()
-crypto_service = CryptoService()
+
+# Timeframe do gráfico de /analyze (bom equilíbrio entre detalhe e visão geral)
+CHART_TIMEFRAME = '4h'
+
+crypto_service = get_crypto_service()
 indicator_service = IndicatorService()
-score_engine = ScoreEngine()
+indicator_params = IndicatorParams.from_settings(settings)
+streaming_indicators = StreamingIndicatorService(max_series=settings.candle_buffer_max_series, params=indicator_params)
+lookback_planner = LookbackPlanner(
+    params=indicator_params,
+    tolerance=settings.lookback_tolerance,
+    default_limit=settings.lookback_default_candles,
+    max_limit=settings.lookback_max_candles,
+    enabled=settings.lookback_planner_enabled
+)
+indicator_cache = IndicatorCache(
+    max_entries=settings.indicator_cache_max_entries,
+    max_bytes=settings.indicator_cache_max_mb * 1024 * 1024,
+    enabled=settings.indicator_cache_enabled
+)
+cpu_pool = get_cpu_pool()
+io_pool = get_io_pool()
+
+
+def _split_selector(value: Optional[str]) -> List[str]:
+    """Converte um parâmetro separado por vírgulas em lista (sem itens vazios)"""
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
 
 
 @router.get("/analyze/{symbol}", response_model=AnalyzeResponse)
-async def analyze_symbol(symbol: str):
+async def analyze_symbol(
+    symbol: str,
+    fields: Optional[str] = Query(None, description="Indicadores separados por vírgula (ex: RSI,EMA9,ATR)"),
+    categories: Optional[str] = Query(None, description="Categorias separadas por vírgula (ex: trend,price,chart)")
+):
     """
     Analisa uma criptomoeda e retorna indicadores técnicos e score
     
+    Sem seletor, todos os indicadores e o gráfico são calculados. Com `fields` e/ou
+    `categories`, a resposta traz só os indicadores pedidos (os demais ficam null),
+    o gráfico só é montado se a categoria 'chart' for pedida e, com o motor
+    incremental desligado, apenas os indicadores pedidos e os usados pelo
+    ScoreEngine são avaliados.
+    
     Args:
         symbol: Símbolo da moeda (BTC, ETH, SOL)
+        fields: Indicadores desejados (nomes da resposta, sem diferenciar maiúsculas)
+        categories: Categorias desejadas (trend, momentum, volatility, volume, strength, price, chart)
         
     Returns:
         Análise técnica completa com indicadores, score e diagnóstico
@@ -35,11 +80,32 @@ async def analyze_symbol(symbol: str):
         # Valida e normaliza o símbolo
         normalized_symbol = validate_and_normalize_symbol(symbol, crypto_service)
         
-        # Busca dados dos timeframes (SEMPRE em tempo real, sem cache)
-        # Usa 500+ candles para garantir cálculo preciso dos indicadores
+        # Resolve o seletor de indicadores (ValueError -> 400)
+        selected_fields = _split_selector(fields)
+        selected_categories = [c.lower() for c in _split_selector(categories)]
+        selective = bool(selected_fields or selected_categories)
+        include_chart = not selective or 'chart' in selected_categories
+        selected_categories = [c for c in selected_categories if c != 'chart']
+        requested_fields = None
+        compute_fields = None
+        if selective:
+            requested_fields = ()
+            if selected_fields or selected_categories:
+                requested_fields = IndicatorService.resolve_fields(selected_fields, selected_categories)
+            compute_fields = IndicatorService.resolve_fields(
+                requested_fields, required=ScoreEngine.REQUIRED_INDICATORS
+            )
+        
+        # Busca dados dos timeframes (candles fechados vêm do cache, o candle em formação é sempre atualizado)
+        # O número de candles vem do aquecimento dos indicadores calculados (ex: ~500 para a
+        # EMA200 com tolerância de 5%); o gráfico de 4h exige as EMAs aquecidas nos 200 candles exibidos
         timeframes = ['1h', '4h', '1d']
+        chart_minimum = None
+        if include_chart:
+            chart_minimum = {CHART_TIMEFRAME: lookback_planner.candles_for(CHART_EMA_FIELDS, display=200)}
+        limits = lookback_planner.plan(timeframes, compute_fields, minimum=chart_minimum)
         try:
-            data = crypto_service.get_multiple_timeframes(normalized_symbol, timeframes, limit=500)
+            data = await crypto_service.get_multiple_timeframes(normalized_symbol, timeframes, limit=limits)
         except Exception as e:
             handle_crypto_service_error(e, symbol, "buscar dados")
         
@@ -51,13 +117,45 @@ async def analyze_symbol(symbol: str):
             last_candle_timestamp, last_candle_timestamp_brt = crypto_service.get_last_candle_timestamps(data['1h'])
         
         # Calcula indicadores para cada timeframe (RECALCULADOS a cada requisição)
+        # Com os dados mais recentes: o motor incremental só avança os candles que fecharam
+        # e avalia o candle em formação sobre uma cópia (estado no processo, custo O(1)).
+        # O estado é compartilhado entre requisições e avança todos os indicadores
+        # (o seletor só filtra a resposta). Sem o motor, o kernel roda no pool de
+        # processos, com os timeframes em paralelo, e só os campos selecionados e suas
+        # dependências são avaliados.
+        # Requisições repetidas com o mesmo candle em formação são servidas do cache.
+        # No kernel, o timeframe do gráfico devolve também as séries das EMAs do gráfico
+        # na mesma passada (modo série só para elas). O motor incremental não guarda
+        # histórico por candle, então com ele as EMAs do gráfico são calculadas à parte.
+        chart_in_kernel = include_chart and not settings.streaming_indicators_enabled
+        
+        async def compute_timeframe(tf, df):
+            if settings.streaming_indicators_enabled:
+                return streaming_indicators.get_indicators(normalized_symbol, tf, df), None
+            if chart_in_kernel and tf == CHART_TIMEFRAME:
+                return await cpu_pool.run(compute_indicators_with_emas, df, compute_fields, indicator_params)
+            return await cpu_pool.run(compute_indicators, df, compute_fields, indicator_params), None
+        
+        # O motor incremental calcula sempre todos os campos: um único resultado por candle
+        selective_compute = compute_fields is not None and not settings.streaming_indicators_enabled
+        spec = ('indicators', compute_fields) if selective_compute else 'indicators'
+        specs = {tf: spec for tf in data}
+        if chart_in_kernel and CHART_TIMEFRAME in specs:
+            specs[CHART_TIMEFRAME] = ('indicators+emas', compute_fields)
+        results = await asyncio.gather(*(
+            indicator_cache.get_or_compute_async(
+                normalized_symbol, tf, specs[tf], df, lambda tf=tf, df=df: compute_timeframe(tf, df)
+            )
+            for tf, df in data.items()
+        ))
+        
         timeframes_data = {}
         indicators_response = {}
+        chart_emas = None
         
-        for tf, df in data.items():
-            # Calcula todos os indicadores usando a nova função get_indicators
-            # TODOS os indicadores são recalculados com os dados mais recentes
-            indicators = indicator_service.get_indicators(df)
+        for tf, (indicators, emas) in zip(data, results):
+            if tf == CHART_TIMEFRAME:
+                chart_emas = emas
             
             # Prepara dados para o score engine
             timeframes_data[tf] = {
@@ -67,39 +165,36 @@ async def analyze_symbol(symbol: str):
             }
             
             # Formata indicadores para resposta usando a nova estrutura
+            # (com seletor, só os indicadores pedidos são devolvidos)
+            selected = indicators if requested_fields is None else mask_indicators(indicators, requested_fields)
             indicators_response[tf] = IndicatorData(
-                trend=TrendIndicators(**indicators['trend']),
-                momentum=MomentumIndicators(**indicators['momentum']),
-                volatility=VolatilityIndicators(**indicators['volatility']),
-                volume=VolumeIndicators(**indicators['volume']),
-                strength=StrengthIndicators(**indicators['strength']),
-                price=PriceData(**indicators['price'])
+                trend=TrendIndicators(**selected['trend']),
+                momentum=MomentumIndicators(**selected['momentum']),
+                volatility=VolatilityIndicators(**selected['volatility']),
+                volume=VolumeIndicators(**selected['volume']),
+                strength=StrengthIndicators(**selected['strength']),
+                price=PriceData(**selected['price'])
             )
         
-        # Analisa múltiplos timeframes e calcula score
-        analysis = score_engine.analyze_multiple_timeframes(timeframes_data)
+        # Analisa múltiplos timeframes, calcula score e oportunidade de trade rápido (1h)
+        # no pool de processos
+        analysis, trade_analysis = await cpu_pool.run(score_timeframes, timeframes_data)
         
-        # Gera comentário natural usando IA
+        # Gera comentário natural usando IA (SDK síncrono: roda no pool de threads)
         # Usa os indicadores do timeframe diário (mais relevante)
         daily_indicators = timeframes_data.get('1d', {}).get('indicators', {})
         symbol_name = symbol.upper()  # Ex: "BTC" -> "Bitcoin" seria ideal, mas usamos o símbolo
         
-        ai_comment = generate_ai_comment(
-            indicators=daily_indicators,
-            score=analysis['overall_score'],
-            symbol=symbol_name,
-            news=None  # Pode ser integrado com news_fetcher futuramente
+        ai_comment = await io_pool.run(
+            generate_ai_comment,
+            daily_indicators,
+            analysis['overall_score'],
+            symbol_name,
+            None  # notícias: pode ser integrado com news_fetcher futuramente
         )
         
-        # Analisa oportunidade de trade rápido (timeframe 1h)
         trade_opportunity = None
-        hourly_data = timeframes_data.get('1h')
-        if hourly_data:
-            trade_analysis = score_engine.analyze_short_term_opportunity(
-                indicators_1h=hourly_data.get('indicators', {}),
-                last_close=hourly_data.get('last_close', 0),
-                current_volume=hourly_data.get('current_volume', 0)
-            )
+        if trade_analysis:
             trade_opportunity = TradeOpportunity(
                 probability=trade_analysis['probability'],
                 comment=trade_analysis['comment']
@@ -108,30 +203,22 @@ async def analyze_symbol(symbol: str):
         # Prepara dados do gráfico (timeframe de 4h com 200 candles)
         chart_data = None
         try:
-            # Usa dados de 4h para o gráfico (bom equilíbrio entre detalhe e visão geral)
-            df_chart = data.get('4h')
+            df_chart = data.get(CHART_TIMEFRAME) if include_chart else None
             if df_chart is not None and not df_chart.empty:
-                chart_df = indicator_service.get_chart_data(df_chart, limit=200)
-                
-                # Converte para lista de CandleWithEMA
-                candles_list = []
-                for _, row in chart_df.iterrows():
-                    candle = CandleWithEMA(
-                        time=int(row['timestamp'].timestamp()),  # Converte para timestamp Unix
-                        open=float(row['open']),
-                        high=float(row['high']),
-                        low=float(row['low']),
-                        close=float(row['close']),
-                        volume=float(row['volume']),
-                        ema9=float(row['ema9']) if pd.notna(row['ema9']) else None,
-                        ema21=float(row['ema21']) if pd.notna(row['ema21']) else None,
-                        ema200=float(row['ema200']) if pd.notna(row['ema200']) else None
+                if chart_emas is None:
+                    # Motor incremental: séries das EMAs em uma varredura, em cache até o próximo candle
+                    ema_lengths = indicator_params.chart_ema_lengths
+                    chart_emas = indicator_cache.get_or_compute(
+                        normalized_symbol, CHART_TIMEFRAME, ('ema', ema_lengths), df_chart,
+                        lambda: indicator_service.get_ema_series(df_chart, ema_lengths)
                     )
-                    candles_list.append(candle)
+                # Monta os candles com EMAs no pool de processos e converte para CandleWithEMA
+                candles = await cpu_pool.run(chart_candles, df_chart, chart_emas, indicator_params)
+                candles_list = [CandleWithEMA(**candle) for candle in candles]
                 
                 chart_data = ChartDataResponse(
                     symbol=normalized_symbol,
-                    timeframe='4h',
+                    timeframe=CHART_TIMEFRAME,
                     candles=candles_list
                 )
         except Exception as e:
@@ -157,6 +244,9 @@ async def analyze_symbol(symbol: str):
     except HTTPException:
         # Re-lança HTTPExceptions que já foram tratadas
         raise
+    except ExecutorSaturatedError as e:
+        # Servidor sobrecarregado: falha rápida em vez de acumular requisições
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Dados inválidos: {str(e)}")
     except Exception as e:
@@ -3,12 +3,18 @@ Funções auxiliares para as rotas
 """
 from fastapi import HTTPException
 from app.services.crypto_service import CryptoService
+from app.services.market_index import SymbolNotListedError
+from app.services.resilience import CircuitOpenError
 
 
 def validate_and_normalize_symbol(symbol: str, crypto_service: CryptoService) -> str:
     """
     Valida e normaliza um símbolo de criptomoeda
     
+    Usa o índice de mercados do CryptoService: símbolos não listados são
+    rejeitados (404) sem nenhuma chamada à exchange; símbolos malformados
+    continuam retornando 400.
+    
     Args:
         symbol: Símbolo da moeda (BTC, ETH, SOL)
         crypto_service: Instância do CryptoService
@@ -17,13 +23,17 @@ def validate_and_normalize_symbol(symbol: str, crypto_service: CryptoService) ->
         Símbolo normalizado (BTC/USDT, ETH/USDT, etc.)
         
     Raises:
-        HTTPException: Se o símbolo for inválido
+        HTTPException: 400 se o símbolo for inválido, 404 se não estiver listado na exchange
     """
     if not symbol or len(symbol) > 20:
         raise HTTPException(status_code=400, detail="Símbolo inválido")
     
     try:
         return crypto_service.normalize_symbol(symbol)
+    except SymbolNotListedError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Erro ao normalizar símbolo: {str(e)}")
 
@@ -43,6 +53,14 @@ def handle_crypto_service_error(e: Exception, symbol: str, operation: str = "bus
     if isinstance(e, ValueError):
         raise HTTPException(status_code=400, detail=str(e))
     
+    if isinstance(e, CircuitOpenError):
+        # Exchange fora do ar: falha imediata, indicando quando tentar novamente
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(1, int(e.retry_after)))}
+        )
+    
     error_msg = str(e).lower()
     if 'network' in error_msg or 'timeout' in error_msg:
         raise HTTPException(
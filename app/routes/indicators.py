@@ -0,0 +1,127 @@
+"""
+Rotas para séries completas de indicadores (painéis de gráfico)
+"""
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import JSONResponse
+from app.config import settings
+from app.services.crypto_service import get_crypto_service
+from app.services.executor_pool import ExecutorSaturatedError, get_cpu_pool
+from app.services.indicator_cache import IndicatorCache
+from app.services.indicator_params import IndicatorParams
+from app.services.indicator_service import IndicatorService
+from app.services.lookback_planner import LookbackPlanner
+from app.services.timeframes import VALID_TIMEFRAMES, timeframe_to_ms
+from app.models.schemas import IndicatorSeriesResponse
+from app.routes.helpers import validate_and_normalize_symbol, handle_crypto_service_error
+
+router = APIRouter()
+crypto_service = get_crypto_service()
+indicator_params = IndicatorParams.from_settings(settings)
+lookback_planner = LookbackPlanner(
+    params=indicator_params,
+    tolerance=settings.lookback_tolerance,
+    default_limit=settings.lookback_default_candles,
+    max_limit=settings.lookback_max_candles,
+    enabled=settings.lookback_planner_enabled
+)
+indicator_cache = IndicatorCache(
+    max_entries=settings.indicator_cache_max_entries,
+    max_bytes=settings.indicator_cache_max_mb * 1024 * 1024,
+    enabled=settings.indicator_cache_enabled
+)
+cpu_pool = get_cpu_pool()
+
+
+def _split_names(value: Optional[str]) -> List[str]:
+    """Converte um parâmetro separado por vírgulas em lista (sem itens vazios)"""
+    return [item.strip() for item in (value or '').split(',') if item.strip()]
+
+
+@router.get("/indicators/{symbol}", response_model=IndicatorSeriesResponse)
+async def get_indicator_series(
+    symbol: str,
+    timeframe: str = Query('1h', description="Timeframe dos candles (1h, 4h, 1d, ...)"),
+    names: Optional[str] = Query(None, description="Indicadores separados por vírgula (ex: RSI,MACD,MACD_Signal)"),
+    since: Optional[int] = Query(None, ge=0, description="Primeiro timestamp desejado (epoch em ms)"),
+    points: int = Query(200, ge=1, le=1000, description="Número de candles da série quando `since` não é informado")
+):
+    """
+    Retorna a série completa dos indicadores em formato colunar
+    
+    Um array de timestamps compartilhado e um array por indicador, convertidos
+    em lista de uma vez a partir dos buffers NumPy do kernel (sem um dicionário
+    nem validação do response_model por candle). Os candles de aquecimento são
+    buscados a mais e descartados da resposta; `points` é limitado para que o
+    aquecimento caiba no máximo de candles por requisição.
+    
+    Args:
+        symbol: Símbolo da moeda (BTC, ETH, SOL)
+        timeframe: Timeframe dos candles
+        names: Indicadores desejados (padrão: todos)
+        since: Devolve só candles a partir deste timestamp
+        points: Número de candles devolvidos quando `since` não é informado
+        
+    Returns:
+        Timestamps e séries dos indicadores pedidos (null onde o indicador ainda não tem dados)
+        
+    Raises:
+        HTTPException 400: Se `since` for anterior à janela que pode ser servida
+    """
+    try:
+        # Valida e normaliza o símbolo
+        normalized_symbol = validate_and_normalize_symbol(symbol, crypto_service)
+        
+        if timeframe not in VALID_TIMEFRAMES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Timeframe inválido: {timeframe}. Use um de: {', '.join(VALID_TIMEFRAMES)}"
+            )
+        
+        # Resolve os indicadores pedidos (ValueError -> 400)
+        fields = IndicatorService.resolve_fields(_split_names(names))
+        
+        # Candles exibidos + aquecimento dos indicadores pedidos (ambos dentro de max_limit)
+        max_points = lookback_planner.max_display(fields)
+        if since is not None:
+            # Relógio da exchange (o da replay não acompanha o relógio da máquina)
+            now_ms = crypto_service.exchange.milliseconds()
+            interval_ms = timeframe_to_ms(timeframe)
+            points = max(1, (now_ms - since) // interval_ms + 1)
+            if points > max_points:
+                earliest = (now_ms // interval_ms - max_points + 1) * interval_ms
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"`since` muito antigo para {timeframe}: no máximo {max_points} candles "
+                           f"(a partir de {earliest}) com os indicadores pedidos"
+                )
+        points = min(points, max_points)
+        limit = lookback_planner.candles_for(fields, display=points)
+        
+        try:
+            df = await crypto_service.get_candles(normalized_symbol, timeframe, limit=limit)
+        except Exception as e:
+            handle_crypto_service_error(e, symbol, "buscar dados")
+        
+        # Séries em cache por (symbol, timeframe, indicadores): valem até o próximo candle.
+        # O cálculo roda no pool de processos
+        timestamps, series = await indicator_cache.get_or_compute_async(
+            normalized_symbol, timeframe, ('series', fields), df,
+            lambda: cpu_pool.run(IndicatorService.get_indicator_series, df, fields, indicator_params)
+        )
+        columns = IndicatorService.series_to_columns(timestamps, series, since=since, points=points)
+        
+        # Resposta montada direto das listas (sem validação por candle do response_model)
+        return JSONResponse({"symbol": normalized_symbol, "timeframe": timeframe, **columns})
+    
+    except HTTPException:
+        # Re-lança HTTPExceptions que já foram tratadas
+        raise
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Dados inválidos: {str(e)}")
+    except Exception as e:
+        # Log do erro (em produção deveria usar logging adequado)
+        print(f"❌ Erro não tratado em /indicators/{symbol}: {type(e).__name__} - {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor. Tente novamente.")
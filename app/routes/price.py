@@ -1,22 +1,28 @@
 """
 Rotas para consulta de preços
 """
-from fastapi import APIRouter, HTTPException
-from app.services.crypto_service import CryptoService
-from app.models.schemas import PriceResponse, CandleData
+from fastapi import APIRouter, HTTPException, Query
+from app.config import settings
+from app.services.candle_buffer import CandleArray
+from app.services.crypto_service import get_crypto_service
+from app.models.schemas import PriceResponse, PricesResponse, CandleData
 from app.routes.helpers import validate_and_normalize_symbol, handle_crypto_service_error
 
 router = APIRouter()
-crypto_service = CryptoService()
+crypto_service = get_crypto_service()
 
 
 @router.get("/price/{symbol}", response_model=PriceResponse)
-async def get_price(symbol: str):
+async def get_price(
+    symbol: str,
+    limit: int = Query(settings.lookback_default_candles, ge=1, le=1000, description="Candles por timeframe")
+):
     """
     Busca os últimos candles de uma criptomoeda em múltiplos timeframes
     
     Args:
         symbol: Símbolo da moeda (BTC, ETH, SOL)
+        limit: Número de candles por timeframe (sem indicadores, não há aquecimento a considerar)
         
     Returns:
         Dados dos candles em 1h, 4h e 1d
@@ -28,7 +34,7 @@ async def get_price(symbol: str):
         # Busca dados dos timeframes
         timeframes = ['1h', '4h', '1d']
         try:
-            data = crypto_service.get_multiple_timeframes(normalized_symbol, timeframes, limit=500)
+            data = await crypto_service.get_multiple_timeframes(normalized_symbol, timeframes, limit=limit)
         except Exception as e:
             handle_crypto_service_error(e, symbol, "buscar dados")
         
@@ -39,19 +45,8 @@ async def get_price(symbol: str):
         }
         
         for tf, df in data.items():
-            candles = []
-            for _, row in df.iterrows():
-                candle = CandleData(
-                    timestamp=int(row['timestamp'].timestamp() * 1000),
-                    open=float(row['open']),
-                    high=float(row['high']),
-                    low=float(row['low']),
-                    close=float(row['close']),
-                    volume=float(row['volume'])
-                )
-                candles.append(candle)
-            
-            result["timeframes"][tf] = candles
+            # Converte coluna a coluna (sem um objeto pandas por linha)
+            result["timeframes"][tf] = [CandleData(**candle) for candle in CandleArray.from_dataframe(df).to_dicts()]
         
         return result
         
@@ -65,3 +60,46 @@ async def get_price(symbol: str):
         print(f"❌ Erro não tratado em /price/{symbol}: {type(e).__name__} - {str(e)}")
         raise HTTPException(status_code=500, detail="Erro interno do servidor. Tente novamente.")
 
+
+@router.get("/prices", response_model=PricesResponse)
+async def get_prices(symbols: str = Query(..., description="Símbolos separados por vírgula (ex: BTC,ETH,SOL)")):
+    """
+    Busca o preço atual de vários símbolos com uma única chamada à exchange
+    
+    Args:
+        symbols: Símbolos separados por vírgula (BTC,ETH,SOL)
+        
+    Returns:
+        Preços por par normalizado e lista de pares sem preço disponível
+    """
+    try:
+        requested = [s.strip() for s in symbols.split(',') if s.strip()]
+        if not requested:
+            raise HTTPException(status_code=400, detail="Informe ao menos um símbolo")
+        if len(requested) > settings.max_symbols_per_request:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Máximo de {settings.max_symbols_per_request} símbolos por requisição"
+            )
+        
+        # Valida e normaliza os símbolos (sem duplicatas, mantendo a ordem)
+        normalized = list(dict.fromkeys(
+            validate_and_normalize_symbol(symbol, crypto_service) for symbol in requested
+        ))
+        
+        try:
+            prices = await crypto_service.get_prices(normalized)
+        except Exception as e:
+            handle_crypto_service_error(e, symbols, "buscar preços")
+        
+        return {
+            "prices": prices,
+            "missing": [symbol for symbol in normalized if symbol not in prices],
+            "timestamp": crypto_service.exchange.milliseconds()
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"❌ Erro não tratado em /prices: {type(e).__name__} - {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor. Tente novamente.")
@@ -0,0 +1,93 @@
+"""
+Rotas do screener de mercado (ranking de todos os pares por score)
+"""
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, HTTPException, Query
+from app.config import settings
+from app.services.crypto_service import get_crypto_service
+from app.services.executor_pool import ExecutorSaturatedError, get_cpu_pool
+from app.services.indicator_params import IndicatorParams
+from app.services.lookback_planner import LookbackPlanner
+from app.services.screener import MarketScreener
+from app.services.timeframes import VALID_TIMEFRAMES
+from app.models.schemas import ScreenerResponse
+from app.routes.helpers import handle_crypto_service_error
+
+router = APIRouter()
+crypto_service = get_crypto_service()
+indicator_params = IndicatorParams.from_settings(settings)
+screener = MarketScreener(
+    crypto_service,
+    get_cpu_pool(),
+    planner=LookbackPlanner(
+        params=indicator_params,
+        tolerance=settings.lookback_tolerance,
+        default_limit=settings.lookback_default_candles,
+        max_limit=settings.lookback_max_candles,
+        enabled=settings.lookback_planner_enabled
+    ),
+    params=indicator_params,
+    universe=settings.screener_universe,
+    concurrency=settings.screener_concurrency,
+    batch_size=settings.screener_batch_size,
+    max_top=settings.screener_max_top,
+    timeframes=settings.default_timeframes
+)
+
+
+@router.get("/screener", response_model=ScreenerResponse)
+async def screen_market(
+    quote: str = Query('USDT', description="Moeda de cotação dos pares (USDT, BRL, ...)"),
+    top: int = Query(50, ge=1, le=settings.screener_max_top, description="Número de pares no ranking"),
+    timeframe: Optional[str] = Query(None, description="Score de um único timeframe (padrão: score geral 1h/4h/1d)")
+):
+    """
+    Ranking dos pares de uma moeda de cotação pelo score
+
+    Os pares de maior volume em 24h são varridos em paralelo e pontuados em lotes.
+    O ranking fica em cache até o fechamento do candle atual (do menor timeframe);
+    o progresso de uma varredura em andamento aparece em /screener/status.
+
+    Args:
+        quote: Moeda de cotação
+        top: Número de pares retornados
+        timeframe: Timeframe do score (vazio = score geral, como em /analyze)
+
+    Returns:
+        Pares ordenados do maior para o menor score
+    """
+    try:
+        timeframe = timeframe or None
+        if timeframe is not None and timeframe not in VALID_TIMEFRAMES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Timeframe inválido: {timeframe}. Use um de: {', '.join(VALID_TIMEFRAMES)}"
+            )
+
+        try:
+            return await screener.scan(quote, timeframe, top)
+        except ExecutorSaturatedError:
+            raise
+        except Exception as e:
+            handle_crypto_service_error(e, quote, "varrer o mercado")
+
+    except HTTPException:
+        # Re-lança HTTPExceptions que já foram tratadas
+        raise
+    except ExecutorSaturatedError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except Exception as e:
+        # Log do erro (em produção deveria usar logging adequado)
+        print(f"❌ Erro não tratado em /screener: {type(e).__name__} - {str(e)}")
+        raise HTTPException(status_code=500, detail="Erro interno do servidor. Tente novamente.")
+
+
+@router.get("/screener/status")
+async def screener_status() -> Dict[str, Any]:
+    """
+    Progresso das varreduras (em andamento ou a última de cada moeda/timeframe)
+
+    Returns:
+        Dicionário com pares buscados, com falha e pontuados de cada varredura
+    """
+    return screener.stats()
@@ -0,0 +1,141 @@
+"""
+Tarefas de cálculo da análise executadas no pool de processos
+
+Funções no nível do módulo (serializáveis) e com poucas importações: os workers
+carregam só o cálculo de indicadores e o ScoreEngine, não as rotas nem a exchange.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.indicator_kernel import compute_indicators_batch
+from app.services.indicator_params import IndicatorParams
+from app.services.indicator_service import IndicatorService
+from app.services.streaming_indicators import FIELD_DECIMALS
+from app.services.timeframes import to_epoch_ms
+from app.utils.score_engine import ScoreEngine
+
+
+def compute_indicators(df: pd.DataFrame, fields: Iterable[str] = None,
+                       params: IndicatorParams = None) -> Dict[str, Any]:
+    """
+    Indicadores de um timeframe pelo kernel (ver IndicatorService.get_indicators)
+
+    Args:
+        df: DataFrame OHLCV
+        fields: Indicadores a calcular (padrão: todos)
+        params: Períodos dos indicadores
+
+    Returns:
+        Dicionário com indicadores organizados por categoria
+    """
+    return IndicatorService.get_indicators(df, fields, params)
+
+
+def compute_indicators_with_emas(df: pd.DataFrame, fields: Iterable[str] = None,
+                                 params: IndicatorParams = None) -> Tuple[Dict[str, Any], Dict[int, np.ndarray]]:
+    """
+    Indicadores do timeframe do gráfico e as EMAs do gráfico em uma passada do kernel
+
+    Args:
+        df: DataFrame OHLCV
+        fields: Indicadores a calcular (padrão: todos)
+        params: Períodos dos indicadores
+
+    Returns:
+        Tupla (indicadores por categoria, {período da EMA: série})
+    """
+    return IndicatorService.get_indicators_with_emas(df, fields, params)
+
+
+def score_timeframes(timeframes_data: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """
+    Score multi-timeframe e oportunidade de trade rápido (timeframe de 1h)
+
+    Args:
+        timeframes_data: {timeframe: {'indicators', 'last_close', 'current_volume'}}
+
+    Returns:
+        Tupla (resultado de analyze_multiple_timeframes, resultado de
+        analyze_short_term_opportunity ou None sem dados de 1h)
+    """
+    analysis = ScoreEngine.analyze_multiple_timeframes(timeframes_data)
+    trade_analysis = None
+    hourly_data = timeframes_data.get('1h')
+    if hourly_data:
+        trade_analysis = ScoreEngine.analyze_short_term_opportunity(
+            indicators_1h=hourly_data.get('indicators', {}),
+            last_close=hourly_data.get('last_close', 0),
+            current_volume=hourly_data.get('current_volume', 0)
+        )
+    return analysis, trade_analysis
+
+
+def chart_candles(df_chart: pd.DataFrame, emas: Dict[int, np.ndarray] = None,
+                  params: IndicatorParams = None, limit: int = 200) -> List[Dict[str, Any]]:
+    """
+    Candles do gráfico com EMAs como dicionários (campos de CandleWithEMA)
+
+    As colunas são convertidas de uma vez (sem iterrows).
+
+    Args:
+        df_chart: DataFrame OHLCV do timeframe do gráfico
+        emas: Séries de EMA já calculadas por período (calculadas aqui se None)
+        params: Períodos dos indicadores
+        limit: Número de candles do gráfico
+
+    Returns:
+        Lista de dicionários com time (segundos), OHLCV e ema9/ema21/ema200 (None no aquecimento)
+    """
+    chart_df = IndicatorService.get_chart_data(df_chart, limit=limit, emas=emas, params=params)
+    columns = {'time': (to_epoch_ms(chart_df['timestamp']) // 1000).tolist()}
+    for name in ('open', 'high', 'low', 'close', 'volume'):
+        columns[name] = chart_df[name].to_numpy(dtype=np.float64).tolist()
+    for name in ('ema9', 'ema21', 'ema200'):
+        values = chart_df[name].to_numpy(dtype=np.float64)
+        columns[name] = [None if np.isnan(v) else v for v in values.tolist()]
+    return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+def score_symbols(ohlcv: Dict[str, Dict[str, np.ndarray]], params: IndicatorParams = None) -> Dict[str, Any]:
+    """
+    Score de vários símbolos de uma vez (screener): uma passada do kernel por timeframe
+
+    Os scores são os mesmos de /analyze: indicadores arredondados como na resposta
+    e, com mais de um timeframe, combinados com ScoreEngine.TIMEFRAME_WEIGHTS
+    (timeframe ausente vale 0.5).
+
+    Args:
+        ohlcv: {timeframe: {'high', 'low', 'close', 'volume': matriz símbolos × candles}}
+            alinhada à direita (ver stack_ohlcv), com as mesmas linhas em todos os timeframes
+        params: Períodos dos indicadores
+
+    Returns:
+        Dicionário com 'scores' ({timeframe: array por símbolo}), 'overall', 'last_close'
+        (do menor timeframe), 'rsi' e 'valid' (False sem candles suficientes)
+    """
+    scores, valid, base = {}, None, None
+    for tf, matrices in ohlcv.items():
+        batch = compute_indicators_batch(matrices['high'], matrices['low'], matrices['close'], matrices['volume'],
+                                         ScoreEngine.REQUIRED_INDICATORS, params or IndicatorParams())
+        scores[tf] = ScoreEngine.calculate_score_series(batch, FIELD_DECIMALS)
+        has_price = ~np.isnan(batch['last_close'])
+        valid = has_price if valid is None else valid & has_price
+        if base is None:
+            base = batch
+
+    if len(scores) == 1:
+        overall = next(iter(scores.values()))
+    else:
+        # Mesma soma de analyze_multiple_timeframes
+        overall = 0
+        for tf, weight in ScoreEngine.TIMEFRAME_WEIGHTS.items():
+            overall = overall + (scores[tf] if tf in scores else 0.5) * weight
+    return {
+        'scores': scores,
+        'overall': overall,
+        'last_close': base['last_close'],
+        'rsi': base['RSI'],
+        'valid': valid
+    }
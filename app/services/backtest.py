@@ -0,0 +1,288 @@
+"""
+Backtest histórico dos sinais do ScoreEngine
+
+Reproduz, candle a candle do timeframe base (ex: 1h), a decisão que a API teria
+tomado com os dados disponíveis naquele momento:
+- séries completas de indicadores por timeframe (kernel em modo série) e score
+  vetorizado de cada candle (mesmo resultado do calculate_overall_score);
+- para os timeframes maiores (4h, 1d) só entram candles já fechados no fechamento
+  do candle base (sem look-ahead, ver timeframe_alignment.py);
+- score combinado com os pesos de analyze_multiple_timeframes (0.2/0.3/0.5) e
+  sinais pelos limiares de get_diagnostic: compra com score >= 0.7, venda com < 0.4.
+
+A simulação é long-only (spot): a posição decidida no fechamento do candle i vale
+a partir do candle i+1 e cada compra/venda paga a taxa configurada.
+"""
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.candle_store import CandleStore
+from app.services.indicator_kernel import compute_series_from_dataframe, required_candles
+from app.services.indicator_params import DEFAULT_PARAMS, IndicatorParams
+from app.services.resampler import resample_ohlcv
+from app.services.streaming_indicators import FIELD_DECIMALS
+from app.services.timeframe_alignment import TimeframeAlignment
+from app.services.timeframes import TIMEFRAME_MINUTES, timeframe_to_ms
+from app.utils.score_engine import ScoreEngine
+
+
+class BacktestConfig(NamedTuple):
+    """Regras da simulação (imutável)"""
+
+    entry_threshold: float = 0.7  # "Alta probabilidade de alta"
+    exit_threshold: float = 0.4   # "Baixa probabilidade de alta / possível queda"
+    fee_rate: float = 0.001       # por operação (compra ou venda)
+    # Pesos por timeframe (analyze_multiple_timeframes); (('1h', 1.0),) = trade rápido
+    timeframe_weights: Tuple[Tuple[str, float], ...] = tuple(ScoreEngine.TIMEFRAME_WEIGHTS.items())
+
+    @property
+    def timeframes(self) -> List[str]:
+        """Timeframes usados, do menor (base) para o maior"""
+        return sorted((tf for tf, _ in self.timeframe_weights), key=TIMEFRAME_MINUTES.__getitem__)
+
+
+class BacktestResult(NamedTuple):
+    """Séries da simulação (um valor por candle do timeframe base) e operações"""
+
+    timestamps: np.ndarray  # abertura dos candles base (ms)
+    close: np.ndarray
+    score: np.ndarray       # score combinado (NaN durante o aquecimento)
+    position: np.ndarray    # 1 comprado / 0 fora, decidido no fechamento do candle
+    equity: np.ndarray      # patrimônio relativo (1.0 no início), líquido de taxas
+    trades: List[Dict[str, Any]]
+    start_index: int        # primeiro candle do período avaliado
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        Métricas do período avaliado
+
+        Returns:
+            Dicionário com retorno total, buy & hold, drawdown máximo, número de
+            operações, taxa de acerto e exposição
+        """
+        start = self.start_index
+        if start >= len(self.equity):
+            return {'candles': 0, 'total_return': 0.0, 'buy_and_hold': 0.0, 'max_drawdown': 0.0,
+                    'trades': 0, 'hit_rate': None, 'exposure': 0.0}
+        equity = self.equity[start:] / self.equity[start]
+        drawdown = equity / np.maximum.accumulate(equity) - 1
+        returns = [trade['return'] for trade in self.trades]
+        held = np.r_[0.0, self.position[:-1]][start:]
+        return {
+            'candles': len(equity),
+            'total_return': float(equity[-1] - 1),
+            'buy_and_hold': float(self.close[-1] / self.close[start] - 1),
+            'max_drawdown': float(drawdown.min()),
+            'trades': len(returns),
+            'hit_rate': float(np.mean(np.array(returns) > 0)) if returns else None,
+            'exposure': float(held.mean())
+        }
+
+
+def timeframe_scores(df: pd.DataFrame, params: IndicatorParams = DEFAULT_PARAMS) -> np.ndarray:
+    """
+    Score de cada candle de um timeframe (como calculate_overall_score na resposta da API)
+
+    Args:
+        df: DataFrame OHLCV em ordem cronológica
+        params: Períodos dos indicadores
+
+    Returns:
+        Array com um score por candle (NaN enquanto algum indicador do score não aqueceu)
+    """
+    series = compute_series_from_dataframe(df, ScoreEngine.REQUIRED_INDICATORS, params)
+    scores = ScoreEngine.calculate_score_series(series, FIELD_DECIMALS)
+    warming = np.logical_or.reduce([np.isnan(values) for values in series.values()])
+    return np.where(warming, np.nan, scores)
+
+
+def blended_scores(frames: Dict[str, pd.DataFrame], config: BacktestConfig = BacktestConfig(),
+                   params: IndicatorParams = DEFAULT_PARAMS) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Score combinado dos timeframes em cada candle base, sem look-ahead
+
+    Args:
+        frames: DataFrames OHLCV por timeframe (o menor de config.timeframes é a base)
+        config: Pesos por timeframe
+        params: Períodos dos indicadores
+
+    Returns:
+        Tupla (aberturas dos candles base em ms, score combinado com NaN no aquecimento)
+    """
+    base_tf = config.timeframes[0]
+    alignment = TimeframeAlignment(base_tf, frames[base_tf]['timestamp'])
+    scores = {}
+    for tf in config.timeframes:
+        alignment.add(tf, frames[tf]['timestamp'])
+        scores[tf] = timeframe_scores(frames[tf], params)
+    return alignment.timestamps, alignment.blend(scores, dict(config.timeframe_weights), missing=np.nan)
+
+
+def hold_positions(score: np.ndarray, config: BacktestConfig = BacktestConfig(), start: int = 0) -> np.ndarray:
+    """
+    Posição decidida no fechamento de cada candle, com histerese entre os limiares
+
+    Args:
+        score: Scores (1-D, ou uma linha por candidato × candles)
+        config: Limiares
+        start: Primeiro candle em que é permitido operar
+
+    Returns:
+        Array do mesmo formato com 1.0 (comprado) ou 0.0 (fora)
+    """
+    index = np.arange(score.shape[-1])
+    active = (index >= start) & ~np.isnan(score)
+    # O último evento (compra/venda) define a posição até o próximo
+    event = np.where(~active, 0.0, np.where(score >= config.entry_threshold, 1.0,
+                                            np.where(score < config.exit_threshold, 0.0, np.nan)))
+    last_event = np.maximum.accumulate(np.where(np.isnan(event), -1, index), axis=-1)
+    return np.where(last_event >= 0, np.take_along_axis(event, np.maximum(last_event, 0), axis=-1), 0.0)
+
+
+def equity_curves(close: np.ndarray, position: np.ndarray,
+                  fee_rate: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Patrimônio de uma ou várias séries de posições sobre os mesmos fechamentos
+
+    Args:
+        close: Fechamentos (1-D)
+        position: Posições de hold_positions (1-D ou candidatos × candles)
+        fee_rate: Taxa por operação
+
+    Returns:
+        Tupla (patrimônio bruto, patrimônio líquido de taxas, mudanças de posição)
+    """
+    returns = np.r_[0.0, close[1:] / close[:-1] - 1]
+    held = np.concatenate([np.zeros(position.shape[:-1] + (1,)), position[..., :-1]], axis=-1)
+    gross = np.cumprod(1 + held * returns, axis=-1)
+    changes = np.diff(position, axis=-1, prepend=0.0)
+    equity = gross * (1 - fee_rate) ** np.cumsum(np.abs(changes), axis=-1)
+    return gross, equity, changes
+
+
+def simulate(timestamps: np.ndarray, close: np.ndarray, score: np.ndarray,
+             config: BacktestConfig = BacktestConfig(), start_ms: int = None) -> BacktestResult:
+    """
+    Simula entradas e saídas a partir de uma série de scores (vetorizado)
+
+    Compra quando score >= entry_threshold e vende quando score < exit_threshold
+    (entre os dois, mantém a posição). Antes de start_ms e durante o aquecimento
+    a posição é zerada.
+
+    Args:
+        timestamps: Abertura de cada candle (ms)
+        close: Fechamentos
+        score: Score de cada candle (decisão no fechamento)
+        config: Limiares e taxa
+        start_ms: Início do período avaliado (padrão: primeiro candle)
+
+    Returns:
+        BacktestResult com posição, patrimônio e operações
+    """
+    n = len(close)
+    start = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, side='left'))
+    position = hold_positions(score, config, start)
+    gross, equity, changes = equity_curves(close, position, config.fee_rate)
+
+    entries = np.flatnonzero(changes > 0)
+    exits = np.flatnonzero(changes < 0)
+    if len(exits) < len(entries):
+        exits = np.r_[exits, n - 1]  # posição aberta no fim: fechada no último candle
+    trade_returns = gross[exits] / gross[entries] * (1 - config.fee_rate) ** 2 - 1
+    trades = [
+        {'entry': int(timestamps[i]), 'exit': int(timestamps[j]), 'return': float(r)}
+        for i, j, r in zip(entries, exits, trade_returns)
+    ]
+    return BacktestResult(timestamps, close, np.where(np.arange(n) >= start, score, np.nan),
+                          position, equity, trades, start)
+
+
+class BacktestEngine:
+    """Backtest dos sinais do ScoreEngine sobre o histórico local (CandleStore)"""
+
+    def __init__(self, store: CandleStore = None, config: BacktestConfig = BacktestConfig(),
+                 params: IndicatorParams = DEFAULT_PARAMS):
+        """
+        Args:
+            store: Histórico local de candles (preenchido por backfill_history)
+            config: Limiares, taxa e pesos por timeframe
+            params: Períodos dos indicadores
+        """
+        self.store = store
+        self.config = config
+        self.params = params
+
+    def load_frames(self, symbol: str, start_ms: int = None, end_ms: int = None) -> Dict[str, pd.DataFrame]:
+        """
+        Lê do histórico local os candles de cada timeframe, com aquecimento antes de start_ms
+
+        Timeframes maiores sem histórico próprio são derivados do timeframe base.
+
+        Args:
+            symbol: Par de trading
+            start_ms: Início do período avaliado
+            end_ms: Fim do período (exclusivo)
+
+        Returns:
+            DataFrames OHLCV por timeframe
+
+        Raises:
+            ValueError: Se não houver histórico do timeframe base
+        """
+        timeframes = self.config.timeframes
+        warmup = required_candles(ScoreEngine.REQUIRED_INDICATORS, self.params, tolerance=0.01)
+
+        def since(tf):
+            return None if start_ms is None else start_ms - warmup * timeframe_to_ms(tf)
+
+        base_tf = timeframes[0]
+        frames = {base_tf: self.store.read_dataframe(symbol, base_tf, since(timeframes[-1]), end_ms)}
+        if frames[base_tf].empty:
+            raise ValueError(f"Sem histórico de {symbol} ({base_tf}): execute backfill_history.py")
+        for tf in timeframes[1:]:
+            df = self.store.read_dataframe(symbol, tf, since(tf), end_ms)
+            frames[tf] = df if not df.empty else resample_ohlcv(frames[base_tf], base_tf, tf)
+        return frames
+
+    def run(self, frames: Dict[str, pd.DataFrame], start_ms: int = None) -> BacktestResult:
+        """
+        Executa o backtest sobre candles já carregados
+
+        Args:
+            frames: DataFrames OHLCV por timeframe (ver load_frames)
+            start_ms: Início do período avaliado (antes disso, só aquecimento)
+
+        Returns:
+            BacktestResult
+        """
+        timestamps, score = blended_scores(frames, self.config, self.params)
+        close = frames[self.config.timeframes[0]]['close'].to_numpy(dtype=np.float64)
+        return simulate(timestamps, close, score, self.config, start_ms)
+
+    def run_symbol(self, symbol: str, start_ms: int = None, end_ms: int = None) -> BacktestResult:
+        """Carrega o histórico de um símbolo e executa o backtest"""
+        return self.run(self.load_frames(symbol, start_ms, end_ms), start_ms)
+
+    def run_many(self, symbols: Iterable[str], start_ms: int = None,
+                 end_ms: int = None) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Executa o backtest de vários símbolos
+
+        Args:
+            symbols: Pares de trading
+            start_ms: Início do período avaliado
+            end_ms: Fim do período
+
+        Returns:
+            Dicionário {symbol: summary() ou None se não houver histórico}
+        """
+        results = {}
+        for symbol in symbols:
+            try:
+                results[symbol] = self.run_symbol(symbol, start_ms, end_ms).summary()
+            except ValueError as e:
+                print(f"⚠️ {symbol}: {str(e)}")
+                results[symbol] = None
+        return results
@@ -0,0 +1,262 @@
+"""
+Buffer circular de candles por (symbol, timeframe) e série compacta de candles
+
+Permite atualização incremental: cada refresh baixa apenas os candles a partir
+do último timestamp armazenado, substitui o candle em formação e anexa os novos.
+
+Buffers e caches guardam os candles como arrays (timestamps int64 em ms e OHLCV
+em float64); DataFrames só são criados nas bordas (entrada da exchange / saída
+para os serviços). No modo compacto, OHLCV fica em float32 e os timestamps em
+int32 (segundos desde um timestamp base): 24 em vez de 48 bytes por candle.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+from app.services.timeframes import to_epoch_ms
+
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# Resolução dos timestamps no modo compacto (aberturas de candles são minutos exatos)
+COMPACT_TIMESTAMP_UNIT_MS = 1000
+
+
+def is_compact(dtype) -> bool:
+    """Se o dtype de OHLCV corresponde ao modo compacto (float32)"""
+    return np.dtype(dtype) == np.float32
+
+
+def encode_timestamps(timestamps: np.ndarray, base_ms: int, compact: bool) -> np.ndarray:
+    """Timestamps em ms -> armazenamento (int64 em ms ou, compacto, int32 em segundos desde base_ms)"""
+    if not compact:
+        return timestamps
+    return ((timestamps - base_ms) // COMPACT_TIMESTAMP_UNIT_MS).astype(np.int32)
+
+
+def decode_timestamps(stored: np.ndarray, base_ms: int) -> np.ndarray:
+    """Armazenamento -> timestamps int64 em ms (inverso de encode_timestamps)"""
+    if stored.dtype == np.int64:
+        return stored
+    return base_ms + stored.astype(np.int64) * COMPACT_TIMESTAMP_UNIT_MS
+
+
+class CandleArray:
+    """Série de candles em arrays: timestamps (ms) e matriz OHLCV (n, 5)"""
+
+    __slots__ = ('base_ms', 'stored_timestamps', 'values')
+
+    def __init__(self, timestamps: np.ndarray, values: np.ndarray, dtype=np.float64):
+        """
+        Args:
+            timestamps: Timestamps de abertura em milissegundos
+            values: Matriz (n, 5) com open, high, low, close e volume
+            dtype: Tipo dos valores OHLCV (np.float32 = modo compacto, com timestamps
+                int32 em segundos: metade da memória)
+        """
+        timestamps = np.ascontiguousarray(timestamps, dtype=np.int64)
+        self.base_ms = int(timestamps[0]) if len(timestamps) else 0
+        self.stored_timestamps = encode_timestamps(timestamps, self.base_ms, is_compact(dtype))
+        self.values = np.ascontiguousarray(values, dtype=dtype).reshape(len(timestamps), len(OHLCV_COLUMNS))
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamps de abertura (int64, ms)"""
+        return decode_timestamps(self.stored_timestamps, self.base_ms)
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, dtype=np.float64) -> "CandleArray":
+        """
+        Converte um DataFrame OHLCV (coluna timestamp em datetime) para arrays
+
+        Args:
+            df: DataFrame com colunas timestamp, open, high, low, close, volume
+            dtype: Tipo dos valores OHLCV
+
+        Returns:
+            CandleArray com os mesmos candles
+        """
+        return cls(to_epoch_ms(df['timestamp']), df[OHLCV_COLUMNS].to_numpy(dtype=dtype), dtype)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Materializa os candles como DataFrame (timestamp em datetime UTC, OHLCV float64)
+
+        Returns:
+            DataFrame com colunas timestamp, open, high, low, close, volume
+        """
+        df = pd.DataFrame(self.values.astype(np.float64), columns=OHLCV_COLUMNS)
+        df.insert(0, 'timestamp', pd.to_datetime(self.timestamps, unit='ms', utc=True))
+        return df
+
+    def __len__(self) -> int:
+        return len(self.stored_timestamps)
+
+    @property
+    def nbytes(self) -> int:
+        """Memória ocupada pelos arrays (bytes)"""
+        return self.stored_timestamps.nbytes + self.values.nbytes
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Timestamp (ms) de abertura do último candle"""
+        return int(decode_timestamps(self.stored_timestamps[-1:], self.base_ms)[0]) if len(self) else None
+
+    def column(self, name: str) -> np.ndarray:
+        """Coluna OHLCV em float64 (ex: 'close')"""
+        return self.values[:, OHLCV_COLUMNS.index(name)].astype(np.float64)
+
+    def tail(self, n: int) -> "CandleArray":
+        """Últimos n candles (views dos arrays, sem cópia)"""
+        tail = object.__new__(CandleArray)
+        tail.base_ms = self.base_ms
+        tail.stored_timestamps = self.stored_timestamps[len(self) - min(n, len(self)):]
+        tail.values = self.values[len(self) - min(n, len(self)):]
+        return tail
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """
+        Converte para lista de dicionários (timestamp em ms e OHLCV float), coluna a coluna
+
+        Returns:
+            Lista com um dicionário por candle (campos de CandleData)
+        """
+        columns = {'timestamp': self.timestamps.tolist()}
+        for position, name in enumerate(OHLCV_COLUMNS):
+            columns[name] = self.values[:, position].astype(np.float64).tolist()
+        return [dict(zip(columns, row)) for row in zip(*columns.values())]
+
+
+class CandleBuffer:
+    """Buffer circular de tamanho fixo com timestamps int64 (ms) e OHLCV float64 (ou compacto)"""
+
+    __slots__ = ('interval_ms', 'capacity', '_timestamps', '_values', '_base_ms', '_start', '_count')
+
+    def __init__(self, interval_ms: int, capacity: int = 1000, dtype=np.float64):
+        """
+        Args:
+            interval_ms: Duração de um candle em milissegundos
+            capacity: Número máximo de candles mantidos
+            dtype: Tipo dos valores OHLCV (np.float32 no modo compacto, com timestamps
+                int32 em segundos desde o primeiro candle)
+        """
+        self.interval_ms = interval_ms
+        self.capacity = capacity
+        self._timestamps = np.zeros(capacity, dtype=np.int32 if is_compact(dtype) else np.int64)
+        self._values = np.zeros((capacity, len(OHLCV_COLUMNS)), dtype=dtype)
+        self._base_ms = 0
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def last_timestamp(self) -> Optional[int]:
+        """Timestamp (ms) de abertura do último candle armazenado (em formação)"""
+        if self._count == 0:
+            return None
+        last = self._timestamps[(self._start + self._count - 1) % self.capacity]
+        return int(decode_timestamps(np.atleast_1d(last), self._base_ms)[0])
+
+    def _extend(self, timestamps: np.ndarray, values: np.ndarray):
+        n = len(timestamps)
+        compact = self._timestamps.dtype == np.int32
+        if n >= self.capacity:
+            timestamps, values = timestamps[-self.capacity:], values[-self.capacity:]
+            self._base_ms = int(timestamps[0])
+            self._timestamps[:] = encode_timestamps(timestamps, self._base_ms, compact)
+            self._values[:] = values
+            self._start = 0
+            self._count = self.capacity
+            return
+
+        if self._count == 0 and n:
+            self._base_ms = int(timestamps[0])
+        idx = (self._start + self._count + np.arange(n)) % self.capacity
+        self._timestamps[idx] = encode_timestamps(timestamps, self._base_ms, compact)
+        self._values[idx] = values
+        overflow = max(0, self._count + n - self.capacity)
+        self._start = (self._start + overflow) % self.capacity
+        self._count = min(self.capacity, self._count + n)
+
+    def clear(self):
+        """Descarta todos os candles"""
+        self._start = 0
+        self._count = 0
+
+    def merge(self, ohlcv: List[list]) -> int:
+        """
+        Incorpora candles vindos da exchange
+
+        O candle com o mesmo timestamp do último armazenado substitui o candle em
+        formação; candles mais antigos são ignorados e os mais novos são anexados.
+        Se houver um buraco entre o buffer e os novos candles, o buffer é reiniciado.
+
+        Args:
+            ohlcv: Lista ordenada de candles [timestamp, open, high, low, close, volume]
+
+        Returns:
+            Número de candles novos anexados
+        """
+        if not ohlcv:
+            return 0
+
+        rows = np.asarray(ohlcv, dtype=np.float64)
+        timestamps = rows[:, 0].astype(np.int64)
+        values = rows[:, 1:6]
+
+        last = self.last_timestamp
+        if last is not None and timestamps[0] > last + self.interval_ms:
+            self.clear()
+            last = None
+
+        if last is not None:
+            if timestamps[0] <= last:
+                same = np.flatnonzero(timestamps == last)
+                if len(same):
+                    self._values[(self._start + self._count - 1) % self.capacity] = values[same[-1]]
+            newer = timestamps > last
+            timestamps, values = timestamps[newer], values[newer]
+
+        self._extend(timestamps, values)
+        return len(timestamps)
+
+    def tail(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Retorna os últimos n candles em arrays contíguos
+
+        Args:
+            n: Número de candles
+
+        Returns:
+            Tupla (timestamps int64, valores OHLCV com shape (n, 5) no dtype do buffer)
+        """
+        n = min(n, self._count)
+        idx = (self._start + self._count - n + np.arange(n)) % self.capacity
+        return decode_timestamps(self._timestamps[idx], self._base_ms), self._values[idx]
+
+    def to_candles(self, n: int) -> CandleArray:
+        """
+        Copia os últimos n candles para uma série compacta (mesmo dtype do buffer)
+
+        Args:
+            n: Número de candles
+
+        Returns:
+            CandleArray com os candles em ordem cronológica
+        """
+        timestamps, values = self.tail(n)
+        return CandleArray(timestamps, values, self._values.dtype)
+
+    def to_dataframe(self, n: int) -> pd.DataFrame:
+        """
+        Materializa os últimos n candles como DataFrame (timestamp em datetime UTC)
+
+        Args:
+            n: Número de candles
+
+        Returns:
+            DataFrame com colunas timestamp, open, high, low, close, volume
+        """
+        return self.to_candles(n).to_dataframe()
@@ -0,0 +1,172 @@
+"""
+Cache em memória de candles OHLCV, ciente da fronteira dos candles
+
+Candles fechados nunca mudam, então ficam no cache até serem despejados (LRU).
+Apenas o candle em formação (o último) expira, com um TTL que depende do timeframe.
+
+As entradas são guardadas como CandleArray (arrays, OHLCV opcionalmente em
+float32); o DataFrame é montado só na leitura.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+import numpy as np
+import pandas as pd
+
+from app.services.candle_buffer import CandleArray
+from app.services.timeframes import timeframe_to_ms
+
+
+# TTL (em segundos) do candle em formação por timeframe
+DEFAULT_TTL_SECONDS = {
+    '1m': 5, '5m': 15, '15m': 30, '30m': 60,
+    '1h': 60, '4h': 120, '1d': 300, '1w': 600
+}
+
+
+class CachedCandles:
+    """Entrada do cache: candles em arrays e o momento em que foram atualizados"""
+
+    __slots__ = ('candles', 'fetched_at_ms', 'last_open_ms')
+
+    def __init__(self, candles: CandleArray, fetched_at_ms: int, last_open_ms: int):
+        self.candles = candles
+        self.fetched_at_ms = fetched_at_ms
+        self.last_open_ms = last_open_ms
+
+
+class CandleCache:
+    """Cache LRU limitado de candles, chaveado por (symbol, timeframe, limit)"""
+
+    def __init__(self, max_entries: int = 256, enabled: bool = True, ttl_seconds: Dict[str, int] = None,
+                 dtype=np.float64):
+        """
+        Args:
+            max_entries: Número máximo de séries em cache (LRU)
+            enabled: Se False, o cache não armazena nem retorna nada
+            ttl_seconds: TTL do candle em formação por timeframe (usa DEFAULT_TTL_SECONDS se None)
+            dtype: Tipo dos valores OHLCV armazenados (np.float32 no modo compacto)
+        """
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.dtype = np.dtype(dtype)
+        self.ttl_seconds = dict(DEFAULT_TTL_SECONDS, **(ttl_seconds or {}))
+        self._entries: "OrderedDict[Tuple[str, str, int], CachedCandles]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.evictions = 0
+
+    def is_fresh(self, entry: CachedCandles, timeframe: str, now_ms: int) -> bool:
+        """
+        Verifica se o candle em formação da entrada ainda é válido
+
+        A entrada expira quando o TTL do timeframe passa ou quando um novo candle abre.
+
+        Args:
+            entry: Entrada do cache
+            timeframe: Timeframe da série
+            now_ms: Horário atual em milissegundos
+
+        Returns:
+            True se a entrada pode ser servida sem consultar a exchange
+        """
+        ttl_ms = self.ttl_seconds.get(timeframe, 60) * 1000
+        if now_ms - entry.fetched_at_ms >= ttl_ms:
+            return False
+        return now_ms < entry.last_open_ms + timeframe_to_ms(timeframe)
+
+    def get(self, symbol: str, timeframe: str, limit: int, now_ms: int) -> Optional[pd.DataFrame]:
+        """
+        Retorna os candles em cache se ainda estiverem válidos
+
+        Args:
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            limit: Número de candles
+            now_ms: Horário atual em milissegundos
+
+        Returns:
+            DataFrame novo com os candles em cache ou None (miss ou candle em formação expirado)
+        """
+        if not self.enabled:
+            return None
+
+        key = (symbol, timeframe, limit)
+        entry = self._entries.get(key)
+        if entry is None or not self.is_fresh(entry, timeframe, now_ms):
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.candles.to_dataframe()
+
+    def get_stale(self, symbol: str, timeframe: str, limit: int) -> Optional[pd.DataFrame]:
+        """
+        Retorna os candles em cache mesmo com o candle em formação expirado
+
+        Usado como fallback quando a exchange está indisponível.
+
+        Args:
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            limit: Número de candles
+
+        Returns:
+            DataFrame com os candles em cache ou None
+        """
+        entry = self._entries.get((symbol, timeframe, limit)) if self.enabled else None
+        return entry.candles.to_dataframe() if entry is not None else None
+
+    def put(self, symbol: str, timeframe: str, limit: int, candles: Union[CandleArray, pd.DataFrame],
+            now_ms: int, refreshed: bool = False):
+        """
+        Armazena candles no cache, despejando a entrada menos usada se necessário
+
+        Args:
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            limit: Número de candles
+            candles: CandleArray ou DataFrame com os candles (coluna 'timestamp' em datetime UTC)
+            now_ms: Horário da busca em milissegundos
+            refreshed: True se a série foi atualizada incrementalmente
+        """
+        if not self.enabled or candles is None or len(candles) == 0:
+            return
+
+        if isinstance(candles, pd.DataFrame):
+            candles = CandleArray.from_dataframe(candles, self.dtype)
+        elif candles.values.dtype != self.dtype:
+            candles = CandleArray(candles.timestamps, candles.values, self.dtype)
+
+        key = (symbol, timeframe, limit)
+        self._entries[key] = CachedCandles(candles, now_ms, candles.last_timestamp)
+        self._entries.move_to_end(key)
+        if refreshed:
+            self.refreshes += 1
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Remove todas as entradas do cache"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas de uso do cache
+
+        Returns:
+            Dicionário com hits, misses, refreshes, evictions, tamanho e memória (bytes) atuais
+        """
+        return {
+            'enabled': self.enabled,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'bytes': sum(entry.candles.nbytes for entry in self._entries.values()),
+            'hits': self.hits,
+            'misses': self.misses,
+            'refreshes': self.refreshes,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,285 @@
+"""
+Armazenamento local de histórico de candles em arquivos memory-mapped
+
+Cada (symbol, timeframe) tem um único arquivo colunar: um cabeçalho fixo seguido
+de um bloco int64 de timestamps (ms) e um bloco float64 para cada coluna OHLCV.
+As leituras por intervalo de tempo são fatias zero-copy do mapeamento em memória,
+então anos de candles de 1h são lidos sem rede e praticamente sem custo.
+
+O armazenamento assume um único processo escritor por arquivo.
+"""
+import os
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+
+from app.services.candle_buffer import OHLCV_COLUMNS
+
+
+MAGIC = b'CISTORE1'
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('capacity', '<i8'),
+    ('count', '<i8'),
+    ('interval_ms', '<i8'),
+    ('reserved', '<i8', (4,))
+])
+HEADER_SIZE = HEADER_DTYPE.itemsize
+COLUMNS = ['timestamp'] + OHLCV_COLUMNS
+INITIAL_CAPACITY = 4096
+
+
+class _SeriesFile:
+    """Arquivo memory-mapped de uma série (symbol, timeframe)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._map()
+
+    def _map(self):
+        self._mm = np.memmap(self.path, dtype=np.uint8, mode='r+')
+        self.header = self._mm[:HEADER_SIZE].view(HEADER_DTYPE)[0:1]
+        if self.header['magic'][0] != MAGIC:
+            raise ValueError(f"Arquivo de histórico inválido: {self.path}")
+        capacity = int(self.header['capacity'][0])
+        self.columns: Dict[str, np.ndarray] = {}
+        for i, name in enumerate(COLUMNS):
+            start = HEADER_SIZE + i * capacity * 8
+            dtype = np.int64 if name == 'timestamp' else np.float64
+            self.columns[name] = self._mm[start:start + capacity * 8].view(dtype)
+
+    @staticmethod
+    def create(path: str, interval_ms: int, capacity: int = INITIAL_CAPACITY) -> '_SeriesFile':
+        """Cria um arquivo vazio com a capacidade informada"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        header = np.zeros(1, dtype=HEADER_DTYPE)
+        header['magic'] = MAGIC
+        header['capacity'] = capacity
+        header['interval_ms'] = interval_ms
+        with open(path, 'wb') as f:
+            f.write(header.tobytes())
+            f.truncate(HEADER_SIZE + len(COLUMNS) * capacity * 8)
+        return _SeriesFile(path)
+
+    @property
+    def capacity(self) -> int:
+        return int(self.header['capacity'][0])
+
+    @property
+    def count(self) -> int:
+        return int(self.header['count'][0])
+
+    @property
+    def interval_ms(self) -> int:
+        return int(self.header['interval_ms'][0])
+
+    def column(self, name: str) -> np.ndarray:
+        """Visão (sem cópia) dos valores válidos de uma coluna"""
+        return self.columns[name][:self.count]
+
+    def rewrite(self, timestamps: np.ndarray, values: np.ndarray):
+        """
+        Regrava a série inteira em um novo arquivo (crescimento ou inserção no início)
+
+        O novo arquivo é escrito ao lado e substitui o antigo atomicamente.
+        """
+        count = len(timestamps)
+        capacity = max(INITIAL_CAPACITY, self.capacity)
+        while capacity < count:
+            capacity *= 2
+
+        tmp_path = self.path + '.tmp'
+        new_file = _SeriesFile.create(tmp_path, self.interval_ms, capacity)
+        new_file.columns['timestamp'][:count] = timestamps
+        for i, name in enumerate(OHLCV_COLUMNS):
+            new_file.columns[name][:count] = values[:, i]
+        new_file.header['count'] = count
+        new_file.flush()
+        del new_file
+
+        os.replace(tmp_path, self.path)
+        self._map()
+
+    def write_at(self, index: int, timestamps: np.ndarray, values: np.ndarray):
+        """Escreve candles a partir de `index` (a capacidade deve ser suficiente)"""
+        end = index + len(timestamps)
+        self.columns['timestamp'][index:end] = timestamps
+        for i, name in enumerate(OHLCV_COLUMNS):
+            self.columns[name][index:end] = values[:, i]
+        self.header['count'] = max(self.count, end)
+        self.flush()
+
+    def flush(self):
+        self._mm.flush()
+
+
+class CandleStore:
+    """Histórico local de candles com um arquivo memory-mapped por (symbol, timeframe)"""
+
+    def __init__(self, base_dir: str):
+        """
+        Args:
+            base_dir: Diretório onde os arquivos de histórico são mantidos
+        """
+        self.base_dir = base_dir
+        self._files: Dict[tuple, _SeriesFile] = {}
+
+    def path_for(self, symbol: str, timeframe: str) -> str:
+        """Caminho do arquivo de (symbol, timeframe)"""
+        return os.path.join(self.base_dir, f"{symbol.replace('/', '-')}_{timeframe}.candles")
+
+    def _get_file(self, symbol: str, timeframe: str, interval_ms: int = None) -> Optional[_SeriesFile]:
+        key = (symbol, timeframe)
+        series = self._files.get(key)
+        if series is not None:
+            return series
+
+        path = self.path_for(symbol, timeframe)
+        if os.path.exists(path):
+            series = _SeriesFile(path)
+        elif interval_ms is not None:
+            series = _SeriesFile.create(path, interval_ms)
+        else:
+            return None
+
+        self._files[key] = series
+        return series
+
+    def count(self, symbol: str, timeframe: str) -> int:
+        """Número de candles armazenados"""
+        series = self._get_file(symbol, timeframe)
+        return series.count if series else 0
+
+    def first_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        """Timestamp (ms) do candle mais antigo armazenado"""
+        series = self._get_file(symbol, timeframe)
+        if not series or series.count == 0:
+            return None
+        return int(series.columns['timestamp'][0])
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
+        """Timestamp (ms) do candle mais recente armazenado"""
+        series = self._get_file(symbol, timeframe)
+        if not series or series.count == 0:
+            return None
+        return int(series.columns['timestamp'][series.count - 1])
+
+    def append(self, symbol: str, timeframe: str, interval_ms: int, ohlcv: List[list]) -> int:
+        """
+        Incorpora candles ao histórico
+
+        Candles posteriores ao último armazenado são anexados; o candle com o mesmo
+        timestamp do último é substituído (candle em formação). Candles anteriores
+        ao último que ainda não existem (antes do primeiro ou em lacunas do
+        histórico) são intercalados em ordem (regravando o arquivo); os que já
+        existem são mantidos.
+
+        Args:
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            interval_ms: Duração de um candle em milissegundos
+            ohlcv: Lista ordenada de candles [timestamp, open, high, low, close, volume]
+
+        Returns:
+            Número de candles novos armazenados
+        """
+        if not ohlcv:
+            return 0
+
+        rows = np.asarray(ohlcv, dtype=np.float64)
+        timestamps = rows[:, 0].astype(np.int64)
+        values = rows[:, 1:6]
+
+        series = self._get_file(symbol, timeframe, interval_ms)
+        count = series.count
+
+        if count == 0:
+            if len(timestamps) > series.capacity:
+                series.rewrite(timestamps, values)
+            else:
+                series.write_at(0, timestamps, values)
+            return len(timestamps)
+
+        stored = series.column('timestamp')
+        last = int(stored[-1])
+
+        # Candles ausentes antes do último: união ordenada com o histórico
+        position = np.minimum(np.searchsorted(stored, timestamps), count - 1)
+        missing = (timestamps < last) & (stored[position] != timestamps)
+        inserted = 0
+        if missing.any():
+            missing_ts, first_index = np.unique(timestamps[missing], return_index=True)
+            merged_ts = np.concatenate([stored, missing_ts])
+            merged_values = np.concatenate([
+                np.column_stack([series.column(name) for name in OHLCV_COLUMNS]),
+                values[missing][first_index]
+            ])
+            order = np.argsort(merged_ts, kind='stable')
+            series.rewrite(merged_ts[order], merged_values[order])
+            count = series.count
+            inserted = len(missing_ts)
+
+        same = np.flatnonzero(timestamps == last)
+        if len(same):
+            series.write_at(count - 1, timestamps[same[-1:]], values[same[-1:]])
+
+        newer = timestamps > last
+        new_ts, new_values = timestamps[newer], values[newer]
+        if len(new_ts):
+            if count + len(new_ts) > series.capacity:
+                all_ts = np.concatenate([series.column('timestamp'), new_ts])
+                all_values = np.concatenate([
+                    np.column_stack([series.column(name) for name in OHLCV_COLUMNS]),
+                    new_values
+                ])
+                series.rewrite(all_ts, all_values)
+            else:
+                series.write_at(count, new_ts, new_values)
+
+        return inserted + len(new_ts)
+
+    def read(self, symbol: str, timeframe: str, start_ms: int = None, end_ms: int = None) -> Dict[str, np.ndarray]:
+        """
+        Lê um intervalo de tempo como fatias zero-copy (somente leitura) do arquivo
+
+        Args:
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            start_ms: Abertura mínima (inclusiva); None para o início do histórico
+            end_ms: Abertura máxima (exclusiva); None para o fim do histórico
+
+        Returns:
+            Dicionário {coluna: array} com timestamp (int64) e open/high/low/close/volume (float64)
+        """
+        series = self._get_file(symbol, timeframe)
+        if series is None or series.count == 0:
+            return {name: np.empty(0, dtype=np.int64 if name == 'timestamp' else np.float64) for name in COLUMNS}
+
+        stored = series.column('timestamp')
+        lo = 0 if start_ms is None else int(np.searchsorted(stored, start_ms, side='left'))
+        hi = len(stored) if end_ms is None else int(np.searchsorted(stored, end_ms, side='left'))
+
+        result = {}
+        for name in COLUMNS:
+            view = series.column(name)[lo:hi]
+            view.flags.writeable = False
+            result[name] = view
+        return result
+
+    def read_dataframe(self, symbol: str, timeframe: str, start_ms: int = None, end_ms: int = None) -> pd.DataFrame:
+        """
+        Lê um intervalo de tempo como DataFrame (copia os dados)
+
+        Args:
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            start_ms: Abertura mínima (inclusiva)
+            end_ms: Abertura máxima (exclusiva)
+
+        Returns:
+            DataFrame com colunas timestamp (datetime UTC), open, high, low, close, volume
+        """
+        arrays = self.read(symbol, timeframe, start_ms, end_ms)
+        df = pd.DataFrame({name: np.array(arrays[name]) for name in OHLCV_COLUMNS})
+        df.insert(0, 'timestamp', pd.to_datetime(np.array(arrays['timestamp']), unit='ms', utc=True))
+        return df
@@ -1,42 +1,102 @@
 """
 Serviço para buscar dados de criptomoedas usando CCXT
+
+O CryptoService é assíncrono (ccxt.async_support): as chamadas à exchange não
+bloqueiam o event loop e os timeframes são buscados em paralelo.
+O backend de exchange é escolhido por Settings.exchange_name (ver exchanges.py).
+Scripts síncronos devem usar o SyncCryptoService.
 """
+import asyncio
+from collections import OrderedDict
 import ccxt
+import numpy as np
 import pandas as pd
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Union
 from datetime import datetime, timezone
 import pytz
-import time
+
+from app.config import settings
+from app.services.candle_buffer import CandleBuffer
+from app.services.candle_cache import CandleCache
+from app.services.candle_store import CandleStore
+from app.services.exchanges import create_exchange
+from app.services.market_index import MarketIndex, clean_symbol
+from app.services.resampler import resample_ohlcv, timeframe_ratio
+from app.services.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, call_with_resilience
+from app.services.single_flight import SingleFlight
+from app.services.timeframes import TIMEFRAME_MINUTES, VALID_TIMEFRAMES, candle_open_time, timeframe_to_ms
+
+
+# Máximo de candles por chamada fetch_ohlcv na Binance
+MAX_FETCH_LIMIT = 1000
 
 
 class CryptoService:
-    """Serviço para interagir com exchanges de cripto"""
+    """Serviço assíncrono para interagir com exchanges de cripto"""
     
-    def __init__(self, max_retries: int = 3, retry_delay: float = 1.0):
+    def __init__(self, max_retries: int = 3, retry_delay: float = 1.0, cache: CandleCache = None,
+                 resample: bool = None, exchange=None):
         """
-        Inicializa a exchange (Binance por padrão)
+        Inicializa a exchange (settings.exchange_name; Binance por padrão)
         
         Args:
             max_retries: Número máximo de tentativas em caso de falha
-            retry_delay: Delay entre tentativas (em segundos)
+            retry_delay: Delay base do backoff exponencial com jitter (em segundos)
+            cache: Cache de candles (usa as configurações da aplicação se None)
+            resample: Se True, get_multiple_timeframes busca só o menor timeframe e
+                deriva os maiores localmente (usa settings.resample_timeframes se None)
+            exchange: Backend de exchange já criado (usa create_exchange() se None)
         """
         try:
-            self.exchange = ccxt.binance({
-                'enableRateLimit': True,
-                'timeout': 10000,  # 10 segundos de timeout
-                'options': {
-                    'defaultType': 'spot'
-                }
-            })
+            self.exchange = exchange if exchange is not None else create_exchange()
             self.max_retries = max_retries
             self.retry_delay = retry_delay
         except Exception as e:
             raise Exception(f"Erro ao inicializar exchange: {str(e)}")
+        
+        # Modo compacto: OHLCV em float32 nos buffers e no cache (DataFrames continuam float64)
+        self.candle_dtype = np.float32 if settings.compact_candles else np.float64
+        
+        # Cache e buffers comportam as séries de /analyze e as de uma varredura completa do
+        # screener (pares × timeframes): a varredura seguinte só busca os candles novos
+        screener_series = settings.screener_universe * len(settings.default_timeframes)
+        self.max_series = settings.candle_buffer_max_series + screener_series
+        if cache is None:
+            cache = CandleCache(
+                max_entries=settings.candle_cache_max_entries + screener_series,
+                enabled=settings.candle_cache_enabled,
+                dtype=self.candle_dtype
+            )
+        self.cache = cache
+        self.single_flight = SingleFlight(enabled=settings.single_flight_enabled)
+        self.retry_policy = RetryPolicy(
+            max_attempts=max_retries,
+            base_delay=retry_delay,
+            max_delay=settings.retry_max_delay
+        )
+        self.circuit_breaker = CircuitBreaker(
+            getattr(self.exchange, 'id', settings.exchange_name),
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            reset_timeout=settings.circuit_breaker_reset_timeout,
+            enabled=settings.circuit_breaker_enabled
+        )
+        self._last_prices: Dict[str, float] = {}
+        self._tickers: Dict[str, dict] = {}
+        self._tickers_fetched_at = None
+        self.market_index = MarketIndex(settings.quote_preference, market_type=settings.exchange_type)
+        self.resample = settings.resample_timeframes if resample is None else resample
+        self.history_store = CandleStore(settings.candle_store_dir)
+        self._buffers: "OrderedDict[Tuple[str, str], CandleBuffer]" = OrderedDict()
     
-    def get_candles(self, symbol: str, timeframe: str = '1h', limit: int = 500) -> pd.DataFrame:
+    async def get_candles(self, symbol: str, timeframe: str = '1h', limit: int = 500) -> pd.DataFrame:
         """
         Busca candles de uma criptomoeda com retry automático
-        SEMPRE busca dados em tempo real diretamente da API sem cache
+        
+        Candles fechados são servidos do cache; apenas o candle em formação é
+        atualizado na exchange quando o TTL do timeframe expira ou um novo candle abre.
+        Cada (symbol, timeframe) mantém um buffer circular, então um refresh baixa
+        só os candles a partir do último timestamp armazenado (1–2 em vez de 500).
+        Com o circuit breaker aberto, os últimos candles conhecidos são servidos.
         
         Args:
             symbol: Par de trading (ex: 'BTC/USDT')
@@ -47,118 +107,407 @@ class CryptoService:
             DataFrame com os dados dos candles (timestamp, open, high, low, close, volume)
             
         Raises:
+            CircuitOpenError: Se a exchange estiver indisponível e não houver candles em cache
             Exception: Se houver erro após todas as tentativas
         """
-        # Valida parâmetros
-        if not symbol or not isinstance(symbol, str):
-            raise ValueError("Símbolo inválido")
+        # Valida parâmetros (símbolos fora do índice de mercados falham sem ir à rede)
+        self._validate_symbol(symbol)
         
         if limit < 1 or limit > 1000:
             raise ValueError("Limite deve estar entre 1 e 1000")
         
-        valid_timeframes = ['1m', '5m', '15m', '30m', '1h', '4h', '1d', '1w']
-        if timeframe not in valid_timeframes:
-            raise ValueError(f"Timeframe inválido. Use um dos: {', '.join(valid_timeframes)}")
+        if timeframe not in VALID_TIMEFRAMES:
+            raise ValueError(f"Timeframe inválido. Use um dos: {', '.join(VALID_TIMEFRAMES)}")
+        
+        return await self._get_series(symbol, timeframe, limit)
+    
+    def _validate_symbol(self, symbol: str):
+        """
+        Valida um par de trading contra o índice de mercados (se já carregado)
+        
+        Args:
+            symbol: Par de trading (ex: 'BTC/USDT')
+            
+        Raises:
+            ValueError: Se o símbolo for inválido ou não estiver listado na exchange
+        """
+        if not symbol or not isinstance(symbol, str):
+            raise ValueError("Símbolo inválido")
+        
+        if self.market_index.loaded and not self.market_index.is_valid(symbol):
+            raise ValueError(f"Par {symbol} não listado na exchange")
+    
+    async def _get_series(self, symbol: str, timeframe: str, limit: int) -> pd.DataFrame:
+        """
+        Retorna os últimos `limit` candles usando cache, buffer circular e exchange
+        
+        Diferente de get_candles, aceita mais de 1000 candles (a carga inicial é
+        paginada), o que permite derivar timeframes maiores localmente.
         
-        # Calcula o timestamp 'since' para garantir dados mais recentes
-        # Usa exchange.milliseconds() para garantir sincronização com a exchange
-        timeframe_minutes = {
-            '1m': 1, '5m': 5, '15m': 15, '30m': 30,
-            '1h': 60, '4h': 240, '1d': 1440, '1w': 10080
-        }
-        minutes = timeframe_minutes.get(timeframe, 60)
+        Args:
+            symbol: Par de trading (ex: 'BTC/USDT')
+            timeframe: Timeframe dos candles
+            limit: Número de candles
+            
+        Returns:
+            DataFrame com os dados dos candles (timestamp, open, high, low, close, volume)
+        """
+        interval_ms = timeframe_to_ms(timeframe)
         
         # Usa o horário da exchange (mais preciso que time.time())
         now = self.exchange.milliseconds()
-        # Calcula 'since' baseado no número de candles e timeframe
-        # Fórmula: agora - (limit * intervalo_em_minutos * 60_segundos * 1000_milissegundos)
-        since = now - (limit * minutes * 60 * 1000)
         
-        last_exception = None
+        cached_df = self.cache.get(symbol, timeframe, limit, now)
+        if cached_df is not None:
+            return cached_df
         
-        for attempt in range(self.max_retries):
-            try:
-                # Busca os dados da exchange COM parâmetro 'since' para garantir dados atualizados
-                ohlcv = self.exchange.fetch_ohlcv(
-                    symbol=symbol,
-                    timeframe=timeframe,
-                    since=since,
-                    limit=limit
-                )
-                
-                # Valida se recebeu dados
-                if not ohlcv or len(ohlcv) == 0:
-                    raise Exception(f"Nenhum dado retornado para {symbol}")
-                
-                # Converte para DataFrame
-                df = pd.DataFrame(
-                    ohlcv, 
-                    columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-                )
-                
-                # Valida DataFrame
-                if df.empty:
-                    raise Exception(f"DataFrame vazio para {symbol}")
-                
-                # Guarda o timestamp do último candle ANTES de converter
-                last_candle_timestamp_ms = df['timestamp'].iloc[-1]
-                
-                # Converte timestamp para datetime ANTES de retornar
-                df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
-                
-                # Valida se o último candle é recente (dentro de 24h para timeframes maiores)
-                max_delay_hours = {'1m': 1, '5m': 1, '15m': 2, '30m': 2, '1h': 3, '4h': 12, '1d': 48, '1w': 168}
-                max_delay = max_delay_hours.get(timeframe, 24) * 60 * 60 * 1000  # em milissegundos
-                
-                if (now - last_candle_timestamp_ms) > max_delay:
-                    print(f"⚠️ AVISO: Último candle de {symbol} ({timeframe}) está defasado!")
-                    print(f"   Horário atual: {datetime.fromtimestamp(now/1000, tz=timezone.utc)}")
-                    print(f"   Último candle: {datetime.fromtimestamp(last_candle_timestamp_ms/1000, tz=timezone.utc)}")
-                
-                return df
-                
-            except ccxt.NetworkError as e:
-                last_exception = e
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))  # Backoff exponencial
-                    continue
-                raise Exception(f"Erro de rede ao buscar {symbol} após {self.max_retries} tentativas: {str(e)}")
+        buffer = self._get_buffer(symbol, timeframe, limit)
+        pending = (now - buffer.last_timestamp) // interval_ms + 1 if len(buffer) else None
+        try:
+            if pending is not None and len(buffer) >= limit and pending <= MAX_FETCH_LIMIT:
+                # Refresh incremental: baixa só a partir do último candle armazenado
+                # (substitui o candle em formação e anexa os que fecharam desde então)
+                ohlcv = await self._fetch_ohlcv(symbol, timeframe, since=buffer.last_timestamp, limit=pending)
+                refreshed = True
+            else:
+                # Calcula 'since' baseado no número de candles e timeframe
+                # Alinhada à abertura do próximo candle (a exchange retorna candles com
+                # abertura >= since), para que requisições simultâneas usem a mesma janela
+                since = candle_open_time(now - (limit - 1) * interval_ms, timeframe)
+                ohlcv = await self._fetch_ohlcv_range(symbol, timeframe, since=since, count=limit)
+                buffer.clear()
+                refreshed = False
+        except CircuitOpenError:
+            # Exchange indisponível: serve os últimos candles conhecidos, se houver
+            stale_df = self.cache.get_stale(symbol, timeframe, limit)
+            if stale_df is None and len(buffer) >= limit:
+                stale_df = buffer.to_dataframe(limit)
+            if stale_df is None:
+                raise
+            print(f"⚠️ Exchange indisponível: servindo candles em cache de {symbol} ({timeframe})")
+            return stale_df
+        
+        buffer.merge(ohlcv)
+        candles = buffer.to_candles(limit)
+        df = candles.to_dataframe()
+        
+        self._warn_if_outdated(df, symbol, timeframe, now)
+        self.cache.put(symbol, timeframe, limit, candles, now, refreshed=refreshed)
+        
+        return df
+    
+    def _get_buffer(self, symbol: str, timeframe: str, limit: int) -> CandleBuffer:
+        """
+        Retorna o buffer circular de (symbol, timeframe), criando ou ampliando se necessário
+        
+        Os buffers são mantidos em LRU limitado por max_series
+        (settings.candle_buffer_max_series mais as séries do screener).
+        Com o refresh incremental desligado, sempre retorna um buffer vazio.
+        
+        Args:
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            limit: Número de candles que o buffer precisa comportar
             
-            except ccxt.ExchangeError as e:
-                # Erros da exchange não devem fazer retry
-                raise Exception(f"Erro da exchange para {symbol}: {str(e)}")
+        Returns:
+            CandleBuffer da série
+        """
+        if not settings.incremental_refresh_enabled:
+            return CandleBuffer(timeframe_to_ms(timeframe), capacity=limit, dtype=self.candle_dtype)
+        
+        key = (symbol, timeframe)
+        buffer = self._buffers.get(key)
+        if buffer is None or buffer.capacity < limit:
+            buffer = CandleBuffer(timeframe_to_ms(timeframe), capacity=max(limit, 1000), dtype=self.candle_dtype)
+            self._buffers[key] = buffer
+        self._buffers.move_to_end(key)
+        
+        while len(self._buffers) > self.max_series:
+            self._buffers.popitem(last=False)
+        
+        return buffer
+    
+    async def _fetch_ohlcv_range(self, symbol: str, timeframe: str, since: int, count: int) -> List[list]:
+        """
+        Busca `count` candles a partir de `since`, paginando em blocos de MAX_FETCH_LIMIT
+        
+        Como as janelas de cada página são conhecidas de antemão, as páginas são
+        buscadas em paralelo (o rate limit do ccxt continua valendo).
+        
+        Args:
+            symbol: Par de trading (ex: 'BTC/USDT')
+            timeframe: Timeframe dos candles
+            since: Timestamp (ms) de abertura do primeiro candle
+            count: Número de candles
             
-            except Exception as e:
-                last_exception = e
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
-                    continue
-                raise Exception(f"Erro ao buscar dados de {symbol}: {str(e)}")
+        Returns:
+            Lista de candles [timestamp, open, high, low, close, volume]
+        """
+        if count <= MAX_FETCH_LIMIT:
+            return await self._fetch_ohlcv(symbol, timeframe, since=since, limit=count)
+        
+        interval_ms = timeframe_to_ms(timeframe)
+        pages = []
+        for offset in range(0, count, MAX_FETCH_LIMIT):
+            page_limit = min(MAX_FETCH_LIMIT, count - offset)
+            pages.append(self._fetch_ohlcv(symbol, timeframe, since=since + offset * interval_ms, limit=page_limit))
+        
+        ohlcv = []
+        for page in await asyncio.gather(*pages):
+            if ohlcv and page and page[0][0] <= ohlcv[-1][0]:
+                page = [candle for candle in page if candle[0] > ohlcv[-1][0]]
+            ohlcv.extend(page)
+        return ohlcv
+    
+    async def _fetch_ohlcv(self, symbol: str, timeframe: str, since: int, limit: int) -> List[list]:
+        """
+        Busca candles crus na exchange, coalescendo chamadas idênticas simultâneas
+        
+        Chamadores concorrentes pedindo a mesma janela (symbol, timeframe, since, limit)
+        compartilham uma única chamada à exchange (single-flight).
         
-        # Se chegou aqui, todas as tentativas falharam
-        raise Exception(f"Erro ao buscar dados de {symbol} após {self.max_retries} tentativas: {str(last_exception)}")
+        Args:
+            symbol: Par de trading (ex: 'BTC/USDT')
+            timeframe: Timeframe dos candles
+            since: Timestamp (ms) do primeiro candle
+            limit: Número máximo de candles
+            
+        Returns:
+            Lista de candles [timestamp, open, high, low, close, volume] (não deve ser modificada)
+        """
+        return await self.single_flight.do(
+            ('ohlcv', symbol, timeframe, since, limit),
+            lambda: self._fetch_ohlcv_with_retry(symbol, timeframe, since, limit)
+        )
+    
+    async def _fetch_ohlcv_with_retry(self, symbol: str, timeframe: str, since: int, limit: int) -> List[list]:
+        """
+        Busca candles crus na exchange com retry assíncrono e circuit breaker
+        
+        Erros de rede são repetidos com backoff exponencial com jitter (sem bloquear
+        o event loop); durante uma indisponibilidade o circuit breaker rejeita as
+        chamadas imediatamente com CircuitOpenError.
+        
+        Args:
+            symbol: Par de trading (ex: 'BTC/USDT')
+            timeframe: Timeframe dos candles
+            since: Timestamp (ms) do primeiro candle
+            limit: Número máximo de candles
+            
+        Returns:
+            Lista de candles [timestamp, open, high, low, close, volume]
+            
+        Raises:
+            CircuitOpenError: Se o circuito da exchange estiver aberto
+            Exception: Se houver erro após todas as tentativas
+        """
+        try:
+            # Busca os dados da exchange COM parâmetro 'since' para garantir dados atualizados
+            ohlcv = await call_with_resilience(
+                lambda: self.exchange.fetch_ohlcv(symbol=symbol, timeframe=timeframe, since=since, limit=limit),
+                self.retry_policy,
+                self.circuit_breaker
+            )
+        except CircuitOpenError:
+            raise
+        except ccxt.NetworkError as e:
+            raise Exception(f"Erro de rede ao buscar {symbol} após {self.max_retries} tentativas: {str(e)}")
+        except ccxt.ExchangeError as e:
+            # Erros da exchange não devem fazer retry
+            raise Exception(f"Erro da exchange para {symbol}: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Erro ao buscar dados de {symbol}: {str(e)}")
+        
+        # Valida se recebeu dados
+        if not ohlcv or len(ohlcv) == 0:
+            raise Exception(f"Nenhum dado retornado para {symbol}")
+        
+        return ohlcv
     
-    def get_multiple_timeframes(self, symbol: str, timeframes: List[str] = None, limit: int = 500) -> Dict[str, pd.DataFrame]:
+    @staticmethod
+    def _warn_if_outdated(df: pd.DataFrame, symbol: str, timeframe: str, now: int):
         """
-        Busca candles de múltiplos timeframes
+        Avisa se o último candle não é recente (dados defasados na exchange)
+        
+        Args:
+            df: DataFrame com os candles
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            now: Horário atual em milissegundos
+        """
+        last_candle_timestamp_ms = int(df['timestamp'].iloc[-1].timestamp() * 1000)
+        
+        # Valida se o último candle é recente (dentro de 24h para timeframes maiores)
+        max_delay_hours = {'1m': 1, '5m': 1, '15m': 2, '30m': 2, '1h': 3, '4h': 12, '1d': 48, '1w': 168}
+        max_delay = max_delay_hours.get(timeframe, 24) * 60 * 60 * 1000  # em milissegundos
+        
+        if (now - last_candle_timestamp_ms) > max_delay:
+            print(f"⚠️ AVISO: Último candle de {symbol} ({timeframe}) está defasado!")
+            print(f"   Horário atual: {datetime.fromtimestamp(now/1000, tz=timezone.utc)}")
+            print(f"   Último candle: {datetime.fromtimestamp(last_candle_timestamp_ms/1000, tz=timezone.utc)}")
+    
+    async def get_multiple_timeframes(self, symbol: str, timeframes: List[str] = None,
+                                      limit: Union[int, Dict[str, int]] = 500) -> Dict[str, pd.DataFrame]:
+        """
+        Busca candles de múltiplos timeframes em paralelo (asyncio.gather)
+        
+        A latência total fica próxima de um único round-trip à exchange.
         
         Args:
             symbol: Par de trading (ex: 'BTC/USDT')
             timeframes: Lista de timeframes ('1h', '4h', '1d')
-            limit: Número de candles para buscar em cada timeframe
+            limit: Número de candles em cada timeframe, ou um por timeframe
+                (ex: o plano do LookbackPlanner)
             
         Returns:
             Dicionário com DataFrames por timeframe
         """
         if timeframes is None:
             timeframes = ['1h', '4h', '1d']
+        limits = self._limits_by_timeframe(timeframes, limit)
         
-        result = {}
+        if self.resample and len(timeframes) > 1:
+            return await self._get_resampled_timeframes(symbol, timeframes, limits)
+        
+        frames = await asyncio.gather(
+            *(self.get_candles(symbol, tf, limits[tf]) for tf in timeframes)
+        )
+        
+        return dict(zip(timeframes, frames))
+    
+    @staticmethod
+    def _limits_by_timeframe(timeframes: List[str], limit: Union[int, Dict[str, int]]) -> Dict[str, int]:
+        """Normaliza `limit` (único ou por timeframe) para {timeframe: candles}"""
+        if isinstance(limit, dict):
+            missing = [tf for tf in timeframes if tf not in limit]
+            if missing:
+                raise ValueError(f"Limite não informado para: {', '.join(missing)}")
+            return {tf: limit[tf] for tf in timeframes}
+        return {tf: limit for tf in timeframes}
+    
+    async def _get_resampled_timeframes(self, symbol: str, timeframes: List[str],
+                                        limit: Union[int, Dict[str, int]]) -> Dict[str, pd.DataFrame]:
+        """
+        Busca apenas o menor timeframe e deriva os demais por reamostragem local
+        
+        A primeira carga do timeframe base é paginada; depois disso o buffer circular
+        faz com que cada análise custe uma única chamada incremental à exchange.
+        
+        Args:
+            symbol: Par de trading (ex: 'BTC/USDT')
+            timeframes: Lista de timeframes (os maiores devem ser múltiplos do menor)
+            limit: Número de candles em cada timeframe (único ou um por timeframe)
+            
+        Returns:
+            Dicionário com DataFrames por timeframe
+        """
+        self._validate_symbol(symbol)
         for tf in timeframes:
-            result[tf] = self.get_candles(symbol, tf, limit)
+            if tf not in VALID_TIMEFRAMES:
+                raise ValueError(f"Timeframe inválido. Use um dos: {', '.join(VALID_TIMEFRAMES)}")
+        limits = self._limits_by_timeframe(timeframes, limit)
+        if any(value < 1 or value > 1000 for value in limits.values()):
+            raise ValueError("Limite deve estar entre 1 e 1000")
+        
+        base = min(timeframes, key=lambda tf: TIMEFRAME_MINUTES[tf])
         
+        # `limit` candles de um timeframe cabem sempre em limit * razão candles do
+        # base (a janela parcial mais antiga é descartada na reamostragem). A contagem
+        # fixa mantém estáveis a chave do cache e o buffer circular entre requisições.
+        count = max(limits[tf] * timeframe_ratio(base, tf) for tf in timeframes)
+        base_df = await self._get_series(symbol, base, count)
+        
+        result = {}
+        for tf in timeframes:
+            if tf == base:
+                result[tf] = base_df.tail(limits[tf]).reset_index(drop=True)
+            else:
+                resampled = resample_ohlcv(base_df, base, tf)
+                result[tf] = resampled.tail(limits[tf]).reset_index(drop=True)
         return result
     
+    async def backfill_history(self, symbol: str, timeframe: str, since_ms: int, until_ms: int = None) -> int:
+        """
+        Preenche o histórico local (CandleStore) paginando a exchange com cursores 'since'
+        
+        Só baixa o que falta: candles anteriores ao primeiro armazenado e posteriores
+        ao último, mantendo o histórico contínuo. Pode ser chamado periodicamente
+        para manter o histórico em dia.
+        
+        Args:
+            symbol: Par de trading (ex: 'BTC/USDT')
+            timeframe: Timeframe dos candles
+            since_ms: Timestamp (ms) a partir do qual o histórico deve existir
+            until_ms: Timestamp (ms) final (padrão: agora)
+            
+        Returns:
+            Número de candles novos armazenados
+        """
+        if not symbol or not isinstance(symbol, str):
+            raise ValueError("Símbolo inválido")
+        if timeframe not in VALID_TIMEFRAMES:
+            raise ValueError(f"Timeframe inválido. Use um dos: {', '.join(VALID_TIMEFRAMES)}")
+        
+        until_ms = until_ms or self.exchange.milliseconds()
+        first = self.history_store.first_timestamp(symbol, timeframe)
+        last = self.history_store.last_timestamp(symbol, timeframe)
+        
+        stored = 0
+        if first is not None and since_ms < first:
+            stored += await self._backfill_range(symbol, timeframe, since_ms, first)
+        # Com histórico, continua do último candle (sem deixar lacuna até since_ms)
+        start = since_ms if last is None else last
+        stored += await self._backfill_range(symbol, timeframe, start, until_ms)
+        return stored
+    
+    async def _backfill_range(self, symbol: str, timeframe: str, start_ms: int, end_ms: int) -> int:
+        """
+        Baixa candles com abertura em [start_ms, end_ms) página a página
+        
+        Args:
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            start_ms: Abertura inicial (inclusiva)
+            end_ms: Abertura final (exclusiva)
+            
+        Returns:
+            Número de candles novos armazenados
+        """
+        interval_ms = timeframe_to_ms(timeframe)
+        cursor = start_ms
+        stored = 0
+        
+        while cursor < end_ms:
+            page = await self._fetch_ohlcv(symbol, timeframe, since=cursor, limit=MAX_FETCH_LIMIT)
+            full_page = len(page) == MAX_FETCH_LIMIT
+            page = [candle for candle in page if candle[0] < end_ms]
+            if not page:
+                break
+            
+            stored += self.history_store.append(symbol, timeframe, interval_ms, page)
+            cursor = page[-1][0] + interval_ms
+            if not full_page:
+                break
+        
+        return stored
+    
+    def get_history(self, symbol: str, timeframe: str, start_ms: int = None, end_ms: int = None) -> pd.DataFrame:
+        """
+        Lê candles do histórico local, sem acesso à rede
+        
+        Para leitura sem cópia use self.history_store.read(...).
+        
+        Args:
+            symbol: Par de trading (ex: 'BTC/USDT')
+            timeframe: Timeframe dos candles
+            start_ms: Abertura mínima (inclusiva)
+            end_ms: Abertura máxima (exclusiva)
+            
+        Returns:
+            DataFrame com os dados dos candles (timestamp, open, high, low, close, volume)
+        """
+        return self.history_store.read_dataframe(symbol, timeframe, start_ms, end_ms)
+    
     def get_last_candle_timestamps(self, df: pd.DataFrame) -> Tuple[str, str]:
         """
         Extrai e formata os timestamps do último candle (UTC e Brasília)
@@ -188,17 +537,60 @@ class CryptoService:
         
         return (timestamp_utc, timestamp_brt)
     
+    async def load_markets(self) -> int:
+        """
+        Carrega (ou recarrega) os mercados da exchange no índice em memória
+        
+        Returns:
+            Número de pares indexados
+        """
+        markets = await call_with_resilience(
+            lambda: self.exchange.load_markets(reload=self.market_index.loaded),
+            self.retry_policy,
+            self.circuit_breaker
+        )
+        self.market_index.load(markets)
+        return len(self.market_index)
+    
+    async def refresh_markets_periodically(self, interval: float):
+        """
+        Recarrega o índice de mercados em segundo plano (até ser cancelado)
+        
+        Falhas são apenas registradas: o índice anterior continua em uso.
+        
+        Args:
+            interval: Intervalo entre recargas (em segundos)
+        """
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                count = await self.load_markets()
+                print(f"🔄 Índice de mercados atualizado: {count} pares")
+            except Exception as e:
+                print(f"⚠️ Falha ao atualizar índice de mercados: {type(e).__name__} - {str(e)}")
+    
     def normalize_symbol(self, symbol: str) -> str:
         """
         Normaliza o símbolo da moeda para o formato esperado
         
+        Com o índice de mercados carregado, resolve em O(1) sem acesso à rede:
+        aceita 'BTC', 'BTC/BRL', 'btc-usdt' ou 'BTCFDUSD' e rejeita pares não listados.
+        Sem o índice, apenas adiciona /USDT.
+        
         Args:
             symbol: Símbolo da moeda (BTC, ETH, SOL)
             
         Returns:
             Símbolo normalizado (BTC/USDT, ETH/USDT, SOL/USDT)
+            
+        Raises:
+            SymbolNotListedError: Se o símbolo não estiver listado na exchange
+            ValueError: Se o símbolo for malformado
         """
-        symbol = symbol.upper()
+        if self.market_index.loaded:
+            return self.market_index.resolve(symbol)
+        
+        symbol = clean_symbol(symbol)
         
         # Se já está no formato correto, retorna
         if '/' in symbol:
@@ -207,10 +599,12 @@ class CryptoService:
         # Adiciona /USDT se não tiver
         return f"{symbol}/USDT"
     
-    def get_current_price(self, symbol: str) -> float:
+    async def get_current_price(self, symbol: str) -> float:
         """
         Busca o preço atual de uma criptomoeda com retry
         
+        Com o circuit breaker aberto, retorna o último preço conhecido do símbolo.
+        
         Args:
             symbol: Par de trading (ex: 'BTC/USDT')
             
@@ -220,37 +614,240 @@ class CryptoService:
         Raises:
             Exception: Se houver erro após todas as tentativas
         """
-        if not symbol or not isinstance(symbol, str):
-            raise ValueError("Símbolo inválido")
+        self._validate_symbol(symbol)
         
-        for attempt in range(self.max_retries):
-            try:
-                ticker = self.exchange.fetch_ticker(symbol)
-                
-                if not ticker or 'last' not in ticker:
-                    raise Exception(f"Dados de ticker inválidos para {symbol}")
-                
-                price = ticker['last']
-                
-                if price is None or price <= 0:
-                    raise Exception(f"Preço inválido para {symbol}: {price}")
-                
-                return float(price)
-                
-            except ccxt.NetworkError as e:
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay * (attempt + 1))
-                    continue
-                raise Exception(f"Erro de rede ao buscar preço de {symbol}: {str(e)}")
+        # Um snapshot recente de fetch_tickers (ver get_prices) já tem o preço
+        if self._tickers_fresh() and symbol in self._tickers:
+            price = self._ticker_price(self._tickers[symbol])
+            if price is not None:
+                return price
+        
+        try:
+            price = await self.single_flight.do(('ticker', symbol), lambda: self._fetch_price_with_retry(symbol))
+        except CircuitOpenError:
+            # Exchange indisponível: usa o último preço conhecido, se houver
+            if symbol not in self._last_prices:
+                raise
+            print(f"⚠️ Exchange indisponível: usando o último preço conhecido de {symbol}")
+            return self._last_prices[symbol]
+        
+        self._last_prices[symbol] = price
+        return price
+    
+    async def _fetch_price_with_retry(self, symbol: str) -> float:
+        """
+        Busca o último preço na exchange com retry assíncrono e circuit breaker
+        
+        Args:
+            symbol: Par de trading (ex: 'BTC/USDT')
             
-            except ccxt.ExchangeError as e:
-                raise Exception(f"Erro da exchange para {symbol}: {str(e)}")
+        Returns:
+            Preço atual
             
-            except Exception as e:
-                if attempt < self.max_retries - 1:
-                    time.sleep(self.retry_delay)
-                    continue
-                raise Exception(f"Erro ao buscar preço de {symbol}: {str(e)}")
+        Raises:
+            CircuitOpenError: Se o circuito da exchange estiver aberto
+        """
+        try:
+            ticker = await call_with_resilience(
+                lambda: self.exchange.fetch_ticker(symbol),
+                self.retry_policy,
+                self.circuit_breaker
+            )
+        except CircuitOpenError:
+            raise
+        except ccxt.NetworkError as e:
+            raise Exception(f"Erro de rede ao buscar preço de {symbol}: {str(e)}")
+        except ccxt.ExchangeError as e:
+            raise Exception(f"Erro da exchange para {symbol}: {str(e)}")
+        except Exception as e:
+            raise Exception(f"Erro ao buscar preço de {symbol}: {str(e)}")
+        
+        if not ticker or 'last' not in ticker:
+            raise Exception(f"Dados de ticker inválidos para {symbol}")
+        
+        price = ticker['last']
         
-        raise Exception(f"Erro ao buscar preço de {symbol} após {self.max_retries} tentativas")
+        if price is None or price <= 0:
+            raise Exception(f"Preço inválido para {symbol}: {price}")
+        
+        return float(price)
+    
+    async def get_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Busca o preço atual de vários pares com uma única chamada fetch_tickers
+        
+        O snapshot com os tickers de todos os pares é guardado por
+        settings.tickers_snapshot_ttl_seconds e compartilhado entre chamadores
+        (chamadas simultâneas são coalescidas), então a latência não cresce com o
+        tamanho da lista. Com o circuit breaker aberto, o último snapshot é usado.
+        
+        Args:
+            symbols: Pares de trading (ex: ['BTC/USDT', 'ETH/USDT'])
+            
+        Returns:
+            Dicionário {symbol: preço} (pares sem preço na exchange são omitidos)
+        """
+        for symbol in symbols:
+            self._validate_symbol(symbol)
+        
+        await self._ensure_tickers()
+        
+        prices = {}
+        for symbol in symbols:
+            price = self._ticker_price(self._tickers.get(symbol))
+            if price is not None:
+                prices[symbol] = price
+                self._last_prices[symbol] = price
+        return prices
+    
+    async def get_quote_volumes(self, symbols: List[str]) -> Dict[str, float]:
+        """
+        Volume negociado em 24h (na moeda de cotação) de vários pares
+        
+        Usa o mesmo snapshot de fetch_tickers de get_prices (uma chamada para todos).
+        
+        Args:
+            symbols: Pares de trading
+            
+        Returns:
+            Dicionário {symbol: volume} (pares sem ticker ficam com 0.0)
+        """
+        await self._ensure_tickers()
+        return {symbol: float((self._tickers.get(symbol) or {}).get('quoteVolume') or 0.0) for symbol in symbols}
+    
+    async def _ensure_tickers(self):
+        """Atualiza o snapshot de tickers se expirado (com o circuito aberto, usa o último)"""
+        if self._tickers_fresh():
+            return
+        try:
+            await self.single_flight.do(('tickers',), self._refresh_tickers)
+        except CircuitOpenError:
+            if not self._tickers:
+                raise
+            print("⚠️ Exchange indisponível: usando o último snapshot de preços")
+    
+    def _tickers_fresh(self) -> bool:
+        """Verifica se o snapshot de tickers ainda está dentro do TTL"""
+        if self._tickers_fetched_at is None:
+            return False
+        age_ms = self.exchange.milliseconds() - self._tickers_fetched_at
+        return age_ms < settings.tickers_snapshot_ttl_seconds * 1000
+    
+    @staticmethod
+    def _ticker_price(ticker: dict):
+        """Extrai o último preço de um ticker (None se ausente ou inválido)"""
+        price = ticker.get('last') if ticker else None
+        return float(price) if price is not None and price > 0 else None
+    
+    async def _refresh_tickers(self):
+        """
+        Substitui o snapshot de tickers por uma nova chamada fetch_tickers (todos os pares)
+        """
+        try:
+            tickers = await call_with_resilience(
+                lambda: self.exchange.fetch_tickers(),
+                self.retry_policy,
+                self.circuit_breaker
+            )
+        except CircuitOpenError:
+            raise
+        except ccxt.NetworkError as e:
+            raise Exception(f"Erro de rede ao buscar preços: {str(e)}")
+        except ccxt.ExchangeError as e:
+            raise Exception(f"Erro da exchange ao buscar preços: {str(e)}")
+        
+        self._tickers = tickers or {}
+        self._tickers_fetched_at = self.exchange.milliseconds()
+    
+    async def close(self):
+        """
+        Fecha a sessão HTTP da exchange (deve ser chamado no shutdown da aplicação)
+        """
+        await self.exchange.close()
+
 
+class SyncCryptoService:
+    """
+    Adaptador síncrono do CryptoService para scripts e testes fora do FastAPI
+    
+    Mantém um event loop privado, pois a sessão aiohttp da exchange fica
+    associada ao loop em que foi criada.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        """
+        Args:
+            *args, **kwargs: Repassados para o CryptoService
+        """
+        self._loop = asyncio.new_event_loop()
+        self._service = CryptoService(*args, **kwargs)
+    
+    def _run(self, coro):
+        return self._loop.run_until_complete(coro)
+    
+    def get_candles(self, symbol: str, timeframe: str = '1h', limit: int = 500) -> pd.DataFrame:
+        """Versão síncrona de CryptoService.get_candles"""
+        return self._run(self._service.get_candles(symbol, timeframe, limit))
+    
+    def get_multiple_timeframes(self, symbol: str, timeframes: List[str] = None,
+                                limit: Union[int, Dict[str, int]] = 500) -> Dict[str, pd.DataFrame]:
+        """Versão síncrona de CryptoService.get_multiple_timeframes"""
+        return self._run(self._service.get_multiple_timeframes(symbol, timeframes, limit))
+    
+    def get_current_price(self, symbol: str) -> float:
+        """Versão síncrona de CryptoService.get_current_price"""
+        return self._run(self._service.get_current_price(symbol))
+    
+    def get_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """Versão síncrona de CryptoService.get_prices"""
+        return self._run(self._service.get_prices(symbols))
+    
+    def backfill_history(self, symbol: str, timeframe: str, since_ms: int, until_ms: int = None) -> int:
+        """Versão síncrona de CryptoService.backfill_history"""
+        return self._run(self._service.backfill_history(symbol, timeframe, since_ms, until_ms))
+    
+    def load_markets(self) -> int:
+        """Versão síncrona de CryptoService.load_markets"""
+        return self._run(self._service.load_markets())
+    
+    def get_history(self, symbol: str, timeframe: str, start_ms: int = None, end_ms: int = None) -> pd.DataFrame:
+        """Ver CryptoService.get_history"""
+        return self._service.get_history(symbol, timeframe, start_ms, end_ms)
+    
+    def get_last_candle_timestamps(self, df: pd.DataFrame) -> Tuple[str, str]:
+        """Ver CryptoService.get_last_candle_timestamps"""
+        return self._service.get_last_candle_timestamps(df)
+    
+    def normalize_symbol(self, symbol: str) -> str:
+        """Ver CryptoService.normalize_symbol"""
+        return self._service.normalize_symbol(symbol)
+    
+    def close(self):
+        """Fecha a sessão da exchange e o event loop privado"""
+        if not self._loop.is_closed():
+            self._run(self._service.close())
+            self._loop.close()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+# Instância compartilhada pelas rotas, para que cache, buffers e single-flight
+# valham para todas as requisições do processo
+_shared_crypto_service = None
+
+
+def get_crypto_service() -> CryptoService:
+    """
+    Retorna a instância compartilhada do CryptoService (criada sob demanda)
+    
+    Returns:
+        CryptoService compartilhado
+    """
+    global _shared_crypto_service
+    if _shared_crypto_service is None:
+        _shared_crypto_service = CryptoService()
+    return _shared_crypto_service
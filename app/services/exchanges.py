@@ -0,0 +1,295 @@
+"""
+Backends de exchange plugáveis para o CryptoService
+
+- Qualquer id do ccxt (ex: 'binance'): exchange real via ccxt.async_support
+- 'replay': serve candles gravados em fixtures JSON (ver record_fixtures.py)
+- 'synthetic': gera preços determinísticos sem arquivos nem rede
+
+Os backends falsos imitam a interface usada do ccxt (fetch_ohlcv, fetch_ticker,
+fetch_tickers, load_markets, milliseconds, close) e permitem injetar latência e
+falhas, para testes e benchmarks reprodutíveis sem acesso à rede.
+"""
+import abc
+import asyncio
+import glob
+import json
+import math
+import os
+import random
+import time
+import zlib
+from typing import Dict, List, Optional
+
+import ccxt
+import ccxt.async_support as ccxt_async
+
+from app.config import settings
+from app.services.timeframes import TIMEFRAME_MINUTES, candle_open_time, timeframe_to_ms
+
+
+# Bases listadas pela exchange sintética (todas cotadas em USDT)
+SYNTHETIC_BASES = [
+    'BTC', 'ETH', 'BNB', 'SOL', 'XRP', 'ADA', 'DOGE', 'AVAX', 'DOT', 'LINK',
+    'MATIC', 'LTC', 'TRX', 'ATOM', 'UNI', 'XLM', 'NEAR', 'APT', 'ARB', 'OP',
+    'FIL', 'ICP', 'AAVE', 'INJ', 'SUI', 'SEI', 'TIA', 'RUNE', 'PEPE', 'SHIB'
+]
+
+
+class FakeExchange(abc.ABC):
+    """
+    Base dos backends falsos: latência, injeção de falhas e metadados de mercado
+
+    Subclasses implementam symbols, fetch_ohlcv e _ticker.
+    """
+
+    id = 'fake'
+    rateLimit = 50
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0, seed: int = None):
+        """
+        Args:
+            latency: Latência fixa por chamada (segundos)
+            jitter: Variação aleatória adicional da latência (segundos)
+            failure_rate: Probabilidade (0-1) de cada chamada falhar com ccxt.NetworkError
+            seed: Semente do gerador de falhas/jitter (reprodutibilidade)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self.calls: Dict[str, int] = {}
+
+    async def _simulate_network(self, method: str):
+        self.calls[method] = self.calls.get(method, 0) + 1
+        delay = self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if self.failure_rate and self._rng.random() < self.failure_rate:
+            raise ccxt.NetworkError(f"{self.id}: falha de rede injetada em {method}")
+
+    def milliseconds(self) -> int:
+        return int(time.time() * 1000)
+
+    @abc.abstractmethod
+    def symbols(self) -> List[str]:
+        """Pares listados pela exchange"""
+
+    async def load_markets(self, reload: bool = False) -> Dict[str, dict]:
+        await self._simulate_network('load_markets')
+        markets = {}
+        for symbol in self.symbols():
+            base, quote = symbol.split('/')
+            markets[symbol] = {
+                'id': base + quote,
+                'symbol': symbol,
+                'base': base,
+                'quote': quote,
+                'active': True,
+                'type': 'spot',
+                'spot': True,
+                'precision': {'amount': 5, 'price': 2},
+                'limits': {'amount': {'min': 0.00001}, 'cost': {'min': 5.0}}
+            }
+        return markets
+
+    @abc.abstractmethod
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = '1h', since: int = None, limit: int = None) -> List[list]:
+        """Candles [timestamp, open, high, low, close, volume] no formato do ccxt"""
+
+    async def fetch_ticker(self, symbol: str) -> dict:
+        await self._simulate_network('fetch_ticker')
+        return self._ticker(symbol)
+
+    async def fetch_tickers(self, symbols: List[str] = None) -> Dict[str, dict]:
+        await self._simulate_network('fetch_tickers')
+        return {symbol: self._ticker(symbol) for symbol in (symbols or self.symbols())}
+
+    @abc.abstractmethod
+    def _ticker(self, symbol: str) -> dict:
+        """Ticker de um par no formato do ccxt"""
+
+    def _check_symbol(self, symbol: str):
+        if symbol not in self.symbols():
+            raise ccxt.BadSymbol(f"{self.id} não possui o mercado {symbol}")
+
+    async def close(self):
+        pass
+
+
+class ReplayExchange(FakeExchange):
+    """Exchange que reproduz candles gravados em fixtures JSON"""
+
+    id = 'replay'
+
+    def __init__(self, fixtures_dir: str, now_ms: int = None, **kwargs):
+        """
+        Args:
+            fixtures_dir: Diretório com arquivos {exchange}_{BASE-QUOTE}_{timeframe}.json
+            now_ms: Relógio da replay (padrão: fim do último candle comum a todas as fixtures)
+            **kwargs: Latência e injeção de falhas (ver FakeExchange)
+        """
+        super().__init__(**kwargs)
+        self._candles: Dict[tuple, List[list]] = {}
+        for path in sorted(glob.glob(os.path.join(fixtures_dir, '*.json'))):
+            with open(path, encoding='utf-8') as f:
+                fixture = json.load(f)
+            self._candles[(fixture['symbol'], fixture['timeframe'])] = fixture['candles']
+
+        if not self._candles:
+            raise ValueError(f"Nenhuma fixture encontrada em {fixtures_dir}")
+
+        if now_ms is None:
+            now_ms = min(
+                candles[-1][0] + timeframe_to_ms(tf) - 1
+                for (_, tf), candles in self._candles.items() if candles
+            )
+        self.now_ms = now_ms
+
+    def milliseconds(self) -> int:
+        return self.now_ms
+
+    def symbols(self) -> List[str]:
+        return sorted({symbol for symbol, _ in self._candles})
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = '1h', since: int = None, limit: int = None) -> List[list]:
+        await self._simulate_network('fetch_ohlcv')
+        self._check_symbol(symbol)
+        candles = self._candles.get((symbol, timeframe))
+        if candles is None:
+            raise ccxt.BadRequest(f"replay: sem fixture de {symbol} {timeframe}")
+
+        visible = [c for c in candles if c[0] <= self.now_ms and (since is None or c[0] >= since)]
+        if limit is not None:
+            visible = visible[:limit] if since is not None else visible[-limit:]
+        return [list(c) for c in visible]
+
+    def _ticker(self, symbol: str) -> dict:
+        self._check_symbol(symbol)
+        timeframe = min(
+            (tf for s, tf in self._candles if s == symbol),
+            key=lambda tf: TIMEFRAME_MINUTES[tf]
+        )
+        last = [c for c in self._candles[(symbol, timeframe)] if c[0] <= self.now_ms][-1]
+        return {'symbol': symbol, 'timestamp': self.now_ms, 'last': last[4], 'close': last[4],
+                'quoteVolume': last[4] * last[5]}
+
+
+class SyntheticExchange(FakeExchange):
+    """Exchange com preços sintéticos determinísticos em função do tempo"""
+
+    id = 'synthetic'
+
+    def __init__(self, symbols: List[str] = None, volatility: float = 0.02, **kwargs):
+        """
+        Args:
+            symbols: Mercados listados (padrão: SYNTHETIC_BASES cotados em USDT)
+            volatility: Amplitude relativa das oscilações de preço
+            **kwargs: Latência e injeção de falhas (ver FakeExchange)
+        """
+        super().__init__(**kwargs)
+        self._symbols = symbols or [f"{base}/USDT" for base in SYNTHETIC_BASES]
+        self.volatility = volatility
+
+    def symbols(self) -> List[str]:
+        return self._symbols
+
+    @staticmethod
+    def _noise(symbol: str, timestamp_ms: int) -> float:
+        """Ruído determinístico em [-1, 1) derivado de (symbol, timestamp)"""
+        return zlib.crc32(f"{symbol}:{timestamp_ms}".encode()) / 2 ** 31 - 1.0
+
+    def price_at(self, symbol: str, timestamp_ms: int) -> float:
+        """
+        Preço contínuo do símbolo em um instante (mesmo valor em qualquer timeframe)
+
+        Args:
+            symbol: Par de trading
+            timestamp_ms: Instante em milissegundos
+
+        Returns:
+            Preço sintético
+        """
+        seed = zlib.crc32(symbol.encode())
+        base_price = 10 ** (1 + seed % 4) * (1 + (seed >> 8) % 9)
+        hours = timestamp_ms / 3_600_000
+        phase = (seed % 1000) / 1000 * 2 * math.pi
+        wave = (
+            math.sin(hours / 37 + phase) * 3
+            + math.sin(hours / 211 + 2 * phase) * 5
+            + math.sin(hours / 1499 + 3 * phase) * 8
+        )
+        return round(base_price * math.exp(self.volatility * wave), 6)
+
+    def _candle(self, symbol: str, timeframe: str, open_ms: int, now_ms: int) -> list:
+        interval = timeframe_to_ms(timeframe)
+        close_ms = min(open_ms + interval, now_ms)
+        open_ = self.price_at(symbol, open_ms)
+        close = self.price_at(symbol, close_ms)
+        spread = self.volatility * 0.25 * (1 + abs(self._noise(symbol, open_ms)))
+        high = max(open_, close) * (1 + spread * (close_ms - open_ms) / interval)
+        low = min(open_, close) * (1 - spread * (close_ms - open_ms) / interval)
+        volume = 1000 * (1.5 + self._noise(symbol, open_ms + 1)) * (close_ms - open_ms) / 3_600_000
+        return [open_ms, open_, round(high, 6), round(low, 6), close, round(volume, 5)]
+
+    async def fetch_ohlcv(self, symbol: str, timeframe: str = '1h', since: int = None, limit: int = None) -> List[list]:
+        await self._simulate_network('fetch_ohlcv')
+        self._check_symbol(symbol)
+        interval = timeframe_to_ms(timeframe)
+        now = self.milliseconds()
+        limit = limit or 500
+        current = candle_open_time(now, timeframe)
+
+        if since is None:
+            first = current - (limit - 1) * interval
+        else:
+            first = candle_open_time(since, timeframe)
+            if first < since:
+                first += interval
+
+        opens = range(first, min(current, first + (limit - 1) * interval) + 1, interval)
+        return [self._candle(symbol, timeframe, open_ms, now) for open_ms in opens]
+
+    def _ticker(self, symbol: str) -> dict:
+        self._check_symbol(symbol)
+        now = self.milliseconds()
+        price = self.price_at(symbol, now)
+        return {'symbol': symbol, 'timestamp': now, 'last': price, 'close': price,
+                'quoteVolume': price * 24000 * (1.5 + self._noise(symbol, 0))}
+
+
+def create_exchange(name: Optional[str] = None):
+    """
+    Cria o backend de exchange configurado
+
+    Args:
+        name: 'replay', 'synthetic' ou um id do ccxt (padrão: settings.exchange_name)
+
+    Returns:
+        Instância da exchange (ccxt.async_support ou backend falso)
+
+    Raises:
+        ValueError: Se a exchange não existir
+    """
+    name = (name or settings.exchange_name).lower()
+    fake_options = {
+        'latency': settings.fake_exchange_latency_ms / 1000,
+        'jitter': settings.fake_exchange_jitter_ms / 1000,
+        'failure_rate': settings.fake_exchange_failure_rate,
+        'seed': settings.fake_exchange_seed
+    }
+
+    if name == 'replay':
+        return ReplayExchange(settings.replay_fixtures_dir, **fake_options)
+    if name == 'synthetic':
+        return SyntheticExchange(**fake_options)
+
+    exchange_class = getattr(ccxt_async, name, None)
+    if exchange_class is None:
+        raise ValueError(f"Exchange desconhecida: {name}")
+    return exchange_class({
+        'enableRateLimit': True,
+        'timeout': 10000,  # 10 segundos de timeout
+        'options': {
+            'defaultType': settings.exchange_type
+        }
+    })
@@ -0,0 +1,249 @@
+"""
+Pools de execução para tirar trabalho bloqueante do event loop
+
+- Pool de processos ('cpu'): cálculo de indicadores, score e preparação do gráfico;
+  escala entre núcleos e não disputa o GIL com o event loop
+- Pool de threads ('io'): chamadas de I/O bloqueantes (ex: SDK síncrono da IA)
+
+Cada pool tem fila limitada: com todos os workers ocupados e a fila cheia, a
+chamada falha na hora (ExecutorSaturatedError -> 503) em vez de acumular
+requisições. A vaga só é liberada quando a tarefa termina no worker (ou é
+cancelada antes de começar), mesmo que a requisição tenha sido cancelada antes. Desligados (ou com 0 workers), as funções rodam direto no event loop.
+"""
+import asyncio
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from app.config import settings
+
+
+PROCESS = 'process'
+THREAD = 'thread'
+
+
+class ExecutorSaturatedError(Exception):
+    """Chamada rejeitada porque o pool e a sua fila estão cheios"""
+
+    def __init__(self, name: str, capacity: int):
+        self.name = name
+        self.capacity = capacity
+        super().__init__(f"Pool {name} ocupado ({capacity} tarefas em execução ou na fila)")
+
+
+class ManagedExecutor:
+    """Pool de processos ou threads com fila limitada e métricas"""
+
+    def __init__(self, name: str, kind: str = THREAD, max_workers: int = 4, max_queue: int = 64,
+                 enabled: bool = True):
+        """
+        Args:
+            name: Nome do pool (usado nas mensagens e métricas)
+            kind: 'process' ou 'thread'
+            max_workers: Número de workers (0 = roda no event loop)
+            max_queue: Tarefas que podem aguardar um worker livre
+            enabled: Se False, as funções rodam direto no event loop
+
+        Raises:
+            ValueError: Se o tipo de pool for desconhecido
+        """
+        if kind not in (PROCESS, THREAD):
+            raise ValueError(f"Tipo de pool desconhecido: {kind}")
+        self.name = name
+        self.kind = kind
+        self.max_workers = max(0, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.enabled = enabled and self.max_workers > 0
+        self._executor: Optional[Executor] = None
+        # Os contadores também são atualizados pelos callbacks das tarefas (outra thread)
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.rejected = 0
+        self.restarts = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    @property
+    def capacity(self) -> int:
+        """Tarefas simultâneas aceitas (workers + fila)"""
+        return self.max_workers + self.max_queue
+
+    def _get_executor(self) -> Executor:
+        # Criado sob demanda; processos usam 'spawn' (fork com event loop e threads ativos não é seguro)
+        if self._executor is None:
+            if self.kind == PROCESS:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=self.name)
+        return self._executor
+
+    async def run(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Executa fn(*args) no pool sem bloquear o event loop
+
+        No pool de processos, fn, argumentos e resultado precisam ser serializáveis
+        (funções definidas no nível do módulo).
+
+        Args:
+            fn: Função a executar
+            *args: Argumentos posicionais
+
+        Returns:
+            Resultado de fn
+
+        Raises:
+            ExecutorSaturatedError: Se todos os workers e a fila estiverem ocupados
+        """
+        if not self.enabled:
+            return fn(*args)
+
+        with self._lock:
+            if self.in_flight >= self.capacity:
+                self.rejected += 1
+                raise ExecutorSaturatedError(self.name, self.capacity)
+            self.in_flight += 1
+            self.submitted += 1
+
+        started = time.perf_counter()
+        try:
+            try:
+                future = self._get_executor().submit(fn, *args)
+            except BaseException:
+                self._release(started)
+                raise
+            # A vaga é liberada quando a tarefa termina no worker, não quando a requisição
+            # desiste: cancelar a espera só cancela a tarefa se ela ainda estiver na fila
+            future.add_done_callback(lambda done: self._release(started, done))
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            # Um worker morreu: descarta o pool (o próximo pedido cria outro)
+            self.restarts += 1
+            print(f"⚠️ Pool {self.name} quebrado, será recriado no próximo pedido")
+            self._discard_executor()
+            raise
+
+    def _release(self, started: float, future: Optional[Future] = None):
+        """Libera a vaga de uma tarefa e registra o resultado (chamado em qualquer thread)"""
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.in_flight -= 1
+            if future is not None and future.cancelled():
+                self.cancelled += 1
+            elif future is None or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+            self.total_seconds += elapsed
+            self.max_seconds = max(self.max_seconds, elapsed)
+
+    async def warm_up(self, *modules: str):
+        """
+        Inicia os workers antes do primeiro pedido (o spawn de processos leva ~1s)
+
+        Args:
+            *modules: Módulos a importar em cada worker (ex: 'app.services.analysis_tasks')
+        """
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        await asyncio.gather(*(
+            loop.run_in_executor(executor, _import_modules, modules) for _ in range(self.max_workers)
+        ))
+
+    def _discard_executor(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def shutdown(self):
+        """Encerra os workers (tarefas na fila são canceladas)"""
+        self._discard_executor()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna métricas do pool
+
+        Returns:
+            Dicionário com configuração, tarefas em execução/na fila e contadores
+        """
+        finished = self.completed + self.failed
+        return {
+            'name': self.name,
+            'kind': self.kind,
+            'enabled': self.enabled,
+            'max_workers': self.max_workers,
+            'max_queue': self.max_queue,
+            'running': min(self.in_flight, self.max_workers),
+            'queued': max(0, self.in_flight - self.max_workers),
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'cancelled': self.cancelled,
+            'rejected': self.rejected,
+            'restarts': self.restarts,
+            'avg_seconds': self.total_seconds / finished if finished else 0.0,
+            'max_seconds': self.max_seconds
+        }
+
+
+def _import_modules(modules):
+    # Executado em cada worker por warm_up()
+    for module in modules:
+        importlib.import_module(module)
+
+
+# Pools compartilhados pelas rotas (criados sob demanda)
+_shared_pools: Dict[str, ManagedExecutor] = {}
+
+
+def get_cpu_pool() -> ManagedExecutor:
+    """
+    Retorna o pool de processos compartilhado (indicadores, score, gráfico)
+
+    Returns:
+        ManagedExecutor de processos configurado em settings
+    """
+    if 'cpu' not in _shared_pools:
+        _shared_pools['cpu'] = ManagedExecutor(
+            'cpu', PROCESS,
+            max_workers=settings.cpu_pool_workers or os.cpu_count() or 1,
+            max_queue=settings.cpu_pool_queue,
+            enabled=settings.executor_pools_enabled
+        )
+    return _shared_pools['cpu']
+
+
+def get_io_pool() -> ManagedExecutor:
+    """
+    Retorna o pool de threads compartilhado (I/O bloqueante)
+
+    Returns:
+        ManagedExecutor de threads configurado em settings
+    """
+    if 'io' not in _shared_pools:
+        _shared_pools['io'] = ManagedExecutor(
+            'io', THREAD,
+            max_workers=settings.io_pool_workers,
+            max_queue=settings.io_pool_queue,
+            enabled=settings.executor_pools_enabled
+        )
+    return _shared_pools['io']
+
+
+def shutdown_pools():
+    """Encerra todos os pools compartilhados"""
+    for pool in _shared_pools.values():
+        pool.shutdown()
+    _shared_pools.clear()
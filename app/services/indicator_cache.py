@@ -0,0 +1,196 @@
+"""
+Cache de resultados de indicadores
+
+As saídas são memorizadas por (symbol, timeframe, especificação do indicador,
+timestamp do último candle, impressão digital dos dados). Candles fechados não
+mudam, então a impressão digital só precisa cobrir o tamanho e as bordas da
+janela e os valores do candle em formação: requisições repetidas dentro do mesmo
+candle (com o mesmo preço em formação) são hits.
+
+O cache é LRU, limitado por número de entradas e por memória estimada.
+"""
+import copy
+import sys
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.candle_buffer import OHLCV_COLUMNS
+from app.services.timeframes import to_epoch_ms
+
+
+def data_fingerprint(df: pd.DataFrame) -> int:
+    """
+    Impressão digital O(1) de uma janela de candles
+
+    Args:
+        df: DataFrame ordenado com colunas timestamp, open, high, low, close, volume
+
+    Returns:
+        Hash de (tamanho, primeiro e último timestamp, OHLCV do último candle)
+    """
+    if df is None or df.empty:
+        return 0
+    edges = to_epoch_ms(df['timestamp'].iloc[[0, -1]])
+    last = df[OHLCV_COLUMNS].iloc[-1].to_numpy(dtype=np.float64)
+    return hash((len(df), int(edges[0]), int(edges[1]), last.tobytes()))
+
+
+def estimate_size(value: Any) -> int:
+    """Estimativa (bytes) da memória ocupada por um resultado em cache"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(index=True, deep=False)))
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class IndicatorCache:
+    """Cache LRU de saídas de indicadores com limite de entradas e de memória"""
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024, enabled: bool = True):
+        """
+        Args:
+            max_entries: Número máximo de resultados mantidos
+            max_bytes: Memória máxima estimada (bytes)
+            enabled: Se False, todo pedido recalcula o resultado
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        # (symbol, timeframe, spec) -> ((último timestamp, impressão digital), resultado, bytes)
+        self._entries: "OrderedDict[Tuple, Tuple[Tuple, Any, int]]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(symbol: str, timeframe: str, spec: Hashable, df: pd.DataFrame) -> Tuple:
+        """
+        Monta a chave de um resultado
+
+        Args:
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            spec: Especificação do indicador (ex: 'indicators', ('ema', (9, 21, 200)))
+            df: Janela de candles usada no cálculo
+
+        Returns:
+            Tupla (symbol, timeframe, spec, timestamp do último candle, impressão digital)
+        """
+        last_ts = int(to_epoch_ms(df['timestamp'].iloc[[-1]])[0]) if df is not None and not df.empty else None
+        return (symbol, timeframe, spec, last_ts, data_fingerprint(df))
+
+    def get_or_compute(self, symbol: str, timeframe: str, spec: Hashable, df: pd.DataFrame,
+                       compute: Callable[[], Any]) -> Any:
+        """
+        Retorna o resultado em cache ou calcula e armazena
+
+        Cada (symbol, timeframe, spec) guarda só o resultado mais recente: quando
+        o último candle ou o candle em formação mudam, a entrada é substituída.
+        O valor devolvido é uma cópia, para que o chamador possa alterá-lo.
+
+        Args:
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            spec: Especificação do indicador
+            df: Janela de candles usada no cálculo
+            compute: Função sem argumentos que calcula o resultado
+
+        Returns:
+            Resultado de compute() (memorizado)
+        """
+        if not self.enabled:
+            return compute()
+
+        series_key, version, entry = self._lookup(symbol, timeframe, spec, df)
+        if entry is not None:
+            return copy.deepcopy(entry[1])
+
+        value = compute()
+        self._put(series_key, version, value)
+        return copy.deepcopy(value)
+
+    async def get_or_compute_async(self, symbol: str, timeframe: str, spec: Hashable, df: pd.DataFrame,
+                                   compute: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Versão assíncrona de get_or_compute (ex: cálculo em um pool de processos)
+
+        Args:
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            spec: Especificação do indicador
+            df: Janela de candles usada no cálculo
+            compute: Função sem argumentos que devolve um awaitable com o resultado
+
+        Returns:
+            Resultado de compute() (memorizado)
+        """
+        if not self.enabled:
+            return await compute()
+
+        series_key, version, entry = self._lookup(symbol, timeframe, spec, df)
+        if entry is not None:
+            return copy.deepcopy(entry[1])
+
+        value = await compute()
+        self._put(series_key, version, value)
+        return copy.deepcopy(value)
+
+    def _lookup(self, symbol: str, timeframe: str, spec: Hashable, df: pd.DataFrame) -> Tuple:
+        # Retorna (chave da série, versão, entrada válida ou None) e contabiliza hit/miss
+        key = self.make_key(symbol, timeframe, spec, df)
+        series_key, version = key[:3], key[3:]
+        entry = self._entries.get(series_key)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(series_key)
+            self.hits += 1
+            return series_key, version, entry
+        self.misses += 1
+        return series_key, version, None
+
+    def _put(self, series_key: Tuple, version: Tuple, value: Any):
+        previous = self._entries.pop(series_key, None)
+        if previous is not None:
+            self.bytes -= previous[2]
+
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        self._entries[series_key] = (version, value, size)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        """Remove todos os resultados"""
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas de uso do cache
+
+        Returns:
+            Dicionário com tamanho, memória estimada, hits, misses e evictions
+        """
+        return {
+            'enabled': self.enabled,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+            'bytes': self.bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
@@ -0,0 +1,849 @@
+"""
+Kernel NumPy fundido para os indicadores do IndicatorService
+
+Uma única passada sobre arrays float64 contíguos calcula todos os indicadores,
+compartilhando os intermediários que as chamadas separadas do pandas_ta refazem:
+o RSI do Stochastic RSI, o true range do ATR e do ADX e as EMAs 12/26 do MACD.
+
+As recorrências (EMA e RMA) são resolvidas de forma vetorizada em blocos com
+somas acumuladas escaladas, e indicadores de janela só olham a última janela.
+As fórmulas são as mesmas do pandas_ta (ver streaming_indicators.py).
+
+Tudo opera sobre matrizes (símbolos × candles) ao longo do eixo do tempo, então
+um screening de centenas de pares é uma única passada vetorizada. Históricos de
+tamanhos diferentes são alinhados à direita (último candle na última coluna) e
+completados com NaN à esquerda; a máscara de NaN define o início de cada série.
+
+Cada indicador é um nó de um grafo de dependências (INDICATOR_GRAPH). Pedidos
+seletivos avaliam só os nós necessários, em ordem de dependência; um indicador
+novo é só mais um nó registrado com @indicator_node.
+"""
+import math
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.indicator_params import DEFAULT_PARAMS, EMA_SLOTS, IndicatorParams
+from app.services.streaming_indicators import EPSILON, INDICATOR_LAYOUT, MIN_CANDLES, format_indicators
+
+
+# Campos calculados pelo kernel (mesmos nomes da resposta da API)
+KERNEL_FIELDS = tuple(name for fields in INDICATOR_LAYOUT.values() for name, _ in fields)
+
+# Tamanho máximo dos blocos da recorrência linear (limita decay^-bloco)
+RECURRENCE_BLOCK = 256
+
+
+class IndicatorResult:
+    """Valores dos indicadores no último candle (NaN quando não há candles suficientes)"""
+
+    __slots__ = KERNEL_FIELDS
+
+    def __init__(self, **values: float):
+        for name in KERNEL_FIELDS:
+            setattr(self, name, values.get(name, math.nan))
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        """Dicionário plano {indicador: valor} (NaN vira None)"""
+        return {name: None if math.isnan(getattr(self, name)) else getattr(self, name) for name in KERNEL_FIELDS}
+
+    def to_indicators(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Formato de resposta do IndicatorService.get_indicators (por categoria, arredondado)"""
+        return format_indicators(self.to_dict())
+
+
+def linear_recurrence(x: np.ndarray, decay: float, initial=0.0) -> np.ndarray:
+    """
+    Resolve y[t] = decay * y[t-1] + x[t] sem laço por elemento (ao longo do último eixo)
+
+    Dentro de cada bloco, y[j] = decay^(j+1) * (y0 + cumsum(x[k] * decay^-(k+1))).
+    Os blocos limitam decay^-k para manter a precisão de float64. Com decay = 0
+    (período 1), y = x.
+
+    Args:
+        x: Entradas da recorrência (1-D ou 2-D com uma série por linha)
+        decay: Fator de decaimento (0 <= decay < 1), escalar ou um por linha
+        initial: Valor de y antes do primeiro elemento (escalar ou um por linha)
+
+    Returns:
+        Array com y[t] para cada t, no formato de x
+    """
+    n = x.shape[-1]
+    y = np.empty(x.shape, dtype=np.float64)
+    if n == 0:
+        return y
+
+    decay = np.asarray(decay, dtype=np.float64)
+    memoryless = decay <= 0
+    if memoryless.all():
+        y[...] = x
+        return y
+    if memoryless.any():
+        # Linhas sem memória: calculadas com um decaimento qualquer e substituídas no fim
+        decay = np.where(memoryless, 0.5, decay)
+
+    # O bloco é limitado pelo menor decaimento (o que cresce mais rápido em decay^-k)
+    block = max(1, min(RECURRENCE_BLOCK, int(200 / -math.log(decay.min()))))
+    powers = decay[..., None] ** np.arange(1, block + 1, dtype=np.float64)
+    carry = np.asarray(initial, dtype=np.float64)
+    for start in range(0, n, block):
+        chunk = x[..., start:start + block]
+        width = chunk.shape[-1]
+        p = powers[..., :width]
+        y[..., start:start + width] = p * (carry[..., None] + np.cumsum(chunk / p, axis=-1))
+        carry = y[..., start + width - 1]
+    if memoryless.any():
+        y = np.where(memoryless[..., None], x, y)
+    return y
+
+
+def _as_matrix(x: np.ndarray) -> np.ndarray:
+    return x[None, :] if x.ndim == 1 else x
+
+
+def _zero_nan(x: np.ndarray) -> np.ndarray:
+    return np.where(np.isnan(x), 0.0, x)
+
+
+def first_valid_index(x: np.ndarray) -> np.ndarray:
+    """
+    Índice do primeiro valor não-NaN de cada linha (número de colunas se não houver)
+
+    Args:
+        x: Matriz (símbolos × candles)
+
+    Returns:
+        Array int com um índice por linha
+    """
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=-1), valid.argmax(axis=-1), x.shape[-1])
+
+
+def _seeded_ema(values: np.ndarray, prefix: np.ndarray, length: np.ndarray, start: np.ndarray) -> np.ndarray:
+    """EMA de matrizes sem NaN a partir das somas de prefixo (compartilháveis entre períodos)"""
+    rows, n = values.shape
+    seed_at = start + length - 1
+    has_seed = seed_at < n
+    columns = np.arange(n)
+
+    # Semente: média dos `length` primeiros valores válidos de cada linha
+    seeds = prefix[np.arange(rows), np.minimum(seed_at, n - 1)] / length
+
+    alpha = 2.0 / (length + 1)
+    inputs = np.where(columns > seed_at[:, None], alpha[..., None] * values, 0.0)
+    inputs[has_seed, seed_at[has_seed]] = seeds[has_seed]
+    out = linear_recurrence(inputs, 1.0 - alpha)
+    out[columns < seed_at[:, None]] = np.nan
+    out[~has_seed] = np.nan
+    return out
+
+
+def ema(x: np.ndarray, length, start: np.ndarray = None) -> np.ndarray:
+    """
+    EMA com semente SMA dos primeiros `length` valores (pandas_ta: sma=True, adjust=False)
+
+    Args:
+        x: Valores (1-D ou matriz com uma série por linha)
+        length: Período (escalar ou um por linha)
+        start: Primeiro índice válido de cada linha (padrão: 0)
+
+    Returns:
+        EMA no formato de x (NaN antes da semente)
+    """
+    matrix = _as_matrix(x)
+    start = np.zeros(matrix.shape[0], dtype=np.int64) if start is None else np.asarray(start)
+    values = _zero_nan(matrix)
+    out = _seeded_ema(values, np.cumsum(values, axis=-1), np.asarray(length), start)
+    return out if x.ndim == 2 else out[0]
+
+
+def rma(x: np.ndarray, length, start: np.ndarray = None) -> np.ndarray:
+    """
+    Média de Wilder: ewm(alpha=1/length, adjust=True, min_periods=length)
+
+    Args:
+        x: Valores (1-D ou matriz); os anteriores a `start` são ignorados, como NaN iniciais
+        length: Período (escalar ou um por linha)
+        start: Primeiro índice válido de cada linha (padrão: 0)
+
+    Returns:
+        RMA no formato de x (NaN antes de `length` valores)
+    """
+    matrix = _as_matrix(x)
+    rows, n = matrix.shape
+    start = np.zeros(rows, dtype=np.int64) if start is None else np.asarray(start)
+    columns = np.arange(n)
+    active = columns >= start[:, None]
+
+    length = np.asarray(length, dtype=np.float64)
+    decay = 1.0 - 1.0 / length
+    count = np.where(active, columns - start[:, None] + 1, 0)
+    weights = (1.0 - decay[..., None] ** count) / (1.0 - decay[..., None])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        out = linear_recurrence(np.where(active, _zero_nan(matrix), 0.0), decay) / weights
+    out[count < length[..., None]] = np.nan
+    return out if x.ndim == 2 else out[0]
+
+
+def _sliding(x: np.ndarray, length: int) -> np.ndarray:
+    return np.lib.stride_tricks.sliding_window_view(x, length, axis=-1)
+
+
+# Grafo de dependências: nó -> (dependências, função). Os nós de saída têm os
+# nomes de KERNEL_FIELDS e devolvem um valor por linha; os demais são
+# intermediários compartilhados (séries completas ou None sem candles suficientes).
+INDICATOR_GRAPH: Dict[str, Tuple[Tuple[str, ...], Callable]] = {}
+
+# Aquecimento de cada nó: (params, tolerância) -> candles que o nó acrescenta às
+# suas dependências (None = depende do histórico inteiro, ex: OBV)
+NODE_WARMUP: Dict[str, Callable[[IndicatorParams, float], Optional[int]]] = {}
+
+
+def decay_steps(decay: float, tolerance: float) -> int:
+    """
+    Candles até o peso do estado inicial de uma recorrência cair abaixo da tolerância
+
+    Args:
+        decay: Fator de decaimento por candle (ex: 1 - 2/(n+1) na EMA, 1 - 1/n na RMA)
+        tolerance: Peso residual máximo aceito (ex: 0.05)
+
+    Returns:
+        Menor k com decay^k <= tolerance
+    """
+    return int(math.ceil(math.log(tolerance) / math.log(decay)))
+
+
+def ema_warmup(length: int, tolerance: float) -> int:
+    """Candles para uma EMA com semente SMA convergir (semente + decaimento)"""
+    return length + decay_steps(1.0 - 2.0 / (length + 1), tolerance)
+
+
+def rma_warmup(length: int, tolerance: float) -> int:
+    """Candles para uma média de Wilder convergir"""
+    return length + decay_steps(1.0 - 1.0 / length, tolerance)
+
+
+def indicator_node(name: str, *deps: str, warmup: Callable[[IndicatorParams, float], Optional[int]] = None):
+    """
+    Registra um nó do grafo de indicadores
+
+    A função recebe o contexto (matrizes OHLCV, `start`, `rows`, `n`, `params`,
+    `span`) seguido dos valores das dependências, na ordem declarada. Nós de saída
+    devolvem as últimas `span` colunas (1 no valor atual, n na série completa).
+
+    Args:
+        name: Nome do nó (indicador da resposta ou intermediário)
+        *deps: Nós que precisam ser avaliados antes
+        warmup: Candles que o nó exige além das dependências, em função dos
+            parâmetros e da tolerância (padrão: nenhum)
+    """
+    def register(fn: Callable) -> Callable:
+        INDICATOR_GRAPH[name] = (deps, fn)
+        NODE_WARMUP[name] = warmup or (lambda params, tolerance: 0)
+        return fn
+    return register
+
+
+def evaluation_order(fields: Iterable[str] = None) -> List[str]:
+    """
+    Nós necessários para os campos pedidos, em ordem de dependência
+
+    Args:
+        fields: Indicadores desejados (padrão: todos de KERNEL_FIELDS)
+
+    Returns:
+        Lista de nós (dependências antes de quem as usa), sem repetição
+
+    Raises:
+        ValueError: Se algum campo não existir no grafo
+    """
+    order: List[str] = []
+    visited = set()
+
+    def visit(name: str):
+        if name in visited:
+            return
+        if name not in INDICATOR_GRAPH:
+            raise ValueError(f"Indicador desconhecido: {name}")
+        visited.add(name)
+        for dep in INDICATOR_GRAPH[name][0]:
+            visit(dep)
+        order.append(name)
+
+    for name in (KERNEL_FIELDS if fields is None else fields):
+        visit(name)
+    return order
+
+
+def required_candles(fields: Iterable[str] = None, params: IndicatorParams = DEFAULT_PARAMS,
+                     tolerance: float = 0.05) -> Optional[int]:
+    """
+    Candles necessários para que os campos pedidos estejam aquecidos
+
+    O aquecimento de um nó é o dele somado ao da dependência mais exigente (o
+    caminho mais longo do grafo). Nas recorrências, a tolerância é o peso
+    residual máximo do estado inicial no último valor.
+
+    Args:
+        fields: Indicadores desejados (padrão: todos)
+        params: Períodos dos indicadores
+        tolerance: Peso residual máximo aceito (0 < tolerance < 1)
+
+    Returns:
+        Número de candles (pelo menos MIN_CANDLES) ou None se algum campo depende
+        do histórico inteiro
+
+    Raises:
+        ValueError: Se algum campo não existir ou a tolerância for inválida
+    """
+    if not 0 < tolerance < 1:
+        raise ValueError("Tolerância deve estar entre 0 e 1")
+
+    needed: Dict[str, Optional[int]] = {}
+    for name in evaluation_order(fields):
+        own = NODE_WARMUP[name](params, tolerance)
+        deps = [needed[dep] for dep in INDICATOR_GRAPH[name][0]]
+        if own is None or None in deps:
+            needed[name] = None
+        else:
+            needed[name] = own + max(deps, default=0)
+
+    outputs = [needed[name] for name in (KERNEL_FIELDS if fields is None else fields)]
+    if None in outputs:
+        return None
+    return max(outputs + [MIN_CANDLES])
+
+
+def select_fields(fields: Iterable[str] = None, categories: Iterable[str] = None) -> Tuple[str, ...]:
+    """
+    Resolve um seletor de indicadores (nomes e/ou categorias) para campos do kernel
+
+    Nomes e categorias não diferenciam maiúsculas de minúsculas.
+
+    Args:
+        fields: Nomes de indicadores (ex: ['RSI', 'ema9'])
+        categories: Categorias de INDICATOR_LAYOUT (ex: ['trend', 'price'])
+
+    Returns:
+        Campos selecionados na ordem de KERNEL_FIELDS (todos se nada for pedido)
+
+    Raises:
+        ValueError: Se algum nome ou categoria não existir
+    """
+    if not fields and not categories:
+        return KERNEL_FIELDS
+
+    by_name = {name.lower(): name for name in KERNEL_FIELDS}
+    selected = set()
+    for category in categories or ():
+        layout = INDICATOR_LAYOUT.get(category.strip().lower())
+        if layout is None:
+            raise ValueError(f"Categoria desconhecida: {category}")
+        selected.update(name for name, _ in layout)
+    for field in fields or ():
+        name = by_name.get(field.strip().lower())
+        if name is None:
+            raise ValueError(f"Indicador desconhecido: {field}")
+        selected.add(name)
+    return tuple(name for name in KERNEL_FIELDS if name in selected)
+
+
+def mask_indicators(indicators: Dict[str, Dict[str, Any]], fields: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Mantém só os campos selecionados de um resultado por categoria (os demais viram None)
+
+    Args:
+        indicators: Indicadores no formato de format_indicators
+        fields: Campos a manter
+
+    Returns:
+        Novo dicionário no mesmo formato
+    """
+    keep = set(fields)
+    return {
+        category: {name: (value if name in keep else None) for name, value in values.items()}
+        for category, values in indicators.items()
+    }
+
+
+def _tail(series: Optional[np.ndarray], ctx) -> np.ndarray:
+    """Últimas `span` colunas de uma série, alinhadas à direita (NaN onde não há valor)"""
+    rows, span = ctx['rows'], ctx['span']
+    out = np.full((rows, span), np.nan)
+    if series is None:
+        return out
+    width = min(span, series.shape[-1])
+    if width:
+        out[:, span - width:] = series[:, series.shape[-1] - width:]
+    return out
+
+
+def _rolling_mean(x: Optional[np.ndarray], length: int, ctx) -> np.ndarray:
+    """Médias móveis das últimas `span` janelas de x (NaN se a janela tiver NaN)"""
+    if x is None or x.shape[-1] < length:
+        return _tail(None, ctx)
+    recent = x[:, -(ctx['span'] + length - 1):]
+    return _tail(_sliding(recent, length).mean(axis=-1), ctx)
+
+
+# ========== INTERMEDIÁRIOS COMPARTILHADOS ==========
+# A diferença i compara os candles i e i+1, então a primeira diferença válida
+# também está no índice `start`.
+
+@indicator_node('change', warmup=lambda p, t: 1)
+def _change(ctx):
+    return np.diff(ctx['close'], axis=-1)
+
+
+@indicator_node('true_range', warmup=lambda p, t: 1)
+def _true_range(ctx):
+    high, low, prev_close = ctx['high'][:, 1:], ctx['low'][:, 1:], ctx['close'][:, :-1]
+    return np.fmax.reduce([high - low, np.abs(high - prev_close), np.abs(prev_close - low)])
+
+
+def _rsi(change: np.ndarray, length, start: np.ndarray) -> np.ndarray:
+    gain = rma(np.maximum(change, 0.0), length, start)
+    loss = rma(np.maximum(-change, 0.0), length, start)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100.0 * gain / (gain + loss)
+
+
+@indicator_node('atr_series', 'true_range', warmup=lambda p, t: rma_warmup(p.atr_period, t))
+def _atr_series(ctx, true_range):
+    return rma(true_range, ctx['params'].atr_period, ctx['start'])
+
+
+@indicator_node('rsi_series', 'change', warmup=lambda p, t: rma_warmup(p.rsi_period, t))
+def _rsi_series(ctx, change):
+    return _rsi(change, ctx['params'].rsi_period, ctx['start'])
+
+
+@indicator_node('stoch_k_series', 'rsi_series', warmup=lambda p, t: p.stoch_rsi_length + p.stoch_k - 2)
+def _stoch_k_series(ctx, rsi_series):
+    # Stochastic RSI: só as janelas de RSI das últimas `span` saídas (e da média D) são necessárias
+    params = ctx['params']
+    length, k, d = params.stoch_rsi_length, params.stoch_k, params.stoch_d
+    recent_rsi = rsi_series[:, -(length + k + d - 3 + ctx['span']):]
+    if recent_rsi.shape[-1] < length:
+        return None
+    windows = _sliding(recent_rsi, length)
+    lowest, highest = windows.min(axis=-1), windows.max(axis=-1)
+    span = highest - lowest
+    with np.errstate(invalid='ignore'):
+        stoch = 100.0 * (recent_rsi[:, length - 1:] - lowest) / np.where(span == 0, EPSILON, span)
+    if stoch.shape[-1] < k:
+        return None
+    return _sliding(stoch, k).mean(axis=-1)
+
+
+@indicator_node('macd_series', warmup=lambda p, t: ema_warmup(p.macd_slow, t))
+def _macd_series(ctx):
+    params = ctx['params']
+    if ctx['n'] < params.macd_slow:
+        return None
+    return ema(ctx['close'], params.macd_fast, ctx['start']) - ema(ctx['close'], params.macd_slow, ctx['start'])
+
+
+@indicator_node('bollinger', warmup=lambda p, t: p.bb_period)
+def _bollinger(ctx):
+    params = ctx['params']
+    length = params.bb_period
+    if ctx['n'] < length:
+        return None
+    windows = _sliding(ctx['close'][:, -(ctx['span'] + length - 1):], length)
+    middle = windows.mean(axis=-1)
+    width = params.bb_std * np.sqrt(((windows - middle[..., None]) ** 2).mean(axis=-1))
+    return middle + width, middle, middle - width
+
+
+@indicator_node('dx_series', 'true_range', 'atr_series', warmup=lambda p, t: rma_warmup(p.adx_period, t))
+def _dx_series(ctx, true_range, atr_series):
+    # O ADX usa o ATR do próprio período (o do ATR é reaproveitado quando coincidem)
+    params, high, low = ctx['params'], ctx['high'], ctx['low']
+    if params.adx_period != params.atr_period:
+        atr_series = rma(true_range, params.adx_period, ctx['start'])
+    move_up = high[:, 1:] - high[:, :-1]
+    move_down = low[:, :-1] - low[:, 1:]
+    plus = np.where((move_up > move_down) & (move_up > 0), move_up, 0.0)
+    minus = np.where((move_down > move_up) & (move_down > 0), move_down, 0.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        di_plus = 100.0 * rma(plus, params.adx_period, ctx['start']) / atr_series
+        di_minus = 100.0 * rma(minus, params.adx_period, ctx['start']) / atr_series
+        dx = 100.0 * np.abs(di_plus - di_minus) / (di_plus + di_minus)
+    dx[~np.isfinite(dx)] = np.nan
+    return dx
+
+
+# ========== TENDÊNCIA ==========
+
+def _register_ema(field: str):
+    @indicator_node(field, warmup=lambda p, t: ema_warmup(p.ema_length(field), t))
+    def _ema_tail(ctx):
+        return _tail(ema(ctx['close'], ctx['params'].ema_length(field), ctx['start']), ctx)
+
+
+for _field in EMA_SLOTS:
+    _register_ema(_field)
+
+
+@indicator_node('SMA100', warmup=lambda p, t: p.sma_period)
+def _sma(ctx):
+    return _rolling_mean(ctx['close'], ctx['params'].sma_period, ctx)
+
+
+# ========== MOMENTUM ==========
+
+@indicator_node('RSI', 'rsi_series')
+def _rsi_tail(ctx, rsi_series):
+    return _tail(rsi_series, ctx)
+
+
+@indicator_node('Stochastic_RSI_K', 'stoch_k_series')
+def _stoch_rsi_k(ctx, k_series):
+    return _tail(k_series, ctx)
+
+
+@indicator_node('Stochastic_RSI_D', 'stoch_k_series', warmup=lambda p, t: p.stoch_d - 1)
+def _stoch_rsi_d(ctx, k_series):
+    return _rolling_mean(k_series, ctx['params'].stoch_d, ctx)
+
+
+@indicator_node('MACD', 'macd_series')
+def _macd(ctx, macd_series):
+    return _tail(macd_series, ctx)
+
+
+@indicator_node('MACD_Signal', 'macd_series', warmup=lambda p, t: ema_warmup(p.macd_signal, t))
+def _macd_signal(ctx, macd_series):
+    if macd_series is None:
+        return _tail(None, ctx)
+    params = ctx['params']
+    return _tail(ema(macd_series, params.macd_signal, ctx['start'] + params.macd_slow - 1), ctx)
+
+
+@indicator_node('MACD_Histogram', 'MACD', 'MACD_Signal')
+def _macd_histogram(ctx, macd, signal):
+    return macd - signal
+
+
+# ========== VOLATILIDADE ==========
+
+@indicator_node('ATR', 'atr_series')
+def _atr(ctx, atr_series):
+    return _tail(atr_series, ctx)
+
+
+def _register_band(name: str, position: int):
+    @indicator_node(name, 'bollinger')
+    def _band(ctx, bands):
+        return _tail(None if bands is None else bands[position], ctx)
+
+
+for _position, _name in enumerate(('BB_Upper', 'BB_Middle', 'BB_Lower')):
+    _register_band(_name, _position)
+
+
+# ========== VOLUME ==========
+
+@indicator_node('Volume_MA', warmup=lambda p, t: p.volume_ma_period)
+def _volume_ma(ctx):
+    return _rolling_mean(ctx['volume'], ctx['params'].volume_ma_period, ctx)
+
+
+@indicator_node('MFI', warmup=lambda p, t: p.mfi_period + 1)
+def _mfi(ctx):
+    length = ctx['params'].mfi_period
+    if ctx['n'] < length:
+        return _tail(None, ctx)
+    high, low, close, volume = ctx['high'], ctx['low'], ctx['close'], ctx['volume']
+    typical_price = (high + low + close) / 3
+    width = ctx['span'] + length - 1
+    flow = (typical_price * volume)[:, -width:]
+    tp_change = np.diff(typical_price, axis=-1, prepend=np.nan)[:, -width:]
+    # O primeiro candle da série não tem diferença: não conta em nenhum lado
+    positive = _sliding(np.where(tp_change > 0, flow, 0.0), length).sum(axis=-1)
+    negative = _sliding(np.where(tp_change < 0, flow, 0.0), length).sum(axis=-1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mfi = 100.0 * positive / (positive + negative)
+    invalid = _sliding(np.isnan(flow), length).any(axis=-1) | (positive + negative == 0)
+    return _tail(np.where(invalid, np.nan, mfi), ctx)
+
+
+@indicator_node('OBV', 'change', warmup=lambda p, t: None)
+def _obv(ctx, change):
+    volume, start, n = ctx['volume'], ctx['start'], ctx['n']
+    first_volume = volume[np.arange(ctx['rows']), np.minimum(start, n - 1)]
+    if ctx['span'] == 1:
+        return (first_volume + np.nansum(np.sign(change) * volume[:, 1:], axis=-1))[:, None]
+    flows = np.nancumsum(np.sign(change) * volume[:, 1:], axis=-1)
+    obv = first_volume[:, None] + np.concatenate([np.zeros((ctx['rows'], 1)), flows], axis=-1)
+    obv[np.arange(n) < start[:, None]] = np.nan
+    return _tail(obv, ctx)
+
+
+# ========== FORÇA (reaproveita o ATR) ==========
+
+@indicator_node('ADX', 'dx_series', warmup=lambda p, t: rma_warmup(p.adx_period, t))
+def _adx(ctx, dx):
+    if dx.shape[-1] == 0:
+        return _tail(None, ctx)
+    return _tail(rma(dx, ctx['params'].adx_period, first_valid_index(dx)), ctx)
+
+
+# ========== PREÇO ==========
+
+@indicator_node('last_close', warmup=lambda p, t: 1)
+def _last_close(ctx):
+    return _tail(ctx['close'], ctx)
+
+
+@indicator_node('current_volume', warmup=lambda p, t: 1)
+def _current_volume(ctx):
+    return _tail(ctx['volume'], ctx)
+
+
+def compute_indicators_batch(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                             fields: Iterable[str] = None,
+                             params: IndicatorParams = DEFAULT_PARAMS,
+                             series: bool = False) -> Dict[str, np.ndarray]:
+    """
+    Calcula os indicadores do último candle de várias séries em uma passada
+
+    Só os nós do grafo necessários para `fields` são avaliados, em ordem de
+    dependência; cada intermediário é calculado uma única vez.
+
+    Args:
+        high, low, close, volume: Matrizes float64 (símbolos × candles) alinhadas à
+            direita; candles ausentes no início de uma série devem ser NaN
+        fields: Indicadores desejados (padrão: todos de KERNEL_FIELDS)
+        params: Períodos e multiplicadores dos indicadores
+        series: Se True, devolve o valor em cada candle (matriz símbolos × candles,
+            NaN durante o aquecimento) em vez de só o último
+
+    Returns:
+        Dicionário {indicador: array com um valor por símbolo} com todos os campos de
+        KERNEL_FIELDS (NaN sem candles suficientes ou quando o campo não foi pedido)
+
+    Raises:
+        ValueError: Se algum campo não existir no grafo
+    """
+    high, low, close, volume = (_as_matrix(np.asarray(a, dtype=np.float64)) for a in (high, low, close, volume))
+    rows, n = close.shape
+    order = evaluation_order(fields)
+    span = n if series else 1
+    shape = (rows, span) if series else rows
+    result = {name: np.full(shape, np.nan) for name in KERNEL_FIELDS}
+    if n == 0:
+        return result
+
+    values = _evaluate(high, low, close, volume, order, params, span)
+    for name in (KERNEL_FIELDS if fields is None else fields):
+        result[name] = values[name] if series else values[name][:, -1]
+    return result
+
+
+def _evaluate(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+              order: List[str], params: IndicatorParams, span: int,
+              wide: Iterable[str] = ()) -> Dict[str, np.ndarray]:
+    """
+    Avalia os nós em ordem de dependência sobre matrizes não vazias
+
+    Os nós de `wide` são avaliados com span = n (série completa) e os demais com
+    `span`; as saídas são alinhadas à direita, então um nó pode consumir uma
+    dependência mais larga que ele.
+
+    Returns:
+        Dicionário {nó: valor}, com as saídas mascaradas (NaN) nas séries com
+        menos candles que MIN_CANDLES (como em get_indicators)
+    """
+    rows, n = close.shape
+    start = first_valid_index(close)
+    ctx = {'high': high, 'low': low, 'close': close, 'volume': volume,
+           'start': start, 'rows': rows, 'n': n, 'params': params, 'span': span}
+    wide_ctx = dict(ctx, span=n)
+    wide = set(wide)
+    values: Dict[str, Any] = {}
+    for name in order:
+        deps, fn = INDICATOR_GRAPH[name]
+        values[name] = fn(wide_ctx if name in wide else ctx, *(values[dep] for dep in deps))
+
+    too_short = (n - start < MIN_CANDLES)[:, None]
+    return {name: np.where(too_short, np.nan, value) if name in KERNEL_FIELDS else value
+            for name, value in values.items()}
+
+
+def compute_indicators(high: np.ndarray, low: np.ndarray, close: np.ndarray, volume: np.ndarray,
+                       fields: Iterable[str] = None, params: IndicatorParams = DEFAULT_PARAMS) -> IndicatorResult:
+    """
+    Calcula os indicadores do último candle de uma série em uma passada
+
+    Args:
+        high, low, close, volume: Arrays float64 de mesmo tamanho, em ordem cronológica
+        fields: Indicadores desejados (padrão: todos)
+        params: Períodos e multiplicadores dos indicadores
+
+    Returns:
+        IndicatorResult com os valores no último candle (NaN nos campos não pedidos)
+    """
+    batch = compute_indicators_batch(high, low, close, volume, fields, params)
+    return IndicatorResult(**{name: float(values[0]) for name, values in batch.items()})
+
+
+def compute_from_dataframe(df: pd.DataFrame, fields: Iterable[str] = None,
+                           params: IndicatorParams = DEFAULT_PARAMS) -> IndicatorResult:
+    """
+    Atalho para compute_indicators a partir de um DataFrame OHLCV
+
+    Args:
+        df: DataFrame com colunas high, low, close e volume
+        fields: Indicadores desejados (padrão: todos)
+        params: Períodos e multiplicadores dos indicadores
+
+    Returns:
+        IndicatorResult com os valores no último candle
+    """
+    return compute_indicators(*(df[col].to_numpy(dtype=np.float64) for col in ('high', 'low', 'close', 'volume')),
+                              fields=fields, params=params)
+
+
+def compute_series_from_dataframe(df: pd.DataFrame, fields: Iterable[str] = None,
+                                  params: IndicatorParams = DEFAULT_PARAMS) -> Dict[str, np.ndarray]:
+    """
+    Calcula a série completa dos indicadores de um DataFrame OHLCV
+
+    Args:
+        df: DataFrame com colunas high, low, close e volume
+        fields: Indicadores desejados (padrão: todos)
+        params: Períodos e multiplicadores dos indicadores
+
+    Returns:
+        Dicionário {indicador pedido: array float64 com um valor por candle}
+        (NaN enquanto o indicador ainda não tem candles suficientes)
+    """
+    batch = compute_indicators_batch(*(df[col].to_numpy(dtype=np.float64) for col in ('high', 'low', 'close', 'volume')),
+                                     fields=fields, params=params, series=True)
+    return {name: batch[name][0] for name in (KERNEL_FIELDS if fields is None else fields)}
+
+
+def compute_with_series(df: pd.DataFrame, fields: Iterable[str] = None, series_fields: Iterable[str] = (),
+                        params: IndicatorParams = DEFAULT_PARAMS) -> Tuple[IndicatorResult, Dict[str, np.ndarray]]:
+    """
+    Valores no último candle e séries completas de alguns campos, na mesma passada
+
+    Ex: os indicadores de 4h do /analyze e as EMAs do gráfico. Os nós de
+    `series_fields` (e suas dependências) são avaliados com span = n; o último valor
+    de cada um sai da mesma série, sem recalcular.
+
+    Args:
+        df: DataFrame com colunas high, low, close e volume
+        fields: Indicadores desejados no último candle (padrão: todos)
+        series_fields: Indicadores devolvidos também como série completa
+        params: Períodos e multiplicadores dos indicadores
+
+    Returns:
+        Tupla (IndicatorResult no último candle, {campo de series_fields: array
+        float64 com um valor por candle})
+
+    Raises:
+        ValueError: Se algum campo não existir no grafo
+    """
+    fields = KERNEL_FIELDS if fields is None else tuple(fields)
+    series_fields = tuple(series_fields)
+    arrays = [_as_matrix(df[col].to_numpy(dtype=np.float64)) for col in ('high', 'low', 'close', 'volume')]
+    n = arrays[2].shape[1]
+    if n == 0:
+        return IndicatorResult(), {name: np.empty(0) for name in series_fields}
+
+    order = evaluation_order(fields + series_fields)
+    values = _evaluate(*arrays, order, params, 1, wide=evaluation_order(series_fields))
+    last = IndicatorResult(**{name: float(values[name][0, -1]) for name in fields})
+    return last, {name: values[name][0] for name in series_fields}
+
+
+# Famílias aceitas por sweep()
+SWEEP_FAMILIES = ('ema', 'sma', 'rsi', 'atr')
+
+
+def sweep(family: str, lengths: Iterable[int], close: np.ndarray,
+          high: np.ndarray = None, low: np.ndarray = None) -> np.ndarray:
+    """
+    Calcula uma família de indicadores para vários períodos em uma passada vetorizada
+
+    O trabalho comum a todos os períodos é feito uma vez: as somas de prefixo
+    (sementes das EMAs e janelas das SMAs), os ganhos/perdas do RSI e o true
+    range do ATR. Cada período vira uma linha da recorrência, com decaimento próprio.
+
+    Args:
+        family: 'ema', 'sma', 'rsi' ou 'atr'
+        lengths: Períodos (ex: range(5, 201))
+        close: Fechamentos em ordem cronológica (NaN iniciais são ignorados)
+        high, low: Máximas e mínimas (obrigatórias para 'atr')
+
+    Returns:
+        Matriz (períodos × candles) com a série completa de cada período
+
+    Raises:
+        ValueError: Se a família for desconhecida ou algum período for inválido
+    """
+    if family not in SWEEP_FAMILIES:
+        raise ValueError(f"Família de indicador desconhecida: {family}")
+    lengths = np.asarray(list(lengths), dtype=np.int64)
+    if lengths.ndim != 1 or lengths.size == 0 or (lengths < 1).any():
+        raise ValueError("Períodos devem ser inteiros positivos")
+
+    close = np.asarray(close, dtype=np.float64)
+    n = close.shape[-1]
+    k = lengths.size
+    start = np.repeat(first_valid_index(close[None, :]), k)
+    values = _zero_nan(close)
+    prefix = np.cumsum(values)
+
+    if family == 'ema':
+        return _seeded_ema(np.broadcast_to(values, (k, n)), np.broadcast_to(prefix, (k, n)), lengths, start)
+
+    if family == 'sma':
+        columns = np.arange(n)
+        lower = columns - lengths[:, None]
+        window_sum = prefix - np.where(lower >= 0, prefix[np.maximum(lower, 0)], 0.0)
+        out = window_sum / lengths[:, None]
+        out[columns < start[:, None] + lengths[:, None] - 1] = np.nan
+        return out
+
+    if family == 'rsi':
+        series = _rsi(np.broadcast_to(np.diff(close), (k, n - 1)), lengths, start)
+    else:
+        if high is None or low is None:
+            raise ValueError("ATR exige high e low")
+        high, low = np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64)
+        prev_close = close[:-1]
+        true_range = np.fmax.reduce([high[1:] - low[1:], np.abs(high[1:] - prev_close), np.abs(prev_close - low[1:])])
+        series = rma(np.broadcast_to(true_range, (k, n - 1)), lengths, start)
+    # As diferenças começam no segundo candle: alinha com os candles
+    return np.concatenate([np.full((k, 1), np.nan), series], axis=-1)
+
+
+def stack_ohlcv(frames: Dict[str, pd.DataFrame], max_candles: int = None) -> Tuple[List[str], Dict[str, np.ndarray]]:
+    """
+    Empilha DataFrames de vários símbolos em matrizes (símbolos × candles)
+
+    As séries são alinhadas à direita (último candle na última coluna) e as
+    posições sem candle à esquerda ficam NaN.
+
+    Args:
+        frames: Dicionário {symbol: DataFrame OHLCV}
+        max_candles: Número de colunas (padrão: a maior série)
+
+    Returns:
+        Tupla (símbolos na ordem das linhas, {campo: matriz float64})
+    """
+    symbols = list(frames)
+    width = max_candles or max((len(df) for df in frames.values()), default=0)
+    matrices = {field: np.full((len(symbols), width), np.nan) for field in ('open', 'high', 'low', 'close', 'volume')}
+    for row, symbol in enumerate(symbols):
+        df = frames[symbol].tail(width)
+        if df.empty:
+            continue
+        for field, matrix in matrices.items():
+            matrix[row, width - len(df):] = df[field].to_numpy(dtype=np.float64)
+    return symbols, matrices
@@ -0,0 +1,112 @@
+"""
+Parâmetros dos indicadores técnicos (períodos, multiplicadores)
+
+Os nomes dos campos da resposta da API são fixos (EMA9, EMA21, ...) e funcionam
+como posições: 'EMA9' é a EMA rápida, 'EMA21' a média, 'EMA50' a de tendência e
+'EMA200' a lenta, com os períodos definidos aqui. Os valores padrão são os do
+pandas_ta usados originalmente pelo IndicatorService.
+"""
+from typing import Dict, NamedTuple
+
+from app.config import settings
+
+
+# Campo da resposta -> parâmetro com o período da EMA
+EMA_SLOTS = {'EMA9': 'ema_fast', 'EMA21': 'ema_medium', 'EMA50': 'ema_trend', 'EMA200': 'ema_slow'}
+
+# EMAs do gráfico (rápida, média, lenta): colunas ema9/ema21/ema200 de CandleWithEMA
+CHART_EMA_FIELDS = ('EMA9', 'EMA21', 'EMA200')
+
+
+class IndicatorParams(NamedTuple):
+    """Parâmetros de todos os indicadores (imutável e hashable, usado em chaves de cache)"""
+
+    ema_fast: int = 9
+    ema_medium: int = 21
+    ema_trend: int = 50
+    ema_slow: int = 200
+    sma_period: int = 100
+    rsi_period: int = 14
+    stoch_rsi_length: int = 14
+    stoch_k: int = 3
+    stoch_d: int = 3
+    macd_fast: int = 12
+    macd_slow: int = 26
+    macd_signal: int = 9
+    atr_period: int = 14
+    bb_period: int = 20
+    bb_std: float = 2.0
+    volume_ma_period: int = 20
+    mfi_period: int = 14
+    adx_period: int = 14
+
+    @classmethod
+    def from_settings(cls, config=None) -> "IndicatorParams":
+        """
+        Monta os parâmetros a partir das configurações da aplicação
+
+        Args:
+            config: Objeto Settings (padrão: app.config.settings); atributos
+                ausentes mantêm o valor padrão
+
+        Returns:
+            IndicatorParams com os valores configurados
+
+        Raises:
+            ValueError: Se algum período ou multiplicador for inválido
+        """
+        config = settings if config is None else config
+        return cls(**{name: getattr(config, name) for name in cls._fields if hasattr(config, name)}).validated()
+
+    def validated(self) -> "IndicatorParams":
+        """
+        Verifica os parâmetros (períodos inteiros >= 1 e bb_std > 0)
+
+        Returns:
+            Os próprios parâmetros
+
+        Raises:
+            ValueError: Se algum parâmetro for inválido
+        """
+        for name, value in self._asdict().items():
+            if name == 'bb_std':
+                if not value > 0:
+                    raise ValueError(f"Parâmetro de indicador inválido: {name}={value} (deve ser > 0)")
+            elif isinstance(value, bool) or int(value) != value or value < 1:
+                raise ValueError(f"Parâmetro de indicador inválido: {name}={value} (período inteiro >= 1)")
+        return self
+
+    def ema_length(self, field: str) -> int:
+        """Período da EMA de um campo da resposta (ex: 'EMA9' -> ema_fast)"""
+        return getattr(self, EMA_SLOTS[field])
+
+    @property
+    def chart_ema_lengths(self) -> tuple:
+        """Períodos das EMAs do gráfico (rápida, média, lenta)"""
+        return tuple(self.ema_length(field) for field in CHART_EMA_FIELDS)
+
+    def pandas_ta_columns(self) -> Dict[str, str]:
+        """
+        Nomes das colunas geradas pelo pandas_ta com estes parâmetros
+
+        Returns:
+            Dicionário {campo da resposta: coluna do DataFrame do pandas_ta}
+        """
+        stoch = f"{self.stoch_rsi_length}_{self.rsi_period}_{self.stoch_k}_{self.stoch_d}"
+        macd = f"{self.macd_fast}_{self.macd_slow}_{self.macd_signal}"
+        bands = f"{self.bb_period}_{float(self.bb_std)}_{float(self.bb_std)}"
+        return {
+            'Stochastic_RSI_K': f"STOCHRSIk_{stoch}",
+            'Stochastic_RSI_D': f"STOCHRSId_{stoch}",
+            'MACD': f"MACD_{macd}",
+            'MACD_Signal': f"MACDs_{macd}",
+            'MACD_Histogram': f"MACDh_{macd}",
+            'BB_Upper': f"BBU_{bands}",
+            'BB_Middle': f"BBM_{bands}",
+            'BB_Lower': f"BBL_{bands}",
+            'ADX': f"ADX_{self.adx_period}"
+        }
+
+
+# Parâmetros padrão (pandas_ta)
+DEFAULT_PARAMS = IndicatorParams()
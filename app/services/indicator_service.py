@@ -1,9 +1,18 @@
 """
 Serviço para calcular indicadores técnicos
 """
+import numpy as np
 import pandas as pd
 import pandas_ta as ta
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Tuple
+
+from app.services.indicator_kernel import (
+    compute_from_dataframe, compute_indicators_batch, compute_series_from_dataframe, compute_with_series, ema,
+    select_fields, stack_ohlcv, sweep
+)
+from app.services.indicator_params import CHART_EMA_FIELDS, IndicatorParams
+from app.services.streaming_indicators import MIN_CANDLES, format_indicators, format_series
+from app.services.timeframes import to_epoch_ms
 
 
 class IndicatorService:
@@ -29,12 +38,185 @@ class IndicatorService:
         return round(float(value), decimals)
     
     @staticmethod
-    def get_indicators(df: pd.DataFrame) -> Dict[str, Any]:
+    def resolve_fields(fields: Iterable[str] = None, categories: Iterable[str] = None,
+                       required: Iterable[str] = ()) -> Tuple[str, ...]:
+        """
+        Resolve um seletor de indicadores da requisição
+        
+        Args:
+            fields: Nomes de indicadores pedidos (ex: ['RSI', 'EMA9'])
+            categories: Categorias pedidas (ex: ['trend', 'price'])
+            required: Indicadores sempre calculados (ex: ScoreEngine.REQUIRED_INDICATORS)
+            
+        Returns:
+            Campos a calcular (todos se nada for pedido nem obrigatório)
+            
+        Raises:
+            ValueError: Se algum nome ou categoria não existir
+        """
+        selected = list(select_fields(fields, categories)) if fields or categories else []
+        if not selected and not required:
+            return select_fields()
+        return select_fields(selected + list(required))
+    
+    @staticmethod
+    def get_indicators(df: pd.DataFrame, fields: Iterable[str] = None,
+                       params: IndicatorParams = None) -> Dict[str, Any]:
+        """
+        Calcula os indicadores técnicos e retorna em formato JSON pronto para API
+        
+        Usa o kernel NumPy fundido (uma passada, intermediários compartilhados);
+        os valores são os mesmos de get_indicators_pandas_ta. Com `fields`, só os
+        indicadores pedidos e suas dependências são avaliados.
+        
+        Args:
+            df: DataFrame com dados OHLCV (colunas: timestamp, open, high, low, close, volume)
+            fields: Indicadores a calcular (padrão: todos); os demais ficam None
+            params: Períodos dos indicadores (padrão: os das configurações)
+            
+        Returns:
+            Dicionário com indicadores organizados por categoria (ver get_indicators_pandas_ta)
+        """
+        if df is None or df.empty or len(df) < MIN_CANDLES:
+            return format_indicators({})
+        
+        required_columns = ['open', 'high', 'low', 'close', 'volume']
+        missing_columns = [col for col in required_columns if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"DataFrame faltando colunas: {', '.join(missing_columns)}")
+        
+        return compute_from_dataframe(df, fields, params or IndicatorParams.from_settings()).to_indicators()
+    
+    @staticmethod
+    def get_indicators_with_emas(df: pd.DataFrame, fields: Iterable[str] = None,
+                                 params: IndicatorParams = None) -> Tuple[Dict[str, Any], Dict[int, np.ndarray]]:
+        """
+        Indicadores do último candle e as séries das EMAs do gráfico na mesma passada
+        
+        As EMAs rápida, média e lenta são avaliadas em modo série pelo kernel e o
+        último valor de cada uma (EMA9/EMA21/EMA200 da resposta) sai dessa mesma série.
+        
+        Args:
+            df: DataFrame com dados OHLCV
+            fields: Indicadores a calcular (padrão: todos); os demais ficam None
+            params: Períodos dos indicadores (padrão: os das configurações)
+            
+        Returns:
+            Tupla (indicadores como em get_indicators, {período: série} como em get_ema_series)
+        """
+        params = params or IndicatorParams.from_settings()
+        if df is None or df.empty:
+            return format_indicators({}), {}
+        if len(df) < MIN_CANDLES:
+            # Sem indicadores, mas o gráfico ainda mostra as EMAs que já têm semente
+            return format_indicators({}), IndicatorService.get_ema_series(df, params.chart_ema_lengths)
+        
+        result, series = compute_with_series(df, fields, CHART_EMA_FIELDS, params)
+        return result.to_indicators(), {params.ema_length(field): series[field] for field in CHART_EMA_FIELDS}
+    
+    @staticmethod
+    def get_indicators_batch(frames: Dict[str, pd.DataFrame], max_candles: int = None,
+                             fields: Iterable[str] = None, params: IndicatorParams = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Calcula os indicadores de vários símbolos em uma única passada vetorizada
+        
+        Os DataFrames são empilhados em matrizes (símbolos × candles) alinhadas à
+        direita; históricos mais curtos são completados com NaN e mascarados.
+        
+        Args:
+            frames: Dicionário {symbol: DataFrame OHLCV}
+            max_candles: Número máximo de candles por símbolo (padrão: a maior série)
+            fields: Indicadores a calcular (padrão: todos)
+            params: Períodos dos indicadores (padrão: os das configurações)
+            
+        Returns:
+            Dicionário {symbol: indicadores no formato de get_indicators}
+        """
+        symbols, matrices = stack_ohlcv(frames, max_candles)
+        return IndicatorService.get_indicators_matrix(
+            symbols, matrices['high'], matrices['low'], matrices['close'], matrices['volume'], fields, params
+        )
+    
+    @staticmethod
+    def get_indicators_matrix(symbols: List[str], high: np.ndarray, low: np.ndarray,
+                              close: np.ndarray, volume: np.ndarray, fields: Iterable[str] = None,
+                              params: IndicatorParams = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Calcula os indicadores a partir de matrizes (símbolos × candles) por campo OHLCV
+        
+        Args:
+            symbols: Símbolo de cada linha
+            high, low, close, volume: Matrizes float64 alinhadas à direita (NaN à esquerda
+                nas séries mais curtas)
+            fields: Indicadores a calcular (padrão: todos)
+            params: Períodos dos indicadores (padrão: os das configurações)
+            
+        Returns:
+            Dicionário {symbol: indicadores no formato de get_indicators}
+        """
+        batch = compute_indicators_batch(high, low, close, volume, fields, params or IndicatorParams.from_settings())
+        return {
+            symbol: format_indicators({name: values[row] for name, values in batch.items()})
+            for row, symbol in enumerate(symbols)
+        }
+    
+    @staticmethod
+    def get_indicator_series(df: pd.DataFrame, fields: Iterable[str] = None,
+                             params: IndicatorParams = None) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+        """
+        Calcula a série completa (um valor por candle) de cada indicador
+        
+        Mesmo grafo e mesmas fórmulas de get_indicators: o último valor de cada
+        série é o valor devolvido por get_indicators.
+        
+        Args:
+            df: DataFrame com dados OHLCV (colunas: timestamp, open, high, low, close, volume)
+            fields: Indicadores a calcular (padrão: todos)
+            params: Períodos dos indicadores (padrão: os das configurações)
+            
+        Returns:
+            Tupla (timestamps em ms como int64, {indicador: array float64 com NaN no aquecimento})
+        """
+        fields = select_fields(fields)
+        if df is None or df.empty:
+            return np.empty(0, dtype=np.int64), {name: np.empty(0) for name in fields}
+        
+        timestamps = to_epoch_ms(df['timestamp'])
+        return timestamps, compute_series_from_dataframe(df, fields, params or IndicatorParams.from_settings())
+    
+    @staticmethod
+    def series_to_columns(timestamps: np.ndarray, series: Dict[str, np.ndarray],
+                          since: int = None, points: int = None) -> Dict[str, Any]:
+        """
+        Converte séries de indicadores em formato colunar pronto para JSON
+        
+        Args:
+            timestamps: Timestamps em ms de cada candle
+            series: Dicionário {indicador: array com um valor por candle}
+            since: Mantém só candles com timestamp >= since (ms)
+            points: Mantém só os últimos N candles
+            
+        Returns:
+            Dicionário com 'timestamps' (lista de int) e 'series' ({indicador: lista})
+        """
+        keep = np.ones(len(timestamps), dtype=bool)
+        if since is not None:
+            keep &= timestamps >= since
+        if points is not None:
+            keep[:max(0, len(timestamps) - points)] = False
+        return {
+            'timestamps': timestamps[keep].tolist(),
+            'series': {name: format_series(values[keep], name) for name, values in series.items()}
+        }
+    
+    @staticmethod
+    def get_indicators_pandas_ta(df: pd.DataFrame, params: IndicatorParams = None) -> Dict[str, Any]:
         """
-        Calcula todos os indicadores técnicos e retorna em formato JSON pronto para API
+        Calcula todos os indicadores técnicos com pandas_ta (implementação de referência)
         
         Args:
             df: DataFrame com dados OHLCV (colunas: timestamp, open, high, low, close, volume)
+            params: Períodos dos indicadores (padrão: os das configurações)
             
         Returns:
             Dicionário com indicadores organizados por categoria:
@@ -89,35 +271,44 @@ class IndicatorService:
         if missing_columns:
             raise ValueError(f"DataFrame faltando colunas: {', '.join(missing_columns)}")
         
+        p = params or IndicatorParams.from_settings()
+        columns = p.pandas_ta_columns()
+        
         # ========== INDICADORES DE TENDÊNCIA (TREND) ==========
-        ema9 = ta.ema(df['close'], length=9)
-        ema21 = ta.ema(df['close'], length=21)
-        ema50 = ta.ema(df['close'], length=50) if len(df) >= 50 else None
-        ema200 = ta.ema(df['close'], length=200) if len(df) >= 200 else None
-        sma100 = ta.sma(df['close'], length=100) if len(df) >= 100 else None
+        ema9 = ta.ema(df['close'], length=p.ema_fast)
+        ema21 = ta.ema(df['close'], length=p.ema_medium)
+        ema50 = ta.ema(df['close'], length=p.ema_trend) if len(df) >= p.ema_trend else None
+        ema200 = ta.ema(df['close'], length=p.ema_slow) if len(df) >= p.ema_slow else None
+        sma100 = ta.sma(df['close'], length=p.sma_period) if len(df) >= p.sma_period else None
         
         # ========== INDICADORES DE MOMENTUM ==========
-        rsi = ta.rsi(df['close'], length=14)
+        rsi = ta.rsi(df['close'], length=p.rsi_period)
         
-        # Stochastic RSI (14, 14, 3, 3)
-        stoch_rsi = ta.stochrsi(df['close'], length=14, rsi_length=14, k=3, d=3)
+        # Stochastic RSI (padrão 14, 14, 3, 3)
+        stoch_rsi = ta.stochrsi(df['close'], length=p.stoch_rsi_length, rsi_length=p.rsi_period, k=p.stoch_k, d=p.stoch_d)
         
-        # MACD (12, 26, 9)
-        macd_df = df.ta.macd(close='close', fast=12, slow=26, signal=9)
+        # MACD (padrão 12, 26, 9)
+        macd_df = df.ta.macd(close='close', fast=p.macd_fast, slow=p.macd_slow, signal=p.macd_signal)
         
         # ========== INDICADORES DE VOLATILIDADE ==========
-        atr = ta.atr(df['high'], df['low'], df['close'], length=14)
+        atr = ta.atr(df['high'], df['low'], df['close'], length=p.atr_period)
         
-        # Bollinger Bands (20, 2)
-        bb = ta.bbands(df['close'], length=20, std=2)
+        # Bollinger Bands (padrão 20, 2)
+        bb = ta.bbands(df['close'], length=p.bb_period, std=p.bb_std)
         
         # ========== INDICADORES DE VOLUME ==========
-        volume_ma = ta.sma(df['volume'], length=20)
-        mfi = ta.mfi(df['high'], df['low'], df['close'], df['volume'], length=14)
+        volume_ma = ta.sma(df['volume'], length=p.volume_ma_period)
+        mfi = ta.mfi(df['high'], df['low'], df['close'], df['volume'], length=p.mfi_period)
         obv = ta.obv(df['close'], df['volume'])
         
         # ========== INDICADORES DE FORÇA ==========
-        adx_df = ta.adx(df['high'], df['low'], df['close'], length=14)
+        adx_df = ta.adx(df['high'], df['low'], df['close'], length=p.adx_period)
+        
+        def column(frame, field, decimals):
+            name = columns[field]
+            if frame is None or name not in frame.columns:
+                return None
+            return IndicatorService._safe_float(frame[name], decimals)
         
         # Monta o dicionário de resposta organizado por categorias
         indicators = {
@@ -130,17 +321,17 @@ class IndicatorService:
             },
             'momentum': {
                 'RSI': IndicatorService._safe_float(rsi, 2),
-                'Stochastic_RSI_K': IndicatorService._safe_float(stoch_rsi[f'STOCHRSIk_14_14_3_3'], 2) if f'STOCHRSIk_14_14_3_3' in stoch_rsi.columns else None,
-                'Stochastic_RSI_D': IndicatorService._safe_float(stoch_rsi[f'STOCHRSId_14_14_3_3'], 2) if f'STOCHRSId_14_14_3_3' in stoch_rsi.columns else None,
-                'MACD': IndicatorService._safe_float(macd_df['MACD_12_26_9'], 4) if 'MACD_12_26_9' in macd_df.columns else None,
-                'MACD_Signal': IndicatorService._safe_float(macd_df['MACDs_12_26_9'], 4) if 'MACDs_12_26_9' in macd_df.columns else None,
-                'MACD_Histogram': IndicatorService._safe_float(macd_df['MACDh_12_26_9'], 4) if 'MACDh_12_26_9' in macd_df.columns else None
+                'Stochastic_RSI_K': column(stoch_rsi, 'Stochastic_RSI_K', 2),
+                'Stochastic_RSI_D': column(stoch_rsi, 'Stochastic_RSI_D', 2),
+                'MACD': column(macd_df, 'MACD', 4),
+                'MACD_Signal': column(macd_df, 'MACD_Signal', 4),
+                'MACD_Histogram': column(macd_df, 'MACD_Histogram', 4)
             },
             'volatility': {
                 'ATR': IndicatorService._safe_float(atr, 2),
-                'BB_Upper': IndicatorService._safe_float(bb['BBU_20_2.0_2.0'], 2) if bb is not None and 'BBU_20_2.0_2.0' in bb.columns else None,
-                'BB_Middle': IndicatorService._safe_float(bb['BBM_20_2.0_2.0'], 2) if bb is not None and 'BBM_20_2.0_2.0' in bb.columns else None,
-                'BB_Lower': IndicatorService._safe_float(bb['BBL_20_2.0_2.0'], 2) if bb is not None and 'BBL_20_2.0_2.0' in bb.columns else None
+                'BB_Upper': column(bb, 'BB_Upper', 2),
+                'BB_Middle': column(bb, 'BB_Middle', 2),
+                'BB_Lower': column(bb, 'BB_Lower', 2)
             },
             'volume': {
                 'Volume_MA': IndicatorService._safe_float(volume_ma, 2),
@@ -148,7 +339,7 @@ class IndicatorService:
                 'OBV': IndicatorService._safe_float(obv, 0)  # OBV geralmente sem casas decimais
             },
             'strength': {
-                'ADX': IndicatorService._safe_float(adx_df['ADX_14'], 2) if 'ADX_14' in adx_df.columns else None
+                'ADX': column(adx_df, 'ADX', 2)
             },
             'price': {
                 'last_close': IndicatorService._safe_float(df['close'], 2),
@@ -159,13 +350,63 @@ class IndicatorService:
         return indicators
     
     @staticmethod
-    def get_chart_data(df: pd.DataFrame, limit: int = 200) -> pd.DataFrame:
+    def get_ema_series(df: pd.DataFrame, lengths=None) -> Dict[int, np.ndarray]:
+        """
+        Calcula as séries completas de EMA (mesma fórmula do pandas_ta)
+        
+        Args:
+            df: DataFrame com dados OHLCV
+            lengths: Períodos das EMAs (padrão: rápida, média e lenta das configurações)
+            
+        Returns:
+            Dicionário {período: array float64 com NaN antes da semente}
+        """
+        lengths = tuple(lengths or IndicatorParams.from_settings().chart_ema_lengths)
+        series = sweep('ema', lengths, df['close'].to_numpy(dtype=np.float64))
+        return dict(zip(lengths, series))
+    
+    @staticmethod
+    def get_indicator_sweep(df: pd.DataFrame, family: str, lengths: Iterable[int]) -> pd.DataFrame:
+        """
+        Calcula uma família de indicadores para vários períodos de uma vez (pesquisa de parâmetros)
+        
+        Ex: get_indicator_sweep(df, 'ema', range(5, 201)) calcula 196 EMAs em uma
+        única passada vetorizada, em vez de 196 cálculos independentes.
+        
+        Args:
+            df: DataFrame com dados OHLCV
+            family: 'ema', 'sma', 'rsi' ou 'atr'
+            lengths: Períodos desejados
+            
+        Returns:
+            DataFrame com a coluna timestamp e uma coluna por período (ex: EMA_5, EMA_6, ...)
+            
+        Raises:
+            ValueError: Se a família for desconhecida ou algum período for inválido
+        """
+        lengths = list(lengths)
+        series = sweep(
+            family, lengths, df['close'].to_numpy(dtype=np.float64),
+            df['high'].to_numpy(dtype=np.float64), df['low'].to_numpy(dtype=np.float64)
+        )
+        result = pd.DataFrame(series.T, index=df.index, columns=[f"{family.upper()}_{length}" for length in lengths])
+        result.insert(0, 'timestamp', df['timestamp'])
+        return result
+    
+    @staticmethod
+    def get_chart_data(df: pd.DataFrame, limit: int = 200, emas: Dict[int, np.ndarray] = None,
+                       params: IndicatorParams = None) -> pd.DataFrame:
         """
         Retorna dados de candles com EMAs calculadas para gráfico
         
+        As colunas ema9/ema21/ema200 trazem as EMAs rápida, média e lenta configuradas.
+        
         Args:
             df: DataFrame com dados OHLCV
             limit: Número máximo de candles para retornar (últimos N candles)
+            emas: Séries de EMA já calculadas por período (ex: do IndicatorCache);
+                calculadas aqui se None
+            params: Períodos dos indicadores (padrão: os das configurações)
             
         Returns:
             DataFrame com colunas: timestamp, open, high, low, close, volume, ema9, ema21, ema200
@@ -173,14 +414,17 @@ class IndicatorService:
         if df is None or df.empty:
             return pd.DataFrame()
         
-        # Calcula as EMAs
+        fast, medium, slow = (params or IndicatorParams.from_settings()).chart_ema_lengths
+        if emas is None:
+            emas = IndicatorService.get_ema_series(df, (fast, medium, slow))
+        
         df_chart = df.copy()
-        df_chart['ema9'] = ta.ema(df_chart['close'], length=9)
-        df_chart['ema21'] = ta.ema(df_chart['close'], length=21)
+        df_chart['ema9'] = emas[fast]
+        df_chart['ema21'] = emas[medium]
         
-        # EMA200 só se houver dados suficientes
-        if len(df_chart) >= 200:
-            df_chart['ema200'] = ta.ema(df_chart['close'], length=200)
+        # EMA lenta só se houver dados suficientes
+        if len(df_chart) >= slow:
+            df_chart['ema200'] = emas[slow]
         else:
             df_chart['ema200'] = None
         
@@ -192,4 +436,3 @@ class IndicatorService:
         df_chart = df_chart.tail(limit)
         
         return df_chart
-
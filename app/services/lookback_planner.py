@@ -0,0 +1,101 @@
+"""
+Planejamento do histórico mínimo de candles por timeframe
+
+Cada nó do grafo de indicadores declara o seu aquecimento (ver NODE_WARMUP em
+indicator_kernel.py). O planejador soma o aquecimento dos indicadores pedidos
+para uma tolerância alvo e devolve quantos candles buscar em cada timeframe:
+um RSI14 precisa de ~56 candles, a EMA200 de ~500 (com tolerância de 5%).
+"""
+from typing import Dict, Iterable, List
+
+from app.services.indicator_kernel import required_candles
+from app.services.indicator_params import DEFAULT_PARAMS, IndicatorParams
+
+
+class LookbackPlanner:
+    """Calcula o número de candles necessário para os indicadores de uma requisição"""
+
+    def __init__(self, params: IndicatorParams = DEFAULT_PARAMS, tolerance: float = 0.05,
+                 default_limit: int = 500, max_limit: int = 1000, enabled: bool = True):
+        """
+        Args:
+            params: Períodos dos indicadores
+            tolerance: Peso residual máximo do estado inicial das recorrências (EMA, RMA)
+            default_limit: Candles usados quando o planejador está desligado ou quando
+                algum indicador depende do histórico inteiro (ex: OBV)
+            max_limit: Máximo de candles por timeframe (limite de get_candles)
+            enabled: Se False, todo timeframe usa default_limit
+        """
+        self.params = params
+        self.tolerance = tolerance
+        self.default_limit = default_limit
+        self.max_limit = max_limit
+        self.enabled = enabled
+
+    def candles_for(self, fields: Iterable[str] = None, display: int = 1) -> int:
+        """
+        Candles necessários para os indicadores pedidos
+
+        Args:
+            fields: Indicadores desejados (padrão: todos)
+            display: Quantos dos últimos valores precisam estar aquecidos
+                (1 para o valor atual, N para séries exibidas em gráfico)
+
+        Returns:
+            Número de candles, limitado a max_limit
+
+        Raises:
+            ValueError: Se algum campo não existir
+        """
+        if not self.enabled:
+            return self.default_limit
+        needed = required_candles(fields, self.params, self.tolerance)
+        if needed is None:
+            return min(self.max_limit, max(self.default_limit, display))
+        return min(self.max_limit, needed + display - 1)
+
+    def max_display(self, fields: Iterable[str] = None) -> int:
+        """
+        Maior número de valores aquecidos que cabem em max_limit candles
+
+        Args:
+            fields: Indicadores desejados (padrão: todos)
+
+        Returns:
+            max_limit menos o aquecimento dos indicadores (mínimo 1)
+
+        Raises:
+            ValueError: Se algum campo não existir
+        """
+        return max(1, self.max_limit - self.candles_for(fields) + 1)
+
+    def plan(self, timeframes: List[str], fields: Iterable[str] = None,
+             minimum: Dict[str, int] = None) -> Dict[str, int]:
+        """
+        Candles a buscar em cada timeframe
+
+        Args:
+            timeframes: Timeframes da requisição
+            fields: Indicadores calculados em todos os timeframes (padrão: todos)
+            minimum: Mínimo adicional por timeframe (ex: {'4h': candles do gráfico})
+
+        Returns:
+            Dicionário {timeframe: candles}
+        """
+        limit = self.candles_for(fields)
+        minimum = minimum or {}
+        return {tf: max(limit, minimum.get(tf, 0)) for tf in timeframes}
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Retorna a configuração do planejador
+
+        Returns:
+            Dicionário com enabled, tolerância e limites
+        """
+        return {
+            'enabled': self.enabled,
+            'tolerance': self.tolerance,
+            'default_limit': self.default_limit,
+            'max_limit': self.max_limit
+        }
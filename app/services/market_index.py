@@ -0,0 +1,179 @@
+"""
+Índice em memória dos mercados da exchange (resultado de load_markets)
+
+Permite validar e normalizar símbolos em O(1) sem chamadas à rede:
+- 'BTC/USDT', 'btc-usdt', 'BTCUSDT' -> 'BTC/USDT'
+- 'BTC' -> par com a primeira moeda de cotação disponível na ordem de preferência
+- 'BTCBRL', 'BTCFDUSD' -> resolvidos pelo id do mercado na exchange
+"""
+import re
+import time
+from typing import Any, Dict, List, Optional
+
+
+# Formato aceito após a limpeza: BASE ou BASE/QUOTE, só letras e dígitos
+SYMBOL_PATTERN = re.compile(r'^[A-Z0-9]+(/[A-Z0-9]+)?$')
+
+
+class SymbolNotListedError(ValueError):
+    """Símbolo bem formado, mas sem mercado listado na exchange"""
+
+
+def clean_symbol(symbol: str) -> str:
+    """
+    Padroniza um símbolo informado pelo usuário ('btc-usdt' -> 'BTC/USDT')
+
+    Args:
+        symbol: 'BTC', 'BTC/BRL', 'btc-usdt', 'BTCFDUSD', ...
+
+    Returns:
+        Símbolo em maiúsculas com '/' como separador
+
+    Raises:
+        ValueError: Se o símbolo for malformado (ex: 'BTC//', 'BTC$')
+    """
+    cleaned = symbol.strip().upper().replace('-', '/').replace('_', '/')
+    if not SYMBOL_PATTERN.match(cleaned):
+        raise ValueError(f"Símbolo inválido: {symbol}")
+    return cleaned
+
+
+class MarketIndex:
+    """Índice de pares válidos, cotações por moeda base e metadados de precisão"""
+
+    def __init__(self, quote_preference: List[str] = None, market_type: str = 'spot'):
+        """
+        Args:
+            quote_preference: Ordem de preferência das moedas de cotação (ex: ['USDT', 'FDUSD', 'BRL'])
+            market_type: Tipo de mercado indexado ('spot', 'swap', ...)
+        """
+        self.quote_preference = [q.upper() for q in (quote_preference or ['USDT'])]
+        self.market_type = market_type
+        self._markets: Dict[str, Dict[str, Any]] = {}
+        self._by_id: Dict[str, str] = {}
+        self._quotes_by_base: Dict[str, List[str]] = {}
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def loaded(self) -> bool:
+        """True depois da primeira carga de mercados"""
+        return self.loaded_at is not None
+
+    def __len__(self) -> int:
+        return len(self._markets)
+
+    def _quote_rank(self, quote: str) -> int:
+        try:
+            return self.quote_preference.index(quote)
+        except ValueError:
+            return len(self.quote_preference)
+
+    def load(self, markets: Dict[str, dict]):
+        """
+        (Re)constrói o índice a partir do retorno de exchange.load_markets()
+
+        Mercados inativos ou de outro tipo são ignorados. O índice novo só substitui
+        o anterior depois de pronto, então leituras concorrentes nunca veem um estado parcial.
+
+        Args:
+            markets: Dicionário {symbol: market} no formato do ccxt
+        """
+        by_symbol = {}
+        by_id = {}
+        quotes_by_base: Dict[str, List[str]] = {}
+
+        for symbol, market in markets.items():
+            if market.get('active') is False or market.get('type', 'spot') != self.market_type:
+                continue
+            base, quote = market['base'].upper(), market['quote'].upper()
+            by_symbol[symbol] = market
+            by_id[str(market.get('id', base + quote)).upper()] = symbol
+            by_id.setdefault(base + quote, symbol)
+            quotes_by_base.setdefault(base, []).append(quote)
+
+        for quotes in quotes_by_base.values():
+            quotes.sort(key=lambda q: (self._quote_rank(q), q))
+
+        self._markets, self._by_id, self._quotes_by_base = by_symbol, by_id, quotes_by_base
+        self.loaded_at = time.time()
+
+    def is_valid(self, symbol: str) -> bool:
+        """Verifica se o par (formato 'BASE/QUOTE') está listado"""
+        return symbol in self._markets
+
+    def symbols(self, quote: str = None) -> List[str]:
+        """Pares listados (opcionalmente só os cotados em `quote`), em ordem alfabética"""
+        if quote is None:
+            return sorted(self._markets)
+        quote = quote.upper()
+        return sorted(symbol for symbol in self._markets if symbol.split('/')[1] == quote)
+
+    def quotes_for(self, base: str) -> List[str]:
+        """Moedas de cotação disponíveis para a moeda base, na ordem de preferência"""
+        return list(self._quotes_by_base.get(base.upper(), []))
+
+    def resolve(self, symbol: str) -> str:
+        """
+        Normaliza um símbolo informado pelo usuário para o par da exchange
+
+        Args:
+            symbol: 'BTC', 'BTC/BRL', 'btc-usdt', 'BTCFDUSD', ...
+
+        Returns:
+            Par no formato 'BASE/QUOTE'
+
+        Raises:
+            SymbolNotListedError: Se o símbolo não corresponder a nenhum mercado listado
+            ValueError: Se o símbolo for malformado (ex: 'BTC//', 'BTC$')
+        """
+        cleaned = clean_symbol(symbol)
+
+        if '/' in cleaned:
+            if cleaned in self._markets:
+                return cleaned
+            raise SymbolNotListedError(f"Par {cleaned} não listado na exchange")
+
+        resolved = self._by_id.get(cleaned)
+        if resolved is not None:
+            return resolved
+
+        quotes = self._quotes_by_base.get(cleaned)
+        if quotes:
+            return f"{cleaned}/{quotes[0]}"
+
+        raise SymbolNotListedError(f"Símbolo {cleaned} não listado na exchange")
+
+    def precision(self, symbol: str) -> Dict[str, Any]:
+        """
+        Metadados de precisão e limites do par
+
+        Args:
+            symbol: Par no formato 'BASE/QUOTE'
+
+        Returns:
+            Dicionário com precisão de preço/quantidade e quantidade/custo mínimos
+        """
+        market = self._markets.get(symbol)
+        if market is None:
+            raise SymbolNotListedError(f"Par {symbol} não listado na exchange")
+        precision = market.get('precision') or {}
+        limits = market.get('limits') or {}
+        return {
+            'price': precision.get('price'),
+            'amount': precision.get('amount'),
+            'min_amount': (limits.get('amount') or {}).get('min'),
+            'min_cost': (limits.get('cost') or {}).get('min')
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna o tamanho do índice e o horário da última carga
+
+        Returns:
+            Dicionário com número de pares, moedas base e loaded_at
+        """
+        return {
+            'markets': len(self._markets),
+            'bases': len(self._quotes_by_base),
+            'loaded_at': self.loaded_at
+        }
@@ -0,0 +1,88 @@
+"""
+Reamostragem de candles OHLCV para timeframes maiores
+
+Os candles de 4h e 1d são agregações exatas dos candles de 1h: primeira abertura,
+máxima das máximas, mínima das mínimas, último fechamento e soma dos volumes.
+As janelas seguem as fronteiras da exchange (UTC; semanas começando na segunda-feira).
+"""
+import numpy as np
+import pandas as pd
+
+from app.services.timeframes import TIMEFRAME_MINUTES, candle_open_time, to_epoch_ms
+
+
+def timeframe_ratio(fine_timeframe: str, coarse_timeframe: str) -> int:
+    """
+    Retorna quantos candles do timeframe menor formam um candle do maior
+
+    Args:
+        fine_timeframe: Timeframe de origem (ex: '1h')
+        coarse_timeframe: Timeframe de destino (ex: '4h')
+
+    Returns:
+        Razão entre as durações (ex: 4)
+
+    Raises:
+        ValueError: Se o destino não for múltiplo exato da origem
+    """
+    fine = TIMEFRAME_MINUTES[fine_timeframe]
+    coarse = TIMEFRAME_MINUTES[coarse_timeframe]
+    if coarse < fine or coarse % fine != 0:
+        raise ValueError(f"Não é possível derivar {coarse_timeframe} a partir de {fine_timeframe}")
+    return coarse // fine
+
+
+def resample_ohlcv(df: pd.DataFrame, fine_timeframe: str, coarse_timeframe: str) -> pd.DataFrame:
+    """
+    Agrega candles de um timeframe menor em candles de um timeframe maior
+
+    Usa reduções vetorizadas por grupo (np.ufunc.reduceat) sobre os grupos
+    contíguos de candles que caem na mesma janela. O primeiro grupo é descartado
+    se estiver incompleto (a série começa no meio de uma janela); o último é
+    mantido mesmo parcial, pois corresponde ao candle em formação da exchange.
+
+    Args:
+        df: DataFrame ordenado com colunas timestamp (datetime UTC), open, high, low, close, volume
+        fine_timeframe: Timeframe dos candles de entrada (ex: '1h')
+        coarse_timeframe: Timeframe desejado (ex: '4h', '1d')
+
+    Returns:
+        DataFrame no mesmo formato, com um candle por janela do timeframe maior
+    """
+    ratio = timeframe_ratio(fine_timeframe, coarse_timeframe)
+    if df is None or df.empty:
+        return pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    if ratio == 1:
+        return df.copy()
+
+    timestamps = to_epoch_ms(df['timestamp'])
+    buckets = candle_open_time(timestamps, coarse_timeframe)
+
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(buckets)] - 1
+
+    # Descarta a primeira janela se ela não começa na abertura do candle maior
+    if timestamps[0] != buckets[0]:
+        starts, ends = starts[1:], ends[1:]
+        if len(starts) == 0:
+            return pd.DataFrame(columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+
+    opens = df['open'].to_numpy(dtype=np.float64)
+    highs = df['high'].to_numpy(dtype=np.float64)
+    lows = df['low'].to_numpy(dtype=np.float64)
+    closes = df['close'].to_numpy(dtype=np.float64)
+    volumes = df['volume'].to_numpy(dtype=np.float64)
+
+    # reduceat precisa de um array que comece no primeiro índice usado
+    first = starts[0]
+    offsets = starts - first
+
+    result = pd.DataFrame({
+        'timestamp': pd.to_datetime(buckets[starts], unit='ms', utc=True),
+        'open': opens[starts],
+        'high': np.maximum.reduceat(highs[first:], offsets),
+        'low': np.minimum.reduceat(lows[first:], offsets),
+        'close': closes[ends],
+        'volume': np.add.reduceat(volumes[first:], offsets)
+    })
+    return result
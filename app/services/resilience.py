@@ -0,0 +1,207 @@
+"""
+Resiliência das chamadas à exchange: retry assíncrono e circuit breaker
+
+- RetryPolicy: backoff exponencial com jitter ("full jitter"), sem bloquear o event loop
+- CircuitBreaker: após falhas consecutivas abre o circuito e as chamadas falham
+  imediatamente (CircuitOpenError) até o tempo de espera passar; então algumas
+  chamadas de teste (half-open) decidem se o circuito fecha ou abre de novo
+"""
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Tuple, Type
+
+import ccxt
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Chamada rejeitada porque o circuito da exchange está aberto"""
+
+    def __init__(self, name: str, retry_after: float):
+        self.name = name
+        self.retry_after = retry_after
+        super().__init__(
+            f"Exchange {name} indisponível (circuit breaker aberto, nova tentativa em {retry_after:.0f}s)"
+        )
+
+
+class RetryPolicy:
+    """Backoff exponencial com jitter para falhas transitórias"""
+
+    def __init__(self, max_attempts: int = 3, base_delay: float = 1.0, max_delay: float = 10.0,
+                 retry_on: Tuple[Type[Exception], ...] = (ccxt.NetworkError,), seed: int = None):
+        """
+        Args:
+            max_attempts: Número máximo de tentativas (incluindo a primeira)
+            base_delay: Espera base (segundos) antes da segunda tentativa
+            max_delay: Espera máxima (segundos) entre tentativas
+            retry_on: Exceções consideradas transitórias (as demais não têm retry)
+            seed: Semente do jitter (reprodutibilidade em testes)
+        """
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self._rng = random.Random(seed)
+
+    def delay(self, attempt: int) -> float:
+        """
+        Espera antes da próxima tentativa: uniforme em [0, min(max_delay, base * 2^attempt)]
+
+        O jitter espalha as novas tentativas de clientes que falharam juntos.
+
+        Args:
+            attempt: Índice da tentativa que falhou (0 = primeira)
+
+        Returns:
+            Espera em segundos
+        """
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Circuit breaker (closed/open/half-open) de uma exchange"""
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_max_calls: int = 1, enabled: bool = True,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            name: Nome da exchange (usado nas mensagens)
+            failure_threshold: Falhas consecutivas que abrem o circuito
+            reset_timeout: Tempo (segundos) com o circuito aberto antes do half-open
+            half_open_max_calls: Chamadas de teste simultâneas permitidas no half-open
+            enabled: Se False, o circuito nunca abre
+            clock: Relógio monotônico (injetável em testes)
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.enabled = enabled
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.rejected = 0
+        self.opened = 0
+
+    @property
+    def state(self) -> str:
+        """Estado atual; um circuito aberto passa a half-open quando o tempo de espera expira"""
+        if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+
+    def retry_after(self) -> float:
+        """Segundos até o circuito aceitar uma chamada de teste"""
+        return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def before_call(self):
+        """
+        Autoriza uma chamada à exchange
+
+        Raises:
+            CircuitOpenError: Se o circuito estiver aberto (ou sem vagas de teste no half-open)
+        """
+        if not self.enabled:
+            return
+        state = self.state
+        if state == OPEN or (state == HALF_OPEN and self._half_open_calls >= self.half_open_max_calls):
+            self.rejected += 1
+            raise CircuitOpenError(self.name, self.retry_after())
+        if state == HALF_OPEN:
+            self._half_open_calls += 1
+
+    def record_success(self):
+        """Registra uma chamada bem-sucedida (fecha o circuito)"""
+        if self._state != CLOSED:
+            print(f"✅ Circuit breaker de {self.name} fechado: exchange respondendo novamente")
+        self._state = CLOSED
+        self._failures = 0
+        self._half_open_calls = 0
+
+    def record_failure(self):
+        """Registra uma falha transitória (pode abrir o circuito)"""
+        if not self.enabled:
+            return
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            if self._state != OPEN:
+                self.opened += 1
+                print(f"🔌 Circuit breaker de {self.name} aberto após {self._failures} falha(s); "
+                      f"chamadas rejeitadas por {self.reset_timeout:.0f}s")
+            self._state = OPEN
+            self._opened_at = self._clock()
+            self._half_open_calls = 0
+
+    def release(self):
+        """Libera a vaga de teste de uma chamada half-open que terminou sem veredito"""
+        if self._state == HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna o estado do circuito
+
+        Returns:
+            Dicionário com estado, falhas consecutivas, aberturas e chamadas rejeitadas
+        """
+        return {
+            'name': self.name,
+            'enabled': self.enabled,
+            'state': self.state,
+            'consecutive_failures': self._failures,
+            'opened': self.opened,
+            'rejected': self.rejected
+        }
+
+
+async def call_with_resilience(fn: Callable[[], Awaitable[Any]], policy: RetryPolicy,
+                               breaker: CircuitBreaker = None) -> Any:
+    """
+    Executa fn() com retry (backoff com jitter) protegido pelo circuit breaker
+
+    Falhas transitórias (policy.retry_on) contam para o circuito e são repetidas;
+    as demais exceções são repassadas sem retry e sem afetar o circuito. Se o
+    circuito abrir durante os retries, a próxima tentativa falha imediatamente.
+
+    Args:
+        fn: Função sem argumentos que retorna a corrotina da chamada
+        policy: Política de retry
+        breaker: Circuit breaker da exchange (opcional)
+
+    Returns:
+        Resultado de fn()
+
+    Raises:
+        CircuitOpenError: Se o circuito estiver aberto
+        Exception: A última falha, após esgotar as tentativas
+    """
+    for attempt in range(policy.max_attempts):
+        if breaker is not None:
+            breaker.before_call()
+        try:
+            result = await fn()
+        except policy.retry_on:
+            if breaker is not None:
+                breaker.record_failure()
+            if attempt >= policy.max_attempts - 1:
+                raise
+        except BaseException:
+            if breaker is not None:
+                breaker.release()
+            raise
+        else:
+            if breaker is not None:
+                breaker.record_success()
+            return result
+
+        await asyncio.sleep(policy.delay(attempt))
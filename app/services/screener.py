@@ -0,0 +1,223 @@
+"""
+Screener de mercado: ranking dos pares de uma moeda de cotação pelo score
+
+Pipeline de uma varredura:
+- universo: pares do índice de mercados cotados em `quote`, os de maior volume em
+  24h primeiro (um único fetch_tickers);
+- busca dos candles em paralelo, limitada por um semáforo (o throttle do ccxt,
+  o retry com backoff e o circuit breaker do CryptoService continuam valendo);
+- à medida que os candles chegam, lotes de símbolos são empilhados em matrizes
+  (símbolos × candles) e pontuados no pool de processos (uma passada do kernel
+  por timeframe e lote);
+- um heap limitado mantém só os melhores `max_top` resultados.
+
+O ranking fica em cache até o fechamento do candle do menor timeframe e o
+progresso das varreduras em andamento pode ser consultado em stats().
+"""
+import asyncio
+import heapq
+import math
+import time
+from typing import Any, Dict, List
+
+from app.services.analysis_tasks import score_symbols
+from app.services.executor_pool import ManagedExecutor
+from app.services.indicator_kernel import stack_ohlcv
+from app.services.indicator_params import DEFAULT_PARAMS, IndicatorParams
+from app.services.lookback_planner import LookbackPlanner
+from app.services.single_flight import SingleFlight
+from app.services.timeframes import TIMEFRAME_MINUTES, candle_open_time
+from app.utils.score_engine import ScoreEngine
+
+
+class MarketScreener:
+    """Varre os pares de uma moeda de cotação e mantém o ranking por score"""
+
+    def __init__(self, crypto_service, cpu_pool: ManagedExecutor, planner: LookbackPlanner = None,
+                 params: IndicatorParams = DEFAULT_PARAMS, universe: int = 150, concurrency: int = 16,
+                 batch_size: int = 50, max_top: int = 100, timeframes: List[str] = None):
+        """
+        Args:
+            crypto_service: CryptoService usado para mercados, tickers e candles
+            cpu_pool: Pool onde os lotes são pontuados
+            planner: Planejador do histórico por timeframe (padrão: LookbackPlanner(params))
+            params: Períodos dos indicadores
+            universe: Máximo de pares por varredura (os de maior volume em 24h)
+            concurrency: Buscas de candles simultâneas
+            batch_size: Símbolos por lote enviado ao pool
+            max_top: Resultados mantidos no ranking (limite do parâmetro `top`)
+            timeframes: Timeframes do score geral (padrão: 1h, 4h e 1d)
+        """
+        self.crypto_service = crypto_service
+        self.cpu_pool = cpu_pool
+        self.params = params
+        self.planner = planner or LookbackPlanner(params)
+        self.universe = universe
+        self.concurrency = max(1, concurrency)
+        self.batch_size = max(1, batch_size)
+        self.max_top = max_top
+        self.timeframes = timeframes or list(ScoreEngine.TIMEFRAME_WEIGHTS)
+        self.single_flight = SingleFlight()
+        self._results: Dict[tuple, Dict[str, Any]] = {}
+        self._progress: Dict[tuple, Dict[str, Any]] = {}
+        self.scans = 0
+        self.cache_hits = 0
+
+    async def scan(self, quote: str = 'USDT', timeframe: str = None, top: int = 50) -> Dict[str, Any]:
+        """
+        Ranking dos pares pelo score (do cache enquanto o candle atual não fechar)
+
+        Args:
+            quote: Moeda de cotação (ex: 'USDT', 'BRL')
+            timeframe: Score de um único timeframe; None usa o score geral (1h/4h/1d)
+            top: Número de resultados (até max_top)
+
+        Returns:
+            Dicionário com o ranking e os metadados da varredura
+
+        Raises:
+            ValueError: Se não houver pares listados com a moeda de cotação
+        """
+        quote = quote.upper()
+        timeframes = [timeframe] if timeframe else self.timeframes
+        key = (quote, timeframe)
+        base_tf = min(timeframes, key=TIMEFRAME_MINUTES.__getitem__)
+        candle_open = candle_open_time(self.crypto_service.exchange.milliseconds(), base_tf)
+
+        result = self._results.get(key)
+        cached = result is not None and result['candle_open'] == candle_open
+        if cached:
+            self.cache_hits += 1
+        else:
+            result = await self.single_flight.do(
+                ('screener', key, candle_open),
+                lambda: self._run_scan(key, quote, timeframes, candle_open)
+            )
+        return {**result, 'results': result['results'][:top], 'cached': cached}
+
+    async def _universe(self, quote: str) -> List[str]:
+        """Pares cotados em `quote`, limitados aos `universe` de maior volume em 24h"""
+        index = self.crypto_service.market_index
+        if not index.loaded:
+            await self.crypto_service.load_markets()
+        symbols = index.symbols(quote)
+        if not symbols:
+            raise ValueError(f"Nenhum par listado com a moeda de cotação {quote}")
+        if len(symbols) > self.universe:
+            volumes = await self.crypto_service.get_quote_volumes(symbols)
+            symbols = heapq.nlargest(self.universe, symbols, key=volumes.__getitem__)
+        return symbols
+
+    async def _run_scan(self, key: tuple, quote: str, timeframes: List[str], candle_open: int) -> Dict[str, Any]:
+        """Executa uma varredura completa e guarda o ranking no cache"""
+        started = time.perf_counter()
+        symbols = await self._universe(quote)
+        limits = self.planner.plan(timeframes, ScoreEngine.REQUIRED_INDICATORS)
+        progress = {
+            'quote': quote, 'timeframe': key[1], 'state': 'running', 'total': len(symbols),
+            'fetched': 0, 'failed': 0, 'scored': 0, 'started_at': time.time(), 'elapsed_seconds': 0.0
+        }
+        self._progress[key] = progress
+        semaphore = asyncio.Semaphore(self.concurrency)
+        heap: List[tuple] = []
+
+        async def fetch(symbol):
+            async with semaphore:
+                try:
+                    frames = await self.crypto_service.get_multiple_timeframes(symbol, timeframes, limits)
+                except Exception as e:
+                    progress['failed'] += 1
+                    print(f"⚠️ Screener: {symbol} ignorado ({type(e).__name__})")
+                    return symbol, None
+            progress['fetched'] += 1
+            return symbol, frames
+
+        # Lotes pontuados no pool enquanto as buscas seguintes continuam
+        fetches = [asyncio.ensure_future(fetch(symbol)) for symbol in symbols]
+        batches, pending = [], {}
+        try:
+            for completed in asyncio.as_completed(fetches):
+                symbol, frames = await completed
+                if frames is None:
+                    continue
+                pending[symbol] = frames
+                if len(pending) >= self.batch_size:
+                    batches.append(asyncio.ensure_future(self._score_batch(pending, limits, heap, progress)))
+                    pending = {}
+            if pending:
+                batches.append(asyncio.ensure_future(self._score_batch(pending, limits, heap, progress)))
+            await asyncio.gather(*batches)
+        except BaseException:
+            for task in fetches + batches:
+                task.cancel()
+            progress['state'] = 'failed'
+            raise
+        finally:
+            progress['elapsed_seconds'] = time.perf_counter() - started
+
+        progress['state'] = 'done'
+        ranking = sorted(heap, reverse=True)
+        result = {
+            'quote': quote,
+            'timeframe': key[1],
+            'timeframes': timeframes,
+            'candle_open': candle_open,
+            'scanned': progress['scored'],
+            'failed': progress['failed'],
+            'elapsed_seconds': round(progress['elapsed_seconds'], 3),
+            'results': [{'rank': rank, **entry} for rank, (_, _, entry) in enumerate(ranking, start=1)]
+        }
+        self._results[key] = result
+        self.scans += 1
+        print(f"✅ Screener {quote} ({key[1] or 'geral'}): {progress['scored']} pares em {progress['elapsed_seconds']:.1f}s")
+        return result
+
+    async def _score_batch(self, frames: Dict[str, Dict[str, Any]], limits: Dict[str, int],
+                           heap: List[tuple], progress: Dict[str, Any]):
+        """Pontua um lote no pool e insere os resultados no heap limitado"""
+        ohlcv = {}
+        for tf, limit in limits.items():
+            symbols, matrices = stack_ohlcv({symbol: by_tf[tf] for symbol, by_tf in frames.items()}, limit)
+            ohlcv[tf] = {name: matrices[name] for name in ('high', 'low', 'close', 'volume')}
+
+        scored = await self.cpu_pool.run(score_symbols, ohlcv, self.params)
+
+        for row, symbol in enumerate(symbols):
+            if not scored['valid'][row]:
+                continue
+            score = float(scored['overall'][row])
+            rsi = float(scored['rsi'][row])
+            entry = {
+                'symbol': symbol,
+                'score': round(score, 2),
+                'diagnostic': ScoreEngine.get_diagnostic(score, {}),
+                'scores': {tf: round(float(values[row]), 2) for tf, values in scored['scores'].items()},
+                'last_close': float(scored['last_close'][row]),
+                'rsi': None if math.isnan(rsi) else round(rsi, 2)
+            }
+            item = (score, symbol, entry)
+            if len(heap) < self.max_top:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        progress['scored'] += len(symbols)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna o progresso das varreduras e o estado do cache
+
+        Returns:
+            Dicionário com a última varredura de cada (quote, timeframe) e contadores
+        """
+        return {
+            'scans': self.scans,
+            'cache_hits': self.cache_hits,
+            'universe': self.universe,
+            'concurrency': self.concurrency,
+            'batch_size': self.batch_size,
+            'progress': [
+                {**progress, 'elapsed_seconds': round(time.time() - progress['started_at'], 3)}
+                if progress['state'] == 'running' else dict(progress)
+                for progress in self._progress.values()
+            ]
+        }
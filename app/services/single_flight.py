@@ -0,0 +1,66 @@
+"""
+Single-flight: coalescência de chamadas idênticas e simultâneas à exchange
+
+Quando vários chamadores pedem a mesma chave ao mesmo tempo, apenas o primeiro
+dispara a chamada; os demais aguardam a mesma tarefa e recebem o mesmo resultado
+(ou a mesma exceção).
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """Agrupa chamadas assíncronas simultâneas com a mesma chave"""
+
+    def __init__(self, enabled: bool = True):
+        """
+        Args:
+            enabled: Se False, toda chamada é executada individualmente
+        """
+        self.enabled = enabled
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.calls = 0
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Executa fn() uma única vez por chave enquanto houver uma chamada em andamento
+
+        A tarefa compartilhada é protegida com asyncio.shield, então o cancelamento
+        de um chamador não cancela a chamada para os demais.
+
+        Args:
+            key: Chave que identifica a chamada (ex: (symbol, timeframe, since, limit))
+            fn: Função sem argumentos que retorna a corrotina a executar
+
+        Returns:
+            Resultado de fn()
+        """
+        if not self.enabled:
+            self.calls += 1
+            return await fn()
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.shared += 1
+            return await asyncio.shield(task)
+
+        self.calls += 1
+        task = asyncio.ensure_future(fn())
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas de coalescência
+
+        Returns:
+            Dicionário com chamadas executadas, chamadas compartilhadas e em andamento
+        """
+        return {
+            'enabled': self.enabled,
+            'calls': self.calls,
+            'shared': self.shared,
+            'in_flight': len(self._inflight)
+        }
@@ -0,0 +1,430 @@
+"""
+Motor incremental de indicadores técnicos (custo O(1) por candle)
+
+Em vez de recalcular todos os indicadores sobre os 500 candles a cada requisição,
+cada (symbol, timeframe) guarda o estado das recorrências: valores das EMAs, médias
+de Wilder (RMA), janelas móveis e o OBV acumulado. Quando um candle fecha, o estado
+avança uma vez; o candle em formação é avaliado sobre uma cópia do estado, sem alterá-lo.
+
+As fórmulas seguem as do pandas_ta (parâmetros em IndicatorParams, padrão do pandas_ta):
+- EMA: semente = SMA dos primeiros `length` valores, depois ewm(span, adjust=False)
+- RMA (RSI, ATR, ADX): ewm(alpha=1/length, adjust=True, min_periods=length)
+- Bollinger: média e desvio padrão populacional (ddof=0) da janela
+- Stochastic RSI, MFI, OBV e ADX como em pandas_ta 0.3.14b
+"""
+import math
+import sys
+from collections import OrderedDict, deque
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from app.services.candle_buffer import OHLCV_COLUMNS
+from app.services.indicator_params import DEFAULT_PARAMS, IndicatorParams
+from app.services.timeframes import to_epoch_ms
+
+
+EPSILON = sys.float_info.epsilon
+
+# Mínimo de candles para calcular indicadores (mesmo critério do IndicatorService)
+MIN_CANDLES = 14
+
+# Indicadores por categoria e casas decimais de cada um na resposta
+INDICATOR_LAYOUT: Dict[str, List[Tuple[str, int]]] = {
+    'trend': [('EMA9', 2), ('EMA21', 2), ('EMA50', 2), ('EMA200', 2), ('SMA100', 2)],
+    'momentum': [('RSI', 2), ('Stochastic_RSI_K', 2), ('Stochastic_RSI_D', 2),
+                 ('MACD', 4), ('MACD_Signal', 4), ('MACD_Histogram', 4)],
+    'volatility': [('ATR', 2), ('BB_Upper', 2), ('BB_Middle', 2), ('BB_Lower', 2)],
+    'volume': [('Volume_MA', 2), ('MFI', 2), ('OBV', 0)],
+    'strength': [('ADX', 2)],
+    'price': [('last_close', 2), ('current_volume', 2)]
+}
+
+# Casas decimais de cada indicador
+FIELD_DECIMALS: Dict[str, int] = {name: decimals for fields in INDICATOR_LAYOUT.values() for name, decimals in fields}
+
+
+class _State:
+    """Base dos estados incrementais: cópia barata (usada para o candle em formação)"""
+
+    __slots__ = ()
+
+    def copy(self):
+        new = object.__new__(type(self))
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if isinstance(value, deque):
+                value = deque(value, value.maxlen)
+            elif isinstance(value, _State):
+                value = value.copy()
+            setattr(new, name, value)
+        return new
+
+
+class _EMA(_State):
+    """EMA com semente SMA (pandas_ta: sma=True, adjust=False)"""
+
+    __slots__ = ('length', 'alpha', 'count', 'seed_sum', 'value')
+
+    def __init__(self, length: int):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+        self.count = 0
+        self.seed_sum = 0.0
+        self.value = None
+
+    def update(self, x: float) -> Optional[float]:
+        self.count += 1
+        if self.count < self.length:
+            self.seed_sum += x
+            return None
+        if self.count == self.length:
+            self.value = (self.seed_sum + x) / self.length
+        else:
+            self.value = self.alpha * x + (1.0 - self.alpha) * self.value
+        return self.value
+
+
+class _RMA(_State):
+    """Média de Wilder como no pandas_ta: ewm(alpha=1/length, adjust=True, min_periods=length)"""
+
+    __slots__ = ('length', 'decay', 'count', 'num', 'den')
+
+    def __init__(self, length: int):
+        self.length = length
+        self.decay = 1.0 - 1.0 / length
+        self.count = 0
+        self.num = 0.0
+        self.den = 0.0
+
+    def update(self, x: Optional[float]) -> Optional[float]:
+        # Valores ausentes só ocorrem no início da série (ex: primeira diferença)
+        if x is not None:
+            self.num = x + self.decay * self.num
+            self.den = 1.0 + self.decay * self.den
+            self.count += 1
+        if self.count < self.length:
+            return None
+        return self.num / self.den
+
+
+class _Window(_State):
+    """Janela móvel de tamanho fixo com soma mantida incrementalmente"""
+
+    __slots__ = ('length', 'values', 'total')
+
+    def __init__(self, length: int):
+        self.length = length
+        self.values = deque(maxlen=length)
+        self.total = 0.0
+
+    @property
+    def full(self) -> bool:
+        return len(self.values) == self.length
+
+    def update(self, x: float):
+        if self.full:
+            self.total -= self.values[0]
+        self.values.append(x)
+        self.total += x
+
+    def mean(self) -> Optional[float]:
+        return self.total / self.length if self.full else None
+
+
+class StreamingIndicators(_State):
+    """Estado incremental de todos os indicadores de uma série (symbol, timeframe)"""
+
+    __slots__ = (
+        'params', 'count', 'last_timestamp', 'last_values', 'prev_high', 'prev_low', 'prev_close', 'prev_tp', 'obv',
+        'ema_fast', 'ema_medium', 'ema_trend', 'ema_slow', 'sma',
+        'rsi_gain', 'rsi_loss', 'rsi_window', 'stoch_k', 'stoch_d',
+        'macd_fast', 'macd_slow', 'macd_signal',
+        'atr', 'bb', 'volume_ma', 'mfi_pos', 'mfi_neg',
+        'dm_pos', 'dm_neg', 'adx_atr', 'adx'
+    )
+
+    def __init__(self, params: IndicatorParams = DEFAULT_PARAMS):
+        """
+        Args:
+            params: Períodos e multiplicadores dos indicadores
+        """
+        self.params = params
+        self.count = 0
+        self.last_timestamp = None
+        self.last_values: Dict[str, Optional[float]] = {}
+        self.prev_high = self.prev_low = self.prev_close = self.prev_tp = None
+        self.obv = 0.0
+
+        self.ema_fast, self.ema_medium = _EMA(params.ema_fast), _EMA(params.ema_medium)
+        self.ema_trend, self.ema_slow = _EMA(params.ema_trend), _EMA(params.ema_slow)
+        self.sma = _Window(params.sma_period)
+
+        self.rsi_gain, self.rsi_loss = _RMA(params.rsi_period), _RMA(params.rsi_period)
+        self.rsi_window = _Window(params.stoch_rsi_length)
+        self.stoch_k, self.stoch_d = _Window(params.stoch_k), _Window(params.stoch_d)
+        self.macd_fast, self.macd_slow = _EMA(params.macd_fast), _EMA(params.macd_slow)
+        self.macd_signal = _EMA(params.macd_signal)
+
+        self.atr = _RMA(params.atr_period)
+        self.bb = _Window(params.bb_period)
+
+        self.volume_ma = _Window(params.volume_ma_period)
+        self.mfi_pos, self.mfi_neg = _Window(params.mfi_period), _Window(params.mfi_period)
+
+        # O ADX usa o ATR do próprio período (compartilhado quando os períodos coincidem)
+        self.dm_pos, self.dm_neg = _RMA(params.adx_period), _RMA(params.adx_period)
+        self.adx_atr = None if params.adx_period == params.atr_period else _RMA(params.adx_period)
+        self.adx = _RMA(params.adx_period)
+
+    def update(self, timestamp: int, high: float, low: float, close: float, volume: float) -> Dict[str, Optional[float]]:
+        """
+        Avança o estado com um candle e retorna os indicadores nesse candle
+
+        Args:
+            timestamp: Abertura do candle (ms)
+            high, low, close, volume: Valores do candle
+
+        Returns:
+            Dicionário plano {indicador: valor} (None enquanto não há candles suficientes)
+        """
+        prev_close = self.prev_close
+        first = prev_close is None
+        self.count += 1
+        out: Dict[str, Optional[float]] = {'last_close': close, 'current_volume': volume}
+
+        # ========== TENDÊNCIA ==========
+        out['EMA9'] = self.ema_fast.update(close)
+        out['EMA21'] = self.ema_medium.update(close)
+        out['EMA50'] = self.ema_trend.update(close)
+        out['EMA200'] = self.ema_slow.update(close)
+        self.sma.update(close)
+        out['SMA100'] = self.sma.mean()
+
+        # ========== MOMENTUM ==========
+        change = None if first else close - prev_close
+        gain = self.rsi_gain.update(None if first else max(change, 0.0))
+        loss = self.rsi_loss.update(None if first else max(-change, 0.0))
+        rsi = 100.0 * gain / (gain + loss) if gain is not None and gain + loss > 0 else None
+        out['RSI'] = rsi
+
+        stoch_k = stoch_d = None
+        if rsi is not None:
+            self.rsi_window.update(rsi)
+            if self.rsi_window.full:
+                lowest, highest = min(self.rsi_window.values), max(self.rsi_window.values)
+                stoch = 100.0 * (rsi - lowest) / ((highest - lowest) or EPSILON)
+                self.stoch_k.update(stoch)
+                stoch_k = self.stoch_k.mean()
+                if stoch_k is not None:
+                    self.stoch_d.update(stoch_k)
+                    stoch_d = self.stoch_d.mean()
+        out['Stochastic_RSI_K'], out['Stochastic_RSI_D'] = stoch_k, stoch_d
+
+        fast, slow = self.macd_fast.update(close), self.macd_slow.update(close)
+        macd = signal = histogram = None
+        if fast is not None and slow is not None:
+            macd = fast - slow
+            signal = self.macd_signal.update(macd)
+            histogram = macd - signal if signal is not None else None
+        out['MACD'], out['MACD_Signal'], out['MACD_Histogram'] = macd, signal, histogram
+
+        # ========== VOLATILIDADE ==========
+        true_range = None if first else max(high - low, abs(high - prev_close), abs(prev_close - low))
+        atr = self.atr.update(true_range)
+        out['ATR'] = atr
+
+        self.bb.update(close)
+        middle = self.bb.mean()
+        if middle is not None:
+            std = math.sqrt(sum((x - middle) ** 2 for x in self.bb.values) / self.bb.length)
+            width = self.params.bb_std * std
+            out['BB_Upper'], out['BB_Middle'], out['BB_Lower'] = middle + width, middle, middle - width
+        else:
+            out['BB_Upper'] = out['BB_Middle'] = out['BB_Lower'] = None
+
+        # ========== VOLUME ==========
+        self.volume_ma.update(volume)
+        out['Volume_MA'] = self.volume_ma.mean()
+
+        typical_price = (high + low + close) / 3
+        money_flow = typical_price * volume
+        up = self.prev_tp is not None and typical_price > self.prev_tp
+        down = self.prev_tp is not None and typical_price < self.prev_tp
+        self.mfi_pos.update(money_flow if up else 0.0)
+        self.mfi_neg.update(money_flow if down else 0.0)
+        flow = self.mfi_pos.total + self.mfi_neg.total
+        out['MFI'] = 100.0 * self.mfi_pos.total / flow if self.mfi_pos.full and flow > 0 else None
+
+        if first:
+            self.obv = volume
+        elif change > 0:
+            self.obv += volume
+        elif change < 0:
+            self.obv -= volume
+        out['OBV'] = self.obv
+
+        # ========== FORÇA ==========
+        adx = None
+        adx_atr = atr if self.adx_atr is None else self.adx_atr.update(true_range)
+        if first:
+            self.dm_pos.update(None)
+            self.dm_neg.update(None)
+        else:
+            move_up = high - self.prev_high
+            move_down = self.prev_low - low
+            plus = self.dm_pos.update(move_up if move_up > move_down and move_up > 0 else 0.0)
+            minus = self.dm_neg.update(move_down if move_down > move_up and move_down > 0 else 0.0)
+            if adx_atr and plus is not None and minus is not None:
+                di_plus, di_minus = 100.0 * plus / adx_atr, 100.0 * minus / adx_atr
+                if di_plus + di_minus > 0:
+                    adx = self.adx.update(100.0 * abs(di_plus - di_minus) / (di_plus + di_minus))
+        out['ADX'] = adx
+
+        self.prev_high, self.prev_low, self.prev_close, self.prev_tp = high, low, close, typical_price
+        self.last_timestamp = timestamp
+        self.last_values = out
+        return out
+
+
+def format_indicators(values: Dict[str, Optional[float]]) -> Dict[str, Any]:
+    """
+    Organiza valores planos no formato de resposta do IndicatorService (com arredondamento)
+
+    Args:
+        values: Dicionário plano {indicador: valor}
+
+    Returns:
+        Dicionário com as categorias trend, momentum, volatility, volume, strength e price
+    """
+    result = {}
+    for category, fields in INDICATOR_LAYOUT.items():
+        result[category] = {}
+        for name, decimals in fields:
+            value = values.get(name)
+            if value is None or math.isnan(value):
+                result[category][name] = None
+            else:
+                result[category][name] = round(float(value), decimals)
+    return result
+
+
+def format_series(values: np.ndarray, field: str) -> List[Optional[float]]:
+    """
+    Converte a série de um indicador em lista JSON (arredondada, NaN -> None)
+
+    O arredondamento e a conversão são feitos sobre o buffer NumPy inteiro;
+    só as posições NaN são trocadas por None.
+
+    Args:
+        values: Array float64 com um valor por candle
+        field: Nome do indicador (define as casas decimais, como em format_indicators)
+
+    Returns:
+        Lista com um valor por candle
+    """
+    result = np.round(values, FIELD_DECIMALS[field]).tolist()
+    for index in np.flatnonzero(np.isnan(values)).tolist():
+        result[index] = None
+    return result
+
+
+class StreamingIndicatorService:
+    """Mantém o estado incremental dos indicadores por (symbol, timeframe)"""
+
+    def __init__(self, max_series: int = 256, params: IndicatorParams = DEFAULT_PARAMS):
+        """
+        Args:
+            max_series: Número máximo de séries mantidas (LRU)
+            params: Períodos e multiplicadores dos indicadores
+        """
+        self.max_series = max_series
+        self.params = params
+        self._states: "OrderedDict[Tuple[str, str], StreamingIndicators]" = OrderedDict()
+        self.rebuilds = 0
+        self.advanced = 0
+
+    def get_indicators(self, symbol: str, timeframe: str, df: pd.DataFrame, forming: bool = True) -> Dict[str, Any]:
+        """
+        Calcula os indicadores do último candle reaproveitando o estado da série
+
+        Os candles fechados ainda não vistos avançam o estado (normalmente 0 ou 1);
+        o último candle, se `forming`, é avaliado sobre uma cópia do estado. Se o
+        DataFrame não continuar a série armazenada (buraco ou outra janela), o
+        estado é reconstruído a partir dos candles recebidos.
+
+        Args:
+            symbol: Par de trading
+            timeframe: Timeframe dos candles
+            df: DataFrame ordenado com colunas timestamp, open, high, low, close, volume
+            forming: Se True, o último candle está em formação e não altera o estado
+
+        Returns:
+            Dicionário no mesmo formato de IndicatorService.get_indicators
+        """
+        if df is None or df.empty or len(df) < MIN_CANDLES:
+            return format_indicators({})
+
+        missing_columns = [col for col in OHLCV_COLUMNS if col not in df.columns]
+        if missing_columns:
+            raise ValueError(f"DataFrame faltando colunas: {', '.join(missing_columns)}")
+
+        timestamps = to_epoch_ms(df['timestamp'])
+        values = df[['high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64)
+        closed = len(df) - 1 if forming else len(df)
+
+        key = (symbol, timeframe)
+        state = self._states.get(key)
+        start = self._resume_index(state, timestamps, closed)
+        if start is None:
+            state = StreamingIndicators(self.params)
+            start = 0
+            self.rebuilds += 1
+            self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_series:
+            self._states.popitem(last=False)
+
+        for i in range(start, closed):
+            state.update(int(timestamps[i]), *values[i].tolist())
+        self.advanced += max(0, closed - start)
+
+        if forming:
+            out = state.copy().update(int(timestamps[-1]), *values[-1].tolist())
+        else:
+            out = state.last_values
+        return format_indicators(out)
+
+    @staticmethod
+    def _resume_index(state: Optional[StreamingIndicators], timestamps: np.ndarray, closed: int) -> Optional[int]:
+        """
+        Índice do primeiro candle fechado ainda não incorporado ao estado
+
+        Returns:
+            Índice em `timestamps` ou None se o estado precisa ser reconstruído
+        """
+        if state is None or state.last_timestamp is None or closed == 0:
+            return None
+        position = int(np.searchsorted(timestamps[:closed], state.last_timestamp, side='left'))
+        if position >= closed or timestamps[position] != state.last_timestamp:
+            return None
+        return position + 1
+
+    def clear(self):
+        """Descarta o estado de todas as séries"""
+        self._states.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas do motor incremental
+
+        Returns:
+            Dicionário com séries mantidas, reconstruções e candles avançados
+        """
+        return {
+            'series': len(self._states),
+            'max_series': self.max_series,
+            'rebuilds': self.rebuilds,
+            'advanced': self.advanced
+        }
@@ -0,0 +1,166 @@
+"""
+Alinhamento de timeframes maiores à grade do timeframe base (sem look-ahead)
+
+Para cada candle base (ex: 1h), o estado de um timeframe maior (4h, 1d) é o do
+último candle maior já fechado no fechamento do candle base. O índice desse
+candle é obtido com um único searchsorted sobre os horários de fechamento,
+funciona com lacunas no histórico e com semanas que abrem na segunda-feira.
+
+As séries do timeframe maior continuam com o seu tamanho original: o alinhamento
+guarda só o índice (um int64 por candle base) e faz o gather quando um campo é
+lido, ou direto no buffer do score combinado.
+"""
+from collections.abc import Mapping
+from typing import Dict, Iterator
+
+import numpy as np
+
+from app.services.timeframes import timeframe_to_ms, to_epoch_ms
+
+
+def last_closed_index(base_close_ms: np.ndarray, coarse_open_ms: np.ndarray, coarse_interval_ms: int) -> np.ndarray:
+    """
+    Para cada candle base, índice do último candle maior já fechado no seu fechamento
+
+    Args:
+        base_close_ms: Horário de fechamento de cada candle base (ms)
+        coarse_open_ms: Aberturas ordenadas dos candles maiores (ms)
+        coarse_interval_ms: Duração do candle maior (ms)
+
+    Returns:
+        Array int64 de índices em coarse_open_ms (-1 quando nenhum candle fechou ainda)
+    """
+    return np.searchsorted(coarse_open_ms + coarse_interval_ms, base_close_ms, side='right') - 1
+
+
+class AlignedFields(Mapping):
+    """Séries de um timeframe maior vistas na grade base (gather sob demanda, sem cópia prévia)"""
+
+    def __init__(self, series: Dict[str, np.ndarray], index: np.ndarray, missing: float = np.nan):
+        self._series = series
+        self._index = index
+        self._missing = missing
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return _gather(self._series[name], self._index, self._missing)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._series)
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+
+def _gather(values: np.ndarray, index: np.ndarray, missing: float, out: np.ndarray = None) -> np.ndarray:
+    out = np.take(values, np.maximum(index, 0), out=out)
+    out[index < 0] = missing
+    return out
+
+
+class TimeframeAlignment:
+    """Junta séries de vários timeframes à grade de candles do timeframe base"""
+
+    def __init__(self, base_timeframe: str, base_timestamps):
+        """
+        Args:
+            base_timeframe: Timeframe base (ex: '1h')
+            base_timestamps: Abertura dos candles base (ms ou datetime)
+        """
+        self.base_timeframe = base_timeframe
+        self.timestamps = to_epoch_ms(base_timestamps)
+        self.close_ms = self.timestamps + timeframe_to_ms(base_timeframe)
+        self._indices: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def add(self, timeframe: str, timestamps) -> np.ndarray:
+        """
+        Registra os candles de um timeframe maior
+
+        Args:
+            timeframe: Timeframe (ex: '4h')
+            timestamps: Abertura dos seus candles, em ordem (ms ou datetime)
+
+        Returns:
+            Índice do último candle fechado para cada candle base (-1 se nenhum)
+        """
+        if timeframe == self.base_timeframe:
+            index = np.arange(len(self), dtype=np.int64)
+        else:
+            index = last_closed_index(self.close_ms, to_epoch_ms(timestamps), timeframe_to_ms(timeframe))
+        self._indices[timeframe] = index
+        return index
+
+    def index(self, timeframe: str) -> np.ndarray:
+        """
+        Índice de alinhamento de um timeframe registrado
+
+        Raises:
+            KeyError: Se o timeframe não foi registrado com add()
+        """
+        if timeframe == self.base_timeframe and timeframe not in self._indices:
+            return self.add(timeframe, None)
+        return self._indices[timeframe]
+
+    def align(self, timeframe: str, values: np.ndarray, missing: float = np.nan) -> np.ndarray:
+        """
+        Valores de um timeframe na grade base
+
+        Args:
+            timeframe: Timeframe dos valores
+            values: Um valor por candle do timeframe
+            missing: Valor antes do primeiro candle fechado
+
+        Returns:
+            Array com um valor por candle base (o próprio array no timeframe base)
+        """
+        if timeframe == self.base_timeframe:
+            return values
+        return _gather(values, self.index(timeframe), missing)
+
+    def fields(self, timeframe: str, series: Dict[str, np.ndarray], missing: float = np.nan) -> Mapping:
+        """
+        Séries de indicadores de um timeframe na grade base, alinhadas ao serem lidas
+
+        Args:
+            timeframe: Timeframe das séries
+            series: Dicionário {campo: array} (ex: compute_series_from_dataframe)
+            missing: Valor antes do primeiro candle fechado
+
+        Returns:
+            Mapping {campo: array na grade base}
+        """
+        if timeframe == self.base_timeframe:
+            return series
+        return AlignedFields(series, self.index(timeframe), missing)
+
+    def blend(self, scores: Dict[str, np.ndarray], weights: Dict[str, float], missing: float = 0.5) -> np.ndarray:
+        """
+        Score combinado em cada candle base (como analyze_multiple_timeframes)
+
+        Soma na mesma ordem do cálculo escalar, com um único buffer de trabalho
+        para o gather dos timeframes maiores.
+
+        Args:
+            scores: Score de cada candle por timeframe ({'1h': array, '4h': array, ...})
+            weights: Peso por timeframe
+            missing: Score de um timeframe ausente ou ainda sem candle fechado
+                (0.5 como na API; NaN marca o candle como indisponível)
+
+        Returns:
+            Array com o score combinado de cada candle base
+        """
+        total = np.zeros(len(self))
+        buffer = np.empty(len(self))
+        for tf, weight in weights.items():
+            if tf not in scores:
+                values = np.full(len(self), missing)
+            elif tf == self.base_timeframe:
+                values = buffer
+                np.copyto(values, scores[tf])
+            else:
+                values = _gather(scores[tf], self.index(tf), missing, out=buffer)
+            values *= weight
+            total += values
+        return total
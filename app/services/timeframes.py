@@ -0,0 +1,61 @@
+"""
+Constantes e utilitários de timeframes compartilhados pelos serviços
+"""
+import numpy as np
+
+# Timeframes suportados e sua duração em minutos
+TIMEFRAME_MINUTES = {
+    '1m': 1, '5m': 5, '15m': 15, '30m': 30,
+    '1h': 60, '4h': 240, '1d': 1440, '1w': 10080
+}
+
+VALID_TIMEFRAMES = list(TIMEFRAME_MINUTES.keys())
+
+# A Binance abre candles semanais na segunda-feira 00:00 UTC; a epoch Unix
+# (1970-01-01) foi uma quinta-feira, então o alinhamento semanal é deslocado 4 dias
+WEEK_OFFSET_MS = 4 * 24 * 60 * 60 * 1000
+
+
+def timeframe_to_ms(timeframe: str) -> int:
+    """
+    Converte um timeframe para sua duração em milissegundos
+
+    Args:
+        timeframe: Timeframe ('1m', '1h', '4h', '1d', ...)
+
+    Returns:
+        Duração do candle em milissegundos
+    """
+    return TIMEFRAME_MINUTES.get(timeframe, 60) * 60 * 1000
+
+
+def candle_open_time(timestamp_ms: int, timeframe: str) -> int:
+    """
+    Retorna o horário de abertura do candle que contém o timestamp informado
+
+    Também funciona elemento a elemento para arrays int64 do NumPy.
+
+    Args:
+        timestamp_ms: Timestamp em milissegundos (UTC)
+        timeframe: Timeframe do candle
+
+    Returns:
+        Timestamp de abertura do candle em milissegundos
+    """
+    interval = timeframe_to_ms(timeframe)
+    offset = WEEK_OFFSET_MS if timeframe == '1w' else 0
+    return timestamp_ms - ((timestamp_ms - offset) % interval)
+
+
+def to_epoch_ms(timestamps) -> np.ndarray:
+    """
+    Converte uma coluna de datetimes (com ou sem timezone) em epoch ms int64
+
+    Args:
+        timestamps: Série ou array de datetimes
+
+    Returns:
+        Array int64 com os timestamps em milissegundos
+    """
+    values = getattr(timestamps, 'values', timestamps)
+    return np.asarray(values).astype('datetime64[ms]').astype(np.int64)
@@ -0,0 +1,300 @@
+"""
+Otimização dos pesos do ScoreEngine sobre o histórico local
+
+Os sub-scores de cada indicador não dependem dos pesos, então são calculados uma
+única vez por símbolo e timeframe (ScoreEngine.score_features) e alinhados à
+grade do timeframe base sem look-ahead. Avaliar um conjunto de pesos vira um
+produto matriz-vetor (features × coeficientes); um lote de candidatos é um
+produto de matrizes seguido do backtest vetorizado de todas as linhas de uma vez
+(mesmas regras de backtest.simulate).
+
+Os candidatos (grade ou amostragem aleatória) são divididos em lotes e avaliados
+em um pool de processos; cada worker recebe as features uma única vez.
+"""
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, NamedTuple
+
+import numpy as np
+
+from app.services.backtest import BacktestConfig, BacktestEngine, equity_curves, hold_positions
+from app.services.indicator_kernel import compute_series_from_dataframe
+from app.services.indicator_params import DEFAULT_PARAMS, IndicatorParams
+from app.services.streaming_indicators import FIELD_DECIMALS
+from app.services.timeframe_alignment import TimeframeAlignment
+from app.utils.score_engine import ScoreEngine
+from app.utils.score_weights import CATEGORY_FIELDS, DEFAULT_WEIGHTS, MOMENTUM_FIELDS, ScoreWeights
+
+
+# Objetivos disponíveis: (retorno total, drawdown máximo) -> valor a maximizar
+OBJECTIVES = {
+    'total_return': lambda total_return, max_drawdown: total_return,
+    'return_over_drawdown': lambda total_return, max_drawdown: total_return / np.maximum(-max_drawdown, 0.01)
+}
+
+
+class SymbolFeatures(NamedTuple):
+    """Features de score de um símbolo na grade do timeframe base"""
+
+    symbol: str
+    features: Dict[str, np.ndarray]  # {timeframe: matriz (candles base × 6)}
+    valid: Dict[str, np.ndarray]     # {timeframe: preço válido (senão o score é 0.5)}
+    ready: Dict[str, np.ndarray]     # {timeframe: indicadores aquecidos e candle fechado}
+    close: np.ndarray                # fechamentos do timeframe base
+    start: int                       # primeiro candle do período avaliado
+
+
+def precompute_features(symbol: str, frames: Dict[str, Any], config: BacktestConfig = BacktestConfig(),
+                        params: IndicatorParams = DEFAULT_PARAMS, start_ms: int = None) -> SymbolFeatures:
+    """
+    Calcula os sub-scores de todos os timeframes de um símbolo (uma única vez)
+
+    Args:
+        symbol: Par de trading
+        frames: DataFrames OHLCV por timeframe (ver BacktestEngine.load_frames)
+        config: Timeframes usados
+        params: Períodos dos indicadores
+        start_ms: Início do período avaliado
+
+    Returns:
+        SymbolFeatures com as features alinhadas à grade base
+    """
+    base_tf = config.timeframes[0]
+    alignment = TimeframeAlignment(base_tf, frames[base_tf]['timestamp'])
+    features, valid, ready = {}, {}, {}
+    for tf in config.timeframes:
+        index = alignment.add(tf, frames[tf]['timestamp'])
+        series = compute_series_from_dataframe(frames[tf], ScoreEngine.REQUIRED_INDICATORS, params)
+        components = ScoreEngine.calculate_score_components(series, FIELD_DECIMALS)
+        warmed = ~np.logical_or.reduce([np.isnan(values) for values in series.values()])
+        closed = np.maximum(index, 0)
+        features[tf] = np.nan_to_num(ScoreEngine.score_features(components))[closed]
+        valid[tf] = components['valid'][closed]
+        ready[tf] = warmed[closed] & (index >= 0)
+
+    start = 0 if start_ms is None else int(np.searchsorted(alignment.timestamps, start_ms, side='left'))
+    close = frames[base_tf]['close'].to_numpy(dtype=np.float64)
+    return SymbolFeatures(symbol, features, valid, ready, close, start)
+
+
+def candidate_scores(data: SymbolFeatures, candidates: np.ndarray,
+                     config: BacktestConfig = BacktestConfig()) -> np.ndarray:
+    """
+    Score combinado de cada candidato em cada candle base
+
+    Args:
+        data: Features de um símbolo
+        candidates: Matriz (candidatos × 7) de pesos na ordem de ScoreWeights
+        config: Pesos por timeframe
+
+    Returns:
+        Matriz (candidatos × candles) com NaN durante o aquecimento
+    """
+    coefficients = np.stack([ScoreWeights.from_vector(row).coefficients() for row in candidates])
+    total = 0
+    for tf, weight in config.timeframe_weights:
+        raw = coefficients @ data.features[tf].T
+        score = np.round(np.clip((raw + 1) / 2, 0.0, 1.0), 2)
+        score = np.where(data.valid[tf], score, 0.5)
+        total = total + np.where(data.ready[tf], score, np.nan) * weight
+    return total
+
+
+def evaluate_candidates(dataset: List[SymbolFeatures], candidates: np.ndarray,
+                        config: BacktestConfig = BacktestConfig(),
+                        objective: str = 'total_return') -> Dict[str, np.ndarray]:
+    """
+    Backtest vetorizado de um lote de candidatos em todos os símbolos
+
+    Args:
+        dataset: Features por símbolo
+        candidates: Matriz (candidatos × 7) de pesos
+        config: Limiares, taxa e pesos por timeframe
+        objective: Chave de OBJECTIVES
+
+    Returns:
+        Dicionário de arrays (um valor por candidato): objective, total_return e
+        max_drawdown (médias entre os símbolos) e trades (soma)
+    """
+    rows = len(candidates)
+    totals = {'objective': np.zeros(rows), 'total_return': np.zeros(rows),
+              'max_drawdown': np.zeros(rows), 'trades': np.zeros(rows, dtype=np.int64)}
+    for data in dataset:
+        score = candidate_scores(data, candidates, config)
+        position = hold_positions(score, config, data.start)
+        _, equity, changes = equity_curves(data.close, position, config.fee_rate)
+
+        equity = equity[:, data.start:] / equity[:, data.start:data.start + 1]
+        total_return = equity[:, -1] - 1
+        max_drawdown = (equity / np.maximum.accumulate(equity, axis=1) - 1).min(axis=1)
+        totals['objective'] += OBJECTIVES[objective](total_return, max_drawdown)
+        totals['total_return'] += total_return
+        totals['max_drawdown'] += max_drawdown
+        totals['trades'] += (changes > 0).sum(axis=1)
+
+    for name in ('objective', 'total_return', 'max_drawdown'):
+        totals[name] /= max(1, len(dataset))
+    return totals
+
+
+def _simplex_grid(size: int, step: float) -> np.ndarray:
+    """Todos os vetores de `size` pesos não negativos, múltiplos de `step`, que somam 1"""
+    units = int(round(1 / step))
+    points = []
+    for bars in itertools.combinations(range(units + size - 1), size - 1):
+        edges = (-1,) + bars + (units + size - 1,)
+        points.append([edges[i + 1] - edges[i] - 1 for i in range(size)])
+    return np.array(points, dtype=np.float64) / units
+
+
+def grid_candidates(step: float = 0.1) -> np.ndarray:
+    """
+    Grade de pesos: categorias × sub-pesos do momento, cada grupo somando 1
+
+    Args:
+        step: Passo da grade (0.1 gera 286 × 66 = 18.876 candidatos)
+
+    Returns:
+        Matriz (candidatos × 7) na ordem de ScoreWeights
+    """
+    categories = _simplex_grid(len(CATEGORY_FIELDS), step)
+    momentum = _simplex_grid(len(MOMENTUM_FIELDS), step)
+    return np.hstack([np.repeat(categories, len(momentum), axis=0), np.tile(momentum, (len(categories), 1))])
+
+
+def random_candidates(count: int, seed: int = None) -> np.ndarray:
+    """
+    Amostragem aleatória uniforme dos pesos (Dirichlet em cada grupo)
+
+    Args:
+        count: Número de candidatos
+        seed: Semente do gerador (reprodutibilidade)
+
+    Returns:
+        Matriz (candidatos × 7) na ordem de ScoreWeights
+    """
+    rng = np.random.default_rng(seed)
+    return np.hstack([rng.dirichlet(np.ones(len(CATEGORY_FIELDS)), count),
+                      rng.dirichlet(np.ones(len(MOMENTUM_FIELDS)), count)])
+
+
+# Estado de cada worker do pool (recebido uma única vez em _init_worker)
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(dataset, config, objective):
+    _worker_state.update(dataset=dataset, config=config, objective=objective)
+
+
+def _evaluate_chunk(candidates: np.ndarray) -> Dict[str, np.ndarray]:
+    return evaluate_candidates(_worker_state['dataset'], candidates,
+                               _worker_state['config'], _worker_state['objective'])
+
+
+class WeightOptimizer:
+    """Busca de pesos do ScoreEngine pelo resultado do backtest no histórico local"""
+
+    def __init__(self, dataset: List[SymbolFeatures], config: BacktestConfig = BacktestConfig(),
+                 objective: str = 'total_return', workers: int = None, chunk_size: int = 64):
+        """
+        Args:
+            dataset: Features por símbolo (ver build_dataset)
+            config: Limiares, taxa e pesos por timeframe do backtest
+            objective: Chave de OBJECTIVES a maximizar
+            workers: Processos do pool (padrão: núcleos da máquina; 1 = sem pool)
+            chunk_size: Candidatos por tarefa enviada ao pool
+
+        Raises:
+            ValueError: Se o objetivo for desconhecido
+        """
+        if objective not in OBJECTIVES:
+            raise ValueError(f"Objetivo desconhecido: {objective}. Use um de: {', '.join(OBJECTIVES)}")
+        self.dataset = dataset
+        self.config = config
+        self.objective = objective
+        self.workers = workers or multiprocessing.cpu_count()
+        self.chunk_size = max(1, chunk_size)
+
+    def evaluate(self, candidates: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Avalia todos os candidatos (em lotes no pool de processos)
+
+        Args:
+            candidates: Matriz (candidatos × 7) de pesos
+
+        Returns:
+            Métricas por candidato (ver evaluate_candidates)
+        """
+        candidates = np.atleast_2d(np.asarray(candidates, dtype=np.float64))
+        chunks = [candidates[i:i + self.chunk_size] for i in range(0, len(candidates), self.chunk_size)]
+        if self.workers <= 1 or len(chunks) <= 1:
+            results = [evaluate_candidates(self.dataset, chunk, self.config, self.objective) for chunk in chunks]
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(chunks)),
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_worker,
+                                     initargs=(self.dataset, self.config, self.objective)) as executor:
+                results = list(executor.map(_evaluate_chunk, chunks))
+        return {name: np.concatenate([result[name] for result in results]) for name in results[0]}
+
+    def search(self, candidates: np.ndarray, top: int = 10) -> Dict[str, Any]:
+        """
+        Avalia os candidatos e os pesos atuais (referência) e ordena pelo objetivo
+
+        Args:
+            candidates: Matriz (candidatos × 7) de pesos
+            top: Número de melhores candidatos retornados
+
+        Returns:
+            Dicionário com 'baseline' (pesos padrão), 'best' (lista ordenada) e 'evaluated'
+        """
+        candidates = np.vstack([np.asarray(DEFAULT_WEIGHTS, dtype=np.float64), np.asarray(candidates)])
+        metrics = self.evaluate(candidates)
+
+        def describe(row):
+            return {
+                'weights': ScoreWeights.from_vector(candidates[row]).to_dict(),
+                'objective': float(metrics['objective'][row]),
+                'total_return': float(metrics['total_return'][row]),
+                'max_drawdown': float(metrics['max_drawdown'][row]),
+                'trades': int(metrics['trades'][row])
+            }
+
+        order = np.argsort(-metrics['objective'][1:], kind='stable')[:top] + 1
+        return {
+            'baseline': describe(0),
+            'best': [describe(row) for row in order],
+            'evaluated': len(candidates) - 1
+        }
+
+
+def build_dataset(engine: BacktestEngine, symbols: Iterable[str], start_ms: int = None,
+                  end_ms: int = None) -> List[SymbolFeatures]:
+    """
+    Carrega o histórico local dos símbolos e pré-calcula as features
+
+    Símbolos sem histórico no período são ignorados (com aviso).
+
+    Args:
+        engine: BacktestEngine com o CandleStore, a configuração e os parâmetros
+        symbols: Pares de trading
+        start_ms: Início do período avaliado
+        end_ms: Fim do período
+
+    Returns:
+        Lista de SymbolFeatures
+    """
+    dataset = []
+    for symbol in symbols:
+        try:
+            frames = engine.load_frames(symbol, start_ms, end_ms)
+        except ValueError as e:
+            print(f"⚠️ {symbol}: {str(e)}")
+            continue
+        data = precompute_features(symbol, frames, engine.config, engine.params, start_ms)
+        if data.start >= len(data.close):
+            print(f"⚠️ {symbol}: sem candles no período")
+            continue
+        dataset.append(data)
+    return dataset
@@ -1,12 +1,37 @@
 """
 Engine para calcular score de análise técnica
+
+Além do cálculo escalar (último candle), há um caminho vetorizado que avalia as
+mesmas regras como expressões NumPy mascaradas sobre séries inteiras de
+indicadores (NaN = indicador ausente), com resultado idêntico ao escalar.
 """
 from typing import Dict, Any, List
 
+import numpy as np
+
+from app.utils.score_weights import ScoreWeights
+
 
 class ScoreEngine:
     """Engine para calcular scores e diagnósticos"""
     
+    # Indicadores lidos pelo cálculo de score e pela oportunidade de trade
+    # (nomes da resposta da API); pedidos seletivos sempre calculam estes
+    REQUIRED_INDICATORS = (
+        'EMA9', 'EMA21', 'EMA200',
+        'RSI', 'Stochastic_RSI_K', 'Stochastic_RSI_D', 'MACD', 'MACD_Signal', 'MACD_Histogram',
+        'ATR', 'BB_Upper', 'BB_Middle', 'BB_Lower',
+        'Volume_MA', 'MFI',
+        'ADX',
+        'last_close', 'current_volume'
+    )
+    
+    # Pesos do score geral por timeframe (analyze_multiple_timeframes)
+    TIMEFRAME_WEIGHTS = {'1h': 0.2, '4h': 0.3, '1d': 0.5}
+    
+    # Pesos das categorias e sub-pesos do momento (settings.score_weights)
+    WEIGHTS = ScoreWeights.from_settings()
+    
     @staticmethod
     def _flatten_indicators(indicators: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -330,9 +355,11 @@ class ScoreEngine:
             return (atr_percent - 1) / 2
     
     @staticmethod
-    def calculate_overall_score(indicators: Dict[str, Any], last_close: float, current_volume: float) -> float:
+    def calculate_overall_score(indicators: Dict[str, Any], last_close: float, current_volume: float,
+                                weights: ScoreWeights = None) -> float:
         """
-        Calcula score geral baseado em todos os indicadores com pesos específicos:
+        Calcula score geral baseado em todos os indicadores com pesos específicos
+        (padrão, ver ScoreWeights):
         - Tendência (EMAs, ADX): 40%
         - Momento (RSI, MACD, Stochastic): 30%
         - Volume e volatilidade (MFI, ATR, Bollinger): 20%
@@ -342,6 +369,7 @@ class ScoreEngine:
             indicators: Dicionário com todos os indicadores (novo formato ou antigo)
             last_close: Último preço de fechamento
             current_volume: Volume atual
+            weights: Pesos das categorias (padrão: ScoreEngine.WEIGHTS)
             
         Returns:
             Score entre 0.0 e 1.0 (0 = muito baixista, 1 = muito altista)
@@ -350,6 +378,8 @@ class ScoreEngine:
         if not indicators or last_close is None or last_close <= 0:
             return 0.5  # Retorna neutro se dados inválidos
         
+        weights = weights or ScoreEngine.WEIGHTS
+        
         # Converte para formato flat se necessário
         flat_indicators = ScoreEngine._flatten_indicators(indicators)
         
@@ -383,7 +413,7 @@ class ScoreEngine:
         )
         
         # Média ponderada dos indicadores de momento
-        momentum_score = (rsi_score * 0.4 + macd_score * 0.4 + stoch_score * 0.2)  # -1 a 1
+        momentum_score = (rsi_score * weights.rsi + macd_score * weights.macd + stoch_score * weights.stoch)  # -1 a 1
         
         # ========== VOLUME E VOLATILIDADE (20%) ==========
         mfi_score = ScoreEngine._calculate_mfi_score(flat_indicators.get('mfi'))
@@ -421,10 +451,10 @@ class ScoreEngine:
         # ========== SCORE FINAL PONDERADO ==========
         # Todos os scores estão em -1 a 1
         weighted_score = (
-            trend_score * 0.40 +
-            momentum_score * 0.30 +
-            vol_volatility_score * 0.20 +
-            sentiment_score * 0.10
+            trend_score * weights.trend +
+            momentum_score * weights.momentum +
+            vol_volatility_score * weights.volatility +
+            sentiment_score * weights.sentiment
         )
         
         # Converte para 0 a 1 (garante que está no range)
@@ -433,6 +463,211 @@ class ScoreEngine:
         
         return round(normalized_score, 2)
     
+    # ========== CAMINHO VETORIZADO (séries de indicadores) ==========
+    
+    @staticmethod
+    def _round_like_python(values: np.ndarray, decimals: int) -> np.ndarray:
+        """
+        Arredonda como round() do Python (np.round pode divergir perto de empates, ex: x.xx5)
+        
+        Args:
+            values: Array float64
+            decimals: Casas decimais
+            
+        Returns:
+            Array arredondado
+        """
+        result = np.round(values, decimals)
+        scaled = values * 10 ** decimals
+        near_tie = np.isfinite(values) & (np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5) < 1e-6)
+        for index in np.flatnonzero(near_tie):
+            result.flat[index] = round(float(values.flat[index]), decimals)
+        return result
+    
+    @staticmethod
+    def _calculate_rsi_scores(rsi: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de _calculate_rsi_score (NaN = ausente)"""
+        score = np.where(rsi <= 30, -1.0 + (rsi / 30) * 0.5,
+                         np.where(rsi >= 70, 1.0 - ((100 - rsi) / 30) * 0.5, (rsi - 50) / 40))
+        return np.where(np.isnan(rsi), 0.0, score)
+    
+    @staticmethod
+    def _calculate_ema_scores(close: np.ndarray, ema9: np.ndarray, ema21: np.ndarray,
+                              ema200: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de _calculate_ema_score (NaN = ausente)"""
+        score = 0.0 + np.where(close > ema9, 0.3, -0.3)
+        score = score + np.where(close > ema21, 0.3, -0.3)
+        score = score + np.where(ema9 > ema21, 0.2, -0.2)
+        score = np.where(np.isnan(ema200), score, score + np.where(close > ema200, 0.2, -0.2))
+        return np.where(np.isnan(ema9) | np.isnan(ema21), 0.0, np.clip(score, -1.0, 1.0))
+    
+    @staticmethod
+    def _calculate_macd_scores(macd: np.ndarray, macd_signal: np.ndarray, macd_histogram: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de _calculate_macd_score (NaN = ausente)"""
+        score = 0.0 + np.where(macd > macd_signal, 0.5, -0.5)
+        score = score + np.where(macd_histogram > 0, 0.5, -0.5)
+        return np.where(np.isnan(macd) | np.isnan(macd_signal) | np.isnan(macd_histogram), 0.0, score)
+    
+    @staticmethod
+    def _calculate_volume_scores(current_volume: np.ndarray, volume_ma: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de _calculate_volume_score (volume ausente conta como 0)"""
+        current_volume = np.where(np.isnan(current_volume), 0.0, current_volume)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ratio = current_volume / volume_ma
+        score = np.where(ratio > 1.5, 1.0, np.where(ratio > 1.0, 0.75, np.where(ratio > 0.7, 0.5, 0.25)))
+        return np.where(np.isnan(volume_ma) | (volume_ma == 0), 0.5, score)
+    
+    @staticmethod
+    def _calculate_stochastic_scores(stoch_k: np.ndarray, stoch_d: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de _calculate_stochastic_score (NaN = ausente)"""
+        score = 0.0 + np.where(stoch_k <= 20, -0.5, np.where(stoch_k >= 80, 0.5, (stoch_k - 50) / 60))
+        score = np.where(np.isnan(stoch_d), score, score + np.where(stoch_k > stoch_d, 0.3, -0.3))
+        return np.where(np.isnan(stoch_k), 0.0, np.clip(score, -1.0, 1.0))
+    
+    @staticmethod
+    def _calculate_adx_scores(adx: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de _calculate_adx_score (NaN = ausente)"""
+        return np.where(adx >= 25, 1.0, np.where(adx >= 20, 0.75, 0.5))
+    
+    @staticmethod
+    def _calculate_mfi_scores(mfi: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de _calculate_mfi_score (NaN = ausente)"""
+        score = np.where(mfi <= 20, -1.0 + (mfi / 20) * 0.5,
+                         np.where(mfi >= 80, 1.0 - ((100 - mfi) / 20) * 0.5, (mfi - 50) / 60))
+        return np.where(np.isnan(mfi), 0.0, score)
+    
+    @staticmethod
+    def _calculate_bollinger_scores(close: np.ndarray, bb_upper: np.ndarray, bb_middle: np.ndarray,
+                                    bb_lower: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de _calculate_bollinger_score (NaN = ausente)"""
+        band_range = bb_upper - bb_lower
+        with np.errstate(divide='ignore', invalid='ignore'):
+            inside = np.where(band_range == 0, 0.0, ((close - bb_lower) / band_range - 0.5) * 2)
+        score = np.where(close >= bb_upper, 1.0, np.where(close <= bb_lower, -1.0, inside))
+        return np.where(np.isnan(bb_upper) | np.isnan(bb_middle) | np.isnan(bb_lower), 0.0, score)
+    
+    @staticmethod
+    def _calculate_atr_scores(atr: np.ndarray, close: np.ndarray) -> np.ndarray:
+        """Versão vetorizada de _calculate_atr_score (NaN = ausente)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            atr_percent = (atr / close) * 100
+        score = np.where(atr_percent >= 3, 1.0, np.where(atr_percent <= 1, 0.0, (atr_percent - 1) / 2))
+        return np.where(np.isnan(atr) | np.isnan(close) | (close == 0), 0.5, score)
+    
+    @staticmethod
+    def calculate_score_components(indicators: Dict[str, Any], decimals: Dict[str, int] = None) -> Dict[str, np.ndarray]:
+        """
+        Calcula os sub-scores de cada indicador para séries inteiras (um valor por candle)
+        
+        Args:
+            indicators: Dicionário {campo da resposta (EMA9, RSI, ..., last_close,
+                current_volume): array}; NaN ou campo ausente = indicador indisponível
+            decimals: Casas decimais por campo; se informado, os valores são arredondados
+                antes (como na resposta da API), para reproduzir o score de /analyze
+                
+        Returns:
+            Dicionário de arrays: ema, adx_strength, rsi, macd, stoch, mfi, bollinger,
+            atr_strength, volume (normalizado para -1 a 1), last_close e valid
+            (False onde o score é neutro por falta de preço)
+        """
+        length = max((np.size(v) for v in indicators.values()), default=0)
+        
+        def field(name):
+            values = np.asarray(indicators.get(name, np.nan), dtype=np.float64)
+            values = np.broadcast_to(values, (length,)) if values.ndim == 0 else values
+            if decimals and name in decimals:
+                values = ScoreEngine._round_like_python(values, decimals[name])
+            return values
+        
+        close = field('last_close')
+        volume_score = ScoreEngine._calculate_volume_scores(field('current_volume'), field('Volume_MA'))
+        return {
+            'ema': ScoreEngine._calculate_ema_scores(close, field('EMA9'), field('EMA21'), field('EMA200')),
+            'adx_strength': ScoreEngine._calculate_adx_scores(field('ADX')),
+            'rsi': ScoreEngine._calculate_rsi_scores(field('RSI')),
+            'macd': ScoreEngine._calculate_macd_scores(field('MACD'), field('MACD_Signal'), field('MACD_Histogram')),
+            'stoch': ScoreEngine._calculate_stochastic_scores(field('Stochastic_RSI_K'), field('Stochastic_RSI_D')),
+            'mfi': ScoreEngine._calculate_mfi_scores(field('MFI')),
+            'bollinger': ScoreEngine._calculate_bollinger_scores(close, field('BB_Upper'), field('BB_Middle'),
+                                                                 field('BB_Lower')),
+            'atr_strength': ScoreEngine._calculate_atr_scores(field('ATR'), close),
+            'volume': (volume_score - 0.5) * 2,
+            'last_close': close,
+            'valid': ~np.isnan(close) & (close > 0)
+        }
+    
+    @staticmethod
+    def combine_score_components(components: Dict[str, np.ndarray], weights: ScoreWeights = None) -> np.ndarray:
+        """
+        Combina os sub-scores com os pesos de calculate_overall_score
+        
+        Args:
+            components: Resultado de calculate_score_components
+            weights: Pesos das categorias (padrão: ScoreEngine.WEIGHTS)
+            
+        Returns:
+            Array de scores entre 0.0 e 1.0 (arredondados em 2 casas; 0.5 sem preço válido)
+        """
+        weights = weights or ScoreEngine.WEIGHTS
+        trend_score = components['ema'] * (0.7 + 0.3 * components['adx_strength'])
+        momentum_score = components['rsi'] * weights.rsi + components['macd'] * weights.macd + components['stoch'] * weights.stoch
+        vol_volatility_score = (
+            components['mfi'] * 0.3 +
+            components['bollinger'] * 0.3 +
+            components['volume'] * 0.3 * (0.8 + 0.2 * components['atr_strength'])
+        )
+        sentiment_score = 0.0
+        weighted_score = (
+            trend_score * weights.trend +
+            momentum_score * weights.momentum +
+            vol_volatility_score * weights.volatility +
+            sentiment_score * weights.sentiment
+        )
+        normalized_score = np.clip((weighted_score + 1) / 2, 0.0, 1.0)
+        return np.where(components['valid'], ScoreEngine._round_like_python(normalized_score, 2), 0.5)
+    
+    @staticmethod
+    def score_features(components: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Sub-scores como matriz de features: o score antes da normalização é
+        score_features(c) @ weights.coefficients() para qualquer ScoreWeights
+        
+        Args:
+            components: Resultado de calculate_score_components
+            
+        Returns:
+            Matriz (candles × 6): tendência, RSI, MACD, Stochastic, volume/volatilidade, sentimento
+        """
+        trend_score = components['ema'] * (0.7 + 0.3 * components['adx_strength'])
+        vol_volatility_score = (
+            components['mfi'] * 0.3 +
+            components['bollinger'] * 0.3 +
+            components['volume'] * 0.3 * (0.8 + 0.2 * components['atr_strength'])
+        )
+        return np.column_stack([
+            trend_score, components['rsi'], components['macd'], components['stoch'],
+            vol_volatility_score, np.zeros_like(trend_score)
+        ])
+    
+    @staticmethod
+    def calculate_score_series(indicators: Dict[str, Any], decimals: Dict[str, int] = None,
+                               weights: ScoreWeights = None) -> np.ndarray:
+        """
+        Versão vetorizada de calculate_overall_score: score de cada candle de uma vez
+        
+        Para cada posição, o resultado é idêntico ao de calculate_overall_score com os
+        mesmos valores (NaN no lugar de None).
+        
+        Args:
+            indicators: Dicionário {campo da resposta: array} (ver calculate_score_components)
+            decimals: Casas decimais por campo para arredondar as entradas (opcional)
+            weights: Pesos das categorias (padrão: ScoreEngine.WEIGHTS)
+            
+        Returns:
+            Array de scores entre 0.0 e 1.0
+        """
+        return ScoreEngine.combine_score_components(ScoreEngine.calculate_score_components(indicators, decimals), weights)
+    
     @staticmethod
     def get_diagnostic(score: float, indicators: Dict[str, Any]) -> str:
         """
@@ -481,13 +716,7 @@ class ScoreEngine:
             diagnostics[tf] = diagnostic
         
         # Score geral (dá mais peso aos timeframes maiores)
-        weights_tf = {
-            '1h': 0.2,
-            '4h': 0.3,
-            '1d': 0.5
-        }
-        
-        overall_score = sum(scores.get(tf, 0.5) * weight for tf, weight in weights_tf.items())
+        overall_score = sum(scores.get(tf, 0.5) * weight for tf, weight in ScoreEngine.TIMEFRAME_WEIGHTS.items())
         overall_diagnostic = ScoreEngine.get_diagnostic(
             overall_score,
             timeframes_data.get('1d', {}).get('indicators', {})
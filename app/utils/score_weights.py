@@ -0,0 +1,118 @@
+"""
+Pesos do score geral (ScoreEngine.calculate_overall_score)
+
+Os pesos das categorias (tendência, momento, volume/volatilidade, sentimento) e
+os sub-pesos do momento (RSI, MACD, Stochastic RSI) ficam em um esquema
+imutável. Os valores padrão são os originais (40/30/20/10 e 0.4/0.4/0.2); outros
+conjuntos podem ser configurados em settings.score_weights (ex: o resultado de
+optimize_weights.py); cada grupo deve somar 1, senão a aplicação não inicia.
+"""
+from typing import Dict, NamedTuple
+
+import numpy as np
+
+from app.config import settings
+
+
+# Grupos de pesos que somam 1 (normalizados por ScoreWeights.normalized)
+CATEGORY_FIELDS = ('trend', 'momentum', 'volatility', 'sentiment')
+MOMENTUM_FIELDS = ('rsi', 'macd', 'stoch')
+
+# Folga na soma de cada grupo (to_dict arredonda os pesos em 4 casas)
+SUM_TOLERANCE = 1e-3
+
+
+class ScoreWeights(NamedTuple):
+    """Pesos do score geral (imutável e hashable)"""
+
+    trend: float = 0.40       # EMAs modulado pelo ADX
+    momentum: float = 0.30    # RSI, MACD, Stochastic RSI
+    volatility: float = 0.20  # MFI, Bollinger, volume modulado pelo ATR
+    sentiment: float = 0.10   # neutro (0.0) por enquanto
+    rsi: float = 0.4
+    macd: float = 0.4
+    stoch: float = 0.2
+
+    @classmethod
+    def from_settings(cls, config=None) -> "ScoreWeights":
+        """
+        Monta os pesos a partir das configurações da aplicação
+
+        Args:
+            config: Objeto Settings (padrão: app.config.settings); score_weights é um
+                dicionário parcial, ex: {"trend": 0.5, "momentum": 0.25}
+
+        Returns:
+            ScoreWeights com os valores configurados
+
+        Raises:
+            ValueError: Se algum peso não existir, for negativo ou um grupo não somar 1
+        """
+        config = settings if config is None else config
+        overrides = getattr(config, 'score_weights', None) or {}
+        unknown = set(overrides) - set(cls._fields)
+        if unknown:
+            raise ValueError(f"Pesos desconhecidos: {', '.join(sorted(unknown))}")
+        return cls(**{name: float(value) for name, value in overrides.items()}).validated()
+
+    @classmethod
+    def from_vector(cls, vector) -> "ScoreWeights":
+        """Pesos a partir de um vetor na ordem dos campos"""
+        return cls(*(float(value) for value in vector))
+
+    def validated(self) -> "ScoreWeights":
+        """
+        Verifica os pesos (não negativos e cada grupo somando 1)
+
+        Returns:
+            Os próprios pesos
+
+        Raises:
+            ValueError: Se algum peso for negativo ou um grupo não somar 1
+        """
+        for group in (CATEGORY_FIELDS, MOMENTUM_FIELDS):
+            values = [getattr(self, name) for name in group]
+            if any(value < 0 for value in values) or abs(sum(values) - 1) > SUM_TOLERANCE:
+                described = ', '.join(f"{name}={getattr(self, name)}" for name in group)
+                raise ValueError(f"Pesos inválidos ({described}): devem ser >= 0 e somar 1")
+        return self
+
+    def normalized(self) -> "ScoreWeights":
+        """
+        Pesos com cada grupo (categorias, sub-pesos do momento) somando 1
+
+        Raises:
+            ValueError: Se algum peso for negativo ou um grupo somar 0
+        """
+        values = self._asdict()
+        for group in (CATEGORY_FIELDS, MOMENTUM_FIELDS):
+            total = sum(values[name] for name in group)
+            if total <= 0 or any(values[name] < 0 for name in group):
+                raise ValueError(f"Pesos inválidos em {', '.join(group)}")
+            for name in group:
+                values[name] /= total
+        return ScoreWeights(**values)
+
+    def coefficients(self) -> np.ndarray:
+        """
+        Coeficientes do score sobre as features de score_features (produto escalar)
+
+        Returns:
+            Array [tendência, RSI, MACD, Stochastic, volume/volatilidade, sentimento]
+        """
+        return np.array([
+            self.trend,
+            self.momentum * self.rsi,
+            self.momentum * self.macd,
+            self.momentum * self.stoch,
+            self.volatility,
+            self.sentiment
+        ])
+
+    def to_dict(self) -> Dict[str, float]:
+        """Pesos como dicionário (formato de settings.score_weights)"""
+        return {name: round(value, 4) for name, value in self._asdict().items()}
+
+
+# Pesos originais do ScoreEngine
+DEFAULT_WEIGHTS = ScoreWeights()
@@ -0,0 +1,45 @@
+"""
+Preenche o histórico local de candles (arquivos memory-mapped em data/candles)
+
+Uso:
+    python backfill_history.py BTC/USDT 1h --since 2021-01-01
+    python backfill_history.py ETH/USDT 1d --since 2018-01-01 --until 2024-01-01
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+
+from app.services.crypto_service import SyncCryptoService
+
+
+def parse_date_ms(value: str) -> int:
+    return int(datetime.strptime(value, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill do histórico local de candles")
+    parser.add_argument('symbol', help="Par de trading (ex: BTC/USDT)")
+    parser.add_argument('timeframe', help="Timeframe (ex: 1h, 4h, 1d)")
+    parser.add_argument('--since', required=True, help="Data inicial (YYYY-MM-DD, UTC)")
+    parser.add_argument('--until', help="Data final (YYYY-MM-DD, UTC); padrão: agora")
+    args = parser.parse_args()
+
+    service = SyncCryptoService()
+    start = time.perf_counter()
+    stored = service.backfill_history(
+        args.symbol,
+        args.timeframe,
+        parse_date_ms(args.since),
+        parse_date_ms(args.until) if args.until else None
+    )
+    elapsed = time.perf_counter() - start
+
+    store = service._service.history_store
+    print(f"✅ {stored} candles novos em {elapsed:.1f}s")
+    print(f"   Arquivo: {store.path_for(args.symbol, args.timeframe)}")
+    print(f"   Total armazenado: {store.count(args.symbol, args.timeframe)} candles")
+    service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Benchmark de carga da API contra uma exchange offline (replay ou sintética)
+
+Dispara N requisições concorrentes diretamente na aplicação ASGI (sem rede e sem
+servidor) e reporta vazão e latências p50/p95/p99 por endpoint. A exchange é
+escolhida por EXCHANGE_NAME e a latência/falhas por FAKE_EXCHANGE_*.
+
+Uso: python benchmark_api.py [requisicoes] [concorrencia] [exchange] [endpoints...]
+Ex:  python benchmark_api.py 200 20 synthetic /price/BTC /analyze/BTC
+"""
+import asyncio
+import os
+import sys
+import time
+
+import numpy as np
+
+os.environ['EXCHANGE_NAME'] = sys.argv[3] if len(sys.argv) > 3 else os.environ.get('EXCHANGE_NAME', 'synthetic')
+
+import httpx  # noqa: E402
+
+from app.main import app  # noqa: E402
+from app.services.crypto_service import get_crypto_service  # noqa: E402
+
+
+async def run_endpoint(client: httpx.AsyncClient, path: str, requests: int, concurrency: int):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = 0
+
+    async def one():
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            if response.status_code != 200:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, [50, 95, 99])
+    print(f"{path:>16}: {requests / elapsed:8.1f} req/s | p50 {p50:7.1f} ms | "
+          f"p95 {p95:7.1f} ms | p99 {p99:7.1f} ms | erros {errors}")
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    endpoints = sys.argv[4:] or ['/price/BTC', '/analyze/BTC']
+
+    print("=" * 70)
+    print(f"BENCHMARK API: {requests} requisições, concorrência {concurrency}, "
+          f"exchange '{os.environ['EXCHANGE_NAME']}'")
+    print("=" * 70)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+        for path in endpoints:
+            await run_endpoint(client, path, requests, concurrency)
+
+    service = get_crypto_service()
+    print(f"\n📦 Cache: {service.cache.stats()}")
+    print(f"🔀 Single-flight: {service.single_flight.stats()}")
+    await service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
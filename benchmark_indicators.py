@@ -0,0 +1,93 @@
+"""
+Benchmark do cálculo de indicadores: pandas_ta vs kernel NumPy fundido vs motor incremental
+
+Mede o custo por requisição de get_indicators para N candles:
+- pandas_ta: ~12 chamadas separadas (IndicatorService.get_indicators_pandas_ta)
+- kernel: uma passada NumPy sobre arrays contíguos (IndicatorService.get_indicators)
+- incremental: estado por série, só o candle em formação é avaliado
+
+E o screening de vários símbolos: um kernel por símbolo vs uma passada 2-D,
+o sweep de períodos: uma EMA por período vs uma passada para EMA 5..200,
+e o histórico de score: calculate_overall_score por candle vs score vetorizado.
+
+Uso: python benchmark_indicators.py [candles] [repeticoes] [simbolos]
+"""
+import importlib.util
+import sys
+import time
+
+from app.services.indicator_kernel import (
+    compute_from_dataframe, compute_indicators_batch, compute_series_from_dataframe, ema, stack_ohlcv, sweep
+)
+from app.services.streaming_indicators import FIELD_DECIMALS, StreamingIndicatorService, format_indicators
+from app.utils.score_engine import ScoreEngine
+from sample_data import make_candles
+
+
+def measure(fn, repeats: int) -> float:
+    """Retorna o tempo médio (ms) de fn() após um aquecimento"""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    candles = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    symbols = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    df = make_candles(candles)
+
+    print("=" * 70)
+    print(f"BENCHMARK INDICADORES: {candles} candles, {repeats} repetições")
+    print("=" * 70)
+
+    timings = {}
+    if importlib.util.find_spec('pandas_ta') is not None:
+        from app.services.indicator_service import IndicatorService
+        timings['pandas_ta'] = measure(lambda: IndicatorService.get_indicators_pandas_ta(df), max(1, repeats // 10))
+    else:
+        print("⚠️ pandas_ta não instalado: caminho antigo não medido")
+
+    timings['kernel NumPy'] = measure(lambda: compute_from_dataframe(df).to_indicators(), repeats)
+
+    streaming = StreamingIndicatorService()
+    timings['incremental'] = measure(lambda: streaming.get_indicators('BTC/USDT', '1h', df), repeats)
+
+    baseline = timings.get('pandas_ta')
+    for name, elapsed in timings.items():
+        speedup = f" | {baseline / elapsed:5.1f}x" if baseline else ""
+        print(f"{name:>14}: {elapsed:8.3f} ms/requisição{speedup}")
+
+    frames = {f"S{i}/USDT": make_candles(candles, seed=i) for i in range(symbols)}
+    _, matrices = stack_ohlcv(frames)
+    fields = [matrices[name] for name in ('high', 'low', 'close', 'volume')]
+    loop = measure(lambda: [compute_from_dataframe(df) for df in frames.values()], 3)
+    batch = measure(lambda: compute_indicators_batch(*fields), 10)
+    print(f"\n📊 Screening de {symbols} símbolos ({candles} candles cada):")
+    print(f"{'um por símbolo':>14}: {loop:8.1f} ms")
+    print(f"{'matriz 2-D':>14}: {batch:8.1f} ms | {loop / batch:5.1f}x")
+
+    close = df['close'].to_numpy()
+    lengths = range(5, 201)
+    loop = measure(lambda: [ema(close, length) for length in lengths], 10)
+    batch = measure(lambda: sweep('ema', lengths, close), 10)
+    print(f"\n📊 Sweep EMA {lengths.start}..{lengths.stop - 1} ({candles} candles):")
+    print(f"{'uma por período':>14}: {loop:8.1f} ms")
+    print(f"{'sweep':>14}: {batch:8.1f} ms | {loop / batch:5.1f}x")
+
+    series = compute_series_from_dataframe(df)
+    rows = [format_indicators({name: values[i] for name, values in series.items()}) for i in range(candles)]
+    loop = measure(lambda: [
+        ScoreEngine.calculate_overall_score(row, row['price']['last_close'], row['price']['current_volume'])
+        for row in rows
+    ], 3)
+    batch = measure(lambda: ScoreEngine.calculate_score_series(series, FIELD_DECIMALS), 10)
+    print(f"\n📊 Histórico de score ({candles} candles):")
+    print(f"{'um por candle':>14}: {loop:8.1f} ms")
+    print(f"{'vetorizado':>14}: {batch:8.1f} ms | {loop / batch:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Benchmark de carga concorrente: chamadas à exchange com e sem single-flight
+
+Simula N clientes abrindo o dashboard ao mesmo tempo (mesmo símbolo, 3 timeframes)
+contra uma exchange falsa com latência fixa. O cache de candles é desligado para
+medir apenas o efeito da coalescência.
+
+Uso: python benchmark_single_flight.py [clientes] [latencia_ms]
+"""
+import asyncio
+import sys
+import time
+
+from app.services.candle_cache import CandleCache
+from app.services.crypto_service import CryptoService
+from app.services.single_flight import SingleFlight
+from app.services.timeframes import timeframe_to_ms
+
+
+class FakeExchange:
+    """Exchange falsa que conta chamadas e simula a latência de rede"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def milliseconds(self):
+        return int(time.time() * 1000)
+
+    async def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=None):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        interval = timeframe_to_ms(timeframe)
+        return [[since + i * interval, 100.0, 101.0, 99.0, 100.5, 10.0] for i in range(limit)]
+
+    async def close(self):
+        pass
+
+
+async def run_load(clients: int, latency: float, single_flight: bool):
+    service = CryptoService(cache=CandleCache(enabled=False))
+    await service.exchange.close()
+    service.exchange = FakeExchange(latency)
+    service.single_flight = SingleFlight(enabled=single_flight)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        service.get_multiple_timeframes('BTC/USDT', ['1h', '4h', '1d'], limit=500)
+        for _ in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+    return service.exchange.calls, elapsed
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    latency = (float(sys.argv[2]) if len(sys.argv) > 2 else 150) / 1000
+
+    print("=" * 70)
+    print(f"BENCHMARK SINGLE-FLIGHT: {clients} clientes simultâneos, latência {latency*1000:.0f} ms")
+    print("=" * 70)
+
+    for enabled in (False, True):
+        calls, elapsed = asyncio.run(run_load(clients, latency, enabled))
+        label = "com single-flight" if enabled else "sem single-flight"
+        print(f"{label:>20}: {calls:5d} chamadas à exchange | {elapsed*1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
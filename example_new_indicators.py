@@ -5,7 +5,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from app.services.crypto_service import CryptoService
+from app.services.crypto_service import SyncCryptoService
 from app.services.indicator_service import IndicatorService
 import json
 
@@ -21,7 +21,7 @@ def analyze_with_new_indicators(symbol: str = "BTC/USDT"):
     
     # Buscar dados
     print(f"[1/3] Buscando dados de {symbol}...")
-    crypto = CryptoService()
+    crypto = SyncCryptoService()
     df = crypto.get_candles(symbol, timeframe='1h', limit=500)
     print(f"      OK - {len(df)} candles obtidos")
     print()
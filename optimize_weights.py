@@ -0,0 +1,74 @@
+"""
+Otimização dos pesos do ScoreEngine sobre o histórico local (data/candles)
+
+Os sub-scores são calculados uma única vez por símbolo; cada conjunto de pesos é
+avaliado com o mesmo backtest de run_backtest.py, em paralelo em todos os núcleos.
+O melhor resultado pode ser aplicado com a variável SCORE_WEIGHTS. Uso:
+    python optimize_weights.py BTC/USDT ETH/USDT --since 2022-01-01
+    python optimize_weights.py BTC/USDT --since 2023-01-01 --search random --samples 20000 --seed 1
+    python optimize_weights.py SOL/USDT --since 2023-01-01 --objective return_over_drawdown --step 0.05
+"""
+import argparse
+import json
+import time
+
+from app.config import settings
+from app.services.backtest import BacktestConfig, BacktestEngine
+from app.services.candle_store import CandleStore
+from app.services.indicator_params import IndicatorParams
+from app.services.weight_optimizer import OBJECTIVES, WeightOptimizer, build_dataset, grid_candidates, random_candidates
+from backfill_history import parse_date_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Otimização dos pesos do ScoreEngine")
+    parser.add_argument('symbols', nargs='+', help="Pares de trading (ex: BTC/USDT ETH/USDT)")
+    parser.add_argument('--since', required=True, help="Início do período avaliado (YYYY-MM-DD, UTC)")
+    parser.add_argument('--until', help="Fim do período (YYYY-MM-DD, UTC); padrão: último candle")
+    parser.add_argument('--search', choices=('grid', 'random'), default='grid', help="Grade ou amostragem aleatória")
+    parser.add_argument('--step', type=float, default=0.1, help="Passo da grade (0.1 = 18.876 candidatos)")
+    parser.add_argument('--samples', type=int, default=10000, help="Candidatos da busca aleatória")
+    parser.add_argument('--seed', type=int, help="Semente da busca aleatória")
+    parser.add_argument('--objective', choices=tuple(OBJECTIVES), default='total_return', help="Métrica a maximizar")
+    parser.add_argument('--workers', type=int, help="Processos (padrão: núcleos da máquina)")
+    parser.add_argument('--entry', type=float, default=0.7, help="Score mínimo para comprar")
+    parser.add_argument('--exit', type=float, default=0.4, help="Score abaixo do qual vende")
+    parser.add_argument('--fee', type=float, default=0.001, help="Taxa por operação (0.001 = 0.1%%)")
+    parser.add_argument('--top', type=int, default=10, help="Número de resultados exibidos")
+    args = parser.parse_args()
+
+    config = BacktestConfig(entry_threshold=args.entry, exit_threshold=args.exit, fee_rate=args.fee)
+    engine = BacktestEngine(CandleStore(settings.candle_store_dir), config, IndicatorParams.from_settings())
+
+    start = time.perf_counter()
+    dataset = build_dataset(engine, args.symbols, parse_date_ms(args.since),
+                            parse_date_ms(args.until) if args.until else None)
+    if not dataset:
+        print("❌ Nenhum símbolo com histórico no período")
+        return
+    print(f"📊 Features de {len(dataset)} símbolos em {time.perf_counter() - start:.2f}s")
+
+    if args.search == 'grid':
+        candidates = grid_candidates(args.step)
+    else:
+        candidates = random_candidates(args.samples, args.seed)
+
+    start = time.perf_counter()
+    result = WeightOptimizer(dataset, config, args.objective, args.workers).search(candidates, args.top)
+    elapsed = time.perf_counter() - start
+
+    def show(label, entry):
+        print(f"{label} {args.objective}: {entry['objective']:+.4f} | Retorno: {entry['total_return']:+.2%} | "
+              f"Drawdown: {entry['max_drawdown']:.2%} | Operações: {entry['trades']}")
+        print(f"   {entry['weights']}")
+
+    show("📌 Pesos atuais", result['baseline'])
+    for rank, entry in enumerate(result['best'], start=1):
+        show(f"{rank:>3}.", entry)
+    print(f"✅ {result['evaluated']} candidatos em {elapsed:.2f}s ({result['evaluated'] / elapsed * 60:,.0f}/min)")
+    if result['best']:
+        print(f"SCORE_WEIGHTS='{json.dumps(result['best'][0]['weights'])}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Grava fixtures OHLCV em JSON para testes e benchmarks offline
+
+Por padrão grava candles reais da Binance (1h, 4h, 1d, 1w) para uma janela fixa
+(arquivos binance_*.json). Com --synthetic, gera uma série de 1h determinística
+(passeio aleatório) e monta os timeframes maiores com uma agregação independente em
+Python puro (arquivos synthetic_*.json), para ambientes sem acesso à exchange; essas
+fixtures só verificam a consistência entre duas agregações, não candles da exchange.
+
+Uso:
+    python record_fixtures.py BTC/USDT --start 2025-09-01 --days 63
+    python record_fixtures.py BTC/USDT --synthetic
+    python record_fixtures.py ETH/USDT --synthetic --price 2500
+"""
+import argparse
+import json
+import os
+import random
+from datetime import datetime, timedelta, timezone
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'ohlcv')
+TIMEFRAMES = ['1h', '4h', '1d', '1w']
+TIMEFRAME_HOURS = {'1h': 1, '4h': 4, '1d': 24, '1w': 168}
+
+
+def fixture_path(exchange: str, symbol: str, timeframe: str) -> str:
+    """Caminho do arquivo de fixture para (exchange, symbol, timeframe)"""
+    return os.path.join(FIXTURES_DIR, f"{exchange}_{symbol.replace('/', '-')}_{timeframe}.json")
+
+
+def save_fixture(exchange: str, symbol: str, timeframe: str, candles: list, source: str):
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    path = fixture_path(exchange, symbol, timeframe)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'exchange': exchange,
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'source': source,
+            'candles': candles
+        }, f, separators=(',', ':'))
+    print(f"✅ {path}: {len(candles)} candles")
+
+
+def record_from_binance(symbol: str, start: datetime, days: int):
+    """Grava candles nativos da Binance para cada timeframe"""
+    import ccxt
+
+    exchange = ccxt.binance({'enableRateLimit': True})
+    since = int(start.timestamp() * 1000)
+    end = int((start + timedelta(days=days)).timestamp() * 1000)
+
+    for timeframe in TIMEFRAMES:
+        candles = []
+        cursor = since
+        while cursor < end:
+            page = exchange.fetch_ohlcv(symbol, timeframe, since=cursor, limit=1000)
+            page = [c for c in page if c[0] < end]
+            if not page:
+                break
+            candles.extend(page)
+            cursor = page[-1][0] + TIMEFRAME_HOURS[timeframe] * 3600 * 1000
+        save_fixture('binance', symbol, timeframe, candles, 'binance')
+
+
+def aggregate_native(candles_1h: list, hours: int) -> list:
+    """Agrega candles de 1h candle a candle, em Python puro, alinhando pelo calendário UTC"""
+    groups = {}
+    for ts, o, h, l, c, v in candles_1h:
+        dt = datetime.fromtimestamp(ts / 1000, tz=timezone.utc)
+        if hours == 168:
+            bucket = (dt - timedelta(days=dt.weekday())).replace(hour=0)
+        elif hours == 24:
+            bucket = dt.replace(hour=0)
+        else:
+            bucket = dt.replace(hour=dt.hour - dt.hour % hours)
+        groups.setdefault(bucket, []).append((o, h, l, c, v))
+
+    native = []
+    for bucket in sorted(groups):
+        rows = groups[bucket]
+        native.append([
+            int(bucket.timestamp() * 1000),
+            rows[0][0],
+            max(r[1] for r in rows),
+            min(r[2] for r in rows),
+            rows[-1][3],
+            round(sum(r[4] for r in rows), 8)
+        ])
+    return native
+
+
+def record_synthetic(symbol: str, start: datetime, days: int, price: float = 60000.0):
+    """Gera fixtures determinísticas (semente derivada do símbolo) para ambientes sem acesso à exchange"""
+    rng = random.Random(sum(map(ord, symbol)))
+    candles_1h = []
+    for i in range(days * 24):
+        ts = int((start + timedelta(hours=i)).timestamp() * 1000)
+        open_ = price
+        close = max(1.0, open_ * (1 + rng.gauss(0, 0.006)))
+        high = max(open_, close) * (1 + abs(rng.gauss(0, 0.002)))
+        low = min(open_, close) * (1 - abs(rng.gauss(0, 0.002)))
+        volume = abs(rng.gauss(800, 250)) + 50
+        candles_1h.append([ts, round(open_, 2), round(high, 2), round(low, 2), round(close, 2), round(volume, 5)])
+        price = round(close, 2)
+
+    for timeframe in TIMEFRAMES:
+        hours = TIMEFRAME_HOURS[timeframe]
+        candles = candles_1h if hours == 1 else aggregate_native(candles_1h, hours)
+        save_fixture('synthetic', symbol, timeframe, candles, 'synthetic')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Grava fixtures OHLCV em JSON")
+    parser.add_argument('symbol', nargs='?', default='BTC/USDT')
+    parser.add_argument('--start', default='2025-09-01', help="Data inicial (UTC, de preferência uma segunda-feira)")
+    parser.add_argument('--days', type=int, default=63)
+    parser.add_argument('--synthetic', action='store_true', help="Gera dados sintéticos em vez de gravar da Binance")
+    parser.add_argument('--price', type=float, default=60000.0, help="Preço inicial da série sintética")
+    args = parser.parse_args()
+
+    start = datetime.strptime(args.start, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+    if args.synthetic:
+        record_synthetic(args.symbol, start, args.days, args.price)
+    else:
+        record_from_binance(args.symbol, start, args.days)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Backtest dos sinais do ScoreEngine sobre o histórico local (data/candles)
+
+Preencha o histórico antes com backfill_history.py (1h basta; 4h e 1d ausentes
+são derivados do 1h). Uso:
+    python run_backtest.py BTC/USDT ETH/USDT --since 2022-01-01
+    python run_backtest.py BTC/USDT --since 2023-01-01 --entry 0.65 --exit 0.45 --fee 0.00075
+    python run_backtest.py SOL/USDT --since 2023-01-01 --short-term
+"""
+import argparse
+import time
+
+from app.config import settings
+from app.services.backtest import BacktestConfig, BacktestEngine
+from app.services.candle_store import CandleStore
+from app.services.indicator_params import IndicatorParams
+from backfill_history import parse_date_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backtest dos sinais do ScoreEngine")
+    parser.add_argument('symbols', nargs='+', help="Pares de trading (ex: BTC/USDT ETH/USDT)")
+    parser.add_argument('--since', required=True, help="Início do período avaliado (YYYY-MM-DD, UTC)")
+    parser.add_argument('--until', help="Fim do período (YYYY-MM-DD, UTC); padrão: último candle")
+    parser.add_argument('--entry', type=float, default=0.7, help="Score mínimo para comprar")
+    parser.add_argument('--exit', type=float, default=0.4, help="Score abaixo do qual vende")
+    parser.add_argument('--fee', type=float, default=0.001, help="Taxa por operação (0.001 = 0.1%%)")
+    parser.add_argument('--short-term', action='store_true', help="Usa só o score 1h (trade rápido)")
+    args = parser.parse_args()
+
+    config = BacktestConfig(entry_threshold=args.entry, exit_threshold=args.exit, fee_rate=args.fee)
+    if args.short_term:
+        config = config._replace(timeframe_weights=(('1h', 1.0),))
+    engine = BacktestEngine(CandleStore(settings.candle_store_dir), config, IndicatorParams.from_settings())
+
+    start = time.perf_counter()
+    results = engine.run_many(args.symbols, parse_date_ms(args.since),
+                              parse_date_ms(args.until) if args.until else None)
+    elapsed = time.perf_counter() - start
+
+    for symbol, summary in results.items():
+        if summary is None:
+            continue
+        hit_rate = f"{summary['hit_rate']:.0%}" if summary['hit_rate'] is not None else "-"
+        print(f"📊 {symbol}: {summary['candles']} candles")
+        print(f"   Retorno: {summary['total_return']:+.2%} (buy & hold {summary['buy_and_hold']:+.2%})")
+        print(f"   Drawdown máximo: {summary['max_drawdown']:.2%}")
+        print(f"   Operações: {summary['trades']} | Acerto: {hit_rate} | Exposição: {summary['exposure']:.0%}")
+    print(f"✅ {len(results)} símbolos em {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
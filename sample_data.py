@@ -0,0 +1,111 @@
+"""
+Dados sintéticos e fórmulas de referência compartilhados por testes e benchmarks
+
+- make_candles / make_frames: candles reprodutíveis (sem rede);
+- reference_last: fórmulas do pandas_ta reescritas em pandas puro, usadas como
+  referência para o motor incremental e o kernel NumPy.
+"""
+import math
+
+import numpy as np
+import pandas as pd
+
+from app.services.indicator_params import DEFAULT_PARAMS, IndicatorParams
+from app.services.resampler import resample_ohlcv
+
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def make_candles(n: int, seed: int = 7) -> pd.DataFrame:
+    """Candles de 1h sintéticos (passeio aleatório reprodutível pela semente)"""
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.005, n))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.005, n))
+    volume = rng.uniform(50, 500, n)
+    timestamps = 1_700_000_000_000 // HOUR_MS * HOUR_MS + np.arange(n) * HOUR_MS
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(timestamps, unit='ms', utc=True),
+        'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume
+    })
+
+
+def ema(series, length):
+    if len(series) < length:
+        return pd.Series(np.nan, index=series.index)
+    seeded = series.copy()
+    seeded.iloc[length - 1] = series.iloc[:length].mean()
+    seeded.iloc[:length - 1] = np.nan
+    return seeded.ewm(span=length, adjust=False).mean()
+
+
+def rma(series, length):
+    return series.ewm(alpha=1 / length, min_periods=length).mean()
+
+
+def reference_last(df: pd.DataFrame, params: IndicatorParams = DEFAULT_PARAMS) -> dict:
+    """Fórmulas do pandas_ta 0.3.14b reescritas em pandas (último valor)"""
+    p = params
+    high, low, close, volume = df['high'], df['low'], df['close'], df['volume']
+    out = {'EMA9': ema(close, p.ema_fast), 'EMA21': ema(close, p.ema_medium), 'EMA50': ema(close, p.ema_trend),
+           'EMA200': ema(close, p.ema_slow), 'SMA100': close.rolling(p.sma_period).mean()}
+
+    diff = close.diff()
+    gain, loss = rma(diff.clip(lower=0), p.rsi_period), rma(diff.clip(upper=0).abs(), p.rsi_period)
+    rsi = 100 * gain / (gain + loss)
+    lowest, highest = rsi.rolling(p.stoch_rsi_length).min(), rsi.rolling(p.stoch_rsi_length).max()
+    stoch = 100 * (rsi - lowest) / (highest - lowest)
+    out['RSI'] = rsi
+    out['Stochastic_RSI_K'] = stoch.rolling(p.stoch_k).mean()
+    out['Stochastic_RSI_D'] = out['Stochastic_RSI_K'].rolling(p.stoch_d).mean()
+
+    macd = ema(close, p.macd_fast) - ema(close, p.macd_slow)
+    signal = pd.Series(np.nan, index=macd.index)
+    first = macd.first_valid_index()
+    signal.loc[first:] = ema(macd.loc[first:], p.macd_signal)
+    out['MACD'], out['MACD_Signal'], out['MACD_Histogram'] = macd, signal, macd - signal
+
+    prev_close = close.shift()
+    tr = pd.concat([high - low, high - prev_close, prev_close - low], axis=1).abs().max(axis=1)
+    tr.iloc[0] = np.nan
+    out['ATR'] = rma(tr, p.atr_period)
+    middle = close.rolling(p.bb_period).mean()
+    std = close.rolling(p.bb_period).std(ddof=0)
+    out['BB_Upper'], out['BB_Middle'], out['BB_Lower'] = middle + p.bb_std * std, middle, middle - p.bb_std * std
+
+    out['Volume_MA'] = volume.rolling(p.volume_ma_period).mean()
+    tp = (high + low + close) / 3
+    flow = tp * volume
+    tp_diff = tp.diff()
+    pos = flow.where(tp_diff > 0, 0.0).rolling(p.mfi_period).sum()
+    neg = flow.where(tp_diff < 0, 0.0).rolling(p.mfi_period).sum()
+    out['MFI'] = 100 * pos / (pos + neg)
+    sign = np.sign(close.diff())
+    sign.iloc[0] = 1
+    out['OBV'] = (sign * volume).cumsum()
+
+    atr = rma(tr, p.adx_period)
+    up, down = high.diff(), -low.diff()
+    plus = ((up > down) & (up > 0)) * up
+    minus = ((down > up) & (down > 0)) * down
+    di_plus, di_minus = 100 / atr * rma(plus, p.adx_period), 100 / atr * rma(minus, p.adx_period)
+    out['ADX'] = rma(100 * (di_plus - di_minus).abs() / (di_plus + di_minus), p.adx_period)
+
+    return {name: series.iloc[-1] for name, series in out.items()}
+
+
+def assert_matches(values: dict, expected: dict):
+    """Compara valores da resposta (None no aquecimento) com os de reference_last"""
+    for name, value in expected.items():
+        if np.isnan(value):
+            assert values[name] is None, name
+            continue
+        assert math.isclose(values[name], value, rel_tol=1e-9, abs_tol=1e-9), (name, values[name], value)
+
+
+def make_frames(n: int, seed: int = 5) -> dict:
+    """Candles de 1h e os de 4h e 1d reamostrados localmente (backtest)"""
+    df = make_candles(n, seed=seed)
+    return {'1h': df, '4h': resample_ohlcv(df, '1h', '4h'), '1d': resample_ohlcv(df, '1h', '1d')}
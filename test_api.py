@@ -11,6 +11,7 @@ se não houver conexão com a internet.
 import pytest
 from httpx import AsyncClient
 from app.main import app
+from app.services.crypto_service import get_crypto_service
 
 
 @pytest.mark.asyncio
@@ -145,9 +146,14 @@ async def test_analyze_sol():
 @pytest.mark.asyncio
 async def test_invalid_symbol():
     """Testa o endpoint com símbolo inválido"""
+    # O AsyncClient não executa o startup: carrega o índice de mercados aqui
+    await get_crypto_service().load_markets()
     async with AsyncClient(app=app, base_url="http://test") as client:
+        # Símbolo bem formado, mas não listado na exchange: 404
         response = await client.get("/price/INVALIDSYMBOL")
-        # Deve retornar erro 400
+        assert response.status_code == 404
+        # Símbolo malformado: 400
+        response = await client.get("/price/BTC$")
         assert response.status_code == 400
 
 
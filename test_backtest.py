@@ -0,0 +1,111 @@
+"""
+Testes do backtest dos sinais do ScoreEngine (sem look-ahead, taxas, histórico local)
+
+Execute: pytest test_backtest.py -v
+"""
+import numpy as np
+import pytest
+
+from app.services.backtest import BacktestConfig, BacktestEngine, blended_scores, simulate
+from app.services.candle_store import CandleStore
+from app.services.resampler import resample_ohlcv
+from app.services.timeframes import to_epoch_ms
+from sample_data import HOUR_MS, make_candles, make_frames
+
+CONFIG = BacktestConfig(entry_threshold=0.6, exit_threshold=0.45)
+
+
+def naive_simulation(close, score, config, start=0):
+    # Loop candle a candle: decisão no fechamento, posição vale no candle seguinte
+    equity, position, equities, positions = 1.0, 0, [], []
+    for i in range(len(close)):
+        if i > 0 and position:
+            equity *= close[i] / close[i - 1]
+        target = position
+        if i < start or np.isnan(score[i]):
+            target = 0
+        elif score[i] >= config.entry_threshold:
+            target = 1
+        elif score[i] < config.exit_threshold:
+            target = 0
+        if target != position:
+            equity *= 1 - config.fee_rate
+            position = target
+        equities.append(equity)
+        positions.append(position)
+    return np.array(equities), np.array(positions)
+
+
+def test_blended_scores_have_no_look_ahead():
+    # A EMA200 do 1d só aquece após 200 dias
+    frames = make_frames(24 * 260)
+    timestamps, full = blended_scores(frames, CONFIG)
+    assert np.isnan(full[:24 * 199]).all() and np.isfinite(full[24 * 201:]).all()
+
+    # Cortar o histórico em qualquer ponto não altera os scores anteriores
+    for cut in (24 * 230 + 5, 24 * 245 + 17, 24 * 260 - 1):
+        base = frames['1h'].iloc[:cut]
+        truncated = {'1h': base, '4h': resample_ohlcv(base, '1h', '4h'), '1d': resample_ohlcv(base, '1h', '1d')}
+        # Candles maiores ainda abertos no corte também existem no histórico truncado
+        _, partial = blended_scores(truncated, CONFIG)
+        np.testing.assert_array_equal(partial, full[:cut])
+
+
+def test_simulation_matches_naive_loop():
+    frames = make_frames(24 * 300, seed=11)
+    timestamps, score = blended_scores(frames, CONFIG)
+    close = frames['1h']['close'].to_numpy()
+    start_ms = int(timestamps[24 * 210])
+
+    result = simulate(timestamps, close, score, CONFIG, start_ms)
+    equity, position = naive_simulation(close, score, CONFIG, start=24 * 210)
+
+    assert len(result.trades) > 0
+    np.testing.assert_array_equal(result.position, position)
+    np.testing.assert_allclose(result.equity, equity, rtol=1e-12)
+    assert result.summary()['candles'] == len(close) - 24 * 210
+
+
+def test_fees_and_trade_accounting():
+    timestamps = np.arange(6) * HOUR_MS
+    close = np.array([100.0, 100.0, 110.0, 121.0, 121.0, 121.0])
+    score = np.array([0.5, 0.8, 0.5, 0.3, 0.5, 0.5])
+    result = simulate(timestamps, close, score, BacktestConfig(fee_rate=0.01))
+
+    # Compra no fechamento do candle 1, vende no 3: +21% menos duas taxas de 1%
+    assert list(result.position) == [0, 1, 1, 0, 0, 0]
+    assert result.trades == [{'entry': HOUR_MS, 'exit': 3 * HOUR_MS, 'return': pytest.approx(1.21 * 0.99 ** 2 - 1)}]
+    summary = result.summary()
+    assert summary['total_return'] == pytest.approx(1.21 * 0.99 ** 2 - 1)
+    assert summary['buy_and_hold'] == pytest.approx(0.21)
+    assert summary['hit_rate'] == 1.0
+    assert summary['max_drawdown'] == pytest.approx(-0.01)
+
+
+def test_open_position_is_closed_at_the_end():
+    timestamps = np.arange(4) * HOUR_MS
+    close = np.array([100.0, 100.0, 90.0, 80.0])
+    result = simulate(timestamps, close, np.array([0.9, 0.6, 0.6, 0.6]), BacktestConfig(fee_rate=0.0))
+    assert result.trades == [{'entry': 0, 'exit': 3 * HOUR_MS, 'return': pytest.approx(-0.2)}]
+    assert result.summary()['hit_rate'] == 0.0
+
+
+def test_engine_reads_store_and_derives_missing_timeframes(tmp_path):
+    df = make_candles(24 * 240, seed=2)
+    store = CandleStore(str(tmp_path))
+    ohlcv = np.column_stack([to_epoch_ms(df['timestamp'])] + [df[c].to_numpy() for c in ('open', 'high', 'low', 'close', 'volume')])
+    store.append('BTC/USDT', '1h', HOUR_MS, ohlcv.tolist())
+
+    engine = BacktestEngine(store, CONFIG)
+    start_ms = int(to_epoch_ms(df['timestamp'])[24 * 220])
+    frames = engine.load_frames('BTC/USDT', start_ms)
+    assert len(frames['1d']) == 240
+
+    result = engine.run_symbol('BTC/USDT', start_ms)
+    expected = BacktestEngine(config=CONFIG).run(make_frames(24 * 240, seed=2), start_ms)
+    np.testing.assert_array_equal(result.equity, expected.equity)
+
+    results = engine.run_many(['BTC/USDT', 'ETH/USDT'], start_ms)
+    assert results['BTC/USDT']['candles'] == 24 * 20
+    assert results['BTC/USDT']['trades'] == len(result.trades) > 0
+    assert results['ETH/USDT'] is None
@@ -0,0 +1,102 @@
+"""
+Testes do buffer circular de candles (refresh incremental)
+
+Execute: pytest test_candle_buffer.py -v
+"""
+import numpy as np
+import pandas as pd
+
+from app.services.candle_buffer import CandleArray, CandleBuffer
+from app.services.candle_cache import CandleCache
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def candles(start: int, count: int, close_offset: float = 0.0):
+    return [[(start + i) * HOUR_MS, i, i + 1, i - 1, i + close_offset, 1.0] for i in range(count)]
+
+
+def test_merge_replaces_forming_candle_and_appends_new():
+    buffer = CandleBuffer(HOUR_MS, capacity=10)
+    assert buffer.merge(candles(0, 5)) == 5
+
+    # Refresh a partir do último candle: o candle 4 é substituído, 5 e 6 são novos
+    appended = buffer.merge([[4 * HOUR_MS, 4, 5, 3, 4.9, 2.0], [5 * HOUR_MS, 5, 6, 4, 5, 1.0], [6 * HOUR_MS, 6, 7, 5, 6, 1.0]])
+    assert appended == 2
+    assert len(buffer) == 7
+    assert buffer.last_timestamp == 6 * HOUR_MS
+
+    df = buffer.to_dataframe(7)
+    assert df['close'].iloc[4] == 4.9
+    assert df['volume'].iloc[4] == 2.0
+    assert df['timestamp'].is_monotonic_increasing
+
+
+def test_ring_wraps_and_keeps_most_recent():
+    buffer = CandleBuffer(HOUR_MS, capacity=4)
+    buffer.merge(candles(0, 3))
+    buffer.merge(candles(2, 4))  # 2 (substitui), 3, 4, 5
+
+    timestamps, values = buffer.tail(10)
+    assert list(timestamps // HOUR_MS) == [2, 3, 4, 5]
+    assert values.shape == (4, 5)
+
+
+def test_gap_resets_buffer():
+    buffer = CandleBuffer(HOUR_MS, capacity=10)
+    buffer.merge(candles(0, 3))
+    buffer.merge(candles(8, 2))
+    assert len(buffer) == 2
+    assert buffer.last_timestamp == 9 * HOUR_MS
+
+
+def test_candle_array_round_trip():
+    buffer = CandleBuffer(HOUR_MS, capacity=10)
+    buffer.merge(candles(0, 6, close_offset=0.25))
+    df = buffer.to_dataframe(6)
+    array = CandleArray.from_dataframe(df)
+    pd.testing.assert_frame_equal(array.to_dataframe(), df)
+    assert array.last_timestamp == 5 * HOUR_MS
+    assert array.tail(2).to_dicts() == [
+        {'timestamp': 4 * HOUR_MS, 'open': 4.0, 'high': 5.0, 'low': 3.0, 'close': 4.25, 'volume': 1.0},
+        {'timestamp': 5 * HOUR_MS, 'open': 5.0, 'high': 6.0, 'low': 4.0, 'close': 5.25, 'volume': 1.0}
+    ]
+
+
+def test_compact_candles_use_less_memory():
+    buffer = CandleBuffer(HOUR_MS, capacity=500, dtype=np.float32)
+    buffer.merge([[i * HOUR_MS, 65000.12 + i, 65010.5 + i, 64990.25 + i, 65001.75 + i, 123.456] for i in range(500)])
+    compact = buffer.to_candles(500)
+    df = buffer.to_dataframe(500)
+    assert compact.values.dtype == np.float32 and df['close'].dtype == np.float64
+    assert compact.stored_timestamps.dtype == np.int32
+    assert compact.nbytes == 500 * (4 + 5 * 4)
+    assert compact.nbytes <= 0.5 * df.memory_usage(index=True, deep=True).sum()
+    # float32: ~7 dígitos significativos; timestamps exatos
+    assert np.allclose(df['close'].to_numpy(), 65001.75 + np.arange(500), rtol=1e-7)
+    assert (compact.timestamps == np.arange(500) * HOUR_MS).all()
+
+
+def test_compact_buffer_wraps_and_keeps_exact_timestamps():
+    start = 1_750_000_000_000 // HOUR_MS
+    buffer = CandleBuffer(HOUR_MS, capacity=4, dtype=np.float32)
+    buffer.merge(candles(start, 3))
+    buffer.merge(candles(start + 2, 4))
+    timestamps, _ = buffer.tail(10)
+    assert list(timestamps // HOUR_MS - start) == [2, 3, 4, 5]
+    assert buffer.last_timestamp == (start + 5) * HOUR_MS
+
+    # Buraco: o buffer é reiniciado com uma nova base
+    buffer.merge(candles(start + 5000, 2))
+    assert list(buffer.to_candles(2).timestamps // HOUR_MS - start) == [5000, 5001]
+    assert buffer.to_candles(1).tail(1).last_timestamp == (start + 5001) * HOUR_MS
+
+
+def test_cache_stores_compact_arrays():
+    buffer = CandleBuffer(HOUR_MS, capacity=10)
+    buffer.merge(candles(0, 5))
+    cache = CandleCache(dtype=np.float32)
+    cache.put('BTC/USDT', '1h', 5, buffer.to_dataframe(5), now_ms=5 * HOUR_MS - 1)
+    assert cache.stats()['bytes'] == 5 * (4 + 5 * 4)
+    cached = cache.get('BTC/USDT', '1h', 5, now_ms=5 * HOUR_MS - 1)
+    pd.testing.assert_frame_equal(cached, buffer.to_dataframe(5))
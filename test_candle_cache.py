@@ -0,0 +1,97 @@
+"""
+Testes do cache de candles do CryptoService (sem acesso à rede)
+
+Execute: pytest test_candle_cache.py -v
+"""
+import asyncio
+
+from app.services.candle_cache import CandleCache
+from app.services.crypto_service import CryptoService
+
+HOUR_MS = 60 * 60 * 1000
+START_MS = 1_700_000_000_000 - (1_700_000_000_000 % HOUR_MS)
+
+
+class ClockExchange:
+    """Exchange falsa com relógio controlável e candles de 1h determinísticos"""
+
+    def __init__(self, now_ms: int):
+        self.now_ms = now_ms
+        self.requested = []
+
+    def milliseconds(self):
+        return self.now_ms
+
+    async def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=None):
+        # Como a Binance, retorna candles com abertura >= since
+        first = since + (-since % HOUR_MS)
+        candles = []
+        ts = first
+        while ts <= self.now_ms and len(candles) < limit:
+            price = 100.0 + (ts - START_MS) / HOUR_MS
+            # O candle em formação muda de preço com o tempo
+            close = price + (self.now_ms - ts) / HOUR_MS if ts + HOUR_MS > self.now_ms else price + 0.5
+            candles.append([ts, price, price + 1, price - 1, close, 10.0])
+            ts += HOUR_MS
+        self.requested.append((since, limit, len(candles)))
+        return candles
+
+    async def close(self):
+        pass
+
+
+def make_service(now_ms: int, cache: CandleCache) -> CryptoService:
+    service = CryptoService(cache=cache)
+    asyncio.run(service.exchange.close())
+    service.exchange = ClockExchange(now_ms)
+    return service
+
+
+def test_cache_hit_within_ttl():
+    """Segunda busca dentro do TTL não deve consultar a exchange"""
+    now = START_MS + 100 * HOUR_MS + 10 * 60 * 1000
+    service = make_service(now, CandleCache())
+
+    first = asyncio.run(service.get_candles('BTC/USDT', '1h', limit=50))
+    service.exchange.now_ms += 30 * 1000
+    second = asyncio.run(service.get_candles('BTC/USDT', '1h', limit=50))
+
+    assert len(service.exchange.requested) == 1
+    assert first.equals(second)
+    assert service.cache.stats()['hits'] == 1
+
+
+def test_only_forming_candle_is_refreshed():
+    """Após o TTL, apenas o candle em formação (e os novos) são baixados"""
+    now = START_MS + 100 * HOUR_MS + 10 * 60 * 1000
+    service = make_service(now, CandleCache())
+
+    asyncio.run(service.get_candles('BTC/USDT', '1h', limit=50))
+    # Passa para o próximo candle: o anterior fecha e um novo abre
+    service.exchange.now_ms += HOUR_MS
+    df = asyncio.run(service.get_candles('BTC/USDT', '1h', limit=50))
+
+    since, limit, returned = service.exchange.requested[-1]
+    assert limit == 2 and returned == 2
+    assert len(df) == 50
+    assert df['timestamp'].is_monotonic_increasing
+    assert df['timestamp'].is_unique
+    # O candle que estava em formação foi substituído pela versão fechada
+    assert df['close'].iloc[-2] == df['open'].iloc[-2] + 0.5
+    assert service.cache.stats()['refreshes'] == 1
+
+
+def test_lru_eviction_and_disabled_switch():
+    """O cache respeita o limite de entradas e pode ser desligado"""
+    now = START_MS + 100 * HOUR_MS
+    service = make_service(now, CandleCache(max_entries=2))
+    for symbol in ['BTC/USDT', 'ETH/USDT', 'SOL/USDT']:
+        asyncio.run(service.get_candles(symbol, '1h', limit=10))
+    stats = service.cache.stats()
+    assert stats['size'] == 2 and stats['evictions'] == 1
+
+    service = make_service(now, CandleCache(enabled=False))
+    asyncio.run(service.get_candles('BTC/USDT', '1h', limit=10))
+    asyncio.run(service.get_candles('BTC/USDT', '1h', limit=10))
+    assert len(service.exchange.requested) == 2
+    assert service.cache.stats()['size'] == 0
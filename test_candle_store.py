@@ -0,0 +1,123 @@
+"""
+Testes do histórico local memory-mapped e do backfill paginado (sem rede)
+
+Execute: pytest test_candle_store.py -v
+"""
+import asyncio
+
+import numpy as np
+
+from app.services.candle_cache import CandleCache
+from app.services.candle_store import CandleStore
+from app.services.crypto_service import CryptoService
+
+HOUR_MS = 60 * 60 * 1000
+
+
+def candles(start: int, count: int):
+    return [[(start + i) * HOUR_MS, float(i), i + 1.0, i - 1.0, i + 0.5, 10.0] for i in range(count)]
+
+
+def test_append_and_zero_copy_range_read(tmp_path):
+    store = CandleStore(str(tmp_path))
+    assert store.append('BTC/USDT', '1h', HOUR_MS, candles(0, 100)) == 100
+
+    arrays = store.read('BTC/USDT', '1h', start_ms=10 * HOUR_MS, end_ms=20 * HOUR_MS)
+    assert list(arrays['timestamp'] // HOUR_MS) == list(range(10, 20))
+    assert np.shares_memory(arrays['close'], store._files[('BTC/USDT', '1h')].columns['close'])
+    assert not arrays['close'].flags.writeable
+
+    # Reabre do disco com outra instância
+    reopened = CandleStore(str(tmp_path))
+    assert reopened.count('BTC/USDT', '1h') == 100
+    assert reopened.last_timestamp('BTC/USDT', '1h') == 99 * HOUR_MS
+
+
+def test_forming_candle_replace_growth_and_prepend(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append('BTC/USDT', '1h', HOUR_MS, candles(100, 10))
+
+    # Substitui o candle em formação e anexa novos
+    assert store.append('BTC/USDT', '1h', HOUR_MS, [[109 * HOUR_MS, 9, 99, 0, 42.0, 1.0], [110 * HOUR_MS, 1, 2, 0, 1.5, 1.0]]) == 1
+    df = store.read_dataframe('BTC/USDT', '1h')
+    assert len(df) == 11 and df['close'].iloc[9] == 42.0
+
+    # Cresce além da capacidade inicial
+    store.append('BTC/USDT', '1h', HOUR_MS, candles(111, 5000))
+    assert store.count('BTC/USDT', '1h') == 5011
+
+    # Insere candles anteriores ao primeiro armazenado
+    assert store.append('BTC/USDT', '1h', HOUR_MS, candles(50, 50)) == 50
+    timestamps = store.read('BTC/USDT', '1h')['timestamp']
+    assert timestamps[0] == 50 * HOUR_MS
+    assert (np.diff(timestamps) == HOUR_MS).all()
+
+
+def test_candles_inside_gaps_are_merged_in_order(tmp_path):
+    store = CandleStore(str(tmp_path))
+    store.append('BTC/USDT', '1h', HOUR_MS, candles(0, 10) + candles(50, 10))
+
+    # Preenche a lacuna (com candles já existentes no meio, que são mantidos)
+    assert store.append('BTC/USDT', '1h', HOUR_MS, candles(5, 50)) == 40
+    df = store.read_dataframe('BTC/USDT', '1h')
+    assert len(df) == 60
+    assert (np.diff(df['timestamp'].astype('int64') // 10 ** 6) == HOUR_MS).all()
+    assert df['close'].iloc[3] == 3.5 and df['close'].iloc[20] == 15.5 and df['close'].iloc[52] == 2.5
+
+
+class PagedExchange:
+    """Exchange falsa com `count` candles de 1h, no máximo 1000 por chamada"""
+
+    def __init__(self, count: int = 2500):
+        self.data = candles(0, count)
+        self.calls = 0
+
+    def milliseconds(self):
+        return len(self.data) * HOUR_MS
+
+    async def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=None):
+        self.calls += 1
+        return [c for c in self.data if c[0] >= since][:min(limit, 1000)]
+
+    async def close(self):
+        pass
+
+
+def test_paginated_backfill_only_downloads_missing(tmp_path):
+    async def run():
+        service = CryptoService(cache=CandleCache(enabled=False))
+        await service.exchange.close()
+        service.exchange = PagedExchange()
+        service.history_store = CandleStore(str(tmp_path))
+
+        assert await service.backfill_history('BTC/USDT', '1h', since_ms=1000 * HOUR_MS) == 1500
+        assert service.exchange.calls == 2
+
+        # Completa o início do histórico sem baixar de novo o que já existe
+        assert await service.backfill_history('BTC/USDT', '1h', since_ms=0) == 1000
+        df = service.get_history('BTC/USDT', '1h')
+        assert len(df) == 2500
+        assert df['timestamp'].is_monotonic_increasing
+
+    asyncio.run(run())
+
+
+def test_backfill_of_many_pages_keeps_history_contiguous(tmp_path):
+    async def run():
+        service = CryptoService(cache=CandleCache(enabled=False))
+        await service.exchange.close()
+        service.exchange = PagedExchange(3500)
+        service.history_store = CandleStore(str(tmp_path))
+
+        # Histórico parcial, depois mais de uma página (2200 candles) antes do primeiro
+        assert await service.backfill_history('BTC/USDT', '1h', since_ms=2200 * HOUR_MS,
+                                              until_ms=2400 * HOUR_MS) == 200
+        assert await service.backfill_history('BTC/USDT', '1h', since_ms=0, until_ms=2400 * HOUR_MS) == 2200
+
+        # since_ms depois do último candle: continua do último, sem lacuna
+        assert await service.backfill_history('BTC/USDT', '1h', since_ms=3000 * HOUR_MS) == 1100
+        timestamps = service.history_store.read('BTC/USDT', '1h')['timestamp']
+        assert len(timestamps) == 3500
+        assert (np.diff(timestamps) == HOUR_MS).all()
+
+    asyncio.run(run())
@@ -0,0 +1,82 @@
+"""
+Testes do CryptoService assíncrono (sem acesso à rede)
+
+Usa uma exchange falsa com latência artificial para verificar que os
+timeframes são buscados em paralelo e que o adaptador síncrono funciona.
+
+Execute: pytest test_crypto_service_async.py -v
+"""
+import asyncio
+import time
+
+from app.services.crypto_service import CryptoService, SyncCryptoService
+
+
+class SlowExchange:
+    """Exchange falsa: cada chamada demora `latency` segundos"""
+
+    def __init__(self, latency: float = 0.2):
+        self.latency = latency
+        self.calls = 0
+
+    def milliseconds(self):
+        return int(time.time() * 1000)
+
+    async def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=None):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        now = self.milliseconds()
+        return [[now - i * 60_000, 100.0, 101.0, 99.0, 100.5, 10.0] for i in range(limit, 0, -1)]
+
+    async def fetch_ticker(self, symbol):
+        await asyncio.sleep(self.latency)
+        return {'last': 100.5}
+
+    async def close(self):
+        pass
+
+
+def test_multiple_timeframes_are_fetched_concurrently():
+    """3 timeframes devem custar aproximadamente um único round-trip"""
+    async def run():
+        service = CryptoService()
+        await service.exchange.close()
+        service.exchange = SlowExchange(latency=0.2)
+
+        start = time.perf_counter()
+        data = await service.get_multiple_timeframes('BTC/USDT', ['1h', '4h', '1d'], limit=50)
+        elapsed = time.perf_counter() - start
+
+        assert set(data.keys()) == {'1h', '4h', '1d'}
+        assert all(len(df) == 50 for df in data.values())
+        assert service.exchange.calls == 3
+        assert elapsed < 0.5, f"Busca não foi paralela ({elapsed:.2f}s)"
+
+    asyncio.run(run())
+
+
+def test_multiple_timeframes_accepts_limit_per_timeframe():
+    """O plano do LookbackPlanner define quantos candles buscar em cada timeframe"""
+    async def run():
+        service = CryptoService()
+        await service.exchange.close()
+        service.exchange = SlowExchange(latency=0.0)
+
+        data = await service.get_multiple_timeframes('BTC/USDT', ['1h', '4h'], limit={'1h': 60, '4h': 30})
+        assert len(data['1h']) == 60 and len(data['4h']) == 30
+
+    asyncio.run(run())
+
+
+def test_sync_shim():
+    """O SyncCryptoService deve expor a mesma API de forma bloqueante"""
+    service = SyncCryptoService()
+    service._run(service._service.exchange.close())
+    service._service.exchange = SlowExchange(latency=0.01)
+
+    df = service.get_candles('BTC/USDT', '1h', limit=20)
+    assert len(df) == 20
+    assert service.get_current_price('BTC/USDT') == 100.5
+    assert service.normalize_symbol('eth') == 'ETH/USDT'
+
+    service.close()
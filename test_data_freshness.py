@@ -13,7 +13,7 @@ if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
     sys.stderr.reconfigure(encoding='utf-8')
 
-from app.services.crypto_service import CryptoService
+from app.services.crypto_service import SyncCryptoService
 
 
 def test_data_freshness():
@@ -24,7 +24,7 @@ def test_data_freshness():
     print()
     
     # Inicializa o serviço
-    service = CryptoService()
+    service = SyncCryptoService()
     symbol = "BTC/USDT"
     
     # Testa diferentes timeframes
@@ -0,0 +1,81 @@
+"""
+Testes dos backends de exchange offline (replay e sintético)
+
+Execute: pytest test_exchanges.py -v
+"""
+import asyncio
+
+import ccxt
+import pytest
+
+from app.config import settings
+from app.services.candle_cache import CandleCache
+from app.services.crypto_service import CryptoService
+from app.services.exchanges import FakeExchange, ReplayExchange, SyntheticExchange, create_exchange
+
+
+def test_create_exchange_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, 'exchange_name', 'replay')
+    assert isinstance(create_exchange(), ReplayExchange)
+    monkeypatch.setattr(settings, 'exchange_name', 'synthetic')
+    assert isinstance(create_exchange(), SyntheticExchange)
+    with pytest.raises(ValueError):
+        create_exchange('exchange_que_nao_existe')
+
+
+def test_incomplete_fake_exchange_fails_on_construction():
+    class NoCandles(FakeExchange):
+        def symbols(self):
+            return ['BTC/USDT']
+
+        def _ticker(self, symbol):
+            return {'symbol': symbol}
+
+    with pytest.raises(TypeError):
+        FakeExchange()
+    with pytest.raises(TypeError):
+        NoCandles()
+
+
+def test_replay_serves_recorded_candles():
+    async def run():
+        exchange = ReplayExchange(settings.replay_fixtures_dir)
+        candles = await exchange.fetch_ohlcv('BTC/USDT', '1d', limit=10)
+        assert len(candles) == 10
+        assert candles[-1][0] <= exchange.milliseconds()
+
+        paged = await exchange.fetch_ohlcv('BTC/USDT', '1h', since=candles[0][0], limit=5)
+        assert paged[0][0] == candles[0][0] and len(paged) == 5
+
+        ticker = await exchange.fetch_ticker('ETH/USDT')
+        assert ticker['last'] > 0
+
+        with pytest.raises(ccxt.BadSymbol):
+            await exchange.fetch_ohlcv('XYZ/USDT', '1h', limit=5)
+
+    asyncio.run(run())
+
+
+def test_synthetic_is_deterministic_and_consistent_across_timeframes():
+    async def run():
+        exchange = SyntheticExchange()
+        hourly = await exchange.fetch_ohlcv('BTC/USDT', '1h', limit=48)
+        again = await exchange.fetch_ohlcv('BTC/USDT', '1h', since=hourly[0][0], limit=47)
+        assert hourly[:47] == again
+
+        # O fechamento de cada candle é a abertura do seguinte
+        assert all(a[4] == b[1] for a, b in zip(hourly[:-2], hourly[1:-1]))
+        assert all(c[3] <= min(c[1], c[4]) and c[2] >= max(c[1], c[4]) for c in hourly)
+
+    asyncio.run(run())
+
+
+def test_failure_injection_is_retried_by_crypto_service():
+    async def run():
+        exchange = SyntheticExchange(failure_rate=0.5, seed=3)
+        service = CryptoService(cache=CandleCache(enabled=False), exchange=exchange, retry_delay=0.0, max_retries=10)
+        df = await service.get_candles('ETH/USDT', '4h', limit=100)
+        assert len(df) == 100
+        assert exchange.calls['fetch_ohlcv'] > 1
+
+    asyncio.run(run())
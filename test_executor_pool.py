@@ -0,0 +1,137 @@
+"""
+Testes dos pools de execução (fila limitada, métricas, processos)
+
+Execute: pytest test_executor_pool.py -v
+"""
+import asyncio
+import threading
+
+import pytest
+
+from app.services.executor_pool import PROCESS, THREAD, ExecutorSaturatedError, ManagedExecutor
+from app.services.indicator_cache import IndicatorCache
+from sample_data import make_candles
+
+
+def test_thread_pool_runs_off_the_event_loop():
+    async def run():
+        pool = ManagedExecutor('io', THREAD, max_workers=2)
+        try:
+            return await pool.run(threading.get_ident), threading.get_ident(), pool.stats()
+        finally:
+            pool.shutdown()
+
+    worker, loop_thread, stats = asyncio.run(run())
+    assert worker != loop_thread
+    assert stats['submitted'] == stats['completed'] == 1
+    assert stats['running'] == stats['queued'] == 0
+
+
+def test_full_queue_rejects_immediately():
+    async def run():
+        pool = ManagedExecutor('io', THREAD, max_workers=1, max_queue=1)
+        release = threading.Event()
+        try:
+            running = [asyncio.ensure_future(pool.run(release.wait, 5)) for _ in range(2)]
+            await asyncio.sleep(0.05)
+            assert pool.stats()['running'] == 1 and pool.stats()['queued'] == 1
+            with pytest.raises(ExecutorSaturatedError):
+                await pool.run(release.wait, 5)
+            release.set()
+            await asyncio.gather(*running)
+            return pool.stats()
+        finally:
+            release.set()
+            pool.shutdown()
+
+    stats = asyncio.run(run())
+    assert stats['rejected'] == 1 and stats['completed'] == 2
+
+
+def test_failures_are_counted_and_raised():
+    async def run():
+        pool = ManagedExecutor('io', THREAD, max_workers=1)
+        try:
+            with pytest.raises(ZeroDivisionError):
+                await pool.run(divmod, 1, 0)
+            return pool.stats()
+        finally:
+            pool.shutdown()
+
+    assert asyncio.run(run())['failed'] == 1
+
+
+def test_cancelled_request_keeps_slot_until_task_finishes():
+    async def run():
+        pool = ManagedExecutor('io', THREAD, max_workers=1, max_queue=1)
+        release = threading.Event()
+        try:
+            running = asyncio.ensure_future(pool.run(release.wait, 5))
+            queued = asyncio.ensure_future(pool.run(release.wait, 5))
+            await asyncio.sleep(0.05)
+
+            # Cliente desconectou: a tarefa na fila é cancelada e libera a vaga, mas a
+            # que já está no worker continua ocupando a sua
+            running.cancel()
+            queued.cancel()
+            await asyncio.sleep(0.05)
+            assert pool.stats()['running'] == 1 and pool.stats()['cancelled'] == 1
+            late = asyncio.ensure_future(pool.run(release.wait, 5))
+            await asyncio.sleep(0.05)
+            with pytest.raises(ExecutorSaturatedError):
+                await pool.run(release.wait, 5)
+
+            release.set()
+            await late
+            await asyncio.sleep(0.05)
+            return pool.stats()
+        finally:
+            release.set()
+            pool.shutdown()
+
+    stats = asyncio.run(run())
+    assert stats['running'] == stats['queued'] == 0
+    assert stats['completed'] == 2 and stats['cancelled'] == 1 and stats['rejected'] == 1
+
+
+def test_disabled_pool_runs_inline():
+    async def run():
+        pool = ManagedExecutor('cpu', PROCESS, max_workers=0)
+        return await pool.run(threading.get_ident), threading.get_ident(), pool.stats()
+
+    worker, loop_thread, stats = asyncio.run(run())
+    assert worker == loop_thread
+    assert not stats['enabled'] and stats['submitted'] == 0
+
+
+def test_process_pool_computes_in_workers():
+    async def run():
+        pool = ManagedExecutor('cpu', PROCESS, max_workers=2)
+        try:
+            await pool.warm_up()
+            return await asyncio.gather(*(pool.run(pow, 2, n) for n in range(8))), pool.stats()
+        finally:
+            pool.shutdown()
+
+    results, stats = asyncio.run(run())
+    assert results == [2 ** n for n in range(8)]
+    assert stats['completed'] == 8 and stats['failed'] == 0
+
+
+def test_async_cache_computes_once_per_candle():
+    async def run():
+        cache = IndicatorCache()
+        df = make_candles(50, seed=1)
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            return {'value': len(calls)}
+
+        first = await cache.get_or_compute_async('BTC/USDT', '1h', 'indicators', df, compute)
+        second = await cache.get_or_compute_async('BTC/USDT', '1h', 'indicators', df, compute)
+        return first, second, len(calls), cache.stats()
+
+    first, second, calls, stats = asyncio.run(run())
+    assert first == second == {'value': 1}
+    assert calls == 1 and stats['hits'] == 1 and stats['misses'] == 1
@@ -0,0 +1,57 @@
+"""
+Testes do cache de resultados de indicadores
+
+Execute: pytest test_indicator_cache.py -v
+"""
+import numpy as np
+
+from app.services.indicator_cache import IndicatorCache
+from app.services.indicator_kernel import compute_from_dataframe
+from sample_data import make_candles
+
+
+def test_repeat_requests_within_candle_are_hits():
+    cache = IndicatorCache()
+    df = make_candles(300)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return compute_from_dataframe(df).to_indicators()
+
+    first = cache.get_or_compute('BTC/USDT', '1h', 'indicators', df, compute)
+    first['trend']['EMA9'] = -1  # o chamador recebe uma cópia
+    second = cache.get_or_compute('BTC/USDT', '1h', 'indicators', df.copy(), compute)
+    assert len(calls) == 1
+    assert second['trend']['EMA9'] != -1
+    assert cache.stats()['hits'] == 1
+
+
+def test_forming_candle_change_or_new_candle_invalidates():
+    cache = IndicatorCache()
+    df = make_candles(301)
+    window = df.iloc[:300].copy()
+    cache.get_or_compute('BTC/USDT', '1h', 'x', window, lambda: 1)
+
+    window.loc[window.index[-1], 'close'] += 10  # preço do candle em formação mudou
+    assert cache.get_or_compute('BTC/USDT', '1h', 'x', window, lambda: 2) == 2
+
+    shifted = df.iloc[1:301]  # novo candle abriu
+    assert cache.get_or_compute('BTC/USDT', '1h', 'x', shifted, lambda: 3) == 3
+    assert cache.stats()['size'] == 1  # só o resultado mais recente de cada série fica
+
+
+def test_lru_and_memory_cap():
+    df = make_candles(50)
+    cache = IndicatorCache(max_entries=100, max_bytes=3 * 8000 + 1000)
+    for i in range(5):
+        cache.get_or_compute(f"S{i}/USDT", '1h', 'ema', df, lambda: np.zeros(1000))
+    stats = cache.stats()
+    assert stats['size'] == 3 and stats['evictions'] == 2
+    assert stats['bytes'] <= cache.max_bytes
+
+    # A entrada menos usada é a que sai
+    cache.get_or_compute('S2/USDT', '1h', 'ema', df, lambda: np.ones(1000))
+    cache.get_or_compute('S5/USDT', '1h', 'ema', df, lambda: np.zeros(1000))
+    assert cache.get_or_compute('S2/USDT', '1h', 'ema', df, lambda: None) is not None
+    assert cache.get_or_compute('S3/USDT', '1h', 'ema', df, lambda: None) is None
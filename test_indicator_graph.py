@@ -0,0 +1,92 @@
+"""
+Testes da avaliação seletiva do grafo de indicadores
+
+Execute: pytest test_indicator_graph.py -v
+"""
+import importlib.util
+import math
+
+import pytest
+
+from app.services.indicator_kernel import (
+    INDICATOR_GRAPH, KERNEL_FIELDS, compute_from_dataframe, evaluation_order, mask_indicators, select_fields
+)
+from app.utils.score_engine import ScoreEngine
+from sample_data import make_candles
+
+
+def test_every_field_is_a_graph_node():
+    assert set(KERNEL_FIELDS) <= set(INDICATOR_GRAPH)
+
+
+def test_evaluation_order_respects_dependencies():
+    order = evaluation_order()
+    position = {name: i for i, name in enumerate(order)}
+    assert len(order) == len(set(order))
+    for name in order:
+        for dep in INDICATOR_GRAPH[name][0]:
+            assert position[dep] < position[name], (dep, name)
+
+
+def test_evaluation_order_only_includes_needed_nodes():
+    assert evaluation_order(['EMA9', 'last_close']) == ['EMA9', 'last_close']
+    assert evaluation_order(['ADX']) == ['true_range', 'atr_series', 'dx_series', 'ADX']
+    assert 'rsi_series' not in evaluation_order(['ATR', 'MACD_Histogram'])
+
+
+def test_unknown_field_raises():
+    with pytest.raises(ValueError):
+        evaluation_order(['EMA7'])
+    with pytest.raises(ValueError):
+        select_fields(categories=['sentiment'])
+
+
+def test_select_fields_by_category_and_name():
+    assert select_fields() == KERNEL_FIELDS
+    assert select_fields(['rsi'], ['price']) == ('RSI', 'last_close', 'current_volume')
+
+
+def test_selective_values_match_full_computation():
+    df = make_candles(300, seed=7)
+    full = compute_from_dataframe(df).to_dict()
+    fields = select_fields(categories=['trend', 'strength'])
+    partial = compute_from_dataframe(df, fields).to_dict()
+    for name in KERNEL_FIELDS:
+        if name in fields:
+            assert partial[name] == pytest.approx(full[name], rel=1e-12), name
+        else:
+            assert partial[name] is None, name
+
+
+def test_score_inputs_are_graph_fields():
+    fields = select_fields(ScoreEngine.REQUIRED_INDICATORS)
+    assert set(fields) == set(ScoreEngine.REQUIRED_INDICATORS)
+
+
+def test_selected_indicators_feed_score_engine():
+    df = make_candles(300, seed=3)
+    fields = select_fields(categories=['trend']) + ScoreEngine.REQUIRED_INDICATORS
+    full = compute_from_dataframe(df).to_indicators()
+    partial = compute_from_dataframe(df, fields).to_indicators()
+    last_close, volume = full['price']['last_close'], full['price']['current_volume']
+    assert ScoreEngine.calculate_overall_score(full, last_close, volume) == \
+        ScoreEngine.calculate_overall_score(partial, last_close, volume)
+
+
+def test_mask_indicators_keeps_layout():
+    df = make_candles(100, seed=1)
+    masked = mask_indicators(compute_from_dataframe(df).to_indicators(), ('RSI',))
+    assert set(masked) == {'trend', 'momentum', 'volatility', 'volume', 'strength', 'price'}
+    assert not math.isnan(masked['momentum']['RSI'])
+    assert masked['trend']['EMA9'] is None
+
+
+@pytest.mark.skipif(importlib.util.find_spec('pandas_ta') is None, reason="pandas_ta não instalado")
+def test_resolve_fields_always_includes_score_inputs():
+    from app.services.indicator_service import IndicatorService
+
+    fields = IndicatorService.resolve_fields(None, ['trend'], required=ScoreEngine.REQUIRED_INDICATORS)
+    assert set(ScoreEngine.REQUIRED_INDICATORS) <= set(fields)
+    assert 'SMA100' in fields and 'OBV' not in fields
+    assert IndicatorService.resolve_fields(required=('RSI',)) == ('RSI',)
+    assert IndicatorService.resolve_fields() == KERNEL_FIELDS
@@ -0,0 +1,66 @@
+"""
+Testes do kernel NumPy fundido de indicadores
+
+O motor incremental (já comparado às fórmulas do pandas_ta) serve de referência.
+
+Execute: pytest test_indicator_kernel.py -v
+"""
+import numpy as np
+import pytest
+
+from app.services.indicator_kernel import compute_from_dataframe, compute_indicators_batch, linear_recurrence, stack_ohlcv
+from app.services.streaming_indicators import StreamingIndicators
+from sample_data import make_candles
+
+
+def streaming_values(df):
+    state = StreamingIndicators()
+    for i, row in enumerate(df.itertuples()):
+        values = state.update(i, row.high, row.low, row.close, row.volume)
+    return values
+
+
+def test_linear_recurrence_matches_loop():
+    x = np.random.default_rng(1).normal(size=1500)
+    expected, y = [], 3.0
+    for value in x:
+        y = 0.9 * y + value
+        expected.append(y)
+    np.testing.assert_allclose(linear_recurrence(x, 0.9, 3.0), expected, rtol=1e-10, atol=1e-10)
+
+
+@pytest.mark.parametrize('n', [14, 15, 30, 60, 250, 500, 1000])
+def test_kernel_matches_incremental_engine(n):
+    df = make_candles(n, seed=n)
+    result = compute_from_dataframe(df).to_dict()
+    expected = streaming_values(df)
+    for name, value in expected.items():
+        if value is None:
+            assert result[name] is None, name
+        else:
+            assert result[name] == pytest.approx(value, rel=1e-8, abs=1e-8), name
+
+
+def test_to_indicators_has_api_layout():
+    indicators = compute_from_dataframe(make_candles(500)).to_indicators()
+    assert set(indicators) == {'trend', 'momentum', 'volatility', 'volume', 'strength', 'price'}
+    assert all(value is not None for fields in indicators.values() for value in fields.values())
+
+
+def test_batch_with_ragged_histories_matches_single_series():
+    frames = {f"S{i}/USDT": make_candles(n, seed=i) for i, n in enumerate([500, 320, 60, 20, 10, 500])}
+    symbols, matrices = stack_ohlcv(frames)
+    assert matrices['close'].shape == (6, 500)
+
+    batch = compute_indicators_batch(matrices['high'], matrices['low'], matrices['close'], matrices['volume'])
+    for row, symbol in enumerate(symbols):
+        single = compute_from_dataframe(frames[symbol]).to_dict()
+        for name, value in single.items():
+            batch_value = batch[name][row]
+            if value is None:
+                assert np.isnan(batch_value), (symbol, name)
+            else:
+                assert batch_value == pytest.approx(value, rel=1e-9, abs=1e-9), (symbol, name)
+
+    # Histórico abaixo do mínimo: nenhum indicador (nem preço), como em get_indicators
+    assert np.isnan(batch['last_close'][4])
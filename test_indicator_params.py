@@ -0,0 +1,128 @@
+"""
+Testes dos parâmetros configuráveis dos indicadores e do sweep de períodos
+
+Execute: pytest test_indicator_params.py -v
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.indicator_kernel import compute_from_dataframe, ema, rma, sweep
+from app.services.indicator_params import DEFAULT_PARAMS, IndicatorParams
+from app.services.streaming_indicators import StreamingIndicators
+from sample_data import assert_matches, make_candles, reference_last
+
+
+CUSTOM = IndicatorParams(
+    ema_fast=5, ema_medium=13, ema_trend=34, ema_slow=89, sma_period=50, rsi_period=7,
+    stoch_rsi_length=10, stoch_k=2, stoch_d=4, macd_fast=8, macd_slow=17, macd_signal=5,
+    atr_period=10, bb_period=15, bb_std=1.5, volume_ma_period=10, mfi_period=9, adx_period=12
+)
+
+
+def test_defaults_keep_pandas_ta_columns():
+    columns = DEFAULT_PARAMS.pandas_ta_columns()
+    assert columns['Stochastic_RSI_K'] == 'STOCHRSIk_14_14_3_3'
+    assert columns['MACD_Signal'] == 'MACDs_12_26_9'
+    assert columns['BB_Upper'] == 'BBU_20_2.0_2.0'
+    assert columns['ADX'] == 'ADX_14'
+
+
+def test_from_settings_reads_overrides():
+    class Config:
+        rsi_period = 21
+        ema_fast = 7
+
+    params = IndicatorParams.from_settings(Config())
+    assert params.rsi_period == 21 and params.ema_fast == 7
+    assert params.macd_slow == DEFAULT_PARAMS.macd_slow
+
+
+@pytest.mark.parametrize('override', [{'ema_fast': 0}, {'rsi_period': -3}, {'atr_period': 2.5}, {'bb_std': 0.0}])
+def test_from_settings_rejects_invalid_periods(override):
+    class Config:
+        pass
+
+    for name, value in override.items():
+        setattr(Config, name, value)
+    with pytest.raises(ValueError):
+        IndicatorParams.from_settings(Config())
+
+
+def test_period_one_in_kernel_streaming_and_sweep():
+    df = make_candles(300, seed=3)
+    params = IndicatorParams(ema_fast=1, sma_period=1, rsi_period=1, stoch_k=1, stoch_d=1, atr_period=1,
+                             bb_period=1, volume_ma_period=1, mfi_period=1, adx_period=1)
+    assert IndicatorParams.from_settings(params) == params
+    expected = reference_last(df, params)
+    assert_matches(compute_from_dataframe(df, params=params).to_dict(), expected)
+
+    state = StreamingIndicators(params)
+    for i, row in enumerate(df.itertuples()):
+        values = state.update(i, row.high, row.low, row.close, row.volume)
+    assert_matches(values, expected)
+
+    close, high, low = (df[column].to_numpy() for column in ('close', 'high', 'low'))
+    for family in ('ema', 'sma', 'rsi', 'atr'):
+        series = sweep(family, [1, 2, 5], close, high, low)
+        np.testing.assert_array_equal(series[1:], sweep(family, [2, 5], close, high, low))
+    np.testing.assert_array_equal(sweep('ema', [1], close)[0], close)
+    rsi = sweep('rsi', [1], close)[0]
+    assert ((rsi[1:] == 100.0) == (np.diff(close) > 0)).all()
+
+
+@pytest.mark.parametrize('params', [DEFAULT_PARAMS, CUSTOM])
+def test_kernel_and_streaming_follow_params(params):
+    df = make_candles(300, seed=11)
+    expected = reference_last(df, params)
+    assert_matches(compute_from_dataframe(df, params=params).to_dict(), expected)
+
+    state = StreamingIndicators(params)
+    for i, row in enumerate(df.itertuples()):
+        values = state.update(i, row.high, row.low, row.close, row.volume)
+    assert_matches(values, expected)
+
+
+def test_ema_sweep_matches_individual_emas():
+    close = make_candles(500, seed=5)['close'].to_numpy()
+    lengths = list(range(5, 201))
+    series = sweep('ema', lengths, close)
+    assert series.shape == (len(lengths), len(close))
+    for row, length in enumerate(lengths):
+        np.testing.assert_allclose(series[row], ema(close, length), rtol=1e-12, equal_nan=True)
+
+
+def test_sma_rsi_atr_sweeps():
+    df = make_candles(300, seed=9)
+    close, high, low = (df[col].to_numpy() for col in ('close', 'high', 'low'))
+    lengths = [3, 14, 50]
+
+    sma = sweep('sma', lengths, close)
+    for row, length in enumerate(lengths):
+        np.testing.assert_allclose(sma[row], pd.Series(close).rolling(length).mean(), rtol=1e-9, equal_nan=True)
+
+    rsi = sweep('rsi', lengths, close)
+    atr = sweep('atr', lengths, close, high, low)
+    for row, length in enumerate(lengths):
+        params = DEFAULT_PARAMS._replace(rsi_period=length, atr_period=length)
+        result = compute_from_dataframe(df, ['RSI', 'ATR'], params)
+        assert rsi[row, -1] == pytest.approx(result.RSI, rel=1e-12)
+        assert atr[row, -1] == pytest.approx(result.ATR, rel=1e-12)
+    assert np.isnan(rsi[:, 0]).all()
+
+
+def test_sweep_rejects_invalid_input():
+    close = make_candles(50)['close'].to_numpy()
+    with pytest.raises(ValueError):
+        sweep('wma', [5], close)
+    with pytest.raises(ValueError):
+        sweep('ema', [0, 5], close)
+    with pytest.raises(ValueError):
+        sweep('atr', [5], close)
+
+
+def test_rma_accepts_one_length_per_row():
+    x = np.abs(np.random.default_rng(3).normal(size=200))
+    rows = rma(np.broadcast_to(x, (2, 200)), np.array([5, 20]))
+    np.testing.assert_allclose(rows[0], rma(x, 5), equal_nan=True)
+    np.testing.assert_allclose(rows[1], rma(x, 20), equal_nan=True)
@@ -0,0 +1,148 @@
+"""
+Testes das séries completas de indicadores (modo série do kernel)
+
+Execute: pytest test_indicator_series.py -v
+"""
+import asyncio
+import importlib.util
+import json
+import math
+
+import numpy as np
+import pytest
+from fastapi import HTTPException
+
+from app.services.crypto_service import CryptoService
+from app.services.exchanges import ReplayExchange
+from app.services.indicator_kernel import (
+    KERNEL_FIELDS, compute_from_dataframe, compute_series_from_dataframe, compute_with_series
+)
+from app.services.indicator_params import IndicatorParams
+from app.services.streaming_indicators import format_series
+from sample_data import make_candles, reference_last
+
+# A rota importa o IndicatorService, que depende do pandas_ta
+requires_pandas_ta = pytest.mark.skipif(importlib.util.find_spec('pandas_ta') is None,
+                                        reason="pandas_ta não instalado")
+
+
+@pytest.mark.parametrize('params', [IndicatorParams(), IndicatorParams(ema_fast=5, rsi_period=7, stoch_d=5, bb_period=10)])
+def test_every_column_matches_last_value_on_prefix(params):
+    df = make_candles(260, seed=5)
+    series = compute_series_from_dataframe(df, params=params)
+    for end in (20, 45, 99, 100, 201, 259):
+        last = compute_from_dataframe(df.iloc[:end + 1], params=params).to_dict()
+        for name in KERNEL_FIELDS:
+            expected = last[name]
+            if expected is None:
+                assert math.isnan(series[name][end]), (name, end)
+            else:
+                assert series[name][end] == pytest.approx(expected, rel=1e-9, abs=1e-9), (name, end)
+
+
+def test_series_match_reference_implementation():
+    df = make_candles(300, seed=11)
+    series = compute_series_from_dataframe(df)
+    for end in (150, 299):
+        expected = reference_last(df.iloc[:end + 1])
+        for name, value in expected.items():
+            if value is not None and not math.isnan(value):
+                assert series[name][end] == pytest.approx(value, rel=1e-6, abs=1e-6), (name, end)
+
+
+def test_series_only_contains_requested_fields():
+    df = make_candles(120, seed=2)
+    series = compute_series_from_dataframe(df, ('RSI', 'OBV'))
+    assert set(series) == {'RSI', 'OBV'}
+    assert series['RSI'].shape == (120,)
+    assert np.isnan(series['RSI'][:14]).all() and not np.isnan(series['RSI'][14:]).any()
+    assert not np.isnan(series['OBV']).any()
+
+
+def test_short_history_has_no_values():
+    series = compute_series_from_dataframe(make_candles(10, seed=1), ('last_close',))
+    assert np.isnan(series['last_close']).all()
+
+
+@pytest.mark.parametrize('n', [10, 60, 300])
+def test_series_fields_in_the_same_pass_as_last_values(n):
+    df = make_candles(n, seed=3)
+    last = compute_from_dataframe(df).to_dict()
+    full = compute_series_from_dataframe(df)
+    for field in KERNEL_FIELDS:
+        result, series = compute_with_series(df, series_fields=[field])
+        np.testing.assert_array_equal(series[field], full[field])
+        for name, value in result.to_dict().items():
+            assert value == pytest.approx(last[name], rel=1e-12, abs=1e-12), (field, name)
+
+
+@requires_pandas_ta
+def test_chart_emas_come_from_the_indicator_pass():
+    from app.services.indicator_service import IndicatorService
+
+    params = IndicatorParams(ema_fast=5, ema_slow=120)
+    df = make_candles(400, seed=8)
+    indicators, emas = IndicatorService.get_indicators_with_emas(df, ('RSI',), params)
+    assert indicators == IndicatorService.get_indicators(df, ('RSI',), params)
+    assert set(emas) == {5, 21, 120}
+    for length, values in IndicatorService.get_ema_series(df, params.chart_ema_lengths).items():
+        np.testing.assert_allclose(emas[length], values, rtol=1e-12)
+
+    # Histórico curto: sem indicadores, mas com as EMAs do gráfico
+    indicators, emas = IndicatorService.get_indicators_with_emas(df.iloc[:10], params=params)
+    assert indicators['momentum']['RSI'] is None
+    assert not np.isnan(emas[5][-1])
+
+
+def test_format_series_rounds_and_replaces_nan():
+    assert format_series(np.array([np.nan, 1.23456, 2.0]), 'RSI') == [None, 1.23, 2.0]
+    assert format_series(np.array([0.123456]), 'MACD') == [0.1235]
+
+
+def call_route(monkeypatch, **query):
+    """Chama GET /indicators/BTC com a exchange de replay (relógio em nov/2025)"""
+    import app.routes.indicators as indicators_route
+
+    async def run():
+        service = CryptoService(exchange=ReplayExchange('fixtures/ohlcv'))
+        monkeypatch.setattr(indicators_route, 'crypto_service', service)
+        query.setdefault('names', None)
+        query.setdefault('since', None)
+        query.setdefault('points', 200)
+        response = await indicators_route.get_indicator_series('BTC', timeframe='1h', **query)
+        return service.exchange.milliseconds(), json.loads(response.body)
+
+    return asyncio.run(run())
+
+
+def planner_max_display(fields):
+    import app.routes.indicators as indicators_route
+    return indicators_route.lookback_planner.max_display(fields)
+
+
+@requires_pandas_ta
+def test_since_is_measured_on_the_exchange_clock(monkeypatch):
+    hour = 3600 * 1000
+    now_ms, _ = call_route(monkeypatch, names='RSI')
+    since = (now_ms // hour - 99) * hour
+    _, body = call_route(monkeypatch, names='RSI', since=since)
+    assert len(body['timestamps']) == 100
+    assert body['timestamps'][0] == since
+    assert None not in body['series']['RSI']
+
+
+@requires_pandas_ta
+def test_since_outside_the_servable_window_is_rejected(monkeypatch):
+    hour = 3600 * 1000
+    now_ms, _ = call_route(monkeypatch, names='RSI')
+    max_points = planner_max_display(['RSI'])
+    with pytest.raises(HTTPException) as error:
+        call_route(monkeypatch, names='RSI', since=(now_ms // hour - max_points) * hour)
+    assert error.value.status_code == 400
+
+
+@requires_pandas_ta
+def test_points_leave_room_for_warmup(monkeypatch):
+    _, body = call_route(monkeypatch, names='EMA200', points=1000)
+    assert len(body['timestamps']) == planner_max_display(['EMA200']) < 1000
+    assert None not in body['series']['EMA200']
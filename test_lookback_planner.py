@@ -0,0 +1,65 @@
+"""
+Testes do planejamento de histórico mínimo (aquecimento dos indicadores)
+
+Execute: pytest test_lookback_planner.py -v
+"""
+import pytest
+
+from app.services.indicator_kernel import KERNEL_FIELDS, compute_from_dataframe, ema_warmup, required_candles
+from app.services.indicator_params import DEFAULT_PARAMS
+from app.services.lookback_planner import LookbackPlanner
+from app.utils.score_engine import ScoreEngine
+from sample_data import make_candles
+
+
+# Indicadores limitados a 0-100: erro medido em pontos; os demais, relativo ao preço
+OSCILLATORS = {'RSI', 'Stochastic_RSI_K', 'Stochastic_RSI_D', 'MFI', 'ADX'}
+
+
+def test_warmup_follows_periods_and_tolerance():
+    assert required_candles(['RSI']) < required_candles(['EMA200'])
+    assert required_candles(['EMA200']) == ema_warmup(200, 0.05) == 500
+    assert required_candles(['EMA200'], tolerance=0.01) > required_candles(['EMA200'], tolerance=0.05)
+    assert required_candles(['EMA9'], DEFAULT_PARAMS._replace(ema_fast=50)) == required_candles(['EMA50'])
+    assert required_candles(['last_close']) == 14
+
+
+def test_history_dependent_fields_fall_back_to_default():
+    assert required_candles(['OBV']) is None
+    planner = LookbackPlanner(default_limit=500)
+    assert planner.candles_for(['OBV', 'RSI']) == 500
+    assert planner.candles_for(['OBV'], display=800) == 800
+    assert planner.candles_for(['OBV'], display=5000) == 1000
+    assert planner.candles_for(['RSI']) < 100
+    assert planner.max_display(['EMA200']) == 1000 - 500 + 1
+    assert planner.candles_for(['EMA200'], display=planner.max_display(['EMA200'])) == 1000
+
+
+@pytest.mark.parametrize('tolerance', [0.05, 0.01])
+def test_planned_window_matches_full_history(tolerance):
+    df = make_candles(3000, seed=4)
+    full = compute_from_dataframe(df).to_dict()
+    scale = full['last_close']
+    for field in KERNEL_FIELDS:
+        if field == 'OBV':
+            continue
+        window = df.tail(required_candles([field], tolerance=tolerance))
+        value = compute_from_dataframe(window, [field]).to_dict()[field]
+        bound = tolerance * (100 if field in OSCILLATORS else scale)
+        assert abs(value - full[field]) <= bound, field
+
+
+def test_plan_per_timeframe():
+    planner = LookbackPlanner(max_limit=1000)
+    chart = planner.candles_for(('EMA9', 'EMA21', 'EMA200'), display=200)
+    plan = planner.plan(['1h', '4h', '1d'], ScoreEngine.REQUIRED_INDICATORS, minimum={'4h': chart})
+    assert plan['1h'] == plan['1d'] == 500
+    assert plan['4h'] == chart == 699
+
+    cheap = planner.plan(['1h'], ['RSI', 'EMA9', 'last_close'])
+    assert cheap['1h'] == required_candles(['RSI'])
+
+
+def test_disabled_planner_and_cap():
+    assert LookbackPlanner(enabled=False, default_limit=500).candles_for(['RSI']) == 500
+    assert LookbackPlanner(tolerance=0.0001, max_limit=1000).candles_for(['EMA200']) == 1000
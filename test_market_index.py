@@ -0,0 +1,87 @@
+"""
+Testes do índice de mercados (validação e normalização de símbolos sem rede)
+
+Execute: pytest test_market_index.py -v
+"""
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.routes.helpers import validate_and_normalize_symbol
+from app.services.crypto_service import CryptoService
+from app.services.exchanges import SyntheticExchange
+from app.services.market_index import MarketIndex, SymbolNotListedError
+
+
+def market(base, quote, active=True, type_='spot'):
+    return {'id': base + quote, 'symbol': f"{base}/{quote}", 'base': base, 'quote': quote,
+            'active': active, 'type': type_, 'precision': {'price': 2, 'amount': 5},
+            'limits': {'amount': {'min': 0.0001}, 'cost': {'min': 10}}}
+
+
+def build_index():
+    markets = [market('BTC', 'USDT'), market('BTC', 'BRL'), market('PEPE', 'FDUSD'),
+               market('OLD', 'USDT', active=False), market('ETH', 'USDT', type_='swap')]
+    index = MarketIndex(['USDT', 'FDUSD', 'BRL'])
+    index.load({m['symbol']: m for m in markets})
+    return index
+
+
+def test_resolve_symbol_formats():
+    index = build_index()
+    assert index.resolve('btc') == 'BTC/USDT'
+    assert index.resolve('btc-brl') == 'BTC/BRL'
+    assert index.resolve('BTCBRL') == 'BTC/BRL'
+    assert index.resolve('PEPE') == 'PEPE/FDUSD'  # única cotação disponível
+    assert index.quotes_for('BTC') == ['USDT', 'BRL']
+    assert index.precision('BTC/USDT')['min_cost'] == 10
+    assert index.symbols('usdt') == ['BTC/USDT']
+    assert index.symbols() == ['BTC/BRL', 'BTC/USDT', 'PEPE/FDUSD']
+
+
+def test_inactive_and_other_market_types_are_rejected():
+    index = build_index()
+    for symbol in ('OLD', 'ETH', 'ETH/USDT', 'XYZ', 'BTC/EUR'):
+        with pytest.raises(SymbolNotListedError):
+            index.resolve(symbol)
+
+
+def test_malformed_symbols_are_not_reported_as_unlisted():
+    index = build_index()
+    for symbol in ('BTC//', '/USDT', 'BTC/', 'BTC$', 'BTC/USDT/BRL', ''):
+        with pytest.raises(ValueError) as error:
+            index.resolve(symbol)
+        assert not isinstance(error.value, SymbolNotListedError)
+
+
+def test_unknown_symbol_fails_without_network():
+    async def run():
+        exchange = SyntheticExchange(symbols=['BTC/USDT', 'ETH/USDT'])
+        service = CryptoService(exchange=exchange)
+        assert service.normalize_symbol('xyz') == 'XYZ/USDT'  # sem índice: comportamento antigo
+        with pytest.raises(ValueError):
+            service.normalize_symbol('xyz//')
+
+        assert await service.load_markets() == 2
+        assert service.normalize_symbol('eth') == 'ETH/USDT'
+        with pytest.raises(ValueError):
+            service.normalize_symbol('xyz')
+        with pytest.raises(ValueError):
+            await service.get_candles('XYZ/USDT', '1h', limit=10)
+        assert 'fetch_ohlcv' not in exchange.calls
+
+    asyncio.run(run())
+
+
+def test_route_status_for_malformed_and_unlisted_symbols():
+    async def run():
+        service = CryptoService(exchange=SyntheticExchange(symbols=['BTC/USDT']))
+        await service.load_markets()
+        assert validate_and_normalize_symbol('btc', service) == 'BTC/USDT'
+        for symbol, status in (('XYZ', 404), ('ETH/USDT', 404), ('BTC//', 400), ('BTC$', 400)):
+            with pytest.raises(HTTPException) as error:
+                validate_and_normalize_symbol(symbol, service)
+            assert error.value.status_code == status, symbol
+
+    asyncio.run(run())
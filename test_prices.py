@@ -0,0 +1,45 @@
+"""
+Testes do preço em lote (/prices) servido por uma única chamada fetch_tickers
+
+Execute: pytest test_prices.py -v
+"""
+import asyncio
+
+from app.services.crypto_service import CryptoService
+from app.services.exchanges import SYNTHETIC_BASES, SyntheticExchange
+
+
+def test_watchlist_costs_one_fetch_tickers_call():
+    async def run():
+        exchange = SyntheticExchange(latency=0.02)
+        service = CryptoService(exchange=exchange)
+        watchlist = [f"{base}/USDT" for base in SYNTHETIC_BASES]
+
+        results = await asyncio.gather(*(service.get_prices(watchlist) for _ in range(20)))
+        assert all(result == results[0] for result in results)
+        assert len(results[0]) == len(watchlist)
+        assert exchange.calls == {'fetch_tickers': 1}
+
+        # Snapshot recente também atende get_current_price sem nova chamada
+        assert await service.get_current_price('ETH/USDT') == results[0]['ETH/USDT']
+        assert 'fetch_ticker' not in exchange.calls
+
+    asyncio.run(run())
+
+
+def test_snapshot_expires(monkeypatch):
+    async def run():
+        exchange = SyntheticExchange()
+        service = CryptoService(exchange=exchange)
+        now = [1_700_000_000_000]
+        monkeypatch.setattr(exchange, 'milliseconds', lambda: now[0])
+
+        await service.get_prices(['BTC/USDT'])
+        now[0] += 1000
+        await service.get_prices(['BTC/USDT', 'SOL/USDT'])
+        assert exchange.calls['fetch_tickers'] == 1
+        now[0] += 5000
+        await service.get_prices(['BTC/USDT'])
+        assert exchange.calls['fetch_tickers'] == 2
+
+    asyncio.run(run())
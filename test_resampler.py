@@ -0,0 +1,126 @@
+"""
+Valida a reamostragem local (1h -> 4h/1d/1w) contra candles de timeframes maiores
+
+Usa as fixtures da Binance quando gravadas (python record_fixtures.py BTC/USDT);
+senão, as fixtures sintéticas do repositório, cujos candles maiores vêm de outra
+agregação local (record_fixtures.py --synthetic). Nesse caso os testes de
+equivalência com os candles nativos da exchange são pulados; os demais só verificam
+a consistência entre as duas agregações.
+
+Execute: pytest test_resampler.py -v
+"""
+import asyncio
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.candle_cache import CandleCache
+from app.services.crypto_service import CryptoService
+from app.services.resampler import resample_ohlcv, timeframe_ratio
+from record_fixtures import fixture_path
+
+SYMBOL = 'BTC/USDT'
+FIXTURE_EXCHANGE = 'binance' if os.path.exists(fixture_path('binance', SYMBOL, '1h')) else 'synthetic'
+
+# Comparação com candles nativos só faz sentido com fixtures gravadas da exchange
+requires_native_fixtures = pytest.mark.skipif(
+    FIXTURE_EXCHANGE == 'synthetic',
+    reason="sem fixtures da Binance (grave com: python record_fixtures.py BTC/USDT); "
+           "as sintéticas não validam contra candles nativos"
+)
+
+
+def load_fixture(timeframe: str) -> pd.DataFrame:
+    with open(fixture_path(FIXTURE_EXCHANGE, SYMBOL, timeframe), encoding='utf-8') as f:
+        candles = json.load(f)['candles']
+    df = pd.DataFrame(candles, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms', utc=True)
+    return df
+
+
+def assert_same_candles(resampled: pd.DataFrame, native: pd.DataFrame):
+    assert len(resampled) == len(native)
+    assert (resampled['timestamp'].values == native['timestamp'].values).all()
+    for column in ['open', 'high', 'low', 'close']:
+        np.testing.assert_array_equal(resampled[column].to_numpy(), native[column].to_numpy())
+    np.testing.assert_allclose(resampled['volume'].to_numpy(), native['volume'].to_numpy(), rtol=1e-9)
+
+
+@requires_native_fixtures
+@pytest.mark.parametrize('timeframe', ['4h', '1d', '1w'])
+def test_resampled_candles_match_native(timeframe):
+    hourly = load_fixture('1h')
+    assert_same_candles(resample_ohlcv(hourly, '1h', timeframe), load_fixture(timeframe))
+
+
+@requires_native_fixtures
+def test_incomplete_first_window_is_dropped():
+    """Série começando às 13h: o primeiro candle diário parcial é descartado"""
+    hourly = load_fixture('1h').iloc[13:].reset_index(drop=True)
+    daily = resample_ohlcv(hourly, '1h', '1d')
+    assert_same_candles(daily, load_fixture('1d').iloc[1:].reset_index(drop=True))
+
+
+def test_forming_candle_is_kept_partial():
+    """O último candle (em formação) agrega apenas as horas já disponíveis"""
+    hourly = load_fixture('1h').iloc[:24 + 5]
+    daily = resample_ohlcv(hourly, '1h', '1d')
+    assert len(daily) == 2
+    assert daily['close'].iloc[-1] == hourly['close'].iloc[-1]
+    assert daily['high'].iloc[-1] == hourly['high'].iloc[24:].max()
+
+
+def test_invalid_ratio():
+    with pytest.raises(ValueError):
+        timeframe_ratio('4h', '1h')
+
+
+class FixtureExchange:
+    """Exchange falsa que serve o fixture de 1h, com o relógio no último candle"""
+
+    def __init__(self):
+        with open(fixture_path(FIXTURE_EXCHANGE, SYMBOL, '1h'), encoding='utf-8') as f:
+            self.candles = json.load(f)['candles']
+        self.now_ms = self.candles[-1][0] + 30 * 60 * 1000
+        self.calls = []
+
+    def milliseconds(self):
+        return self.now_ms
+
+    async def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=None):
+        self.calls.append(timeframe)
+        return [c for c in self.candles if c[0] >= since][:limit]
+
+    async def close(self):
+        pass
+
+
+def test_resample_mode_fetches_only_finest_timeframe():
+    async def run():
+        service = CryptoService(cache=CandleCache(enabled=False), resample=True)
+        await service.exchange.close()
+        service.exchange = FixtureExchange()
+
+        data = await service.get_multiple_timeframes(SYMBOL, ['1h', '4h', '1d'], limit=40)
+        assert set(service.exchange.calls) == {'1h'}
+        assert all(len(df) == 40 for df in data.values())
+        assert_same_candles(data['4h'], load_fixture('4h').tail(40).reset_index(drop=True))
+        assert_same_candles(data['1d'], load_fixture('1d').tail(40).reset_index(drop=True))
+
+    asyncio.run(run())
+
+
+def test_resample_mode_with_limit_per_timeframe():
+    async def run():
+        service = CryptoService(cache=CandleCache(enabled=False), resample=True)
+        await service.exchange.close()
+        service.exchange = FixtureExchange()
+
+        data = await service.get_multiple_timeframes(SYMBOL, ['1h', '4h', '1d'], limit={'1h': 60, '4h': 30, '1d': 10})
+        assert [len(data[tf]) for tf in ('1h', '4h', '1d')] == [60, 30, 10]
+        assert_same_candles(data['1d'], load_fixture('1d').tail(10).reset_index(drop=True))
+
+    asyncio.run(run())
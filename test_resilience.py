@@ -0,0 +1,104 @@
+"""
+Testes do retry assíncrono com jitter e do circuit breaker da exchange
+
+Execute: pytest test_resilience.py -v
+"""
+import asyncio
+import time
+
+import ccxt
+import pytest
+
+from app.services.candle_cache import CandleCache
+from app.services.crypto_service import CryptoService
+from app.services.exchanges import SyntheticExchange
+from app.services.resilience import CircuitBreaker, CircuitOpenError, RetryPolicy, call_with_resilience
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0, seed=1)
+    delays = [policy.delay(attempt) for attempt in range(6) for _ in range(50)]
+    assert all(0 <= d <= 4.0 for d in delays)
+    assert len(set(delays)) > 1
+
+
+def test_breaker_opens_half_opens_and_closes():
+    clock = FakeClock()
+    breaker = CircuitBreaker('test', failure_threshold=2, reset_timeout=30, clock=clock)
+    breaker.record_failure()
+    assert breaker.state == 'closed'
+    breaker.record_failure()
+    assert breaker.state == 'open'
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now = 31
+    assert breaker.state == 'half_open'
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # apenas uma chamada de teste por vez
+
+    breaker.record_failure()
+    assert breaker.state == 'open'
+
+    clock.now = 62
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == 'closed'
+
+
+def test_non_transient_errors_do_not_trip_breaker():
+    async def run():
+        breaker = CircuitBreaker('test', failure_threshold=1)
+        calls = []
+
+        async def bad_symbol():
+            calls.append(1)
+            raise ccxt.BadSymbol('nope')
+
+        with pytest.raises(ccxt.BadSymbol):
+            await call_with_resilience(bad_symbol, RetryPolicy(max_attempts=3, base_delay=0), breaker)
+        assert len(calls) == 1
+        assert breaker.state == 'closed'
+
+    asyncio.run(run())
+
+
+def test_outage_fails_fast_and_falls_back_to_cached_data():
+    async def run():
+        exchange = SyntheticExchange()
+        service = CryptoService(cache=CandleCache(), exchange=exchange, retry_delay=0.01)
+        df = await service.get_candles('BTC/USDT', '1h', limit=50)
+        price = await service.get_current_price('BTC/USDT')
+
+        # Exchange fora do ar: as primeiras chamadas esgotam os retries e abrem o circuito
+        exchange.failure_rate = 1.0
+        service.cache.clear()
+        with pytest.raises(Exception):
+            await service.get_candles('ETH/USDT', '1h', limit=50)
+        with pytest.raises(Exception):
+            await service.get_candles('SOL/USDT', '1h', limit=50)
+        assert service.circuit_breaker.state == 'open'
+
+        # Com o circuito aberto, nenhuma chamada chega à exchange
+        calls = dict(exchange.calls)
+        start = time.perf_counter()
+        with pytest.raises(CircuitOpenError):
+            await service.get_candles('XRP/USDT', '1h', limit=50)
+        assert time.perf_counter() - start < 0.05
+        assert exchange.calls == calls
+
+        # ...e séries já conhecidas continuam sendo servidas (buffer circular)
+        stale = await service.get_candles('BTC/USDT', '1h', limit=50)
+        assert stale['close'].tolist() == df['close'].tolist()
+        assert await service.get_current_price('BTC/USDT') == price
+
+    asyncio.run(run())
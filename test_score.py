@@ -5,7 +5,7 @@ Execute após iniciar o servidor para ver o score e diagnóstico
 import requests
 import json
 from app.services.indicator_service import IndicatorService
-from app.services.crypto_service import CryptoService
+from app.services.crypto_service import SyncCryptoService
 from app.utils.score_engine import ScoreEngine
 
 
@@ -17,7 +17,7 @@ def test_calculate_score_local():
     print("="*70)
     
     # Inicializa serviços
-    crypto_service = CryptoService()
+    crypto_service = SyncCryptoService()
     
     # Símbolos para testar
     symbols = ['BTC', 'ETH', 'SOL']
@@ -0,0 +1,74 @@
+"""
+Testes do ScoreEngine vetorizado (mesmo resultado do cálculo escalar)
+
+Execute: pytest test_score_vectorized.py -v
+"""
+import math
+
+import numpy as np
+
+from app.services.indicator_kernel import compute_series_from_dataframe
+from app.services.streaming_indicators import FIELD_DECIMALS, format_indicators
+from app.utils.score_engine import ScoreEngine
+from sample_data import make_candles
+
+
+def scalar_scores(series):
+    length = len(next(iter(series.values())))
+    scores = []
+    for i in range(length):
+        values = {name: (None if math.isnan(v[i]) else float(v[i])) for name, v in series.items()}
+        flat = {
+            'ema9': values['EMA9'], 'ema21': values['EMA21'], 'ema200': values['EMA200'],
+            'rsi': values['RSI'], 'stoch_rsi_k': values['Stochastic_RSI_K'], 'stoch_rsi_d': values['Stochastic_RSI_D'],
+            'macd': values['MACD'], 'macd_signal': values['MACD_Signal'], 'macd_histogram': values['MACD_Histogram'],
+            'atr': values['ATR'], 'bb_upper': values['BB_Upper'], 'bb_middle': values['BB_Middle'],
+            'bb_lower': values['BB_Lower'], 'volume_ma': values['Volume_MA'], 'mfi': values['MFI'], 'adx': values['ADX']
+        }
+        scores.append(ScoreEngine.calculate_overall_score(flat, values['last_close'], values['current_volume']))
+    return np.array(scores)
+
+
+def test_score_series_matches_scalar_on_kernel_output():
+    df = make_candles(600, seed=9)
+    series = compute_series_from_dataframe(df)
+    vectorized = ScoreEngine.calculate_score_series(series, FIELD_DECIMALS)
+    for i in range(len(df)):
+        indicators = format_indicators({name: values[i] for name, values in series.items()})
+        price = indicators['price']
+        assert vectorized[i] == ScoreEngine.calculate_overall_score(
+            indicators, price['last_close'], price['current_volume']
+        ), i
+
+
+def test_score_series_matches_scalar_on_edge_values():
+    rng = np.random.default_rng(4)
+    n = 3000
+
+    def pick(*choices):
+        return rng.choice(np.array(choices, dtype=np.float64), n)
+
+    close = pick(100.0, 0.0, np.nan, 99.5, 101.0)
+    series = {
+        'EMA9': pick(99.0, 100.0, 101.0, np.nan), 'EMA21': pick(99.0, 100.0, 101.0, np.nan),
+        'EMA200': pick(50.0, 100.0, 150.0, np.nan),
+        'RSI': pick(0.0, 29.99, 30.0, 50.0, 70.0, 85.5, 100.0, np.nan),
+        'Stochastic_RSI_K': pick(0.0, 20.0, 35.0, 80.0, 99.0, np.nan),
+        'Stochastic_RSI_D': pick(10.0, 20.0, 50.0, 80.0, np.nan),
+        'MACD': pick(-1.0, 0.0, 1.0, np.nan), 'MACD_Signal': pick(-1.0, 0.0, 1.0, np.nan),
+        'MACD_Histogram': pick(-0.5, 0.0, 0.5, np.nan),
+        'ATR': pick(0.5, 1.0, 2.0, 3.0, 5.0, np.nan),
+        'BB_Upper': pick(100.0, 101.0, 105.0, np.nan), 'BB_Middle': pick(100.0, np.nan),
+        'BB_Lower': pick(95.0, 99.5, 100.0, 101.0, np.nan),
+        'Volume_MA': pick(0.0, 10.0, 20.0, np.nan), 'MFI': pick(0.0, 20.0, 50.0, 80.0, 100.0, np.nan),
+        'ADX': pick(10.0, 20.0, 25.0, 40.0, np.nan),
+        'last_close': close, 'current_volume': pick(0.0, 7.0, 10.0, 15.0, 16.0, 40.0, np.nan)
+    }
+    np.testing.assert_array_equal(ScoreEngine.calculate_score_series(series), scalar_scores(series))
+
+
+def test_missing_fields_and_rounding_like_python():
+    scores = ScoreEngine.calculate_score_series({'last_close': [100.0, -1.0], 'RSI': [80.0, 80.0]})
+    assert list(scores) == [ScoreEngine.calculate_overall_score({'rsi': 80.0}, 100.0, 0), 0.5]
+    values = np.array([2.675, 0.125, 1.005, 0.285])
+    assert list(ScoreEngine._round_like_python(values, 2)) == [round(float(v), 2) for v in values]
@@ -0,0 +1,158 @@
+"""
+Testes do screener de mercado (exchange sintética, sem rede)
+
+Execute: pytest test_screener.py -v
+"""
+import asyncio
+import importlib.util
+
+import ccxt
+import pytest
+
+from app.services.candle_cache import CandleCache
+from app.services.crypto_service import CryptoService
+from app.services.exchanges import SyntheticExchange
+from app.services.executor_pool import ManagedExecutor
+from app.services.timeframes import timeframe_to_ms
+
+pytestmark = pytest.mark.skipif(importlib.util.find_spec('pandas_ta') is None, reason="pandas_ta não instalado")
+
+NOW_MS = 1_750_000_000_000 + 17 * 60 * 1000
+
+
+class ClockExchange(SyntheticExchange):
+    """Exchange sintética com relógio controlado, falhas por símbolo e contagem de concorrência"""
+
+    def __init__(self, failing=(), **kwargs):
+        super().__init__(**kwargs)
+        self.now_ms = NOW_MS
+        self.failing = set(failing)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+
+    def milliseconds(self) -> int:
+        return self.now_ms
+
+    async def fetch_ohlcv(self, symbol, timeframe='1h', since=None, limit=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001)
+            self.requests.append((symbol, timeframe, since, limit))
+            if symbol in self.failing:
+                raise ccxt.BadSymbol(f"{symbol} fora do ar")
+            return await super().fetch_ohlcv(symbol, timeframe, since, limit)
+        finally:
+            self.in_flight -= 1
+
+
+def make_screener(exchange, **kwargs):
+    from app.services.screener import MarketScreener
+    service = CryptoService(cache=CandleCache(enabled=False), exchange=exchange, retry_delay=0.0)
+    return MarketScreener(service, ManagedExecutor('cpu', enabled=False), **kwargs), service
+
+
+def test_ranking_matches_analyze_scores():
+    from app.services.analysis_tasks import compute_indicators, score_timeframes
+
+    async def run():
+        screener, service = make_screener(ClockExchange(), batch_size=7)
+        result = await screener.scan('usdt', top=30)
+        assert result['quote'] == 'USDT' and result['scanned'] == 30 and not result['cached']
+
+        scores = [entry['score'] for entry in result['results']]
+        assert scores == sorted(scores, reverse=True)
+        assert [entry['rank'] for entry in result['results']] == list(range(1, 31))
+
+        # Mesmo score geral de /analyze para cada par
+        for entry in result['results'][:5]:
+            frames = await service.get_multiple_timeframes(entry['symbol'], ['1h', '4h', '1d'],
+                                                           screener.planner.plan(['1h', '4h', '1d']))
+            data = {}
+            for tf, df in frames.items():
+                indicators = compute_indicators(df)
+                data[tf] = {'indicators': indicators, 'last_close': indicators['price']['last_close'],
+                            'current_volume': indicators['price']['current_volume']}
+            analysis, _ = score_timeframes(data)
+            assert entry['score'] == analysis['overall_score']
+            assert entry['scores'] == {tf: round(score, 2) for tf, score in analysis['scores'].items()}
+
+    asyncio.run(run())
+
+
+def test_universe_top_k_and_bounded_concurrency():
+    async def run():
+        exchange = ClockExchange()
+        screener, service = make_screener(exchange, universe=10, concurrency=3, max_top=4)
+        result = await screener.scan('USDT', timeframe='4h', top=10)
+
+        volumes = await service.get_quote_volumes(exchange.symbols())
+        expected_universe = sorted(volumes, key=volumes.get, reverse=True)[:10]
+        assert result['scanned'] == 10
+        assert len(result['results']) == 4
+        assert {entry['symbol'] for entry in result['results']} <= set(expected_universe)
+        assert exchange.max_in_flight <= 3
+        assert exchange.calls['fetch_ohlcv'] == 10
+
+    asyncio.run(run())
+
+
+def test_cached_until_candle_close_and_failures_are_skipped():
+    async def run():
+        exchange = ClockExchange(failing={'BTC/USDT', 'ETH/USDT'})
+        screener, _ = make_screener(exchange)
+        first, second = await asyncio.gather(screener.scan(timeframe='1h'), screener.scan(timeframe='1h', top=3))
+        assert first['failed'] == 2 and first['scanned'] == 28
+        assert 'BTC/USDT' not in {entry['symbol'] for entry in first['results']}
+        assert len(second['results']) == 3
+        calls = exchange.calls['fetch_ohlcv']
+        assert screener.single_flight.shared == 1
+
+        # Mesmo candle: servido do cache
+        exchange.now_ms += 10 * 60 * 1000
+        cached = await screener.scan(timeframe='1h')
+        assert cached['cached'] and exchange.calls['fetch_ohlcv'] == calls
+
+        # Candle seguinte: nova varredura
+        exchange.now_ms += timeframe_to_ms('1h')
+        fresh = await screener.scan(timeframe='1h')
+        assert not fresh['cached'] and fresh['candle_open'] == first['candle_open'] + timeframe_to_ms('1h')
+
+        stats = screener.stats()
+        assert stats['scans'] == 2 and stats['cache_hits'] == 1
+        assert stats['progress'][0]['state'] == 'done'
+        assert stats['progress'][0]['fetched'] == 28 and stats['progress'][0]['failed'] == 2
+
+    asyncio.run(run())
+
+
+def test_next_candle_scan_only_fetches_new_candles():
+    """Cache e buffers com as configurações padrão comportam a varredura inteira"""
+    from app.services.screener import MarketScreener
+
+    async def run():
+        # 100 pares × 3 timeframes: mais séries que candle_buffer_max_series sozinho
+        exchange = ClockExchange(symbols=[f"C{i:03d}/USDT" for i in range(100)])
+        service = CryptoService(exchange=exchange, retry_delay=0.0)
+        screener = MarketScreener(service, ManagedExecutor('cpu', enabled=False), universe=100)
+        await screener.scan()
+        assert len(service._buffers) == 300
+
+        exchange.now_ms += timeframe_to_ms('1h')
+        exchange.requests.clear()
+        result = await screener.scan()
+        assert not result['cached'] and result['scanned'] == 100
+        assert {symbol for symbol, tf, _, _ in exchange.requests if tf == '1h'} == set(exchange.symbols())
+        assert all(since is not None and limit <= 2 for _, _, since, limit in exchange.requests)
+
+    asyncio.run(run())
+
+
+def test_unknown_quote_is_rejected():
+    async def run():
+        screener, _ = make_screener(ClockExchange())
+        with pytest.raises(ValueError):
+            await screener.scan('XYZ')
+
+    asyncio.run(run())
@@ -0,0 +1,65 @@
+"""
+Testes da coalescência de chamadas (single-flight) - sem acesso à rede
+
+Execute: pytest test_single_flight.py -v
+"""
+import asyncio
+
+import pytest
+
+from app.services.candle_cache import CandleCache
+from app.services.crypto_service import CryptoService
+from app.services.single_flight import SingleFlight
+from test_crypto_service_async import SlowExchange
+
+
+def test_concurrent_callers_share_one_call():
+    async def run():
+        flight = SingleFlight()
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return [1, 2, 3]
+
+        results = await asyncio.gather(*(flight.do('key', fetch) for _ in range(20)))
+        assert len(calls) == 1
+        assert all(r == [1, 2, 3] for r in results)
+        assert flight.stats() == {'enabled': True, 'calls': 1, 'shared': 19, 'in_flight': 0}
+
+    asyncio.run(run())
+
+
+def test_errors_are_propagated_to_all_callers():
+    async def run():
+        flight = SingleFlight()
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("exchange fora do ar")
+
+        results = await asyncio.gather(*(flight.do('key', fail) for _ in range(5)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+        # A chave é liberada após a falha: a próxima chamada é executada de novo
+        with pytest.raises(RuntimeError):
+            await flight.do('key', fail)
+        assert flight.calls == 2
+
+    asyncio.run(run())
+
+
+def test_crypto_service_coalesces_identical_fetches():
+    async def run():
+        service = CryptoService(cache=CandleCache(enabled=False))
+        await service.exchange.close()
+        service.exchange = SlowExchange(latency=0.05)
+
+        await asyncio.gather(*(
+            service.get_multiple_timeframes('BTC/USDT', ['1h', '4h', '1d'], limit=100)
+            for _ in range(10)
+        ))
+        assert service.exchange.calls == 3
+
+    asyncio.run(run())
@@ -0,0 +1,69 @@
+"""
+Testes do motor incremental de indicadores
+
+Compara o estado incremental com as fórmulas do pandas_ta recalculadas sobre a
+série inteira (pandas puro) e, se o pandas_ta estiver instalado, com o próprio
+IndicatorService.
+
+Execute: pytest test_streaming_indicators.py -v
+"""
+import sys
+
+import pytest
+
+from app.services.streaming_indicators import StreamingIndicatorService, StreamingIndicators
+from sample_data import assert_matches, make_candles, reference_last
+
+
+def test_incremental_state_matches_batch_formulas():
+    df = make_candles(400)
+    state = StreamingIndicators()
+    for i, row in enumerate(df.itertuples()):
+        values = state.update(i, row.high, row.low, row.close, row.volume)
+        if i in (60, 250, 399):
+            assert_matches(values, reference_last(df.iloc[:i + 1]))
+
+
+def test_forming_candle_does_not_change_state():
+    df = make_candles(300)
+    service = StreamingIndicatorService()
+    before = service.get_indicators('BTC/USDT', '1h', df)
+
+    # O candle em formação muda várias vezes; o estado continua nos candles fechados
+    forming = df.copy()
+    for close in (31000.0, 29000.0, float(df['close'].iloc[-1])):
+        forming.loc[forming.index[-1], 'close'] = close
+        result = service.get_indicators('BTC/USDT', '1h', forming)
+    assert result == before
+    assert service.stats()['rebuilds'] == 1
+    assert service.stats()['advanced'] == 299
+
+
+def test_new_closed_candle_advances_once():
+    df = make_candles(501)
+    service = StreamingIndicatorService()
+    service.get_indicators('BTC/USDT', '1h', df.iloc[:500])
+
+    # Janela deslizante de 500 candles: só o candle que fechou é incorporado
+    window = df.iloc[1:501].reset_index(drop=True)
+    result = service.get_indicators('BTC/USDT', '1h', window)
+    assert service.stats()['rebuilds'] == 1
+    assert service.stats()['advanced'] == 499 + 1
+
+    expected = StreamingIndicatorService().get_indicators('BTC/USDT', '1h', df)
+    assert result == expected
+
+
+@pytest.mark.skipif('pandas_ta' not in sys.modules and __import__('importlib').util.find_spec('pandas_ta') is None,
+                    reason="pandas_ta não instalado")
+def test_matches_indicator_service():
+    from app.services.indicator_service import IndicatorService
+
+    df = make_candles(500)
+    expected = IndicatorService.get_indicators_pandas_ta(df)
+    result = StreamingIndicatorService().get_indicators('BTC/USDT', '1h', df)
+    for category, fields in expected.items():
+        for name, value in fields.items():
+            if value is None:
+                continue
+            assert result[category][name] == pytest.approx(value, rel=1e-3, abs=0.02), name
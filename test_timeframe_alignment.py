@@ -0,0 +1,111 @@
+"""
+Testes do alinhamento de timeframes sem look-ahead (score combinado por candle)
+
+Execute: pytest test_timeframe_alignment.py -v
+"""
+import numpy as np
+
+from app.services.indicator_kernel import compute_series_from_dataframe
+from app.services.resampler import resample_ohlcv
+from app.services.streaming_indicators import FIELD_DECIMALS, format_indicators
+from app.services.timeframe_alignment import TimeframeAlignment, last_closed_index
+from app.services.timeframes import candle_open_time
+from app.utils.score_engine import ScoreEngine
+from sample_data import HOUR_MS, make_candles
+
+DAY_MS = 24 * HOUR_MS
+
+
+def test_last_closed_index_only_sees_closed_candles():
+    coarse_open = np.array([0, 4, 8]) * HOUR_MS
+    base_close = (np.arange(12) + 1) * HOUR_MS
+    index = last_closed_index(base_close, coarse_open, 4 * HOUR_MS)
+    # O candle 4h [0, 4) só fica disponível no fechamento do candle 1h das 3h
+    assert list(index) == [-1, -1, -1, 0, 0, 0, 0, 1, 1, 1, 1, 2]
+
+
+def test_index_with_gaps_and_weekly_candles():
+    # Lacuna no 1h (horas 5 a 9 ausentes) e no 4h (candle das 4h ausente)
+    base = np.array([0, 1, 2, 3, 4, 10, 11, 12]) * HOUR_MS
+    alignment = TimeframeAlignment('1h', base)
+    index = alignment.add('4h', np.array([0, 8, 12]) * HOUR_MS)
+    assert list(index) == [-1, -1, -1, 0, 0, 0, 1, 1]
+    assert list(alignment.index('1h')) == list(range(8))
+
+    # Semanas abrem na segunda-feira: a primeira só fecha 7 dias depois
+    days = np.arange(30) * DAY_MS + candle_open_time(1_700_000_000_000, '1d')
+    weekly = np.unique(candle_open_time(days, '1w'))
+    alignment = TimeframeAlignment('1d', days)
+    index = alignment.add('1w', weekly)
+    closes = days + DAY_MS
+    for i, j in enumerate(index):
+        if j >= 0:
+            assert weekly[j] + 7 * DAY_MS <= closes[i]
+        if j + 1 < len(weekly):
+            assert weekly[j + 1] + 7 * DAY_MS > closes[i]
+
+
+def test_fields_are_aligned_on_read_without_copying_coarse_series():
+    df = make_candles(24 * 10, seed=3)
+    coarse = resample_ohlcv(df, '1h', '4h')
+    series = compute_series_from_dataframe(coarse, ['RSI', 'EMA9'])
+    alignment = TimeframeAlignment('1h', df['timestamp'])
+    index = alignment.add('4h', coarse['timestamp'])
+
+    fields = alignment.fields('4h', series)
+    assert set(fields) == {'RSI', 'EMA9'}
+    assert fields._series is series
+    rsi = fields['RSI']
+    assert len(rsi) == len(df)
+    assert np.isnan(rsi[index < 0]).all()
+    np.testing.assert_array_equal(rsi[index >= 0], series['RSI'][index[index >= 0]])
+
+    assert alignment.fields('1h', series) is series
+    assert alignment.align('1h', series['RSI']) is series['RSI']
+
+
+def test_blend_matches_analyze_multiple_timeframes_at_every_hour():
+    df = make_candles(24 * 230, seed=8)
+    frames = {'1h': df, '4h': resample_ohlcv(df, '1h', '4h'), '1d': resample_ohlcv(df, '1h', '1d')}
+    alignment = TimeframeAlignment('1h', df['timestamp'])
+    series, scores = {}, {}
+    for tf, frame in frames.items():
+        alignment.add(tf, frame['timestamp'])
+        series[tf] = compute_series_from_dataframe(frame, ScoreEngine.REQUIRED_INDICATORS)
+        scores[tf] = ScoreEngine.calculate_score_series(series[tf], FIELD_DECIMALS)
+
+    blended = alignment.blend(scores, ScoreEngine.TIMEFRAME_WEIGHTS)
+
+    for i in list(range(0, len(df), 97)) + [len(df) - 1]:
+        timeframes_data = {}
+        for tf in frames:
+            j = alignment.index(tf)[i]
+            if j < 0:
+                continue  # sem candle fechado: a API usa 0.5
+            indicators = format_indicators({name: values[j] for name, values in series[tf].items()})
+            timeframes_data[tf] = {
+                'indicators': indicators,
+                'last_close': indicators['price']['last_close'],
+                'current_volume': indicators['price']['current_volume']
+            }
+        scalar = ScoreEngine.analyze_multiple_timeframes(timeframes_data)
+        expected = sum(scalar['scores'].get(tf, 0.5) * w for tf, w in ScoreEngine.TIMEFRAME_WEIGHTS.items())
+        assert blended[i] == expected
+        assert round(float(blended[i]), 2) == scalar['overall_score']
+
+
+def test_blend_marks_missing_timeframes():
+    df = make_candles(48, seed=1)
+    alignment = TimeframeAlignment('1h', df['timestamp'])
+    daily = resample_ohlcv(df, '1h', '1d')
+    alignment.add('1d', daily['timestamp'])
+    scores = {'1h': np.full(48, 0.8), '1d': np.full(len(daily), 0.6)}
+
+    blended = alignment.blend(scores, {'1h': 0.5, '4h': 0.25, '1d': 0.25})
+    before = alignment.index('1d') < 0
+    np.testing.assert_allclose(blended[before], 0.5 * 0.8 + 0.25 * 0.5 + 0.25 * 0.5)
+    np.testing.assert_allclose(blended[~before], 0.5 * 0.8 + 0.25 * 0.5 + 0.25 * 0.6)
+
+    # NaN marca candles sem todos os timeframes (usado pelo backtest)
+    strict = alignment.blend(scores, {'1h': 0.5, '1d': 0.5}, missing=np.nan)
+    assert np.isnan(strict[before]).all() and np.isfinite(strict[~before]).all()
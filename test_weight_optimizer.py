@@ -0,0 +1,116 @@
+"""
+Testes do otimizador de pesos do ScoreEngine (features pré-calculadas, pool de processos)
+
+Execute: pytest test_weight_optimizer.py -v
+"""
+import numpy as np
+import pytest
+
+from app.services.backtest import BacktestConfig, BacktestEngine
+from app.services.indicator_kernel import compute_series_from_dataframe
+from app.services.streaming_indicators import FIELD_DECIMALS, format_indicators
+from app.services.timeframes import to_epoch_ms
+from app.services.weight_optimizer import (
+    WeightOptimizer, evaluate_candidates, grid_candidates, precompute_features, random_candidates
+)
+from app.utils.score_engine import ScoreEngine
+from app.utils.score_weights import DEFAULT_WEIGHTS, ScoreWeights
+from app.config import Settings
+from sample_data import make_candles, make_frames
+
+CONFIG = BacktestConfig(entry_threshold=0.6, exit_threshold=0.45)
+
+
+def test_features_times_coefficients_match_score_series():
+    series = compute_series_from_dataframe(make_candles(400, seed=3), ScoreEngine.REQUIRED_INDICATORS)
+    components = ScoreEngine.calculate_score_components(series, FIELD_DECIMALS)
+    features = ScoreEngine.score_features(components)
+
+    for weights in (DEFAULT_WEIGHTS, ScoreWeights(0.1, 0.5, 0.3, 0.1, 0.2, 0.5, 0.3)):
+        expected = ScoreEngine.calculate_score_series(series, FIELD_DECIMALS, weights)
+        raw = np.clip((features @ weights.coefficients() + 1) / 2, 0.0, 1.0)
+        ok = components['valid'] & ~np.isnan(raw)
+        assert ok.sum() > 100
+        np.testing.assert_allclose(raw[ok], expected[ok], atol=0.005 + 1e-9)
+
+
+def test_custom_weights_in_scalar_and_vector_paths():
+    weights = ScoreWeights(trend=0.7, momentum=0.1, volatility=0.1, sentiment=0.1)
+    series = compute_series_from_dataframe(make_candles(400, seed=4))
+    vector = ScoreEngine.calculate_score_series(series, FIELD_DECIMALS, weights)
+    assert not np.array_equal(vector, ScoreEngine.calculate_score_series(series, FIELD_DECIMALS))
+
+    for i in range(len(vector)):
+        indicators = format_indicators({name: values[i] for name, values in series.items()})
+        price = indicators['price']
+        assert vector[i] == ScoreEngine.calculate_overall_score(
+            indicators, price['last_close'], price['current_volume'], weights
+        ), i
+
+
+def test_default_weights_reproduce_backtest():
+    frames = make_frames(24 * 260, seed=11)
+    start_ms = int(to_epoch_ms(frames['1h']['timestamp'])[24 * 220])
+    data = precompute_features('BTC/USDT', frames, CONFIG, start_ms=start_ms)
+    assert data.start == 24 * 220
+
+    metrics = evaluate_candidates([data], np.array([DEFAULT_WEIGHTS]), CONFIG)
+    summary = BacktestEngine(config=CONFIG).run(frames, start_ms).summary()
+    assert summary['trades'] > 0
+    assert metrics['total_return'][0] == pytest.approx(summary['total_return'], abs=1e-9)
+    assert metrics['max_drawdown'][0] == pytest.approx(summary['max_drawdown'], abs=1e-9)
+
+
+def test_candidate_sets_are_normalized():
+    grid = grid_candidates(0.25)
+    assert grid.shape == (35 * 15, 7)
+    assert len({tuple(row) for row in grid}) == len(grid)
+    np.testing.assert_allclose(grid[:, :4].sum(axis=1), 1.0)
+    np.testing.assert_allclose(grid[:, 4:].sum(axis=1), 1.0)
+    assert len(grid_candidates(0.1)) == 286 * 66
+
+    samples = random_candidates(100, seed=1)
+    np.testing.assert_array_equal(samples, random_candidates(100, seed=1))
+    np.testing.assert_allclose(samples[:, :4].sum(axis=1), 1.0)
+    assert (samples >= 0).all()
+
+    assert ScoreWeights(2, 1, 1, 0, 1, 1, 2).normalized() == ScoreWeights(0.5, 0.25, 0.25, 0.0, 0.25, 0.25, 0.5)
+    with pytest.raises(ValueError):
+        ScoreWeights(0, 0, 0, 0).normalized()
+
+
+def test_weights_from_settings():
+    assert ScoreWeights.from_settings(Settings(score_weights={})) == DEFAULT_WEIGHTS
+    weights = ScoreWeights.from_settings(Settings(score_weights={'trend': 0.5, 'momentum': 0.2}))
+    assert weights.trend == 0.5 and weights.momentum == 0.2
+    rounded = ScoreWeights(1 / 3, 1 / 3, 1 / 3, 0.0, 1 / 3, 1 / 3, 1 / 3).to_dict()  # saída de optimize_weights.py
+    assert ScoreWeights.from_settings(Settings(score_weights=rounded)).trend == 0.3333
+
+
+@pytest.mark.parametrize('overrides', [
+    {'volume': 0.5},
+    {'trend': 0.5},
+    {'trend': 0.6, 'momentum': -0.1},
+    {'rsi': 0.5, 'macd': 0.5, 'stoch': 0.5},
+])
+def test_weights_from_settings_rejects_invalid(overrides):
+    with pytest.raises(ValueError):
+        ScoreWeights.from_settings(Settings(score_weights=overrides))
+
+
+def test_process_pool_matches_inline_search():
+    frames = make_frames(24 * 240, seed=2)
+    start_ms = int(to_epoch_ms(frames['1h']['timestamp'])[24 * 215])
+    dataset = [precompute_features('BTC/USDT', frames, CONFIG, start_ms=start_ms)]
+    candidates = random_candidates(40, seed=7)
+
+    inline = WeightOptimizer(dataset, CONFIG, 'return_over_drawdown', workers=1).search(candidates, top=5)
+    pooled = WeightOptimizer(dataset, CONFIG, 'return_over_drawdown', workers=2, chunk_size=8).search(candidates, top=5)
+    assert pooled == inline
+    assert inline['evaluated'] == 40 and len(inline['best']) == 5
+    assert inline['baseline']['weights'] == DEFAULT_WEIGHTS.to_dict()
+    objectives = [entry['objective'] for entry in inline['best']]
+    assert objectives == sorted(objectives, reverse=True)
+
+    with pytest.raises(ValueError):
+        WeightOptimizer(dataset, objective='sharpe')